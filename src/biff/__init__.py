@@ -14,7 +14,6 @@ Library API — import core types for programmatic use::
 from __future__ import annotations
 
 import importlib
-from importlib.metadata import version
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -39,7 +38,7 @@ if TYPE_CHECKING:
         Relay as Relay,
     )
 
-__version__ = version("punt-biff")
+    __version__: str
 
 __all__ = [
     "BiffConfig",
@@ -67,6 +66,15 @@ def __getattr__(name: str) -> object:
     when lightweight entry points like ``biff-hook`` only need
     ``biff._stdlib`` or ``biff.hook``.
     """
+    # Resolved on first use: importlib.metadata costs tens of milliseconds,
+    # which every biff-hook / biff-statusline invocation would otherwise pay.
+    if name == "__version__":
+        from importlib.metadata import version  # noqa: PLC0415
+
+        value = version("punt-biff")
+        globals()[name] = value
+        return value
+
     # Module re-exports (import the submodule itself).
     submodules = {"commands"}
     if name in submodules:
@@ -9,7 +9,8 @@ Product commands (``biff who``, ``biff finger``, ``biff write``,
 ``biff read``, ``biff plan``, ``biff last``, ``biff wall``, ``biff mesg``,
 ``biff tty``, ``biff status``, ``biff talk``), admin commands
 (``biff serve``, ``biff enable``, ``biff disable``, ``biff install``,
-``biff doctor``, ``biff uninstall``), and status line management.
+``biff doctor``, ``biff uninstall``, ``biff bench``, ``biff agent``), and
+status line management.
 
 Every product command is also available as an MCP tool — the CLI is the
 complete product, MCP tools are projections of CLI functionality.
@@ -24,7 +25,6 @@ import queue as queue_mod
 import sys
 import threading as threading_mod
 import warnings
-from collections.abc import Awaitable, Callable
 from contextlib import suppress
 from datetime import UTC, datetime
 from importlib.metadata import version as pkg_version
@@ -41,7 +41,7 @@ if TYPE_CHECKING:
     from biff.server.state import ServerState
 
 import biff.commands.talk as talk_commands
-from biff import commands
+from biff.cli_agent import AgentError, command_fn, run_via_agent, socket_path
 from biff.cli_session import CliContext, cli_session
 from biff.commands import CommandResult
 from biff.config import (
@@ -1101,42 +1101,54 @@ async def _repl() -> None:
 # ---------------------------------------------------------------------------
 
 
-def _run(
-    coro_factory: Callable[[CliContext], Awaitable[CommandResult]],
-) -> None:
-    """Run a command function inside a CLI session.
+def _run(command: str, *args: object, **kwargs: object) -> None:
+    """Run a ``biff.commands`` command, on the warm agent if one is up.
 
-    Handles JSON/text branching, stderr for errors, and exit codes.
+    Falls back to a CLI session of its own when no agent answers for this
+    repo and ``--user`` (:mod:`biff.cli_agent`).  Handles JSON/text
+    branching, stderr for errors, and exit codes.
     """
 
-    async def _inner() -> None:
-        try:
-            async with cli_session(user_override=_user_override) as ctx:
-                result = await coro_factory(ctx)
-        except ValueError as exc:
-            if _json_output:
-                _print_json({"error": str(exc)})
-            else:
-                print(f"Error: {exc}", file=sys.stderr)
-            raise typer.Exit(code=1) from None
+    async def _in_session() -> CommandResult:
+        async with cli_session(user_override=_user_override) as ctx:
+            return await command_fn(command)(ctx, *args, **kwargs)
 
+    try:
+        result = _run_on_agent(command, args, kwargs)
+        if result is None:
+            result = asyncio.run(_in_session())
+    except (ValueError, AgentError) as exc:
         if _json_output:
-            data = result.json_data if result.json_data is not None else result.text
-            _print_json(data)
-        elif result.error:
-            print(result.text, file=sys.stderr)
-        elif not _quiet_output:
-            print(result.text)
-        if result.error:
-            raise typer.Exit(code=1)
+            _print_json({"error": str(exc)})
+        else:
+            print(f"Error: {exc}", file=sys.stderr)
+        raise typer.Exit(code=1) from None
 
-    asyncio.run(_inner())
+    if _json_output:
+        data = result.json_data if result.json_data is not None else result.text
+        _print_json(data)
+    elif result.error:
+        print(result.text, file=sys.stderr)
+    elif not _quiet_output:
+        print(result.text)
+    if result.error:
+        raise typer.Exit(code=1)
+
+
+def _run_on_agent(
+    command: str, args: tuple[object, ...], kwargs: dict[str, object]
+) -> CommandResult | None:
+    """Send *command* to this repo's ``biff agent``; ``None`` if none runs."""
+    repo_root = find_git_root()
+    if repo_root is None:
+        return None
+    return run_via_agent(socket_path(repo_root, _user_override), command, args, kwargs)
 
 
 @app.command()
 def who() -> None:
     """List active team members and what they're working on."""
-    _run(commands.who)
+    _run("who")
 
 
 @app.command()
@@ -1144,7 +1156,7 @@ def finger(
     user: Annotated[str, typer.Argument(help="User to query, e.g. kai or kai:tty1")],
 ) -> None:
     """Check what a user is working on and their availability."""
-    _run(lambda ctx: commands.finger(ctx, user))
+    _run("finger", user)
 
 
 @app.command("write")
@@ -1153,13 +1165,13 @@ def write_cmd(
     message: Annotated[str, typer.Argument(help="Message to send (auto-splits)")],
 ) -> None:
     """Send a message to a teammate's inbox."""
-    _run(lambda ctx: commands.write(ctx, to, message))
+    _run("write", to, message)
 
 
 @app.command("read")
 def read_cmd() -> None:
     """Check inbox for new messages. Marks all as read."""
-    _run(commands.read)
+    _run("read")
 
 
 @app.command()
@@ -1169,12 +1181,12 @@ def plan(
 ) -> None:
     """Set what you're currently working on."""
     if clear:
-        _run(lambda ctx: commands.plan(ctx, ""))
+        _run("plan", "")
     elif not message:
         print("Usage: biff plan <message> | biff plan --clear", file=sys.stderr)
         raise typer.Exit(code=1)
     else:
-        _run(lambda ctx: commands.plan(ctx, message))
+        _run("plan", message)
 
 
 @app.command("last")
@@ -1183,7 +1195,7 @@ def last_cmd(
     count: Annotated[int, typer.Option(help="Number of entries")] = 25,
 ) -> None:
     """Show session login/logout history."""
-    _run(lambda ctx: commands.last(ctx, user, count))
+    _run("last", user, count)
 
 
 @app.command("wall")
@@ -1193,7 +1205,7 @@ def wall_cmd(
     clear: Annotated[bool, typer.Option("--clear", help="Remove active wall")] = False,
 ) -> None:
     """Post, read, or clear a team broadcast."""
-    _run(lambda ctx: commands.wall(ctx, message, duration, clear=clear))
+    _run("wall", message, duration, clear=clear)
 
 
 @app.command()
@@ -1204,7 +1216,7 @@ def mesg(
     ],
 ) -> None:
     """Control message reception (on/off/y/n)."""
-    _run(lambda ctx: commands.mesg(ctx, enabled))
+    _run("mesg", enabled)
 
 
 @app.command("tty")
@@ -1212,13 +1224,13 @@ def tty_cmd(
     name: Annotated[str, typer.Argument(help="Session name (optional)")] = "",
 ) -> None:
     """Name the current CLI session."""
-    _run(lambda ctx: commands.tty(ctx, name))
+    _run("tty", name)
 
 
 @app.command()
 def status() -> None:
     """Show connection state, session info, and pending messages."""
-    _run(commands.status)
+    _run("status")
 
 
 # ---------------------------------------------------------------------------
@@ -1546,6 +1558,146 @@ def doctor() -> None:
         raise typer.Exit(code=code)
 
 
+@app.command()
+def bench(
+    url: Annotated[
+        str, typer.Option(help="NATS server to load (a local nats-server).")
+    ] = "nats://127.0.0.1:4222",
+    sessions: Annotated[
+        int, typer.Option(help="Simulated agents, one connection each.")
+    ] = 10,
+    ops: Annotated[int, typer.Option(help="Operations per agent.")] = 200,
+    mix: Annotated[
+        str | None,
+        typer.Option(help="Operation weights, e.g. 'heartbeat=30,deliver=10'."),
+    ] = None,
+    seed: Annotated[int, typer.Option(help="Workload RNG seed.")] = 0,
+    output: Annotated[
+        Path | None,
+        typer.Option(help="Report path (default: ~/.punt-labs/biff/bench/)."),
+    ] = None,
+    compare: Annotated[
+        Path | None,
+        typer.Option(help="Earlier report to compare against."),
+    ] = None,
+) -> None:
+    """Load-test the NATS relay and report per-operation latency as JSON."""
+    from biff.bench import (
+        DEFAULT_MIX,
+        BenchConfig,
+        compare_reports,
+        load_report,
+        parse_mix,
+        run_bench,
+        save_report,
+    )
+
+    try:
+        baseline = load_report(compare) if compare is not None else None
+        config = BenchConfig(
+            url=url,
+            sessions=sessions,
+            ops_per_session=ops,
+            mix=parse_mix(mix) if mix else dict(DEFAULT_MIX),
+            seed=seed,
+        )
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise typer.Exit(code=1) from None
+
+    try:
+        report = asyncio.run(run_bench(config))
+    except (NatsError, TimeoutError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise typer.Exit(code=1) from None
+    path = save_report(report, output)
+    _print_json(report)
+    # stdout stays pure JSON; the rest is for the human at the terminal.
+    print(f"Saved {path}", file=sys.stderr)
+    if baseline is not None:
+        print(compare_reports(baseline, report), file=sys.stderr)
+
+
+_AGENT_START_TIMEOUT = 15.0
+
+
+@app.command("agent")
+def agent_cmd(
+    idle_timeout: Annotated[
+        float, typer.Option(help="Log out and exit after this many idle seconds.")
+    ] = 600.0,
+    detach: Annotated[
+        bool, typer.Option("--detach", help="Start in the background and return.")
+    ] = False,
+    stop: Annotated[
+        bool, typer.Option("--stop", help="Stop this repo's running agent.")
+    ] = False,
+) -> None:
+    """Keep a warm CLI session so inline commands skip connect and login.
+
+    Opt-in.  While the agent runs, ``biff who`` (and every other inline
+    product command) in this repo is answered over a Unix socket by the
+    agent's already-registered session instead of building its own.
+    """
+    import time
+
+    from biff import cli_agent
+
+    repo_root = find_git_root()
+    if repo_root is None:
+        raise SystemExit("Not in a git repository. Run biff from inside a repo.")
+    path = cli_agent.socket_path(repo_root, _user_override)
+
+    if stop:
+        print("biff agent stopped." if cli_agent.stop(path) else "No biff agent.")
+        return
+    running = cli_agent.ping(path)
+    if running is not None:
+        print(f"biff agent already running (pid {running.get('pid')}).")
+        return
+
+    if detach:
+        import subprocess
+
+        user_args = ["--user", _user_override] if _user_override else []
+        subprocess.Popen(  # noqa: S603
+            [
+                sys.executable,
+                "-m",
+                "biff",
+                *user_args,
+                "agent",
+                "--idle-timeout",
+                str(idle_timeout),
+            ],
+            cwd=repo_root,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + _AGENT_START_TIMEOUT
+        while time.monotonic() < deadline:
+            running = cli_agent.ping(path)
+            if running is not None:
+                print(f"biff agent running (pid {running.get('pid')}).")
+                return
+            time.sleep(0.1)
+        print("Error: biff agent did not start (see biff.log).", file=sys.stderr)
+        raise typer.Exit(code=1)
+
+    try:
+        with suppress(KeyboardInterrupt):
+            asyncio.run(
+                cli_agent.serve(
+                    path, user_override=_user_override, idle_timeout=idle_timeout
+                )
+            )
+    except (ValueError, RuntimeError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        raise typer.Exit(code=1) from None
+
+
 @app.command("uninstall")
 def uninstall_cmd() -> None:
     """Uninstall biff: remove the plugin, this clone's git hooks, and the import."""
@@ -1625,13 +1777,13 @@ def talk(
     asyncio.run(_talk_interactive(to, message))
 
 
-async def _talk_fetch_and_print(relay: object, session_key: str, user: str) -> None:
+async def _talk_fetch_and_print(relay: object, session_key: str) -> None:
     """Fetch and print any unread messages using shared formatting."""
     from biff.server.tools.talk import fetch_all_unread, format_talk_messages
 
     if not isinstance(relay, NatsRelay):
         return
-    messages = await fetch_all_unread(relay, session_key, user)
+    messages = await fetch_all_unread(relay, session_key)
     if messages:
         print(format_talk_messages(messages))
 
@@ -1767,7 +1919,7 @@ async def _talk_converse(
     fetch_latch = TalkNotifyLatch.for_fetch(logging.getLogger(__name__))
     while True:
         try:
-            await _talk_fetch_and_print(relay, session_key, user)
+            await _talk_fetch_and_print(relay, session_key)
         except (NatsError, TimeoutError, OSError):
             fetch_latch.record_failure()
         else:
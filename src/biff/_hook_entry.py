@@ -127,6 +127,23 @@ def _cc_pre_compact() -> None:
     _emit(_hook_context("PreCompact", result))
 
 
+def _pre_tool_use_via_daemon() -> bool:
+    """Ask the hook daemon for the gate decision; ``False`` if unavailable."""
+    import json  # noqa: PLC0415
+    from pathlib import Path  # noqa: PLC0415
+
+    from biff.hook_daemon import query_gate  # noqa: PLC0415
+
+    try:
+        decision = query_gate(str(Path.cwd()))
+    except (OSError, ValueError):
+        return False
+    if decision is not None:
+        json.dump(decision, sys.stdout)
+        sys.stdout.write("\n")
+    return True
+
+
 _CC_HANDLERS: dict[str, Callable[[], None]] = {
     "session-start": _cc_session_start,
     "session-resume": _cc_session_resume,
@@ -144,6 +161,11 @@ def _dispatch_cc(event: str) -> None:
     if handler is None:
         sys.exit(f"Unknown claude-code event: {event}")
 
+    # Edit/Write gate: a resident daemon answers without importing typer
+    # or running git.  Absent or unhealthy → fall through to in-process.
+    if event == "pre-tool-use" and _pre_tool_use_via_daemon():
+        return
+
     # Gate: skip if biff not enabled in this repo.
     from biff.hook import _is_biff_enabled  # noqa: PLC0415
 
@@ -0,0 +1,35 @@
+"""Lightweight status line entry point — bypasses full CLI import chain.
+
+Claude Code runs the status line command on every render.  ``biff
+statusline`` enters through ``__main__.py``, which loads typer, the
+server package, nats-py, pydantic and fastmcp before
+:func:`~biff.statusline.run_statusline` reads a single byte of stdin.
+
+This module is the entry point for ``biff-statusline``.  It imports only
+``biff.statusline``, whose runtime path is stdlib-only: read the session
+blob from stdin, resolve the session key (``biff.session_key``), read
+``unread/{key}.json`` (``biff.unread``) and format the segments.  Heavier
+modules are imported only by install-time helpers, never on a render.
+"""
+
+from __future__ import annotations
+
+import sys
+
+
+def main() -> None:
+    """Print the status line; any ``--help``-style arguments go to the full CLI."""
+    if sys.argv[1:]:
+        from biff.__main__ import app  # noqa: PLC0415
+
+        sys.argv = [sys.argv[0], "statusline", *sys.argv[1:]]
+        app()
+        return
+
+    from biff.statusline import run_statusline  # noqa: PLC0415
+
+    print(run_statusline())  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Stdlib-only Unix-socket plumbing shared by biff's resident daemons.
+
+``biff-hook daemon`` (:mod:`biff.hook_daemon`) and ``biff agent``
+(:mod:`biff.cli_agent`) both answer one JSON line per connection on a
+per-user socket.  This module holds the parts they share: claiming the
+socket path, binding it owner-only, answering a request line, and the
+blocking client round trip.  Stdlib-only, because the hook client is
+imported by ``biff._hook_entry`` before anything else.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import socket
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from pathlib import Path
+
+# Largest request line a server accepts; a longer one is answered as
+# malformed.
+MAX_REQUEST = 64 * 1024
+
+# Clears group/other bits (and owner execute) for the socket ``bind``
+# creates, so it is never reachable with default permissions.
+_OWNER_ONLY_UMASK = 0o177
+
+
+class NoListenerError(OSError):
+    """Nothing accepted the connection: no socket, or a stale one."""
+
+
+def claim_socket(path: Path, *, owner: str, timeout: float) -> None:
+    """Remove a stale socket at *path*; refuse if a live *owner* holds it."""
+    if not path.exists():
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(timeout)
+        probe.connect(str(path))
+    except OSError:
+        path.unlink(missing_ok=True)
+        return
+    finally:
+        probe.close()
+    msg = f"{owner} already running on {path}"
+    raise RuntimeError(msg)
+
+
+@contextlib.asynccontextmanager
+async def serve_socket(
+    path: Path,
+    answer: Callable[[bytes], Awaitable[bytes]],
+    *,
+    owner: str,
+    timeout: float,
+) -> AsyncGenerator[asyncio.Server]:
+    """Serve *answer* on *path* (mode ``0600``) for the body of the block.
+
+    *answer* maps one request line to one reply line.  The socket is
+    created under an owner-only umask, so there is no window between
+    ``bind`` and a ``chmod``; it is removed on exit.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    claim_socket(path, owner=owner, timeout=timeout)
+    old_umask = os.umask(_OWNER_ONLY_UMASK)
+    try:
+        server = await asyncio.start_unix_server(
+            lambda r, w: answer_line(r, w, answer), path=str(path), limit=MAX_REQUEST
+        )
+    finally:
+        os.umask(old_umask)
+    try:
+        async with server:
+            yield server
+    finally:
+        path.unlink(missing_ok=True)
+
+
+async def answer_line(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    answer: Callable[[bytes], Awaitable[bytes]],
+) -> None:
+    """Read one request line, write ``answer(line)``, close the connection.
+
+    A line over the reader's limit reaches *answer* as ``b""`` — malformed
+    — rather than dropping the connection unanswered.
+    """
+    try:
+        try:
+            line = await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            line = b""
+        writer.write(await answer(line))
+        await writer.drain()
+    except OSError:
+        pass
+    finally:
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+
+
+def request_line(
+    path: Path, payload: bytes, *, connect_timeout: float, reply_timeout: float
+) -> bytes:
+    """Send *payload* (one line) to *path* and return the reply line.
+
+    Raises :class:`NoListenerError` when nothing accepts the connection,
+    and :class:`OSError` when the request was sent but the reply failed.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(connect_timeout)
+        try:
+            sock.connect(str(path))
+        except OSError as exc:
+            raise NoListenerError(str(exc)) from exc
+        sock.settimeout(reply_timeout)
+        sock.sendall(payload)
+        chunks: list[bytes] = []
+        while not chunks or not chunks[-1].endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks)
@@ -0,0 +1,374 @@
+"""Load generator: N simulated agents against a NATS relay.
+
+``biff bench`` starts *sessions* ``NatsRelay`` instances in one process —
+one connection each, the topology of N agents on N MCP servers — and has
+every agent run a weighted random mix of relay operations back to back.
+Each call is timed; the report gives throughput and p50/p95/p99 latency
+per operation as JSON, and is saved so a later run can be compared
+against it (``--compare``).  A regression in ``nats_relay.py`` then shows
+up as a number, not a hunch.
+
+Meant for a local ``nats-server``.  All streams and buckets live under a
+dedicated stream prefix (``biff-bench``) that is deleted before and after
+each run, so runs start from the same empty state and production data is
+never touched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import statistics
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version as pkg_version
+from pathlib import Path
+
+import nats
+
+from biff._stdlib import biff_data_dir
+from biff.models import Message, SessionEvent, UserSession
+from biff.nats_relay import NatsRelay
+from biff.tty import build_session_key
+
+REPORT_VERSION = 1
+DEFAULT_URL = "nats://127.0.0.1:4222"
+DEFAULT_STREAM_PREFIX = "biff-bench"
+DEFAULT_REPO = "_bench"
+_MIN_SESSIONS = 2  # deliver needs a recipient other than the sender
+_CONNECT_TIMEOUT = 5.0  # seconds; the bench targets a local nats-server
+
+# Relative weights, roughly a busy MCP server: heartbeats and unread
+# polls dominate, presence writes and reads follow, mail is rarer.
+DEFAULT_MIX: Mapping[str, int] = {
+    "heartbeat": 25,
+    "get_unread_summary": 25,
+    "update_session": 15,
+    "get_sessions_for_repos": 10,
+    "deliver": 10,
+    "fetch": 10,
+    "append_wtmp": 5,
+}
+
+
+def bench_dir() -> Path:
+    """Where reports are saved: ``~/.punt-labs/biff/bench/``."""
+    return biff_data_dir() / "bench"
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """One benchmark run."""
+
+    url: str = DEFAULT_URL
+    sessions: int = 10
+    ops_per_session: int = 200
+    mix: Mapping[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    seed: int = 0
+    repo: str = DEFAULT_REPO
+    stream_prefix: str = DEFAULT_STREAM_PREFIX
+
+    def __post_init__(self) -> None:
+        unknown = set(self.mix) - set(_OPERATIONS)
+        if unknown:
+            msg = f"Unknown operation(s) in mix: {', '.join(sorted(unknown))}"
+            raise ValueError(msg)
+        if not any(w > 0 for w in self.mix.values()):
+            msg = "Operation mix needs at least one positive weight"
+            raise ValueError(msg)
+        if any(w < 0 for w in self.mix.values()):
+            msg = "Operation weights must not be negative"
+            raise ValueError(msg)
+        if self.sessions < _MIN_SESSIONS:
+            msg = f"bench needs at least {_MIN_SESSIONS} sessions"
+            raise ValueError(msg)
+        if self.stream_prefix == "biff":
+            msg = "Refusing to benchmark against the production stream prefix"
+            raise ValueError(msg)
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """Parse ``"heartbeat=30,deliver=10"`` into a weight mapping."""
+    mix: dict[str, int] = {}
+    for item in spec.split(","):
+        name, sep, weight = item.strip().partition("=")
+        if not sep or not weight.strip().isdigit():
+            msg = f"Invalid mix entry {item!r} (expected op=weight)"
+            raise ValueError(msg)
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+# -- Agents --
+
+
+class _Agent:
+    """One simulated session: its own relay, identity, and RNG."""
+
+    def __init__(self, index: int, config: BenchConfig) -> None:
+        self.user = f"bench{index:03d}"
+        self.tty = f"b{index:07d}"
+        self.key = build_session_key(self.user, self.tty)
+        self.rng = random.Random(config.seed * 100_003 + index)  # noqa: S311 — workload, not crypto
+        self.relay = NatsRelay(
+            url=config.url,
+            name=f"biff-bench-{index:03d}",
+            repo_name=config.repo,
+            stream_prefix=config.stream_prefix,
+        )
+        self.repos = frozenset({config.repo})
+        # Every other agent; filled in once all agents exist.
+        self.peers: list[_Agent] = []
+        self.session = UserSession(
+            user=self.user,
+            tty=self.tty,
+            tty_name=f"tty{index}",
+            hostname="bench",
+            repo=config.repo,
+        )
+
+
+async def _update_session(agent: _Agent) -> None:
+    agent.session = agent.session.model_copy(
+        update={
+            "plan": f"step {agent.rng.randrange(1000)}",
+            "last_active": datetime.now(UTC),
+        }
+    )
+    await agent.relay.update_session(agent.session)
+
+
+async def _deliver(agent: _Agent) -> None:
+    peer = agent.rng.choice(agent.peers)
+    await agent.relay.deliver(
+        Message(from_user=agent.user, to_user=peer.key, body="bench"),
+        sender_key=agent.key,
+    )
+
+
+async def _fetch(agent: _Agent) -> None:
+    await agent.relay.fetch(agent.key)
+
+
+async def _unread(agent: _Agent) -> None:
+    await agent.relay.get_unread_summary(agent.key)
+
+
+async def _who(agent: _Agent) -> None:
+    await agent.relay.get_sessions_for_repos(agent.repos)
+
+
+async def _heartbeat(agent: _Agent) -> None:
+    await agent.relay.heartbeat(agent.key)
+
+
+async def _wtmp(agent: _Agent) -> None:
+    await agent.relay.append_wtmp(
+        SessionEvent(
+            session_key=agent.key,
+            event="login",
+            user=agent.user,
+            tty=agent.tty,
+            repo=agent.session.repo,
+        )
+    )
+
+
+_Op = Callable[[_Agent], Awaitable[None]]
+
+_OPERATIONS: Mapping[str, _Op] = {
+    "update_session": _update_session,
+    "deliver": _deliver,
+    "fetch": _fetch,
+    "get_unread_summary": _unread,
+    "get_sessions_for_repos": _who,
+    "heartbeat": _heartbeat,
+    "append_wtmp": _wtmp,
+}
+
+
+# -- Run --
+
+
+async def _quiet(_exc: Exception) -> None:
+    """nats.py error callback: the failing call raises, so log nothing."""
+
+
+async def _reset(config: BenchConfig) -> None:
+    """Delete the bench prefix's streams and buckets (idempotent).
+
+    The first call doubles as the reachability check, so it fails fast on
+    an unreachable server: nats.py's initial connect otherwise retries for
+    ``max_reconnect_attempts`` x ``reconnect_time_wait`` (two minutes).
+    """
+    nc = await nats.connect(  # pyright: ignore[reportUnknownMemberType]
+        config.url,
+        connect_timeout=_CONNECT_TIMEOUT,
+        max_reconnect_attempts=1,
+        reconnect_time_wait=0,
+        error_cb=_quiet,
+    )
+    try:
+        js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
+        prefix = config.stream_prefix
+        for stream in (f"{prefix}-inbox", f"{prefix}-wtmp"):
+            with suppress(Exception):
+                await js.delete_stream(stream)
+        for bucket in (f"{prefix}-sessions", f"{prefix}-names"):
+            with suppress(Exception):
+                await js.delete_key_value(bucket)  # pyright: ignore[reportUnknownMemberType]
+    finally:
+        await nc.close()
+
+
+async def _run_agent(
+    agent: _Agent,
+    config: BenchConfig,
+    samples: dict[str, list[float]],
+    errors: Counter[str],
+) -> None:
+    names = list(config.mix)
+    weights = [config.mix[n] for n in names]
+    for _ in range(config.ops_per_session):
+        name = agent.rng.choices(names, weights)[0]
+        t0 = time.perf_counter()
+        try:
+            await _OPERATIONS[name](agent)
+        except Exception:  # noqa: BLE001
+            # Counted, not raised: a bench reports failure rates.
+            errors[name] += 1
+            continue
+        samples[name].append(time.perf_counter() - t0)
+
+
+async def run_bench(config: BenchConfig) -> dict[str, object]:
+    """Run the benchmark and return its report (see :func:`summarize`)."""
+    await _reset(config)
+    agents = [_Agent(i, config) for i in range(config.sessions)]
+    for agent in agents:
+        agent.peers = [p for p in agents if p is not agent]
+    try:
+        # Setup is not timed: connect, provision, register every session.
+        # The first agent provisions the streams alone; the rest only bind.
+        first, *rest = agents
+        await first.relay.update_session(first.session)
+        await asyncio.gather(*(a.relay.update_session(a.session) for a in rest))
+        samples: dict[str, list[float]] = {name: [] for name in config.mix}
+        errors: Counter[str] = Counter()
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_run_agent(a, config, samples, errors) for a in agents))
+        elapsed = time.perf_counter() - t0
+    finally:
+        await asyncio.gather(*(a.relay.close() for a in agents), return_exceptions=True)
+        with suppress(Exception):
+            await _reset(config)
+    return summarize(config, samples, errors, elapsed)
+
+
+def _percentile(samples: list[float], q: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[q - 1]
+
+
+def summarize(
+    config: BenchConfig,
+    samples: Mapping[str, list[float]],
+    errors: Mapping[str, int],
+    elapsed: float,
+) -> dict[str, object]:
+    """Build the JSON report from per-operation latency samples (seconds)."""
+    operations: dict[str, dict[str, float | int]] = {}
+    for name, values in samples.items():
+        stats: dict[str, float | int] = {
+            "count": len(values),
+            "errors": errors.get(name, 0),
+            "ops_per_sec": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        }
+        if values:
+            stats |= {
+                "mean_ms": round(statistics.fmean(values) * 1000, 3),
+                "p50_ms": round(_percentile(values, 50) * 1000, 3),
+                "p95_ms": round(_percentile(values, 95) * 1000, 3),
+                "p99_ms": round(_percentile(values, 99) * 1000, 3),
+            }
+        operations[name] = stats
+    total = sum(len(v) for v in samples.values())
+    return {
+        "version": REPORT_VERSION,
+        "biff_version": _biff_version(),
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "config": {**asdict(config), "mix": dict(config.mix)},
+        "elapsed_sec": round(elapsed, 3),
+        "total_ops": total,
+        "total_errors": sum(errors.values()),
+        "ops_per_sec": round(total / elapsed, 1) if elapsed else 0.0,
+        "operations": operations,
+    }
+
+
+def _biff_version() -> str:
+    try:
+        return pkg_version("punt-biff")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+# -- Reports --
+
+
+def save_report(report: Mapping[str, object], path: Path | None = None) -> Path:
+    """Write *report* as JSON; default ``bench_dir()/bench-{timestamp}.json``."""
+    if path is None:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+        path = bench_dir() / f"bench-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    return path
+
+
+def load_report(path: Path) -> dict[str, object]:
+    """Read a saved report."""
+    data: object = json.loads(path.read_text())
+    if not isinstance(data, dict) or "operations" not in data:
+        msg = f"Not a biff bench report: {path}"
+        raise ValueError(msg)
+    return data  # pyright: ignore[reportUnknownVariableType]
+
+
+def compare_reports(
+    baseline: Mapping[str, object], current: Mapping[str, object]
+) -> str:
+    """Per-operation table of p50/p99/throughput, baseline vs current.
+
+    The change column is ``current / baseline`` — above 1.0 is slower for
+    latency and faster for throughput.
+    """
+    base_ops = _operations(baseline)
+    cur_ops = _operations(current)
+    header = f"{'operation':<24} {'p50 ms':>22} {'p99 ms':>22} {'ops/s':>22}"
+    lines = [header, "-" * len(header)]
+    for name in sorted(set(base_ops) | set(cur_ops)):
+        b, c = base_ops.get(name, {}), cur_ops.get(name, {})
+        cells = [
+            _cell(b.get(key), c.get(key)) for key in ("p50_ms", "p99_ms", "ops_per_sec")
+        ]
+        lines.append(f"{name:<24} {cells[0]:>22} {cells[1]:>22} {cells[2]:>22}")
+    return "\n".join(lines)
+
+
+def _operations(report: Mapping[str, object]) -> dict[str, dict[str, float]]:
+    ops = report.get("operations")
+    return ops if isinstance(ops, dict) else {}  # pyright: ignore[reportUnknownVariableType]
+
+
+def _cell(base: float | None, cur: float | None) -> str:
+    if base is None or cur is None:
+        return "-"
+    ratio = f"x{cur / base:.2f}" if base else "-"
+    return f"{base:g}->{cur:g} {ratio}"
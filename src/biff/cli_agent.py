@@ -0,0 +1,304 @@
+"""Opt-in warm CLI agent: one registered session shared by inline commands.
+
+Every inline command (``biff who``, ``biff write``) normally runs a full
+:func:`~biff.cli_session.cli_session` lifecycle: NATS connect and
+provisioning, ``claim_tty_name``, org discovery, ``update_session`` and a
+wtmp login — then wtmp logout, flush, name release, session delete and
+close on the way out.  For a one-line answer that is most of the wall
+time.
+
+``biff agent`` holds that session open instead.  It listens on a Unix
+socket (mode ``0600``) keyed by repo root and ``--user`` override, so it
+only ever answers commands that would have resolved the same config::
+
+    → {"op": "run", "command": "who", "args": [], "kwargs": {}}
+    ← {"text": "...", "json_data": null, "error": false}
+    ← {"fault": "CLI commands require a NATS relay. ..."}   # ValueError
+
+Inline commands try the socket first (:func:`run_via_agent`) and fall
+back to their own ``cli_session`` when nothing answers — the agent is an
+accelerator, never a requirement.  It heartbeats like the REPL, refreshes
+org-discovered repos every :data:`_ORG_REFRESH_INTERVAL` seconds, and
+exits (running the normal session cleanup) after ``idle_timeout`` seconds
+without a request or on ``biff agent --stop``.  Config is read once at
+start; restart the agent after changing ``config.yaml``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import cast
+
+from biff import commands
+from biff._stdlib import biff_data_dir
+from biff._unix_socket import (
+    NoListenerError,
+    claim_socket,
+    request_line,
+    serve_socket,
+)
+from biff.cli_session import CliContext, cli_session
+from biff.commands import CommandResult
+from biff.nats_relay import NatsRelay
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 600.0  # 10 min without a request, then log out
+
+# Connecting to a live socket is sub-millisecond; anything slower means no
+# agent, and the command runs its own session instead.
+_CONNECT_TIMEOUT = 0.25
+# A command is a handful of relay round trips.  Past this the agent is
+# treated as wedged — reported, never retried (``write`` is not idempotent).
+_REPLY_TIMEOUT = 60.0
+_ORG_REFRESH_INTERVAL = 300.0
+
+# Commands the agent will run — the ``biff.commands`` single-function
+# commands.  Looked up by name at call time, so patching
+# ``biff.commands.who`` reaches both paths.
+AGENT_COMMANDS: frozenset[str] = frozenset(
+    {
+        "finger",
+        "last",
+        "mesg",
+        "plan",
+        "read",
+        "status",
+        "tty",
+        "wall",
+        "who",
+        "write",
+    }
+)
+
+_CommandFn = Callable[..., Awaitable[CommandResult]]
+
+_OWNER = "biff agent"  # named in the "already running" refusal
+
+
+class AgentError(RuntimeError):
+    """The agent took the request but did not answer it."""
+
+
+def socket_path(repo_root: Path, user_override: str | None = None) -> Path:
+    """Agent socket for *repo_root* and identity override.
+
+    ``~/.punt-labs/biff/agent/{digest}.sock`` — hashed so the path stays
+    under the ``AF_UNIX`` length limit whatever the repo path.
+    """
+    key = f"{repo_root.resolve()}\0{user_override or ''}"
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return biff_data_dir() / "agent" / f"{digest}.sock"
+
+
+def command_fn(name: str) -> _CommandFn:
+    """Resolve an agent-runnable command by name."""
+    if name not in AGENT_COMMANDS:
+        msg = f"Unknown command: {name}"
+        raise ValueError(msg)
+    return cast("_CommandFn", getattr(commands, name))
+
+
+# ── Server ───────────────────────────────────────────────────────────
+
+
+class _Agent:
+    """The resident session and its idle bookkeeping."""
+
+    def __init__(self, ctx: CliContext, idle_timeout: float) -> None:
+        self.ctx = ctx
+        self.idle_timeout = idle_timeout
+        # Commands share one CliContext (``tty`` renames it), so they run
+        # one at a time — as they would in the REPL.
+        self.lock = asyncio.Lock()
+        self.last_request = time.monotonic()
+        self.in_flight = 0
+        self.stop = asyncio.Event()
+        self._orgs_at = time.monotonic()
+
+    async def run(
+        self, name: str, args: list[object], kwargs: dict[str, object]
+    ) -> CommandResult:
+        fn = command_fn(name)
+        async with self.lock:
+            await self._refresh_orgs()
+            return await fn(self.ctx, *args, **kwargs)
+
+    async def _refresh_orgs(self) -> None:
+        """Re-discover org repos so a long-lived ``who`` sees new repos."""
+        relay = self.ctx.relay
+        orgs = self.ctx.config.orgs
+        now = time.monotonic()
+        if not orgs or not isinstance(relay, NatsRelay):
+            return
+        if now - self._orgs_at < _ORG_REFRESH_INTERVAL:
+            return
+        self._orgs_at = now
+        found = await asyncio.gather(*(relay.discover_repos_for_org(o) for o in orgs))
+        object.__setattr__(self.ctx, "org_repos", frozenset[str]().union(*found))
+
+    async def wait_idle(self) -> None:
+        """Return on ``stop`` or once idle for ``idle_timeout`` seconds."""
+        while not self.stop.is_set():
+            idle = time.monotonic() - self.last_request
+            if self.in_flight == 0 and idle >= self.idle_timeout:
+                logger.info("CLI agent idle for %.0fs, exiting", idle)
+                return
+            remaining = max(self.idle_timeout - idle, 0.05)
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.stop.wait(), timeout=remaining)
+
+
+async def _reply(agent: _Agent, request: dict[str, object]) -> dict[str, object]:
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid(), "session_key": agent.ctx.session_key}
+    if op == "stop":
+        agent.stop.set()
+        return {"ok": True}
+    if op != "run":
+        return {"fault": f"Unknown op: {op}"}
+    args = request.get("args", [])
+    kwargs = request.get("kwargs", {})
+    if not isinstance(args, list) or not isinstance(kwargs, dict):
+        return {"fault": "Malformed request"}
+    try:
+        result = await agent.run(
+            str(request.get("command")),
+            cast("list[object]", args),
+            cast("dict[str, object]", kwargs),
+        )
+    except ValueError as exc:
+        return {"fault": str(exc)}
+    except Exception as exc:  # noqa: BLE001 — reported to the client, agent stays up
+        logger.warning("CLI agent command failed", exc_info=True)
+        return {"fault": f"Command failed in biff agent: {type(exc).__name__}"}
+    return {"text": result.text, "json_data": result.json_data, "error": result.error}
+
+
+async def _answer(agent: _Agent, line: bytes) -> bytes:
+    """Answer one request line; the agent counts as busy meanwhile."""
+    agent.in_flight += 1
+    agent.last_request = time.monotonic()
+    try:
+        try:
+            request: object = json.loads(line)
+        except ValueError:
+            request = None
+        if isinstance(request, dict):
+            reply = await _reply(agent, cast("dict[str, object]", request))
+        else:
+            reply = {"fault": "Malformed request"}
+        return json.dumps(reply, default=str).encode() + b"\n"
+    finally:
+        agent.in_flight -= 1
+        agent.last_request = time.monotonic()
+
+
+async def serve(
+    path: Path,
+    *,
+    user_override: str | None = None,
+    idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ready: asyncio.Event | None = None,
+) -> None:
+    """Hold one CLI session and serve commands on *path* until idle or stopped.
+
+    *ready* is set once the session is registered and the socket accepts
+    connections (tests and the benchmark wait on it).
+    """
+    # Refuse a live agent before paying for a session, not after.
+    claim_socket(path, owner=_OWNER, timeout=_CONNECT_TIMEOUT)
+    async with cli_session(interactive=True, user_override=user_override) as ctx:
+        agent = _Agent(ctx, idle_timeout)
+
+        async def answer(line: bytes) -> bytes:
+            return await _answer(agent, line)
+
+        async with serve_socket(path, answer, owner=_OWNER, timeout=_CONNECT_TIMEOUT):
+            if ready is not None:
+                ready.set()
+            await agent.wait_idle()
+
+
+# ── Client ───────────────────────────────────────────────────────────
+
+
+def _request(
+    path: Path, request: dict[str, object], *, timeout: float
+) -> dict[str, object] | None:
+    """Send one request line; ``None`` when no agent is listening on *path*."""
+    if not path.exists():
+        return None
+    payload = json.dumps(request).encode() + b"\n"
+    try:
+        line = request_line(
+            path, payload, connect_timeout=_CONNECT_TIMEOUT, reply_timeout=timeout
+        )
+    except NoListenerError:
+        return None  # stale socket file: the agent died without cleanup
+    except OSError as exc:
+        msg = f"biff agent did not answer: {exc}"
+        raise AgentError(msg) from exc
+    try:
+        reply: object = json.loads(line)
+    except ValueError as exc:
+        msg = "biff agent sent a malformed reply"
+        raise AgentError(msg) from exc
+    if not isinstance(reply, dict):
+        msg = "biff agent sent a malformed reply"
+        raise AgentError(msg)
+    return cast("dict[str, object]", reply)
+
+
+def run_via_agent(
+    path: Path,
+    command: str,
+    args: tuple[object, ...] = (),
+    kwargs: dict[str, object] | None = None,
+) -> CommandResult | None:
+    """Run *command* on the agent at *path*; ``None`` when there is none.
+
+    A ``fault`` reply re-raises as :class:`ValueError`, the same error the
+    in-process path reports.  Raises :class:`AgentError` when the agent
+    accepted the request but never answered — the command may have run,
+    so the caller must not retry it in-process.
+    """
+    reply = _request(
+        path,
+        {"op": "run", "command": command, "args": list(args), "kwargs": kwargs or {}},
+        timeout=_REPLY_TIMEOUT,
+    )
+    if reply is None:
+        return None
+    if "fault" in reply:
+        raise ValueError(str(reply["fault"]))
+    return CommandResult(
+        text=str(reply.get("text", "")),
+        json_data=reply.get("json_data"),
+        error=bool(reply.get("error")),
+    )
+
+
+def ping(path: Path) -> dict[str, object] | None:
+    """The agent's pid and session key, or ``None`` when none is running."""
+    try:
+        return _request(path, {"op": "ping"}, timeout=_CONNECT_TIMEOUT)
+    except AgentError:
+        return None
+
+
+def stop(path: Path) -> bool:
+    """Ask the agent at *path* to log out and exit; ``False`` if none."""
+    try:
+        return _request(path, {"op": "stop"}, timeout=_CONNECT_TIMEOUT) is not None
+    except AgentError:
+        return False
@@ -28,6 +28,7 @@ from biff.config import load_cli_config
 from biff.models import BiffConfig, SessionEvent, UserSession
 from biff.nats_relay import NatsRelay
 from biff.relay import Relay
+from biff.sqlite_relay import is_sqlite_url
 from biff.talk_state import TalkState
 from biff.tty import (
     build_session_key,
@@ -159,8 +160,9 @@ async def _cli_session_cleanup(
             except Exception:  # noqa: BLE001
                 logger.warning("Failed to release TTY name %s", tty_name, exc_info=True)
 
+        # Logout written above: the repo janitor must not write another.
         try:
-            await relay.delete_session(session_key)
+            await relay.delete_session(session_key, logged_out=True)
         except Exception:  # noqa: BLE001
             logger.warning(
                 "Failed to delete CLI session %s", session_key, exc_info=True
@@ -186,7 +188,9 @@ async def cli_session(
     resolved = load_cli_config(user_override=user_override)
     config = resolved.config
 
-    if not config.relay_url:
+    # A sqlite:// relay serves MCP sessions on one host; the CLI's org
+    # discovery and wtmp flush are NATS-only.
+    if not config.relay_url or is_sqlite_url(config.relay_url):
         msg = (
             "CLI commands require a NATS relay. "
             "Configure relay.url in .punt-labs/biff/config.yaml "
@@ -199,6 +203,7 @@ async def cli_session(
         auth=config.relay_auth,
         name=f"biff-cli-{config.user}",
         repo_name=config.repo_name,
+        slow_op_threshold=config.slow_op_threshold,
     )
 
     user = config.user
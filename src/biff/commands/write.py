@@ -50,24 +50,41 @@ async def write(ctx: CliContext, to: str, message: str) -> CommandResult:
     display = f"{bare_user}:{tty}" if tty else bare_user
 
     chunks = chunk_message(message)
+    parts = len(chunks)
+    messages = [
+        Message(
+            from_user=ctx.user,
+            from_tty=ctx.tty_name,
+            to_user=relay_key,
+            body=chunk,
+        )
+        for chunk in chunks
+    ]
     try:
-        for chunk in chunks:
-            msg = Message(
-                from_user=ctx.user,
-                from_tty=ctx.tty_name,
-                to_user=relay_key,
-                body=chunk,
-            )
-            await ctx.relay.deliver(
-                msg, sender_key=ctx.session_key, target_repo=target_repo
-            )
+        results = await ctx.relay.deliver_many(
+            messages, sender_key=ctx.session_key, target_repo=target_repo
+        )
     except Exception as exc:  # noqa: BLE001
         return CommandResult(
             text=str(exc),
             json_data={"status": "error", "to": to, "error": str(exc)},
             error=True,
         )
-    parts = len(chunks)
+    failed = [part for part, error in enumerate(results, 1) if error is not None]
+    if failed:
+        error = str(next(e for e in results if e is not None))
+        listed = ", ".join(map(str, failed))
+        text = error if parts == 1 else f"Parts {listed} of {parts} failed: {error}"
+        return CommandResult(
+            text=text,
+            json_data={
+                "status": "error",
+                "to": to,
+                "error": error,
+                "failed_parts": failed,
+            },
+            error=True,
+        )
     suffix = f" ({parts} parts)" if parts > 1 else ""
     return CommandResult(
         text=f"Message sent to {display}.{suffix}",
@@ -16,18 +16,24 @@ Data directory layout::
 from __future__ import annotations
 
 import getpass
+import hashlib
 import importlib.resources
 import json
 import logging
+import os
 import re
 import subprocess
-from dataclasses import dataclass
+import sys
+import time
+from contextlib import suppress
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import cast
 
 import yaml
 
 from biff._stdlib import (
+    biff_data_dir,
     enabled_marker_path,
     find_git_root,
     get_repo_owner,
@@ -39,6 +45,7 @@ from biff._stdlib import (
     yaml_config_dir,
 )
 from biff.models import BiffConfig, RelayAuth
+from biff.relay_stats import DEFAULT_SLOW_OP_THRESHOLD
 
 # Re-export stdlib functions so existing callers of biff.config still work.
 __all__ = [
@@ -86,10 +93,25 @@ class GitHubIdentity:
     display_name: str
 
 
-def get_github_identity() -> GitHubIdentity | None:
-    """Resolve GitHub login and display name in a single API call.
+# ``gh api user`` is a network round trip behind every CLI and server
+# startup; a hung ``gh`` (offline, stuck auth helper) used to hold startup
+# indefinitely.  The resolved identity is cached on disk per gh host and
+# credential, served without waiting, and refreshed in the background.
+_GH_TIMEOUT = 5.0  # seconds; hard cap on one ``gh api user`` run
+_IDENTITY_TTL = 24 * 3600.0  # older cached identities are re-queried
+_IDENTITY_RETRY = 300.0  # minimum gap between refreshes of one entry
+_GH_TOKEN_VARS = (
+    "GH_TOKEN",
+    "GITHUB_TOKEN",
+    "GH_ENTERPRISE_TOKEN",
+    "GITHUB_ENTERPRISE_TOKEN",
+)
+
 
-    Returns ``None`` when ``gh`` is missing or the call fails.
+def _query_github_identity() -> GitHubIdentity | None:
+    """Run ``gh api user`` under ``_GH_TIMEOUT``.
+
+    Returns ``None`` when ``gh`` is missing, fails, or times out.
     """
     try:
         result = subprocess.run(
@@ -103,6 +125,7 @@ def get_github_identity() -> GitHubIdentity | None:
             capture_output=True,
             text=True,
             check=False,
+            timeout=_GH_TIMEOUT,
         )
         if result.returncode != 0:
             return None
@@ -112,10 +135,192 @@ def get_github_identity() -> GitHubIdentity | None:
             return None
         display_name = parts[1].strip() if len(parts) > 1 else ""
         return GitHubIdentity(login=login, display_name=display_name)
-    except FileNotFoundError:
+    except (FileNotFoundError, subprocess.TimeoutExpired):
         return None
 
 
+def _gh_config_dir() -> Path:
+    """Where ``gh`` keeps ``hosts.yml``, by gh's own precedence."""
+    explicit = os.environ.get("GH_CONFIG_DIR")
+    if explicit:
+        return Path(explicit)
+    xdg = os.environ.get("XDG_CONFIG_HOME")
+    return (Path(xdg) if xdg else Path.home() / ".config") / "gh"
+
+
+def _identity_cache_key() -> str:
+    """Fingerprint the gh host and the credentials ``gh`` would send.
+
+    Hashes ``GH_HOST``, the token environment variables, and
+    ``hosts.yml`` (which records the active account per host, and the
+    token unless it lives in the keyring), so ``gh auth login``,
+    ``gh auth switch``, or a different ``GH_TOKEN`` lands on a fresh
+    key.  Computed without running ``gh``.
+    """
+    digest = hashlib.sha256((os.environ.get("GH_HOST") or "github.com").encode())
+    for var in _GH_TOKEN_VARS:
+        digest.update(b"\0" + os.environ.get(var, "").encode())
+    with suppress(OSError):
+        digest.update(b"\0" + (_gh_config_dir() / "hosts.yml").read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def _identity_cache_path(key: str) -> Path:
+    return biff_data_dir() / "identity" / f"{key}.json"
+
+
+@dataclass(frozen=True)
+class _CachedIdentity:
+    """A cache entry: the identity plus when it was fetched and last retried."""
+
+    identity: GitHubIdentity
+    fetched_at: float
+    attempted_at: float
+
+    def refresh_due(self, now: float) -> bool:
+        """Older than ``_IDENTITY_TTL`` and no refresh in ``_IDENTITY_RETRY``."""
+        return (
+            now - self.fetched_at > _IDENTITY_TTL
+            and now - self.attempted_at > _IDENTITY_RETRY
+        )
+
+
+def _read_identity_cache(key: str) -> _CachedIdentity | None:
+    """Return the cache entry for *key*; a missing or malformed entry is a miss."""
+    try:
+        raw = json.loads(_identity_cache_path(key).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(raw, dict):
+        return None
+    data = cast("dict[str, object]", raw)
+    login = data.get("login")
+    display_name = data.get("display_name", "")
+    fetched_at = data.get("fetched_at", 0.0)
+    attempted_at = data.get("attempted_at", 0.0)
+    if (
+        not isinstance(login, str)
+        or not login
+        or not isinstance(display_name, str)
+        or not isinstance(fetched_at, int | float)
+        or not isinstance(attempted_at, int | float)
+    ):
+        return None
+    return _CachedIdentity(
+        GitHubIdentity(login=login, display_name=display_name),
+        float(fetched_at),
+        float(attempted_at),
+    )
+
+
+def _write_identity_cache(
+    key: str, identity: GitHubIdentity, *, fetched_at: float, attempted_at: float
+) -> None:
+    """Atomically replace the cache entry for *key*; best effort."""
+    path = _identity_cache_path(key)
+    payload = json.dumps(
+        {
+            "login": identity.login,
+            "display_name": identity.display_name,
+            "fetched_at": fetched_at,
+            "attempted_at": attempted_at,
+        }
+    )
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(payload)
+        tmp.replace(path)
+    except OSError:
+        logger.debug("Cannot write identity cache %s", path, exc_info=True)
+        with suppress(OSError):
+            tmp.unlink()
+
+
+def refresh_github_identity() -> GitHubIdentity | None:
+    """Query ``gh api user`` now and cache the result on success.
+
+    A failed query leaves any cached identity in place: a transient
+    ``gh`` failure should not demote a known login to the OS user.
+    """
+    identity = _query_github_identity()
+    if identity is not None:
+        now = time.time()
+        _write_identity_cache(
+            _identity_cache_key(), identity, fetched_at=now, attempted_at=now
+        )
+    return identity
+
+
+def _claim_identity_refresh(key: str, cached: _CachedIdentity) -> bool:
+    """Stamp a due entry's ``attempted_at``; ``False`` when no refresh is due.
+
+    Stamping before refreshing keeps concurrent startups from all
+    re-querying ``gh`` for the same entry.
+    """
+    now = time.time()
+    if not cached.refresh_due(now):
+        return False
+    _write_identity_cache(
+        key, cached.identity, fetched_at=cached.fetched_at, attempted_at=now
+    )
+    return True
+
+
+def refresh_stale_github_identity() -> None:
+    """Re-query ``gh`` if the cached identity is due for a refresh.
+
+    The MCP server runs this from a lifespan task (in a worker thread)
+    instead of spawning a detached process.
+    """
+    key = _identity_cache_key()
+    cached = _read_identity_cache(key)
+    if cached is not None and _claim_identity_refresh(key, cached):
+        refresh_github_identity()
+
+
+def _spawn_identity_refresh() -> None:
+    """Refresh the cache from a detached process that outlives the CLI."""
+    try:
+        subprocess.Popen(  # noqa: S603
+            [
+                sys.executable,
+                "-c",
+                "from biff.config import refresh_github_identity as r; r()",
+            ],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        logger.debug("Cannot start identity refresh", exc_info=True)
+
+
+def get_github_identity(*, background_refresh: bool = True) -> GitHubIdentity | None:
+    """Resolve GitHub login and display name, served from an on-disk cache.
+
+    The cache under the biff data root is keyed by gh host and credential
+    fingerprint (:func:`_identity_cache_key`).  A cached identity is
+    returned without waiting on ``gh``; once older than ``_IDENTITY_TTL``
+    it is re-queried by a detached process, or — with
+    ``background_refresh=False`` — left for the caller to refresh
+    (the MCP server does so from a task via
+    :func:`refresh_stale_github_identity`).  With nothing cached,
+    ``gh api user`` runs synchronously under ``_GH_TIMEOUT``.
+
+    Returns ``None`` when nothing is cached and ``gh`` is missing,
+    fails, or times out.
+    """
+    key = _identity_cache_key()
+    cached = _read_identity_cache(key)
+    if cached is None:
+        return refresh_github_identity()
+    if background_refresh and _claim_identity_refresh(key, cached):
+        _spawn_identity_refresh()
+    return cached.identity
+
+
 @dataclass(frozen=True)
 class EthosIdentity:
     """Identity resolved from ``ethos whoami --json``."""
@@ -542,7 +747,7 @@ def _extract_peers(
             sanitize_repo_name(r) for r in items_p if isinstance(r, str) and r
         )
     # Org names are sanitized for NATS subject safety.
-    # The relay appends "__>" for the subjects_filter query.
+    # The relay matches repos named "{org}__*" in the KV subject listing.
     orgs_raw: object = section.get("orgs", [])
     if isinstance(orgs_raw, list):
         items_o = cast("list[object]", orgs_raw)
@@ -628,6 +833,18 @@ def _extract_poll_interval(raw: dict[str, object]) -> float:
     return 2.0
 
 
+def _extract_slow_op_threshold(raw: dict[str, object]) -> float:
+    """Extract ``slow_op_threshold`` (seconds) from the config dict.
+
+    Relay requests slower than this are logged.  Returns the default
+    (1.0s) when absent or not a positive number.
+    """
+    value: object = raw.get("slow_op_threshold")
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+        return float(value)
+    return DEFAULT_SLOW_OP_THRESHOLD
+
+
 def extract_biff_fields(
     raw: dict[str, object],
 ) -> tuple[
@@ -657,6 +874,7 @@ class _ConfigFields:
     peers: tuple[str, ...] = ()
     orgs: tuple[str, ...] = ()
     poll_interval: float = 2.0
+    slow_op_threshold: float = DEFAULT_SLOW_OP_THRESHOLD
 
 
 def _has_orgs_key(raw: dict[str, object]) -> bool:
@@ -669,25 +887,258 @@ def _has_orgs_key(raw: dict[str, object]) -> bool:
     return isinstance(peers, dict) and "orgs" in peers
 
 
-def _enrich_team(cf: _ConfigFields) -> _ConfigFields:
+def _enrich_team(
+    cf: _ConfigFields, ethos_team: tuple[str, ...] | None
+) -> _ConfigFields:
     """Enrich team from ethos when no explicit team is configured."""
-    if cf.team:
-        return cf
-    ethos_team = get_ethos_team()
-    if ethos_team is None:
+    if cf.team or ethos_team is None:
         return cf
+    return replace(cf, team=ethos_team)
+
+
+# Compiled-config cache.  Inline CLI commands, hooks and statusline renders
+# each resolve config in a fresh process, and almost always nothing has
+# changed since the last one: re-parsing the YAML and re-running ``git``
+# for the owner is wasted work.  The resolved fields are stored with the
+# ``(path, mtime_ns, size)`` of every file they were derived from; a later
+# call stats those files and reuses the fields while all stamps match.
+# The ethos team comes from outside the repo, where there is nothing to
+# stat, so it is reused for ``_ETHOS_TEAM_TTL`` instead.  The bundled
+# demo credentials are stored as a flag, not a path: the path moves with
+# the installed package (upgrade, new venv), the cache does not.
+_COMPILED_CONFIG_VERSION = 2
+_ETHOS_TEAM_TTL = 300.0  # seconds
+
+_FileStamp = tuple[str, int, int]  # (path, mtime_ns, size); -1s when missing
+
+
+def _stamp(path: Path) -> _FileStamp:
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), -1, -1)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def _git_config_path(repo_root: Path) -> Path | None:
+    """The git config holding ``remote.origin.url`` for *repo_root*.
+
+    Follows a ``.git`` file (worktree or submodule) to its git dir and
+    that dir's ``commondir``.  ``None`` when the pointer is unreadable.
+    """
+    dot_git = repo_root / ".git"
+    if dot_git.is_dir():
+        return dot_git / "config"
+    try:
+        pointer = dot_git.read_text().strip()
+    except OSError:
+        return None
+    if not pointer.startswith("gitdir:"):
+        return None
+    git_dir = repo_root / pointer.removeprefix("gitdir:").strip()
+    try:
+        common = (git_dir / "commondir").read_text().strip()
+    except OSError:
+        return git_dir / "config"
+    return git_dir / common / "config"
+
+
+def _config_inputs(repo_root: Path) -> list[Path] | None:
+    """Every file :func:`_read_config_fields` derives from; ``None`` if unknown."""
+    git_config = _git_config_path(repo_root)
+    if git_config is None:
+        return None
+    config_dir = yaml_config_dir(repo_root)
+    return [config_dir / "config.yaml", config_dir / "config.local.yaml", git_config]
+
+
+def _compiled_config_path(repo_root: Path) -> Path:
+    digest = hashlib.sha256(str(repo_root.resolve()).encode()).hexdigest()[:32]
+    return biff_data_dir() / "config" / f"{digest}.json"
+
+
+def _fields_to_json(cf: _ConfigFields) -> dict[str, object]:
+    auth = cf.relay_auth
+    demo = auth is not None and auth.user_credentials == str(demo_creds_path())
+    return {
+        "team": list(cf.team),
+        "relay_url": cf.relay_url,
+        "relay_auth": None
+        if auth is None
+        else {
+            "token": auth.token,
+            "nkeys_seed": auth.nkeys_seed,
+            "user_credentials": None if demo else auth.user_credentials,
+            "demo_creds": demo,
+        },
+        "peers": list(cf.peers),
+        "orgs": list(cf.orgs),
+        "poll_interval": cf.poll_interval,
+        "slow_op_threshold": cf.slow_op_threshold,
+    }
+
+
+def _str_tuple(value: object) -> tuple[str, ...]:
+    if not isinstance(value, list):
+        raise TypeError
+    items = cast("list[object]", value)
+    if not all(isinstance(item, str) for item in items):
+        raise TypeError
+    return tuple(cast("list[str]", items))
+
+
+def _opt_str(value: object) -> str | None:
+    if value is not None and not isinstance(value, str):
+        raise TypeError
+    return value
+
+
+def _fields_from_json(data: dict[str, object]) -> _ConfigFields:
+    """Inverse of :func:`_fields_to_json`; raises on any malformed field."""
+    auth_raw = data["relay_auth"]
+    auth: RelayAuth | None = None
+    if auth_raw is not None:
+        if not isinstance(auth_raw, dict):
+            raise TypeError
+        a = cast("dict[str, object]", auth_raw)
+        demo = a["demo_creds"]
+        if not isinstance(demo, bool):
+            raise TypeError
+        auth = RelayAuth(
+            token=_opt_str(a["token"]),
+            nkeys_seed=_opt_str(a["nkeys_seed"]),
+            user_credentials=str(demo_creds_path())
+            if demo
+            else _opt_str(a["user_credentials"]),
+        )
+    poll_interval = data["poll_interval"]
+    slow_op_threshold = data["slow_op_threshold"]
+    if not isinstance(poll_interval, int | float) or not isinstance(
+        slow_op_threshold, int | float
+    ):
+        raise TypeError
     return _ConfigFields(
-        team=ethos_team,
-        relay_url=cf.relay_url,
-        relay_auth=cf.relay_auth,
-        peers=cf.peers,
-        orgs=cf.orgs,
-        poll_interval=cf.poll_interval,
+        team=_str_tuple(data["team"]),
+        relay_url=_opt_str(data["relay_url"]),
+        relay_auth=auth,
+        peers=_str_tuple(data["peers"]),
+        orgs=_str_tuple(data["orgs"]),
+        poll_interval=float(poll_interval),
+        slow_op_threshold=float(slow_op_threshold),
     )
 
 
+@dataclass(frozen=True)
+class _CompiledConfig:
+    """A compiled-config cache entry."""
+
+    stamps: list[_FileStamp]
+    fields: _ConfigFields
+    ethos_team: tuple[str, ...] | None = None
+    ethos_at: float = 0.0  # when ethos was last asked; 0 = never
+
+
+def _parse_stamps(raw: object) -> list[_FileStamp]:
+    if not isinstance(raw, list):
+        raise TypeError
+    stamps: list[_FileStamp] = []
+    for item in cast("list[object]", raw):
+        if not isinstance(item, list):
+            raise TypeError
+        path, mtime_ns, size = cast("list[object]", item)
+        if (
+            not isinstance(path, str)
+            or not isinstance(mtime_ns, int)
+            or not isinstance(size, int)
+        ):
+            raise TypeError
+        stamps.append((path, mtime_ns, size))
+    return stamps
+
+
+def _read_compiled_config(path: Path) -> _CompiledConfig | None:
+    """Load a cache entry; a missing or malformed entry is a miss."""
+    try:
+        data = cast("dict[str, object]", json.loads(path.read_text()))
+        if data["version"] != _COMPILED_CONFIG_VERSION:
+            return None
+        stamps = _parse_stamps(data["stamps"])
+        ethos_raw = data["ethos_team"]
+        ethos_at = data["ethos_at"]
+        if not isinstance(ethos_at, int | float):
+            return None
+        return _CompiledConfig(
+            stamps=stamps,
+            fields=_fields_from_json(cast("dict[str, object]", data["fields"])),
+            ethos_team=None if ethos_raw is None else _str_tuple(ethos_raw),
+            ethos_at=float(ethos_at),
+        )
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None
+
+
+def _write_compiled_config(path: Path, entry: _CompiledConfig) -> None:
+    """Atomically replace the cache entry; best effort.
+
+    Owner-only (``0o600``): the fields can carry a relay token from
+    ``config.local.yaml``.
+    """
+    payload = json.dumps(
+        {
+            "version": _COMPILED_CONFIG_VERSION,
+            "stamps": [list(s) for s in entry.stamps],
+            "fields": _fields_to_json(entry.fields),
+            "ethos_team": None if entry.ethos_team is None else list(entry.ethos_team),
+            "ethos_at": entry.ethos_at,
+        }
+    )
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.parent.chmod(0o700)
+        fd = os.open(tmp, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, payload.encode())
+        finally:
+            os.close(fd)
+        tmp.replace(path)
+    except OSError:
+        logger.debug("Cannot write compiled config %s", path, exc_info=True)
+        with suppress(OSError):
+            tmp.unlink()
+
+
 def _resolve_config_fields(repo_root: Path) -> _ConfigFields:
-    """Resolve config fields from YAML or zero-config.
+    """Resolve config fields, from the compiled-config cache when unchanged.
+
+    Stats the inputs recorded with the cached fields; any changed,
+    added, or removed file recompiles via :func:`_read_config_fields`.
+    The ethos team (consulted only when no team is configured) is
+    re-queried once ``_ETHOS_TEAM_TTL`` has passed.
+    """
+    inputs = _config_inputs(repo_root)
+    if inputs is None:
+        cf = _read_config_fields(repo_root)
+        return cf if cf.team else _enrich_team(cf, get_ethos_team())
+    path = _compiled_config_path(repo_root)
+    stamps = [_stamp(p) for p in inputs]
+    entry = _read_compiled_config(path)
+    dirty = False
+    if entry is None or entry.stamps != stamps:
+        # Stamps are taken before the read: a write racing the compile
+        # leaves a stale stamp, and the next call recompiles.
+        entry = _CompiledConfig(stamps=stamps, fields=_read_config_fields(repo_root))
+        dirty = True
+    if not entry.fields.team and time.time() - entry.ethos_at > _ETHOS_TEAM_TTL:
+        entry = replace(entry, ethos_team=get_ethos_team(), ethos_at=time.time())
+        dirty = True
+    if dirty:
+        _write_compiled_config(path, entry)
+    return _enrich_team(entry.fields, entry.ethos_team)
+
+
+def _read_config_fields(repo_root: Path) -> _ConfigFields:
+    """Resolve config fields from YAML or zero-config, before ethos enrichment.
 
     Detection order:
 
@@ -703,8 +1154,11 @@ def _resolve_config_fields(repo_root: Path) -> _ConfigFields:
         yaml_local = load_yaml_local(repo_root)
         merged = merge_config(yaml_shared, yaml_local)
         fields = extract_biff_fields(merged)
-        poll_interval = _extract_poll_interval(merged)
-        cf = _ConfigFields(*fields, poll_interval=poll_interval)
+        cf = _ConfigFields(
+            *fields,
+            poll_interval=_extract_poll_interval(merged),
+            slow_op_threshold=_extract_slow_op_threshold(merged),
+        )
         # Derive orgs from remote only when the peers.orgs key is
         # ABSENT from the merged config. An explicit empty list
         # (peers.orgs: []) is honored — it means "no org discovery."
@@ -717,8 +1171,9 @@ def _resolve_config_fields(repo_root: Path) -> _ConfigFields:
                 peers=cf.peers,
                 orgs=(owner,) if owner else (),
                 poll_interval=cf.poll_interval,
+                slow_op_threshold=cf.slow_op_threshold,
             )
-        return _enrich_team(cf)
+        return cf
 
     # Zero-config: derive org from remote, use demo relay.
     # Still read config.local.yaml — user may have set relay via
@@ -726,8 +1181,11 @@ def _resolve_config_fields(repo_root: Path) -> _ConfigFields:
     yaml_local = load_yaml_local(repo_root)
     if yaml_local:
         fields = extract_biff_fields(yaml_local)
-        poll_interval = _extract_poll_interval(yaml_local)
-        cf = _ConfigFields(*fields, poll_interval=poll_interval)
+        cf = _ConfigFields(
+            *fields,
+            poll_interval=_extract_poll_interval(yaml_local),
+            slow_op_threshold=_extract_slow_op_threshold(yaml_local),
+        )
         # Apply demo relay default only when URL is demo or absent.
         # _apply_demo_relay_default checks relay_url == DEMO_RELAY_URL
         # before applying bundled creds — prevents sending demo creds
@@ -739,25 +1197,22 @@ def _resolve_config_fields(repo_root: Path) -> _ConfigFields:
         else:
             owner = get_repo_owner(repo_root)
             orgs = (owner,) if owner else ()
-        return _enrich_team(
-            _ConfigFields(
-                relay_url=relay_url,
-                relay_auth=relay_auth,
-                orgs=orgs,
-                team=cf.team,
-                peers=cf.peers,
-                poll_interval=cf.poll_interval,
-            )
+        return _ConfigFields(
+            relay_url=relay_url,
+            relay_auth=relay_auth,
+            orgs=orgs,
+            team=cf.team,
+            peers=cf.peers,
+            poll_interval=cf.poll_interval,
+            slow_op_threshold=cf.slow_op_threshold,
         )
 
     owner = get_repo_owner(repo_root)
     orgs = (owner,) if owner else ()
-    return _enrich_team(
-        _ConfigFields(
-            relay_url=DEMO_RELAY_URL,
-            relay_auth=RelayAuth(user_credentials=str(demo_creds_path())),
-            orgs=orgs,
-        )
+    return _ConfigFields(
+        relay_url=DEMO_RELAY_URL,
+        relay_auth=RelayAuth(user_credentials=str(demo_creds_path())),
+        orgs=orgs,
     )
 
 
@@ -790,6 +1245,7 @@ class _BaseConfig:
     peers: tuple[str, ...]
     orgs: tuple[str, ...]
     poll_interval: float
+    slow_op_threshold: float
 
 
 def _load_base_config(
@@ -841,6 +1297,7 @@ def _load_base_config(
         peers=cf.peers,
         orgs=cf.orgs,
         poll_interval=cf.poll_interval,
+        slow_op_threshold=cf.slow_op_threshold,
     )
 
 
@@ -878,6 +1335,7 @@ def _assemble_config(
         peers=base.peers,
         orgs=base.orgs,
         poll_interval=base.poll_interval,
+        slow_op_threshold=base.slow_op_threshold,
     )
     return ResolvedConfig(
         config=config,
@@ -923,7 +1381,8 @@ def load_mcp_config(
     if agent is not None:
         return _assemble_config(base, agent.handle, agent.display_name, agent.kind)
 
-    identity = get_github_identity()
+    # The server refreshes a stale cached login from a lifespan task.
+    identity = get_github_identity(background_refresh=False)
     if identity is not None:
         return _assemble_config(base, identity.login, identity.display_name, "")
 
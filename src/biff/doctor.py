@@ -25,6 +25,8 @@ from biff.config import (
     merge_config,
 )
 from biff.models import RelayAuth
+from biff.relay_stats import RelayStats, format_relay_stats
+from biff.sqlite_relay import is_sqlite_url
 from biff.statusline import SETTINGS_PATH
 
 PLUGIN_ID = "biff@punt-labs"
@@ -51,6 +53,7 @@ class CheckResult:
     passed: bool
     message: str
     required: bool = True
+    detail: str = ""  # multi-line extra output, printed indented under the line
 
 
 # Individual checks ----------------------------------------------------------
@@ -185,9 +188,46 @@ async def _test_nats_connection(url: str, auth: RelayAuth | None) -> bool:
     return False
 
 
+_PROBE_ROUNDS = 5
+_PROBE_TIMEOUT = 15.0
+
+
+async def _probe_relay_stats(url: str, auth: RelayAuth | None) -> RelayStats:
+    """Time a few read-only relay calls and return the relay's stats snapshot.
+
+    Runs through a real :class:`NatsRelay` so the numbers come from the same
+    ``_tracked`` histograms the MCP server reports in ``get_poll_status`` —
+    presence and wall reads under a scratch repo name, nothing written.
+    """
+    from biff.nats_relay import NatsRelay
+
+    relay = NatsRelay(url=url, auth=auth, name="biff-doctor", repo_name="_doctor")
+    try:
+        for _ in range(_PROBE_ROUNDS):
+            await relay.get_sessions()
+            await relay.get_wall()
+        return relay.stats()
+    finally:
+        await relay.close()
+
+
+def _relay_stats_detail(url: str, auth: RelayAuth | None) -> str:
+    """Formatted probe snapshot, or a one-line note when the probe fails."""
+    try:
+        stats = asyncio.run(
+            asyncio.wait_for(_probe_relay_stats(url, auth), _PROBE_TIMEOUT)
+        )
+    except Exception:  # noqa: BLE001
+        return "Relay stats: probe failed"
+    return format_relay_stats(stats)
+
+
 def _check_relay() -> CheckResult:
-    """Check NATS relay is reachable."""
+    """Check NATS relay is reachable, then print a latency probe's stats."""
     relay_url, relay_auth = _resolve_relay_config()
+    if is_sqlite_url(relay_url):
+        # Single-host relay: nothing to reach; the server creates the file.
+        return CheckResult("Relay", True, f"SQLite, single host ({relay_url})")
 
     try:
         reachable = asyncio.run(_test_nats_connection(relay_url, relay_auth))
@@ -195,7 +235,12 @@ def _check_relay() -> CheckResult:
         return CheckResult("NATS relay", False, f"connection error ({relay_url})")
 
     if reachable:
-        return CheckResult("NATS relay", True, f"reachable ({relay_url})")
+        return CheckResult(
+            "NATS relay",
+            True,
+            f"reachable ({relay_url})",
+            detail=_relay_stats_detail(relay_url, relay_auth),
+        )
     return CheckResult("NATS relay", False, f"unreachable ({relay_url})")
 
 
@@ -369,6 +414,8 @@ def _print_check(check: CheckResult) -> None:
     else:
         symbol = "\u25cb"  # ○
     print(f"  {symbol} {check.name}: {check.message}")
+    for line in check.detail.splitlines():
+        print(f"      {line}")
 
 
 def check_environment() -> int:
@@ -163,6 +163,18 @@ def _pre_tool_use_deny(reason: str) -> dict[str, object]:
     }
 
 
+def _plan_unverified_deny() -> dict[str, object]:
+    """The fail-closed deny for a plan gate that could not evaluate.
+
+    Shared by the in-process hook and ``biff.hook_daemon`` so both deny
+    with the same words.
+    """
+    return _pre_tool_use_deny(
+        "Blocked: could not verify plan state. "
+        "Run /plan <what you're working on>, then retry the edit."
+    )
+
+
 def _has_active_session() -> bool:
     """True if any biff MCP server session is active."""
     from biff._stdlib import active_dir  # noqa: PLC0415
@@ -194,10 +206,18 @@ def handle_pre_tool_use(data: dict[str, object]) -> dict[str, object] | None:  #
     """
     if not _has_active_session():
         return None
+    return _plan_gate(_get_worktree_root())
 
+
+def _plan_gate(worktree_root: str) -> dict[str, object] | None:
+    """Deny unless *worktree_root* has a plan-active marker.
+
+    Shared by :func:`handle_pre_tool_use` and the resident hook daemon
+    (``biff.hook_daemon``), which resolves *worktree_root* from its cache.
+    """
     from biff.markers import has_plan_marker  # noqa: PLC0415
 
-    if not has_plan_marker(_get_worktree_root()):
+    if not has_plan_marker(worktree_root):
         return _pre_tool_use_deny(
             "Blocked: editing files requires a plan. "
             "Run /plan <what you're working on>, then retry the edit."
@@ -369,8 +389,12 @@ def _expand_branch_plan(branch: str) -> str:
     return f"→ {branch}"
 
 
-def _get_worktree_root() -> str:
-    """Return the git worktree root path, or empty string on failure."""
+def _get_worktree_root(cwd: str | None = None) -> str:
+    """Return the git worktree root path, or empty string on failure.
+
+    *cwd* defaults to the process's working directory; the hook daemon
+    passes the invoking hook's directory instead.
+    """
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],  # noqa: S607
@@ -378,6 +402,7 @@ def _get_worktree_root() -> str:
             text=True,
             check=False,
             timeout=5,
+            cwd=cwd,
         )
         if result.returncode == 0:
             return result.stdout.strip()
@@ -767,6 +792,17 @@ def handle_session_end() -> int:
     return count
 
 
+# ── Daemon ───────────────────────────────────────────────────────────
+
+
+@hook_app.command("daemon")
+def hook_daemon() -> None:
+    """Run the resident PreToolUse gate daemon (optional; foreground)."""
+    from biff.hook_daemon import main  # noqa: PLC0415
+
+    main()
+
+
 # ── Claude Code commands ─────────────────────────────────────────────
 
 
@@ -786,10 +822,7 @@ def cc_pre_tool_use() -> None:
         result = handle_pre_tool_use(data)
     except Exception:  # noqa: BLE001 — hook boundary (PY-EH-6): a gate that cannot evaluate must fail closed
         logger.warning("Plan gate evaluation failed; denying", exc_info=True)
-        result = _pre_tool_use_deny(
-            "Blocked: could not verify plan state. "
-            "Run /plan <what you're working on>, then retry the edit."
-        )
+        result = _plan_unverified_deny()
     if result is not None:
         _emit(result)
 
@@ -0,0 +1,220 @@
+"""Optional resident daemon for the PreToolUse Edit/Write plan gate.
+
+Every Edit and Write tool call runs ``biff-hook claude-code pre-tool-use``.
+In-process, that hook pays for a Python start, the ``typer`` import,
+``shutil.which("biff")`` and a ``git rev-parse --show-toplevel``
+subprocess — tens of milliseconds, on every edit.
+
+``biff-hook daemon`` keeps that work resident.  It listens on a per-user
+Unix socket (``~/.punt-labs/biff/hookd.sock``, mode ``0600``) and answers
+one JSON line per connection::
+
+    → {"op": "pre-tool-use", "cwd": "/path/to/worktree/src"}
+    ← {"decision": null}                    # allow
+    ← {"decision": {"hookSpecificOutput": ...}}   # deny
+
+What it caches is the expensive, slow-changing state: the worktree root
+per working directory (dropped when ``{root}/.git`` disappears) and the
+``biff`` PATH lookup (re-checked every :data:`_WHICH_TTL` seconds).  The
+cheap, fast-changing state — the enabled marker, active-session files,
+and the plan-active marker — is re-``stat``-ed on every request, so a
+``/plan`` takes effect on the very next edit with no invalidation
+protocol.
+
+The client side (:func:`query_gate`) is stdlib-only and imported by
+``biff._hook_entry`` before anything else.  When the daemon is absent or
+unhealthy it raises, and the hook falls back to the in-process path —
+the daemon is purely an accelerator and never the only way to a decision.
+"""
+
+# pyright: reportPrivateUsage=false
+# The daemon shares the gate implementation with biff.hook — cross-module
+# access to _-prefixed helpers is intentional, not a violation.
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import shutil
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from biff._stdlib import active_dir, biff_data_dir, enabled_marker_path, find_git_root
+from biff._unix_socket import request_line, serve_socket
+
+# Client-side budget for one round-trip.  A healthy daemon answers in well
+# under a millisecond; anything slower is treated as absent so the hook
+# never waits longer than the in-process path would have taken.
+_CLIENT_TIMEOUT = 0.25
+
+# How long a cached ``shutil.which("biff")`` answer stays valid.
+_WHICH_TTL = 60.0
+
+# Working directories remembered for worktree-root lookup.
+_ROOT_CACHE_SIZE = 256
+
+
+def socket_path() -> Path:
+    """Per-user daemon socket: ``~/.punt-labs/biff/hookd.sock``."""
+    return biff_data_dir() / "hookd.sock"
+
+
+# ── Gate state ───────────────────────────────────────────────────────
+
+
+class GateState:
+    """Resident cache behind the daemon's gate decisions."""
+
+    def __init__(self) -> None:
+        self._roots: OrderedDict[str, str] = OrderedDict()
+        self._which: tuple[bool, float] | None = None
+
+    def worktree_root(self, cwd: str) -> str:
+        """Return the worktree root for *cwd*, running git only on a miss.
+
+        A cached root is dropped once its ``.git`` entry vanishes (worktree
+        removed), so a reused path is resolved afresh.
+        """
+        root = self._roots.get(cwd)
+        if root is not None:
+            if (Path(root) / ".git").exists():
+                self._roots.move_to_end(cwd)
+                return root
+            del self._roots[cwd]
+        from biff.hook import _get_worktree_root  # noqa: PLC0415
+
+        root = _get_worktree_root(cwd)
+        if root:
+            self._roots[cwd] = root
+            if len(self._roots) > _ROOT_CACHE_SIZE:
+                self._roots.popitem(last=False)
+        return root
+
+    def biff_on_path(self) -> bool:
+        """Cached equivalent of :func:`biff._stdlib.biff_on_path`."""
+        now = time.monotonic()
+        if self._which is None or now - self._which[1] >= _WHICH_TTL:
+            self._which = (shutil.which("biff") is not None, now)
+        return self._which[0]
+
+    def is_enabled(self, cwd: str) -> bool:
+        """Same contract as :func:`biff._stdlib.is_enabled` for *cwd*'s repo."""
+        repo_root = find_git_root(Path(cwd))
+        if repo_root is None:
+            return False
+        marker = enabled_marker_path(repo_root)
+        return marker.is_file() and not marker.is_symlink() and self.biff_on_path()
+
+    def decide(self, cwd: str) -> dict[str, object] | None:
+        """Gate decision for a PreToolUse hook run in *cwd*.
+
+        Mirrors ``_dispatch_cc`` + :func:`biff.hook.handle_pre_tool_use`:
+        ``None`` (allow) when biff is off for the repo or no session is
+        active, otherwise the plan-marker check.
+        """
+        from biff.hook import _plan_gate  # noqa: PLC0415
+
+        if not self.is_enabled(cwd) or not _any_active_session():
+            return None
+        return _plan_gate(self.worktree_root(cwd))
+
+
+def _any_active_session() -> bool:
+    """Same check as :func:`biff.hook._has_active_session`."""
+    adir = active_dir()
+    try:
+        with os.scandir(adir) as entries:
+            return any(e.is_file() for e in entries)
+    except OSError:
+        return False
+
+
+# ── Server ───────────────────────────────────────────────────────────
+
+
+async def _answer(
+    state: GateState, line: bytes, fail_closed: dict[str, object]
+) -> bytes:
+    """Answer one request line; any failure denies with *fail_closed*."""
+    try:
+        request = json.loads(line)
+        if request.get("op") != "pre-tool-use":
+            reply: dict[str, object] = {"error": "unknown op"}
+        else:
+            reply = {"decision": state.decide(str(request["cwd"]))}
+    except Exception:  # noqa: BLE001 — hook boundary: a gate that cannot evaluate must fail closed
+        reply = {"decision": fail_closed}
+    return json.dumps(reply).encode() + b"\n"
+
+
+async def serve(
+    path: Path | None = None,
+    *,
+    ready: asyncio.Event | None = None,
+) -> None:
+    """Serve gate decisions on *path* until cancelled.
+
+    *ready* is set once the socket accepts connections (tests and the
+    benchmark wait on it).
+    """
+    from biff.hook import _plan_unverified_deny  # noqa: PLC0415
+
+    state = GateState()
+    # Built before serving, so the deny never depends on the import a
+    # failing request may have tripped over.
+    fail_closed = _plan_unverified_deny()
+
+    async def answer(line: bytes) -> bytes:
+        return await _answer(state, line, fail_closed)
+
+    async with serve_socket(
+        path or socket_path(),
+        answer,
+        owner="biff hook daemon",
+        timeout=_CLIENT_TIMEOUT,
+    ) as server:
+        if ready is not None:
+            ready.set()
+        await server.serve_forever()
+
+
+def main() -> None:
+    """Run the daemon in the foreground until interrupted."""
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve())
+
+
+# ── Client ───────────────────────────────────────────────────────────
+
+
+def query_gate(cwd: str, path: Path | None = None) -> dict[str, object] | None:
+    """Ask the daemon for the PreToolUse decision in *cwd*.
+
+    Returns the hook output to emit, or ``None`` to allow.  Raises
+    :class:`OSError` (no daemon, timeout) or :class:`ValueError` (bad
+    reply) so the caller can fall back to the in-process gate.
+    """
+    request = json.dumps({"op": "pre-tool-use", "cwd": cwd}).encode() + b"\n"
+    reply = json.loads(
+        request_line(
+            path or socket_path(),
+            request,
+            connect_timeout=_CLIENT_TIMEOUT,
+            reply_timeout=_CLIENT_TIMEOUT,
+        )
+    )
+    if not isinstance(reply, dict) or "decision" not in reply:
+        msg = f"unexpected hook daemon reply: {reply!r}"
+        raise ValueError(msg)
+    decision = reply["decision"]  # pyright: ignore[reportUnknownVariableType]
+    if decision is not None and not isinstance(decision, dict):
+        msg = f"unexpected hook daemon decision: {decision!r}"
+        raise ValueError(msg)
+    return decision  # pyright: ignore[reportUnknownVariableType]
+
+
+if __name__ == "__main__":
+    main()
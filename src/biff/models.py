@@ -127,6 +127,24 @@ class UserSession(BaseModel):
         return (now - self.last_active).total_seconds() <= ttl_seconds
 
 
+class SessionBeat(BaseModel):
+    """The hot half of a session in NATS KV: its latest ``last_active``.
+
+    Heartbeats write this small record under ``{repo}.{user}.{tty}.beat``.
+    The :class:`UserSession` profile stays under ``{repo}.{user}.{tty}``
+    and is rewritten only when one of its other fields changes.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    last_active: datetime = Field(default_factory=_utc_now)
+
+    @field_validator("last_active", mode="after")
+    @classmethod
+    def _normalize_last_active(cls, v: datetime) -> datetime:
+        return _ensure_utc(v)
+
+
 @dataclass(frozen=True)
 class RelayAuth:
     """Authentication credentials for a remote NATS relay.
@@ -176,6 +194,7 @@ class BiffConfig(BaseModel):
     peers: tuple[str, ...] = ()
     orgs: tuple[str, ...] = ()
     poll_interval: float = 2.0
+    slow_op_threshold: float = 1.0  # seconds; slower relay requests are logged
 
     @property
     def visible_repos(self) -> frozenset[str]:
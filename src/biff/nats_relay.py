@@ -17,31 +17,40 @@ scaling wall (25-stream Synadia Cloud limit hit at 8 repos).
 
 Messages are consumed (deleted) on :meth:`fetch`; :meth:`mark_read` is a
 no-op.  :meth:`get_unread_summary` uses ``stream_info()`` for counts
-only — zero consumers created (DES-015).
+only — zero consumers created (DES-015) — and, once
+:meth:`NatsRelay.enable_unread_counters` is called, answers from
+push-maintained counters (:mod:`biff.unread_counter`) instead.  Inbox reads go through a
+per-relay pool of durable pull consumers (one per filter subject) that
+lives as long as the connection, so a steady-state read makes no
+consumer create/delete API calls.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import ssl
 import time
-from collections.abc import Awaitable, Callable, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
 from contextlib import suppress
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
 from urllib.parse import urlsplit
 from uuid import UUID, uuid4
 
 import nats
-from nats.errors import Error as NatsError
+from nats.errors import Error as NatsError, NoRespondersError
 from nats.js.api import (
     ConsumerConfig,
     DeliverPolicy,
     KeyValueConfig,
     RetentionPolicy,
     StreamConfig,
+    StreamInfo,
 )
 from nats.js.errors import (
     BadRequestError,
@@ -49,29 +58,47 @@ from nats.js.errors import (
     KeyNotFoundError,
     KeyWrongLastSequenceError,
     NotFoundError,
+    ServiceUnavailableError,
 )
+from nats.js.kv import KV_DEL, KV_OP, KeyValue
 from pydantic import ValidationError
 
+from biff._stdlib import biff_data_dir
 from biff.models import (
     Message,
     RelayAuth,
+    SessionBeat,
     SessionEvent,
     UnreadSummary,
     UserSession,
     WallPost,
 )
-from biff.relay import SESSION_TTL_SECONDS
+from biff.presence_mirror import PresenceMirror, merge_beat
+from biff.relay import (
+    DRAIN_PAGE_SIZE,
+    PRESENCE_LIVENESS_SECONDS,
+    SESSION_TTL_SECONDS,
+)
+from biff.relay_stats import (
+    DEFAULT_SLOW_OP_THRESHOLD,
+    Outcome,
+    RelayStats,
+    StatsRecorder,
+)
+from biff.session_watch import RepoWatch
 from biff.tty import (
     SID_HINT_NAMESPACE,
     build_session_key,
     validate_reclaimable_name,
     validate_routing_id,
 )
+from biff.unread_counter import UnreadCounter, removed_stream_seq
 
 if TYPE_CHECKING:
     from nats.aio.client import Client as NatsClient
+    from nats.aio.msg import Msg
+    from nats.aio.subscription import Subscription
     from nats.js.client import JetStreamContext
-    from nats.js.kv import KeyValue
 
 logger = logging.getLogger(__name__)
 
@@ -80,11 +107,33 @@ _KV_MAX_BYTES = 10 * 1024 * 1024  # 10 MiB — shared bucket, all repos' session
 _STREAM_MAX_BYTES = 100 * 1024 * 1024  # 100 MiB — shared stream, all repos' messages
 _FETCH_BATCH = 100
 _FETCH_TIMEOUT = 1.0
+_PUBLISH_ACK_TIMEOUT = 5.0  # per-part ack wait in deliver_many (nats-py's default)
+# JetStream's dedupe header: a frame resent with the same id within the
+# stream's duplicate window (2 min by default) is acked, not stored again.
+_MSG_ID_HEADER = "Nats-Msg-Id"
+_Frame = tuple[str, bytes, str]  # (subject, payload, msg_id) for deliver_many
 _WTMP_MAX_AGE = 30 * 24 * 60 * 60  # 30 days in seconds
 _CONSUMER_INACTIVE_THRESHOLD = 300.0  # 5 min — dead sessions auto-expire
+# Pooled consumers are never deleted on the read path; this threshold is
+# what reclaims them when the owning process crashes without close().
+_UNREAD_RECONCILE_INTERVAL = 300.0  # 5 min — stream_info drift correction
 _CONNECT_PROVISION_TIMEOUT = 20.0  # bound JetStream/KV provisioning so a
 # disconnected connection can't hold _connect_lock forever and wedge every
 # relay caller (biff-wr3)
+# Pre-DES-016 leftovers do not come back once deleted; looking for them on
+# every connect cost three API calls per CLI invocation.
+_LEGACY_CLEANUP_INTERVAL = 86_400.0  # 1 day
+# A tty reservation is rewritten only once less than this much of its
+# _KV_TTL is left — about every two days instead of every heartbeat.
+_KV_REWRITE_MIN_REMAINING = 86_400.0  # 1 day
+# A session profile whose heartbeats go to its beat key still has its own
+# last_active rewritten once it is this old.  Clients from before the beat
+# key read the profile alone; refreshed at half the liveness window, it
+# stays inside that window at any heartbeat cadence shorter than the window.
+_PROFILE_REFRESH_SECONDS = PRESENCE_LIVENESS_SECONDS / 2
+# Session values fetched at once by a presence query; an org-wide /who
+# over many repos must not put thousands of gets on the wire together.
+_SESSION_GET_CONCURRENCY = 64
 
 # Keepalive tuning so a half-open connection (socket up, server not
 # responding) is detected in ~60-80s, not the nats-py default of 240s
@@ -129,6 +178,18 @@ _DEFAULT_STREAM_PREFIX = "biff"
 # does not belong here — it would silently block a user named "name".
 RESERVED_KV_NAMESPACES: frozenset[str] = frozenset({"key"})
 
+# The hot half of a session: ``{repo}.{user}.{tty}.beat`` holds only
+# ``last_active`` (SessionBeat, ~50 bytes) and takes every heartbeat, so
+# the profile under ``{repo}.{user}.{tty}`` is rewritten only when plan,
+# tty name or another cold field changes — and every KV watcher decodes
+# the small record on each tick instead of the whole document.
+BEAT_KV_SUFFIX = ".beat"
+
+# Body of a session delete marker whose logout the deleter already wrote
+# (graceful exit, CLI session, janitor sentinel reap).  The repo janitor
+# writes a logout only for deletes without it — one event per session end.
+LOGGED_OUT_MARKER = b"logged-out"
+
 
 async def safe_close(nc: NatsClient) -> None:
     """Close a NATS connection, suppressing Python 3.14+ SSL teardown errors.
@@ -144,6 +205,42 @@ async def safe_close(nc: NatsClient) -> None:
             raise
 
 
+def _legacy_cleanup_stamp(url: str, repo: str) -> Path:
+    """Stamp whose mtime records the last legacy cleanup of *repo* on *url*.
+
+    ``~/.punt-labs/biff/provisioned/{digest}`` — hashed, because the URL
+    may carry credentials.
+    """
+    digest = hashlib.sha256(f"{url}\0{repo}".encode()).hexdigest()[:16]
+    return biff_data_dir() / "provisioned" / digest
+
+
+def _legacy_cleanup_due(stamp: Path) -> bool:
+    """Whether *stamp* is missing or older than ``_LEGACY_CLEANUP_INTERVAL``."""
+    try:
+        age = time.time() - stamp.stat().st_mtime
+    except OSError:
+        return True
+    return age >= _LEGACY_CLEANUP_INTERVAL
+
+
+def _parse_lease(value: bytes | None) -> tuple[str, float | None]:
+    """Decode a janitor lease into ``(holder, ttl)``.
+
+    *ttl* is ``None`` for a lease written before it was recorded.  An
+    unreadable lease decodes with no holder, so it can be taken over.
+    """
+    try:
+        data = json.loads(value or b"")
+        holder = str(data["holder"])
+    except (ValueError, KeyError, TypeError):
+        return "", None
+    try:
+        return holder, float(data["ttl"])
+    except (KeyError, TypeError, ValueError):
+        return holder, None
+
+
 def _scrub_validation_error(exc: ValidationError | ValueError) -> str:
     """Render a validation failure without leaking the frame content.
 
@@ -168,6 +265,52 @@ def _scrub_validation_error(exc: ValidationError | ValueError) -> str:
     )
 
 
+async def _entry_or_marker(
+    get: Awaitable[KeyValue.Entry],
+) -> tuple[KeyValue.Entry | None, int]:
+    """A KV get's entry (``None`` when missing) and the key's last revision.
+
+    The revision is the entry's, a delete marker's, or ``0`` for a key
+    never written — the ``last`` a revision-checked write needs.
+    """
+    try:
+        entry = await get
+    except KeyNotFoundError as exc:
+        marker = cast("KeyValue.Entry | None", exc.entry)  # pyright: ignore[reportUnknownMemberType]
+        return None, int(marker.revision or 0) if marker is not None else 0
+    return entry, int(entry.revision or 0)
+
+
+def _decode_beat(entry: KeyValue.Entry | None) -> tuple[SessionBeat, int] | None:
+    """A beat key's record and revision; ``None`` when absent or unreadable."""
+    if entry is None or entry.value is None or entry.revision is None:
+        return None
+    try:
+        return SessionBeat.model_validate_json(entry.value), int(entry.revision)
+    except (ValidationError, ValueError):
+        return None
+
+
+def _merge_entries(
+    profile: KeyValue.Entry | None, beat: KeyValue.Entry | None
+) -> UserSession | None:
+    """The session a profile entry and its beat entry describe.
+
+    ``None`` without a profile; a corrupt profile raises
+    :class:`~pydantic.ValidationError`.  A profile with no beat key — any
+    session written before the split — reads as it always did.
+    """
+    if profile is None or profile.value is None:
+        return None
+    session = UserSession.model_validate_json(profile.value)
+    return merge_beat(session, int(profile.revision or 0), _decode_beat(beat))
+
+
+def _same_profile(a: UserSession, b: UserSession) -> bool:
+    """Whether *a* and *b* differ in nothing but ``last_active``."""
+    return a.model_copy(update={"last_active": b.last_active}) == b
+
+
 class _ConnectionHealth:
     """Single source of connection-health diagnostics for :class:`NatsRelay`.
 
@@ -399,6 +542,57 @@ class _ConnectionHealth:
         return f"{time.monotonic() - self._last_ok:.0f}s"
 
 
+@dataclass(slots=True)
+class _PooledConsumer:
+    """A durable pull consumer kept bound across inbox reads.
+
+    *lock* serializes fetches on one subscription: nats-py's ``fetch``
+    drains a shared pending queue and discards status frames meant for
+    other in-flight requests, so two concurrent fetches would steal each
+    other's replies.
+    """
+
+    sub: JetStreamContext.PullSubscription
+    durable: str
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+@dataclass(slots=True)
+class _InboxTap:
+    """Core-NATS subscriptions feeding one inbox subject's unread counter.
+
+    *epoch* is the ``_reconnect_epoch`` the counter was last trusted at: an
+    in-place reconnect replays the SUBs, but anything published or acked
+    while the socket was down was never seen, so the count is re-read.
+    """
+
+    counter: UnreadCounter
+    subs: list[Subscription]
+    epoch: int
+
+
+@dataclass(slots=True)
+class _SessionRow:
+    """A session's two KV keys as this relay last read or wrote them.
+
+    *profile* is the document under ``{repo}.{user}.{tty}`` at *revision*;
+    its ``last_active`` is as of that write.  *beat* is the ``.beat``
+    key's record and revision, and *beat_base* the revision the next beat
+    write is checked against: the beat's, a delete marker's, or ``0`` for
+    a key never written (a guess until the key is read).
+    """
+
+    profile: UserSession
+    revision: int
+    beat: tuple[SessionBeat, int] | None = None
+    beat_base: int = 0
+
+    @property
+    def session(self) -> UserSession:
+        """The merged view readers see."""
+        return merge_beat(self.profile, self.revision, self.beat)
+
+
 class NatsRelay:
     """NATS-backed relay with JetStream messages and KV sessions.
 
@@ -414,6 +608,7 @@ class NatsRelay:
         name: str = "biff",
         repo_name: str = "_default",
         stream_prefix: str = _DEFAULT_STREAM_PREFIX,
+        slow_op_threshold: float = DEFAULT_SLOW_OP_THRESHOLD,
     ) -> None:
         self._url = url
         self._auth = auth
@@ -436,6 +631,7 @@ class NatsRelay:
         self._subject_prefix = f"{stream_prefix}.{repo_name}.inbox"
         self._wtmp_prefix = f"{stream_prefix}.{repo_name}.wtmp"
         self._names_bucket = f"{stream_prefix}-names"
+        self._legacy_stamp = _legacy_cleanup_stamp(url, repo_name)
         self._nc: NatsClient | None = None
         self._js: JetStreamContext | None = None
         self._kv: KeyValue | None = None
@@ -443,6 +639,10 @@ class NatsRelay:
         self._connect_lock = asyncio.Lock()
         self._wtmp_available: bool = False
         self._health = _ConnectionHealth(url)
+        # Latency histograms and outcome counters fed by ``_tracked``;
+        # requests slower than ``slow_op_threshold`` seconds are logged.
+        self._stats = StatsRecorder()
+        self._slow_op_threshold = slow_op_threshold
         # Monotonic per-dial token.  Each new client dialed in
         # ``_open_connection`` bumps it; the connection callbacks capture the
         # value in force at their registration and no-op when it no longer
@@ -461,6 +661,32 @@ class NatsRelay:
         # reconnected one — it is true in both — so the epoch carries the datum
         # ``is_connected`` does not.
         self._reconnect_epoch = 0
+        # Watch-fed copy of the sessions bucket.  The MCP server's KV watcher
+        # feeds it; presence reads use it only while it is ready and fall
+        # back to the live stream_info + kv.get query otherwise.
+        self._presence = PresenceMirror()
+        # Each session's profile and beat as this relay last read or wrote
+        # them, per profile KV key: the base a heartbeat writes on top of
+        # without reading first.
+        self._rows: dict[str, _SessionRow] = {}
+        # Wall-clock time this relay last wrote each tty reservation.  Wall
+        # clock, not monotonic: the bucket TTL keeps running while a laptop
+        # sleeps, and CLOCK_MONOTONIC does not.
+        self._reservations_written: dict[str, float] = {}
+        # Another holder's janitor lease as last seen: (revision, when first
+        # seen on the monotonic clock).  See claim_janitor_lease.
+        self._lease_seen: tuple[int, float] | None = None
+        # Inbox pull consumers keyed by filter subject (biff-tty / user
+        # broadcast).  Subscriptions live on one client, so the pool is
+        # tagged with the dial generation it was built on and dropped
+        # wholesale when a fresh client replaces it.
+        self._consumers: dict[str, _PooledConsumer] = {}
+        self._consumers_generation = 0
+        # Push-maintained unread counters keyed by inbox subject, opt-in via
+        # enable_unread_counters().  Generation-tagged like the pool above.
+        self._unread_push = False
+        self._inbox_taps: dict[str, _InboxTap] = {}
+        self._inbox_taps_generation = 0
 
     def _auth_kwargs(self) -> dict[str, str]:
         """Build authentication keyword arguments for ``nats.connect()``."""
@@ -508,7 +734,9 @@ class NatsRelay:
             self._kv = None
             return await self._open_connection()
 
-    async def _tracked[T](self, operation: str, awaitable: Awaitable[T]) -> T:
+    async def _tracked[T](
+        self, operation: str, awaitable: Awaitable[T], *, subject: str = ""
+    ) -> T:
         """Await a runtime JS/KV request, feeding connection-health diagnostics.
 
         On ``nats: timeout`` the wedge onset is recorded once (with transport
@@ -525,6 +753,11 @@ class NatsRelay:
         timeout or success on a superseded client is then a no-op for the live
         connection — it must never force-reconnect a healthy client nor clear
         the live client's wedge latch (Copilot: tracked-timeout race).
+
+        Every call is also timed into the per-operation histograms behind
+        :meth:`stats` — a "not found" counts as ok (the server answered) —
+        and one slower than ``slow_op_threshold`` is logged with *subject*
+        (the publish subject, KV key, or stream filter) for context.
         """
         # INVARIANT: callers fetch the handle via ``_ensure_connected()``
         # immediately before each ``_tracked``, with no ``await`` in between —
@@ -534,11 +767,11 @@ class NatsRelay:
         # awaitable still runs on the stale handle, so a timeout on that handle
         # would be misattributed to the fresh client and could spuriously
         # force-reconnect it.  Sites issuing two sequential ``_tracked`` calls
-        # (``get_unread_summary``, ``heartbeat``) re-fetch the handle before the
-        # second one to preserve this.
+        # (``heartbeat``) re-fetch the handle before the second one to
+        # preserve this.
         owner = self._nc
         try:
-            result = await awaitable
+            result = await self._timed(operation, awaitable, subject)
         except TimeoutError:
             if self._nc is owner:
                 is_connected = owner is not None and owner.is_connected
@@ -570,6 +803,60 @@ class NatsRelay:
             self._health.record_success()
         return result
 
+    async def _timed[T](
+        self, operation: str, awaitable: Awaitable[T], subject: str
+    ) -> T:
+        """Await *awaitable*, filing its latency and outcome under *operation*.
+
+        Timed here rather than in :meth:`_tracked` so the histogram holds the
+        request alone, never a force-reconnect the timeout branch awaits.
+        A cancelled request is not recorded — it never settled.
+        """
+        started = time.perf_counter()
+        outcome: Outcome | None = Outcome.ERROR
+        try:
+            result = await awaitable
+        except TimeoutError:
+            outcome = Outcome.TIMEOUT
+            raise
+        except (KeyNotFoundError, BucketNotFoundError, NotFoundError):
+            outcome = Outcome.OK
+            raise
+        except asyncio.CancelledError:
+            outcome = None
+            raise
+        else:
+            outcome = Outcome.OK
+            return result
+        finally:
+            if outcome is not None:
+                self._observe(
+                    operation, subject, time.perf_counter() - started, outcome
+                )
+
+    def _observe(
+        self, operation: str, subject: str, seconds: float, outcome: Outcome
+    ) -> None:
+        """Record one settled request; log it when slower than the threshold.
+
+        INFO, not WARNING: a slow request is a latency signal, not a fault,
+        and must stay off the CLI's WARNING stderr floor (biff-9la).
+        """
+        self._stats.record(operation, seconds, outcome)
+        if seconds >= self._slow_op_threshold:
+            self._stats.slow_ops += 1
+            logger.info(
+                "Slow relay op %s on %s: %.0fms (%s)",
+                operation,
+                subject or "-",
+                seconds * 1000,
+                outcome,
+            )
+
+    def stats(self) -> RelayStats:
+        """Snapshot of per-operation latency histograms and counters."""
+        return self._stats.snapshot()
+
     async def _force_reconnect(self, gate_epoch: int) -> None:
         """Tear down a half-open connection so the next call rebuilds it fresh.
 
@@ -774,66 +1061,119 @@ class NatsRelay:
         Run under a timeout by :meth:`_open_connection` so a disconnected
         connection cannot block relay callers indefinitely (biff-wr3).
         Returns ``(js, sessions_kv, names_kv)``.
+
+        Bind-first: each shared resource is looked up and created only when
+        missing, and the four lookups run concurrently — a connect to
+        provisioned infrastructure waits on one round trip, not five in a
+        row.  Legacy cleanup joins them at most once a day per server and
+        repo (:data:`_LEGACY_CLEANUP_INTERVAL`).
         """
         js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
 
         # KV bucket for sessions — shared across all repos (DES-016).
-        # TTL auto-purges truly stale entries.  Never delete-recreate
-        # shared infrastructure; use the existing bucket on config
-        # mismatch.
+        # TTL auto-purges truly stale entries.  ``direct`` lets any replica
+        # answer a presence read (see :meth:`_kv_get`); a bucket made before
+        # it keeps going through the leader.
         kv_config = KeyValueConfig(
             bucket=self._kv_bucket,
             ttl=_KV_TTL,
             max_bytes=_KV_MAX_BYTES,
+            direct=True,
         )
-        try:
-            kv = await js.create_key_value(  # pyright: ignore[reportUnknownMemberType]
-                config=kv_config,
-            )
-        except BadRequestError:
-            logger.info(
-                "Shared KV bucket %s config differs, using as-is",
-                self._kv_bucket,
-            )
-            kv = await js.key_value(self._kv_bucket)  # pyright: ignore[reportUnknownMemberType]
-
-        # Inbox stream — shared WORK_QUEUE with wildcard subjects
-        # (DES-016).  Never delete-recreate shared infrastructure.
+        # Inbox stream — shared WORK_QUEUE with wildcard subjects (DES-016).
         stream_config = StreamConfig(
             name=self._stream_name,
             subjects=[f"{self._stream_prefix}.*.inbox.>"],
             retention=RetentionPolicy.WORK_QUEUE,
             max_bytes=_STREAM_MAX_BYTES,
         )
-        try:
-            await js.add_stream(config=stream_config)  # pyright: ignore[reportUnknownMemberType]
-        except BadRequestError:
-            logger.info(
-                "Shared stream %s config differs, using as-is",
-                self._stream_name,
-            )
-
         # KV bucket for TTY name reservations — shared across all repos (DES-035).
         # Separate from sessions: no repo prefix in keys, 1 MiB max.
         names_config = KeyValueConfig(
             bucket=self._names_bucket,
             ttl=_KV_TTL,
             max_bytes=1 * 1024 * 1024,  # 1 MiB
+            direct=True,
+        )
+        steps: list[Awaitable[None]] = [
+            self._bind_stream(js, self._stream_name, stream_config),
+            self._provision_wtmp(js),
+        ]
+        if _legacy_cleanup_due(self._legacy_stamp):
+            steps.append(self._cleanup_legacy_streams(js))
+        (kv, names_kv), _ = await asyncio.gather(
+            asyncio.gather(
+                self._bind_kv(js, kv_config), self._bind_kv(js, names_config)
+            ),
+            asyncio.gather(*steps),
         )
+        return js, kv, names_kv
+
+    @staticmethod
+    async def _bind_kv(js: JetStreamContext, config: KeyValueConfig) -> KeyValue:
+        """Bind to *config*'s shared bucket, creating it only if missing.
+
+        Never delete-recreate shared infrastructure: an existing bucket is
+        used as-is whatever its config (DES-016) — except ``allow_direct``,
+        which is switched on in place for a bucket provisioned before it
+        (see :meth:`_enable_direct`).
+        """
+        stream = f"KV_{config.bucket}"
         try:
-            names_kv = await js.create_key_value(  # pyright: ignore[reportUnknownMemberType]
-                config=names_config,
-            )
-        except BadRequestError:
+            info = await js.stream_info(stream)
+        except NotFoundError:
+            try:
+                return await js.create_key_value(config=config)  # pyright: ignore[reportUnknownMemberType]
+            except BadRequestError:
+                # Another client created it, differently, since the lookup.
+                logger.info(
+                    "Shared KV bucket %s config differs, using as-is", config.bucket
+                )
+                return await js.key_value(config.bucket)  # pyright: ignore[reportUnknownMemberType]
+        if config.direct and not info.config.allow_direct:
+            info = await NatsRelay._enable_direct(js, info)
+        return KeyValue(
+            name=config.bucket,
+            stream=stream,
+            pre=f"$KV.{config.bucket}.",
+            js=js,
+            direct=bool(info.config.allow_direct),
+        )
+
+    @staticmethod
+    async def _enable_direct(js: JetStreamContext, info: StreamInfo) -> StreamInfo:
+        """Switch on ``allow_direct`` for a bucket's stream, in place.
+
+        A stream edit, not a re-create: the bucket's keys, history and
+        every other setting are kept.  If the server refuses the edit (an
+        account without stream-edit permission), the bucket is used as-is
+        and its reads keep going through the leader.
+        """
+        config = replace(info.config, allow_direct=True)
+        try:
+            return await js.update_stream(config=config)  # pyright: ignore[reportUnknownMemberType]
+        except NatsError:
             logger.info(
-                "Shared names KV bucket %s config differs, using as-is",
-                self._names_bucket,
+                "Could not enable direct get on %s, reading through the leader",
+                config.name,
             )
-            names_kv = await js.key_value(self._names_bucket)  # pyright: ignore[reportUnknownMemberType]
+            return info
 
-        await self._provision_wtmp(js)
-        await self._cleanup_legacy_streams(js)
-        return js, kv, names_kv
+    @staticmethod
+    async def _bind_stream(
+        js: JetStreamContext, name: str, config: StreamConfig
+    ) -> None:
+        """Look up the shared stream *name*; create it from *config* if missing.
+
+        An existing stream is used as-is whatever its config (DES-016).
+        """
+        with suppress(NotFoundError):
+            await js.stream_info(name)
+            return
+        try:
+            await js.add_stream(config=config)  # pyright: ignore[reportUnknownMemberType]
+        except BadRequestError:
+            logger.info("Shared stream %s config differs, using as-is", name)
 
     async def _provision_wtmp(self, js: JetStreamContext) -> None:
         """Provision the shared wtmp stream, degrading gracefully on failure.
@@ -850,6 +1190,10 @@ class NatsRelay:
             max_age=_WTMP_MAX_AGE,
         )
         try:
+            with suppress(NotFoundError):
+                await js.stream_info(self._wtmp_stream)
+                self._wtmp_available = True
+                return
             await js.add_stream(config=wtmp_config)  # pyright: ignore[reportUnknownMemberType]
             self._wtmp_available = True
         except BadRequestError as exc:
@@ -860,7 +1204,7 @@ class NatsRelay:
                 logger.info("Wtmp stream unavailable: %s", exc)
                 self._wtmp_available = False
             else:
-                # Shared stream config differs — use as-is.
+                # Shared stream created concurrently, config differs — use as-is.
                 logger.info(
                     "Shared wtmp stream %s config differs, using as-is",
                     self._wtmp_stream,
@@ -877,9 +1221,9 @@ class NatsRelay:
         """Delete orphaned per-repo streams from pre-DES-016 installations.
 
         Best-effort: any failure is logged and swallowed.  Legacy cleanup
-        must never crash startup.  Always runs — no migration flag.
-        Each delete is a no-op (suppressed NotFoundError) once legacy
-        resources are gone.
+        must never crash startup.  Each delete is a no-op (suppressed
+        NotFoundError) once legacy resources are gone; a completed pass
+        touches the stamp that keeps the next one a day away.
         """
         try:
             for name in (
@@ -902,6 +1246,10 @@ class NatsRelay:
             # failure is non-fatal and must not print into the interactive
             # REPL (biff-9la).  The traceback stays in biff.log.
             logger.info("Legacy stream cleanup failed", exc_info=True)
+            return
+        with suppress(OSError):
+            self._legacy_stamp.parent.mkdir(parents=True, exist_ok=True)
+            self._legacy_stamp.touch()
 
     @property
     def wtmp_available(self) -> bool:
@@ -923,11 +1271,50 @@ class NatsRelay:
         """
         return self._generation
 
+    @property
+    def presence(self) -> PresenceMirror:
+        """The watch-fed presence mirror (see :mod:`biff.presence_mirror`).
+
+        The KV watcher in ``server/app.py`` owns its lifecycle
+        (``begin_snapshot`` / ``end_snapshot`` / ``invalidate``); this relay
+        writes its own puts and deletes through so a read right after a
+        local write never waits on the watch.
+        """
+        return self._presence
+
     async def get_kv(self) -> KeyValue:
         """Return the NATS KV handle, connecting if necessary."""
         _, kv = await self._ensure_connected()
         return kv
 
+    async def watch_repos(self, repos: frozenset[str], *, after: int = 0) -> RepoWatch:
+        """Watch the sessions bucket for *repos* only (``{repo}.>`` each).
+
+        The bucket is shared by every repo on the server; a ``watchall()``
+        would deliver all of them (see :mod:`biff.session_watch`).
+
+        *after* is the last KV revision a previous watch handled.  The new
+        watch resumes at ``after + 1`` unless the stream no longer holds
+        that revision (purged, or the bucket was recreated), in which case
+        it falls back to a full snapshot — check ``RepoWatch.resumed``.
+        """
+        js, _ = await self._ensure_connected()
+        if after:
+            stream = f"KV_{self._kv_bucket}"
+            info = await self._tracked(
+                "stream_info", js.stream_info(stream), subject=stream
+            )
+            if not info.state.first_seq <= after + 1 <= info.state.last_seq + 1:
+                logger.info(
+                    "KV watch cannot resume after revision %d (stream holds %d-%d)"
+                    ", taking a full snapshot",
+                    after,
+                    info.state.first_seq,
+                    info.state.last_seq,
+                )
+                after = 0
+        return await RepoWatch.start(js, self._kv_bucket, repos, after=after)
+
     def reset_infrastructure(self) -> None:
         """Clear cached KV/stream handles, forcing re-provisioning.
 
@@ -939,6 +1326,8 @@ class NatsRelay:
         self._kv = None
         self._names_kv = None
         self._wtmp_available = False
+        self._presence.invalidate()
+        self._invalidate_unread_counters()
 
     async def purge_data(self) -> None:
         """Purge this repo's data from shared streams without deleting infrastructure.
@@ -953,6 +1342,11 @@ class NatsRelay:
         connections.
         """
         js, _ = await self._ensure_connected()
+        # A subject purge removes keys without delete markers, so a watch
+        # never sees it — the mirror must not serve the purged sessions.
+        # Likewise no ack is published for purged inbox messages.
+        self._presence.invalidate()
+        self._invalidate_unread_counters()
         kv_stream = f"KV_{self._kv_bucket}"
         kv_subject = f"$KV.{self._kv_bucket}.{self._repo_name}.>"
         with suppress(NotFoundError):
@@ -1000,12 +1394,16 @@ class NatsRelay:
         if self._nc is not None and not self._nc.is_closed:
             await safe_close(self._nc)
         self._nc = None
+        self._inbox_taps.clear()  # their subscriptions closed with the client
         self._js = None
         self._kv = None
         self._names_kv = None
 
     async def close(self) -> None:
         """Close the NATS connection and release resources."""
+        self._presence.invalidate()
+        await self._close_consumer_pool()
+        self._inbox_taps.clear()
         if self._nc is not None:
             await safe_close(self._nc)
             self._nc = None
@@ -1161,29 +1559,117 @@ class NatsRelay:
         """
         self._validate_user(message.from_user)
         sender_key = self._validated_sender_key(sender_key, message.from_user)
+        subject = self._delivery_subject(message, target_repo)
         js, _ = await self._ensure_connected()
+        await self._tracked(
+            "publish",
+            js.publish(subject, message.model_dump_json().encode()),
+            subject=subject,
+        )
 
-        if ":" in message.to_user:
-            # Targeted delivery — TTY subject
-            subject = self._subject_for_key(message.to_user, target_repo=target_repo)
-            await self._tracked(
-                "publish", js.publish(subject, message.model_dump_json().encode())
+        # Notify any active talk_listen subscriber (core NATS, fire-and-forget).
+        await self._publish_talk_notification(message.to_user, message, sender_key)
+
+    async def deliver_many(
+        self,
+        messages: Sequence[Message],
+        *,
+        sender_key: str = "",
+        target_repo: str | None = None,
+    ) -> list[Exception | None]:
+        """Publish *messages* back to back and collect their acks together.
+
+        Every frame is written before any ack is awaited
+        (``publish_async``) and one flush sends them, so a ten-part
+        message costs one JetStream round trip instead of ten.  The
+        frames go out in order on one connection, so the stream assigns
+        the parts ascending sequences and readers pull them in order.
+
+        Each frame carries its message id as ``Nats-Msg-Id``, so the
+        stream stores a resent part once (within its duplicate window).
+        A part whose ack timed out may still have been stored; it is
+        resent once, and the resend's ack settles it either way.
+
+        Returns one entry per message — ``None`` once the stream acked
+        it, else that part's exception.  A failed part does not stop the
+        rest; talk notifications go out only for the parts that landed.
+        """
+        results: list[Exception | None] = [None] * len(messages)
+        frames: list[tuple[int, _Frame]] = []
+        for index, message in enumerate(messages):
+            try:
+                self._validate_user(message.from_user)
+                subject = self._delivery_subject(message, target_repo)
+            except ValueError as exc:
+                results[index] = exc
+                continue
+            payload = message.model_dump_json().encode()
+            frames.append((index, (subject, payload, str(message.id))))
+        if frames:
+            js, _ = await self._ensure_connected()
+            acked = await self._tracked(
+                "publish_many",
+                self._publish_pipelined(js, [frame for _, frame in frames]),
+                subject=frames[0][1][0],
             )
-        else:
-            # Broadcast — single user subject, no session lookup
-            self._validate_user(message.to_user)
-            if target_repo:
-                repo = self._validate_repo(target_repo)
-                prefix = f"{self._stream_prefix}.{repo}.inbox"
-                subject = f"{prefix}.{message.to_user}"
+            for (index, _), error in zip(frames, acked, strict=True):
+                results[index] = error
+        for message, error in zip(messages, results, strict=True):
+            if error is None:
+                key = self._validated_sender_key(sender_key, message.from_user)
+                await self._publish_talk_notification(message.to_user, message, key)
+        return results
+
+    async def _publish_pipelined(
+        self, js: JetStreamContext, frames: Sequence[_Frame]
+    ) -> list[Exception | None]:
+        """Publish ``(subject, payload, msg_id)`` frames, then await every ack.
+
+        A timed-out ack is resent once with the same ``Nats-Msg-Id`` and
+        awaited on its own: the stream acks a part it already stored as a
+        duplicate instead of storing it twice.
+        """
+        futures = [
+            await js.publish_async(s, p, headers={_MSG_ID_HEADER: i})  # pyright: ignore[reportUnknownMemberType]
+            for s, p, i in frames
+        ]
+        if self._nc is not None:
+            await self._nc.flush()
+        acks = await asyncio.gather(
+            *(asyncio.wait_for(f, _PUBLISH_ACK_TIMEOUT) for f in futures),
+            return_exceptions=True,
+        )
+        errors: list[Exception | None] = []
+        for (subject, payload, msg_id), ack in zip(frames, acks, strict=True):
+            if isinstance(ack, TimeoutError):
+                try:
+                    await js.publish(
+                        subject,
+                        payload,
+                        timeout=_PUBLISH_ACK_TIMEOUT,
+                        headers={_MSG_ID_HEADER: msg_id},
+                    )
+                except Exception as exc:  # noqa: BLE001 — reported per part
+                    errors.append(exc)
+                else:
+                    errors.append(None)
+            elif isinstance(ack, Exception):
+                errors.append(ack)
+            elif isinstance(ack, BaseException):
+                raise ack
             else:
-                subject = self._user_subject(message.to_user)
-            await self._tracked(
-                "publish", js.publish(subject, message.model_dump_json().encode())
-            )
+                errors.append(None)
+        return errors
 
-        # Notify any active talk_listen subscriber (core NATS, fire-and-forget).
-        await self._publish_talk_notification(message.to_user, message, sender_key)
+    def _delivery_subject(self, message: Message, target_repo: str | None) -> str:
+        """Inbox subject for *message*'s recipient (see :meth:`deliver`)."""
+        if ":" in message.to_user:
+            return self._subject_for_key(message.to_user, target_repo=target_repo)
+        self._validate_user(message.to_user)
+        if target_repo:
+            repo = self._validate_repo(target_repo)
+            return f"{self._stream_prefix}.{repo}.inbox.{message.to_user}"
+        return self._user_subject(message.to_user)
 
     async def _publish_talk_notification(
         self,
@@ -1240,37 +1726,110 @@ class NatsRelay:
         """
         return f"{self._repo_name}-inbox-{session_key.replace(':', '-')}"
 
+    async def _pooled_consumer(
+        self,
+        js: JetStreamContext,
+        subject: str,
+        durable: str,
+    ) -> _PooledConsumer:
+        """Return the bound consumer for *subject*, binding it on first use.
+
+        ``pull_subscribe`` with a durable looks the consumer up first and
+        only creates it when missing, so rebinding after a restart reuses
+        the server-side consumer left by the previous process.
+        """
+        if self._consumers_generation != self._generation:
+            # A fresh client replaced the one these subscriptions lived on —
+            # they are gone with it.  Rebind lazily on the new client.
+            self._consumers.clear()
+            self._consumers_generation = self._generation
+        pooled = self._consumers.get(subject)
+        if pooled is None:
+            sub = await js.pull_subscribe(
+                subject,
+                durable=durable,
+                stream=self._stream_name,
+                config=ConsumerConfig(inactive_threshold=_CONSUMER_INACTIVE_THRESHOLD),
+            )
+            # Counted as a create even when the durable already existed:
+            # the bind costs the same consumer API round trips either way.
+            self._stats.consumers_created += 1
+            pooled = _PooledConsumer(sub=sub, durable=durable)
+            self._consumers[subject] = pooled
+        return pooled
+
+    async def _evict_consumer(self, subject: str) -> None:
+        """Drop *subject*'s pooled subscription (the server consumer is gone)."""
+        pooled = self._consumers.pop(subject, None)
+        if pooled is not None:
+            with suppress(NatsError, TimeoutError):
+                await pooled.sub.unsubscribe()
+
+    async def _close_consumer_pool(self) -> None:
+        """Unsubscribe every pooled consumer, leaving the durables in place.
+
+        The user-broadcast durable (``{repo}-userinbox-{user}``) is shared
+        by the user's other live processes — deleting it here would break
+        their reads.  A session's own inbox durable goes with
+        :meth:`delete_session`; whatever is left idle is reaped by
+        ``inactive_threshold``.
+        """
+        pooled = list(self._consumers.values())
+        self._consumers.clear()
+        if not pooled or self._nc is None or not self._nc.is_connected:
+            return
+
+        async def _release(entry: _PooledConsumer) -> None:
+            with suppress(NatsError, TimeoutError):
+                await entry.sub.unsubscribe()
+
+        await asyncio.gather(*(_release(entry) for entry in pooled))
+
+    async def _pull(self, pooled: _PooledConsumer, batch: int) -> list[Msg]:
+        """One bounded fetch; an empty inbox times out and yields ``[]``."""
+        try:
+            return await pooled.sub.fetch(batch=batch, timeout=_FETCH_TIMEOUT)
+        except TimeoutError:
+            return []
+
     async def _fetch_from_subject(
         self,
         js: JetStreamContext,
         subject: str,
         durable: str,
-    ) -> list[Message]:
-        """Pull valid frames, ack them, and delete the consumer for a subject.
+        *,
+        batch: int = _FETCH_BATCH,
+    ) -> tuple[list[Message], int]:
+        """Pull up to *batch* frames from *subject*'s consumer and ack them.
+
+        Returns the valid messages and the number of frames pulled —
+        malformed ones included, so a caller sizing its pulls from a
+        count can tell an all-malformed page from an empty inbox.
 
         Shared implementation for :meth:`fetch` (TTY inbox) and
         :meth:`fetch_user_inbox` (user broadcast inbox).  A valid frame is
         acked (WORK_QUEUE deletes it); a malformed frame is ``term()``ed —
         never acked — so a wire-integrity fault is not silently destroyed as
-        if delivered (biff-cuy).  Acks are fire-and-forget in nats.py, so we
-        flush before deleting the consumer to ensure the server has processed
-        all acks.
+        if delivered (biff-cuy).  The batch's last ack is synchronous, so an
+        immediate unread count already sees the messages removed.
+
+        The consumer stays bound for the next read.  If the server dropped
+        it meanwhile (``inactive_threshold`` expiry, ``delete_session``,
+        stream re-provisioned), the pull gets no responder; rebind once and
+        retry.
         """
-        sub = await js.pull_subscribe(
-            subject,
-            durable=durable,
-            stream=self._stream_name,
-            config=ConsumerConfig(inactive_threshold=_CONSUMER_INACTIVE_THRESHOLD),
-        )
-        try:
+        pooled = await self._pooled_consumer(js, subject, durable)
+        async with pooled.lock:
             try:
-                raw_msgs = await sub.fetch(batch=_FETCH_BATCH, timeout=_FETCH_TIMEOUT)
-            except TimeoutError:
-                raw_msgs = []
-            finally:
-                await sub.unsubscribe()
+                raw_msgs = await self._pull(pooled, batch)
+            except (ServiceUnavailableError, NotFoundError):
+                logger.debug("Pooled consumer %s vanished, rebinding", durable)
+                await self._evict_consumer(subject)
+                pooled = await self._pooled_consumer(js, subject, durable)
+                raw_msgs = await self._pull(pooled, batch)
 
             messages: list[Message] = []
+            synced = False
             for raw in raw_msgs:
                 try:
                     msg = Message.model_validate_json(raw.data)
@@ -1295,36 +1854,33 @@ class NatsRelay:
                         detail,
                     )
                     await raw.term()
+                    self._note_removed(subject, raw)
                     continue
                 messages.append(msg)
-                await raw.ack()
-
-            # Acks are fire-and-forget publishes in nats.py.  Flush
-            # ensures the server has received all acks before we delete
-            # the consumer — otherwise the WORK_QUEUE message removal
-            # can race with consumer deletion.
-            if raw_msgs and self._nc is not None:
+                synced = raw is raw_msgs[-1]
+                await (raw.ack_sync() if synced else raw.ack())
+                self._note_removed(subject, raw)
+
+            # Acks are fire-and-forget publishes in nats.py, and a flush
+            # only proves the server read them — the consumer applies them
+            # on its own goroutine, so a stream_info right after could still
+            # count acked messages.  The consumer applies acks in order, so
+            # awaiting the last one (above) covers the batch; a trailing
+            # term() has no synchronous form and falls back to a flush.
+            if raw_msgs and not synced and self._nc is not None:
                 await self._nc.flush()
 
-            return messages
-        finally:
-            # Delete consumer after use — frees the server-side slot.
-            # Broad except: any delete_consumer failure must not prevent
-            # returning already-acked messages (WORK_QUEUE deletes on ack).
-            # inactive_threshold provides backup cleanup.
-            try:
-                await js.delete_consumer(self._stream_name, durable)
-            except (NatsError, TimeoutError):
-                logger.debug("Consumer cleanup failed for %s (will expire)", durable)
+            return messages, len(raw_msgs)
 
     async def fetch(self, session_key: str) -> list[Message]:
         """Pull and ack all messages — WORK_QUEUE deletes them on ack."""
         js, _ = await self._ensure_connected()
-        return await self._fetch_from_subject(
+        messages, _ = await self._fetch_from_subject(
             js,
             subject=self._subject_for_key(session_key),
             durable=self._durable_name(session_key),
         )
+        return messages
 
     async def mark_read(self, session_key: str, ids: Sequence[UUID]) -> None:
         """No-op — messages are consumed (deleted) by :meth:`fetch`."""
@@ -1335,11 +1891,12 @@ class NatsRelay:
         """Pull and ack all messages from the user's broadcast inbox."""
         self._validate_user(user)
         js, _ = await self._ensure_connected()
-        return await self._fetch_from_subject(
+        messages, _ = await self._fetch_from_subject(
             js,
             subject=self._user_subject(user),
             durable=self._user_durable_name(user),
         )
+        return messages
 
     async def mark_read_user_inbox(self, user: str, ids: Sequence[UUID]) -> None:
         """No-op — messages are consumed (deleted) by :meth:`fetch_user_inbox`."""
@@ -1347,83 +1904,383 @@ class NatsRelay:
     async def get_user_unread_count(self, user: str) -> int:
         """Count unread messages in the user's broadcast inbox."""
         self._validate_user(user)
-        js, _ = await self._ensure_connected()
-        subject = self._user_subject(user)
-        try:
-            info = await self._tracked(
-                "stream_info",
-                js.stream_info(self._stream_name, subjects_filter=subject),
-            )
-        except NotFoundError:
-            return 0
-        if info.state.subjects:
-            return info.state.subjects.get(subject, 0)
-        return 0
+        return await self._count_subject(self._user_subject(user))
+
+    # -- Messages (backlog) --
+
+    async def drain(
+        self, session_key: str, page_size: int = DRAIN_PAGE_SIZE
+    ) -> AsyncIterator[list[Message]]:
+        """Yield the session's backlog page by page, TTY inbox first.
+
+        Each page is one pull on the subject's pooled consumer, acked
+        (and flushed) before it is yielded — a caller that stops early
+        leaves only the pages it never saw.  The pulls are sized from one
+        up-front ``stream_info``, so the drain stops at the end of the
+        backlog without a trailing empty pull (which would linger for the
+        whole ``_FETCH_TIMEOUT``).  A malformed frame is termed and counts
+        against the backlog; a page of nothing but malformed frames is not
+        yielded.  Messages arriving mid-drain are left for the next read.
+        """
+        subjects = self._inbox_subjects([session_key])
+        counts = await self._count_subjects(list(subjects))
+        for subject, durable in subjects.items():
+            remaining = counts[subject]
+            while remaining > 0:
+                js, _ = await self._ensure_connected()
+                page, pulled = await self._fetch_from_subject(
+                    js, subject, durable, batch=min(page_size, remaining)
+                )
+                if not pulled:
+                    break
+                remaining -= pulled
+                if page:
+                    yield page
 
     async def get_unread_summary(self, session_key: str) -> UnreadSummary:
         """Count unread messages across TTY and user inboxes.
 
         Uses ``stream_info()`` with subject filters — zero consumers
-        created (DES-015).
+        created (DES-015).  With :meth:`enable_unread_counters`, the counts
+        come from push-maintained counters and ``stream_info`` runs only to
+        seed or reconcile them.
         """
-        js, _ = await self._ensure_connected()
-        user = session_key.split(":")[0]
-        tty_subject = self._subject_for_key(session_key)
-        user_subject = self._user_subject(user)
+        return await self.get_combined_unread_summary([session_key])
 
-        tty_count = 0
-        user_count = 0
-        try:
-            tty_info = await self._tracked(
-                "stream_info",
-                js.stream_info(self._stream_name, subjects_filter=tty_subject),
-            )
-            if tty_info.state.subjects:
-                tty_count = tty_info.state.subjects.get(tty_subject, 0)
-        except NotFoundError:
-            pass
-        # Re-anchor to the current connection: the first _tracked's await
-        # may have let a concurrent loop rebuild self._nc, leaving `js`
-        # stale.  Fast path returns cached handles, so `owner = self._nc` at
-        # _tracked entry matches the connection this awaitable runs on
-        # (code-reviewer + alex-chen: residual two-_tracked race).  Kept OUT of
-        # the try below so a slow-path rebuild raising BucketNotFoundError (a
-        # NotFoundError subclass) surfaces as a provisioning failure instead of
-        # being swallowed into a tty_count-only undercount (silent-failure-hunter).
+    async def get_combined_unread_summary(
+        self, session_keys: Sequence[str]
+    ) -> UnreadSummary:
+        """Count unread messages across every inbox of *session_keys*.
+
+        All subjects are counted by one ``stream_info`` (or, with push
+        counters, reconciled by one) rather than one per subject.
+        """
+        subjects = self._inbox_subjects(session_keys)
+        if self._unread_push:
+            counts = await self._pushed_counts(subjects)
+        else:
+            counts = await self._count_subjects(list(subjects))
+        return UnreadSummary(count=sum(counts.values()))
+
+    async def fetch_inboxes(
+        self, session_keys: Sequence[str]
+    ) -> dict[str, tuple[list[Message], list[Message]]]:
+        """Pull the TTY and user inboxes of *session_keys* in one pass.
+
+        Returns ``{session_key: (tty_unread, user_unread)}``.  One
+        ``stream_info`` counts every subject first and only the subjects
+        holding messages are pulled: a pull on an empty inbox lingers
+        for the whole ``_FETCH_TIMEOUT``, and binding its consumer costs
+        API round trips for nothing.  A message landing after the count
+        waits for the next read; the unread poller reports it meanwhile.
+
+        Not one multi-filter consumer over all the subjects: the
+        WORK_QUEUE stream rejects a consumer whose filters overlap
+        another's, and the user broadcast subject is already filtered by
+        the consumer the user's other sessions share.
+        """
+        subjects = self._inbox_subjects(session_keys)
+        counts = await self._count_subjects(list(subjects))
+        pending = [subject for subject, count in counts.items() if count]
         js, _ = await self._ensure_connected()
-        try:
-            user_info = await self._tracked(
-                "stream_info",
-                js.stream_info(self._stream_name, subjects_filter=user_subject),
+        batches = await asyncio.gather(
+            *(self._fetch_from_subject(js, s, subjects[s]) for s in pending)
+        )
+        pulled = {s: page for s, (page, _) in zip(pending, batches, strict=True)}
+        result: dict[str, tuple[list[Message], list[Message]]] = {}
+        for key in session_keys:
+            user = key.split(":")[0]
+            # pop: a user inbox shared by two of the keys is returned once.
+            result[key] = (
+                pulled.pop(self._subject_for_key(key), []),
+                pulled.pop(self._user_subject(user), []),
             )
-            if user_info.state.subjects:
-                user_count = user_info.state.subjects.get(user_subject, 0)
+        return result
+
+    def _inbox_subjects(self, session_keys: Sequence[str]) -> dict[str, str]:
+        """Map each TTY and user inbox subject of *session_keys* to its durable."""
+        subjects: dict[str, str] = {}
+        for key in session_keys:
+            user = key.split(":")[0]
+            subjects[self._subject_for_key(key)] = self._durable_name(key)
+            subjects[self._user_subject(user)] = self._user_durable_name(user)
+        return subjects
+
+    async def _count_subject(self, subject: str) -> int:
+        """Messages stored on one inbox subject, via ``stream_info``."""
+        return (await self._count_subjects([subject]))[subject]
+
+    async def _count_subjects(self, subjects: Sequence[str]) -> dict[str, int]:
+        """Messages stored on each of *subjects*, via one ``stream_info``.
+
+        A single subject is filtered exactly.  Several share the repo's
+        inbox wildcard and are split client-side — the reply lists only
+        subjects that hold messages, so it grows with undelivered mail,
+        not with sessions.
+        """
+        # Re-anchor to the current connection on every call: a previous
+        # _tracked's await may have let a concurrent loop rebuild self._nc,
+        # leaving a caller-held `js` stale.  Fast path returns cached handles,
+        # so `owner = self._nc` at _tracked entry matches the connection this
+        # awaitable runs on (code-reviewer + alex-chen: residual two-_tracked
+        # race).  Kept OUT of the try below so a slow-path rebuild raising
+        # BucketNotFoundError (a NotFoundError subclass) surfaces as a
+        # provisioning failure instead of being swallowed into an undercount
+        # (silent-failure-hunter).
+        if not subjects:
+            return {}
+        await self._ensure_connected()
+        if len(subjects) == 1:
+            subject_filter = subjects[0]
+        else:
+            subject_filter = f"{self._subject_prefix}.>"
+        counts = dict.fromkeys(subjects, 0)
+        try:
+            async for page in self._iter_subjects(self._stream_name, subject_filter):
+                for subject, stored in page.items():
+                    if subject in counts:
+                        counts[subject] = stored
         except NotFoundError:
-            pass
-        return UnreadSummary(count=tty_count + user_count)
+            return dict.fromkeys(subjects, 0)
+        return counts
+
+    # -- Unread counters (push) --
+
+    def enable_unread_counters(self) -> None:
+        """Answer :meth:`get_unread_summary` from push-maintained counters.
+
+        For long-lived callers that poll the summary (the MCP server's
+        2-second poller).  Each inbox subject is tapped on first use and
+        reconciled against ``stream_info`` every
+        ``_UNREAD_RECONCILE_INTERVAL`` seconds; a one-shot CLI command
+        should not pay for the subscriptions.
+        """
+        self._unread_push = True
+
+    def _invalidate_unread_counters(self) -> None:
+        """Force every counter to re-read the stream on its next use."""
+        for tap in self._inbox_taps.values():
+            tap.counter.invalidate()
+
+    async def _pushed_counts(self, subjects: dict[str, str]) -> dict[str, int]:
+        """Unread counts for *subjects* from their taps, reconciling when due.
+
+        *subjects* maps each inbox subject to its durable.  Taps created
+        together come due together, so their reconciles share one
+        ``stream_info``.
+        """
+        taps = {s: await self._inbox_tap(s, d) for s, d in subjects.items()}
+        due: list[str] = []
+        now = time.monotonic()
+        for subject, tap in taps.items():
+            if tap.epoch != self._reconnect_epoch:
+                tap.counter.invalidate()
+                tap.epoch = self._reconnect_epoch
+            if tap.counter.needs_reconcile(now):
+                due.append(subject)
+        if due:
+            # A publish or ack landing while stream_info is in flight can be
+            # counted twice or not at all; the next reconcile corrects it.
+            counts = await self._count_subjects(due)
+            now = time.monotonic()
+            for subject in due:
+                taps[subject].counter.reconcile(counts[subject], now)
+        return {subject: tap.counter.count for subject, tap in taps.items()}
+
+    async def _inbox_tap(self, subject: str, durable: str) -> _InboxTap:
+        """Return *subject*'s tap, subscribing on first use or after a new dial."""
+        await self._ensure_connected()
+        if self._inbox_taps_generation != self._generation:
+            # The subscriptions lived on the replaced client.
+            self._inbox_taps.clear()
+            self._inbox_taps_generation = self._generation
+        tap = self._inbox_taps.get(subject)
+        if tap is not None:
+            return tap
+        nc = self._nc
+        if nc is None:
+            msg = "NATS connection lost while tapping inbox"
+            raise NatsError(msg)
+        counter = UnreadCounter(_UNREAD_RECONCILE_INTERVAL)
+
+        async def _on_publish(_msg: Msg) -> None:
+            counter.apply_publish()
+
+        async def _on_ack(msg: Msg) -> None:
+            seq = removed_stream_seq(msg.subject, msg.data)
+            if seq is not None:
+                counter.apply_removed(seq)
+
+        # Acks from any process reading this inbox — including the user's
+        # other sessions on the shared broadcast consumer.  Both the v1 and
+        # the domain-qualified v2 ack subject layouts.
+        stream = self._stream_name
+        subs = [
+            await nc.subscribe(subject, cb=_on_publish),  # pyright: ignore[reportUnknownMemberType]
+            await nc.subscribe(f"$JS.ACK.{stream}.{durable}.>", cb=_on_ack),  # pyright: ignore[reportUnknownMemberType]
+            await nc.subscribe(f"$JS.ACK.*.*.{stream}.{durable}.>", cb=_on_ack),  # pyright: ignore[reportUnknownMemberType]
+        ]
+        # Interest must be registered before the seeding stream_info, or a
+        # publish in between is missed by both.
+        await nc.flush()
+        tap = _InboxTap(counter=counter, subs=subs, epoch=self._reconnect_epoch)
+        self._inbox_taps[subject] = tap
+        return tap
+
+    def _note_removed(self, subject: str, raw: Msg) -> None:
+        """Decrement *subject*'s counter for a message this process acked.
+
+        The ack's echo on the wire names the same stream sequence and is
+        absorbed, so the count is right before the echo arrives.
+        """
+        tap = self._inbox_taps.get(subject)
+        if tap is not None:
+            tap.counter.apply_removed(raw.metadata.sequence.stream)
 
     # -- Presence --
 
+    @staticmethod
+    def _leader_kv(js: JetStreamContext, bucket: str) -> KeyValue:
+        """A handle on *bucket* whose gets always go to the stream leader.
+
+        For reads that feed a write — a CAS base revision or a
+        read-modify-write.  A direct get may be answered by a replica
+        still catching up, and writing back what it returned could undo
+        a newer write.
+        """
+        return KeyValue(
+            name=bucket,
+            stream=f"KV_{bucket}",
+            pre=f"$KV.{bucket}.",
+            js=js,
+            direct=False,
+        )
+
+    async def _kv_get(self, kv: KeyValue, bucket: str, key: str) -> KeyValue.Entry:
+        """Read *key* for display: by direct get where *bucket* allows it.
+
+        nats-py sends ``kv.get`` to ``$JS.API.DIRECT.GET`` — which every
+        replica serves, mid leader election included — when the bucket's
+        stream has ``allow_direct``, and to the leader's ``STREAM.MSG.GET``
+        when it does not (a bucket provisioned before the setting).  A
+        direct get nobody answers, as when the setting was switched off
+        under a live handle, retries once through the leader.
+        """
+        try:
+            return await kv.get(key)
+        except NoRespondersError:
+            js, _ = await self._ensure_connected()
+            return await self._leader_kv(js, bucket).get(key)
+
     async def update_session(self, session: UserSession) -> None:
-        """Store session in KV using ``{user}.{tty}`` key."""
+        """Store session in KV using ``{user}.{tty}`` key.
+
+        When the profile this relay last saw differs only in
+        ``last_active``, just the beat key is written (see :meth:`_touch`).
+        """
         key = build_session_key(session.user, session.tty)
         kv_key = self._kv_key(key)
+        row = self._rows.get(kv_key)
+        if (
+            row is not None
+            and _same_profile(row.profile, session)
+            and await self._touch(kv_key, row, session.last_active) is not None
+        ):
+            return
         _, kv = await self._ensure_connected()
-        await self._tracked(
-            "kv.put", kv.put(kv_key, session.model_dump_json().encode())
+        revision = await self._tracked(
+            "kv.put", kv.put(kv_key, session.model_dump_json().encode()), subject=kv_key
         )
+        self._wrote_profile(kv_key, session, int(revision))
+
+    async def get_session_entry(
+        self, session_key: str
+    ) -> tuple[UserSession, int] | None:
+        """Read a session and the KV revision its profile was written at.
+
+        Always a live read from the stream leader — the revision is the
+        base for a subsequent :meth:`update_session_if`, so it must not
+        come from the presence mirror or a direct get, either of which may
+        trail the bucket.
+        """
+        kv_key = self._kv_key(session_key)
+        row = await self._read_row(kv_key)
+        if row is None:
+            return None
+        return row.session, row.revision
+
+    async def update_session_if(
+        self, session: UserSession, revision: int | None
+    ) -> int | None:
+        """Write *session* only if its profile is still at *revision*.
+
+        ``None`` for *revision* means "only if absent" (``kv.create``, which
+        also recreates over a delete marker).  Returns the profile's
+        revision afterwards, or ``None`` when another writer changed or
+        removed the session since — the caller re-reads and merges.  A
+        change to ``last_active`` alone goes to the beat key.
+        """
+        key = build_session_key(session.user, session.tty)
+        kv_key = self._kv_key(key)
+        row = self._rows.get(kv_key)
+        if (
+            revision is not None
+            and row is not None
+            and row.revision == revision
+            and _same_profile(row.profile, session)
+        ):
+            return await self._touch(kv_key, row, session.last_active)
+        return await self._write_profile_if(kv_key, session, revision)
+
+    async def _write_profile_if(
+        self, kv_key: str, session: UserSession, revision: int | None
+    ) -> int | None:
+        """Revision-checked profile write; ``None`` on a conflict."""
+        payload = session.model_dump_json().encode()
+        _, kv = await self._ensure_connected()
+        try:
+            if revision is None:
+                written = await self._tracked(
+                    "kv.create", kv.create(kv_key, payload), subject=kv_key
+                )
+            else:
+                written = await self._tracked(
+                    "kv.update",
+                    kv.update(kv_key, payload, last=revision),
+                    subject=kv_key,
+                )
+        except KeyWrongLastSequenceError:
+            return None
+        self._wrote_profile(kv_key, session, int(written))
+        return int(written)
 
     async def get_session(self, session_key: str) -> UserSession | None:
-        """Read a single session from KV by ``{user}:{tty}`` key."""
+        """Read a single session by ``{user}:{tty}`` key.
+
+        Served from the presence mirror when it is ready; otherwise a
+        direct get of the profile and its beat, side by side.
+        """
         kv_key = self._kv_key(session_key)
+        if self._presence.covers(frozenset({self._repo_name})):
+            return self._presence.get(kv_key)
+        beat_key = kv_key + BEAT_KV_SUFFIX
         _, kv = await self._ensure_connected()
         try:
-            entry = await self._tracked("kv.get", kv.get(kv_key))
-            if entry.value is None:
-                return None
-            return UserSession.model_validate_json(entry.value)
-        except (KeyNotFoundError, BucketNotFoundError):
+            (profile, _), (beat, _) = await asyncio.gather(
+                self._tracked(
+                    "kv.get",
+                    _entry_or_marker(self._kv_get(kv, self._kv_bucket, kv_key)),
+                    subject=kv_key,
+                ),
+                self._tracked(
+                    "kv.get",
+                    _entry_or_marker(self._kv_get(kv, self._kv_bucket, beat_key)),
+                    subject=beat_key,
+                ),
+            )
+        except BucketNotFoundError:
             return None
+        return _merge_entries(profile, beat)
 
     async def get_sessions_for_user(self, user: str) -> list[UserSession]:
         """Return all sessions for a given user."""
@@ -1431,8 +2288,111 @@ class NatsRelay:
         all_sessions = await self.get_sessions()
         return [s for s in all_sessions if s.user == user]
 
-    async def heartbeat(self, session_key: str) -> None:
-        """Update ``last_active`` for an existing session.
+    def _wrote_profile(self, kv_key: str, session: UserSession, revision: int) -> None:
+        """Record a profile write at *revision*: mirror and session row."""
+        self._presence.apply_put(kv_key, session, revision)
+        row = self._rows.get(kv_key)
+        if row is None:
+            self._rows[kv_key] = _SessionRow(session, revision)
+        else:
+            row.profile, row.revision = session, revision
+
+    def _wrote_beat(
+        self, kv_key: str, row: _SessionRow, beat: SessionBeat, revision: int
+    ) -> None:
+        """Record a beat write at *revision*: mirror and session row."""
+        self._presence.apply_beat(kv_key, beat, revision)
+        row.beat = (beat, revision)
+        row.beat_base = revision
+
+    async def _read_row(self, kv_key: str) -> _SessionRow | None:
+        """Read a session's profile and beat from the stream leader.
+
+        The result is remembered as the base for the next revision-checked
+        write; ``None`` (and nothing remembered) when there is no profile.
+        A corrupt profile raises :class:`~pydantic.ValidationError`; a
+        corrupt beat is ignored.
+        """
+        beat_key = kv_key + BEAT_KV_SUFFIX
+        js, _ = await self._ensure_connected()
+        leader = self._leader_kv(js, self._kv_bucket)
+        try:
+            (profile, revision), (beat, beat_base) = await asyncio.gather(
+                self._tracked(
+                    "kv.get", _entry_or_marker(leader.get(kv_key)), subject=kv_key
+                ),
+                self._tracked(
+                    "kv.get", _entry_or_marker(leader.get(beat_key)), subject=beat_key
+                ),
+            )
+        except BucketNotFoundError:
+            profile = None
+            revision = beat_base = 0
+            beat = None
+        if profile is None or profile.value is None:
+            self._rows.pop(kv_key, None)
+            return None
+        row = _SessionRow(
+            UserSession.model_validate_json(profile.value),
+            revision,
+            _decode_beat(beat),
+            beat_base,
+        )
+        self._rows[kv_key] = row
+        return row
+
+    @staticmethod
+    def _profile_due(row: _SessionRow) -> bool:
+        """Whether *row*'s profile ``last_active`` must be rewritten.
+
+        Keeps the profile live for clients that predate the beat key (see
+        :data:`_PROFILE_REFRESH_SECONDS`), which also resets its KV TTL.
+        The profile's stored ``last_active`` stands in for its write time:
+        a profile is written with the time of writing, or an earlier one.
+        """
+        age = (datetime.now(UTC) - row.profile.last_active).total_seconds()
+        return age >= _PROFILE_REFRESH_SECONDS
+
+    async def _touch(
+        self, kv_key: str, row: _SessionRow, last_active: datetime
+    ) -> int | None:
+        """Move a session's ``last_active`` with one revision-checked write.
+
+        The write goes to the beat key — unless the profile's own
+        ``last_active`` is due (see :meth:`_profile_due`), in which case
+        the whole profile is rewritten.  Returns the
+        profile's revision afterwards, or ``None`` when another writer or
+        a delete moved the key since *row* was read.
+        """
+        if self._profile_due(row):
+            session = row.session.model_copy(update={"last_active": last_active})
+            return await self._write_profile_if(kv_key, session, row.revision)
+        beat_key = kv_key + BEAT_KV_SUFFIX
+        beat = SessionBeat(last_active=last_active)
+        # Re-anchor to the current connection: a kv.get before this may have
+        # let a concurrent loop rebuild self._nc, leaving a captured `kv`
+        # stale.  Fast path returns cached handles, so `owner = self._nc`
+        # at _tracked entry matches the connection this awaitable runs on
+        # — and the update runs on a live handle (code-reviewer +
+        # alex-chen: residual two-_tracked race).
+        _, kv = await self._ensure_connected()
+        try:
+            written = await self._tracked(
+                "kv.update",
+                kv.update(
+                    beat_key, beat.model_dump_json().encode(), last=row.beat_base
+                ),
+                subject=beat_key,
+            )
+        except KeyWrongLastSequenceError:
+            return None
+        self._wrote_beat(kv_key, row, beat, int(written))
+        return row.revision
+
+    async def _read_heartbeat_row(
+        self, session_key: str, kv_key: str
+    ) -> _SessionRow | None:
+        """Read the session from the leader; ``None`` when there is none.
 
         If the session is missing from KV (expired, deleted, or not yet
         created), the heartbeat is skipped.  Writing a bare
@@ -1441,36 +2401,43 @@ class NatsRelay:
         handlers know how to set.  The 3-day TTL means one skipped
         heartbeat is harmless; overwriting with a bare session is not.
         """
-        kv_key = self._kv_key(session_key)
-        _, kv = await self._ensure_connected()
         try:
-            entry = await self._tracked("kv.get", kv.get(kv_key))
-            if entry.value is None:
-                return  # No session to heartbeat
-            existing = UserSession.model_validate_json(entry.value)
-        except (KeyNotFoundError, BucketNotFoundError):
-            return  # Session not found — nothing to heartbeat
+            return await self._read_row(kv_key)
         except (ValidationError, ValueError):
             # INFO: heartbeat runs in the background loop; a skipped tick is
             # harmless (3-day TTL) and must not print into the interactive
             # REPL (biff-9la).  biff.log records the anomaly.
             logger.info("Corrupt session for %s, skip heartbeat", session_key)
-            return
-        updated = existing.model_copy(update={"last_active": datetime.now(UTC)})
-        # Re-anchor to the current connection: the kv.get above may have let a
-        # concurrent loop rebuild self._nc, leaving `kv` stale.  Fast path
-        # returns cached handles, so `owner = self._nc` at _tracked entry
-        # matches the connection this awaitable runs on — and the put runs on a
-        # live handle (code-reviewer + alex-chen: residual two-_tracked race).
-        _, kv = await self._ensure_connected()
-        await self._tracked(
-            "kv.put", kv.put(kv_key, updated.model_dump_json().encode())
-        )
+            return None
+
+    async def heartbeat(self, session_key: str) -> None:
+        """Update ``last_active`` for an existing session.
+
+        One revision-checked write of the beat key, on top of the revision
+        this relay last read or wrote (see :meth:`_touch`).  Only a
+        mismatch — a delete, or another writer — costs a re-read, and the
+        heartbeat never recreates a missing session (see
+        :meth:`_read_heartbeat_row`): a delete leaves a marker the write
+        is checked against.
+        """
+        kv_key = self._kv_key(session_key)
+        row = self._rows.get(kv_key)
+        for _ in range(2):
+            if row is None:
+                row = await self._read_heartbeat_row(session_key, kv_key)
+                if row is None:
+                    return
+            if await self._touch(kv_key, row, datetime.now(UTC)) is not None:
+                break
+            row = None
+        else:
+            return  # Lost the race twice; the next tick starts from a read.
         # Refresh TTY name reservation to prevent TTL expiry (DES-035).
-        if existing.tty_name:
+        profile = row.profile
+        if profile.tty_name:
             try:
                 await self.refresh_tty_reservation(
-                    existing.user, existing.tty_name, session_key
+                    profile.user, profile.tty_name, session_key
                 )
             except Exception:  # noqa: BLE001
                 # INFO: reservation refresh runs inside the background
@@ -1487,31 +2454,43 @@ class NatsRelay:
         return await self._get_sessions_for_repo(self._repo_name)
 
     async def get_sessions_for_repos(self, repos: frozenset[str]) -> list[UserSession]:
-        """Return sessions from multiple repos via parallel per-repo queries.
-
-        Each repo gets its own ``stream_info`` call with a repo-scoped
-        ``subjects_filter`` (``$KV.{bucket}.{repo}.>``), keeping all
-        filtering server-side.  Results are merged and returned as a
-        single list.  Used by cross-repo commands (``/who``, ``/finger``)
-        when peers are configured (DES-030).
+        """Return sessions from multiple repos in one listing pass.
+
+        One repo keeps its repo-scoped ``subjects_filter``
+        (``$KV.{bucket}.{repo}.>``).  Several share a single bucket-wide
+        listing partitioned by repo prefix client-side — one
+        ``stream_info`` instead of one per repo, which for an org of 40
+        repos was 40 round trips before any value was fetched.  Used by
+        cross-repo commands (``/who``, ``/finger``) when peers are
+        configured (DES-030).
+
+        When the presence mirror covers *repos* the whole answer comes from
+        memory — zero NATS requests.
         """
         if not repos:
             return []
+        if self._presence.covers(repos):
+            return self._presence.sessions_for_repos(repos)
         if len(repos) == 1:
             (repo,) = repos
             return await self._get_sessions_for_repo(repo)
-        repo_results = await asyncio.gather(
-            *(self._get_sessions_for_repo(repo) for repo in repos)
-        )
-        return [s for batch in repo_results for s in batch]
+        try:
+            return await self._get_sessions_for_repos_inner(repos)
+        except NotFoundError:
+            return []
+        except Exception:  # noqa: BLE001
+            # INFO, like _get_sessions_for_repo: the next call self-recovers.
+            logger.info(
+                "Failed to query sessions for %d repos", len(repos), exc_info=True
+            )
+            return []
 
     async def discover_repos_for_org(self, org: str) -> frozenset[str]:
         """Discover repos with active sessions under an org prefix.
 
-        Uses a single ``stream_info`` with ``subjects_filter`` scoped to
-        the org's KV key prefix (``$KV.{bucket}.{org}__>``).  Returns
-        repo names extracted from subject metadata — no session values
-        are fetched (DES-034).
+        Lists the bucket's profile subjects (``$KV.{bucket}.*.*.*``) and
+        keeps the repos named ``{org}__*``.  Returns repo names extracted
+        from subject metadata — no session values are fetched (DES-034).
 
         Returns an empty frozenset on any error (transient NATS failures
         must not break startup).
@@ -1530,28 +2509,22 @@ class NatsRelay:
 
     async def _discover_repos_for_org_inner(self, org: str) -> frozenset[str]:
         """Inner implementation — may raise on NATS errors."""
-        js, _ = await self._ensure_connected()
-        kv_stream = f"KV_{self._kv_bucket}"
         kv_prefix = f"$KV.{self._kv_bucket}."
-        # org = "punt-labs", repos are keyed as "punt-labs__biff.user.tty"
-        # Filter: $KV.biff-sessions.punt-labs__> matches all repos under this org
-        org_filter = f"{kv_prefix}{org}__>"
-        info = await self._tracked(
-            "stream_info",
-            js.stream_info(kv_stream, subjects_filter=org_filter),
-        )
-        if not info.state.subjects:
-            return frozenset()
+        # org = "punt-labs", repos are keyed as "punt-labs__biff.user.tty".
+        # A subject wildcard only matches whole tokens — "punt-labs__>"
+        # matches nothing — so list every profile key ({repo}.{user}.{tty},
+        # three tokens: no beats, no walls) and match the org client-side.
+        org_prefix = f"{org}__"
         repos: set[str] = set()
-        for subject in info.state.subjects:
-            key = subject.removeprefix(kv_prefix)
-            parts = key.split(".", maxsplit=2)
-            if len(parts) < 2:
-                continue
-            repo = parts[0]
-            if parts[1] in RESERVED_KV_NAMESPACES:
-                continue
-            repos.add(repo)
+        async for page in self._iter_subjects(
+            f"KV_{self._kv_bucket}", f"{kv_prefix}*.*.*"
+        ):
+            for subject in page:
+                repo, namespace, _ = subject.removeprefix(kv_prefix).split(".")
+                if namespace in RESERVED_KV_NAMESPACES:
+                    continue
+                if repo.startswith(org_prefix):
+                    repos.add(repo)
         return frozenset(repos)
 
     async def _get_sessions_for_repo(self, repo: str) -> list[UserSession]:
@@ -1559,8 +2532,11 @@ class NatsRelay:
 
         Catches all errors and returns an empty list on failure so that
         a transient error on one peer repo does not take down the entire
-        ``get_sessions_for_repos`` call.
+        ``get_sessions_for_repos`` call.  Served from the presence mirror
+        when it is ready.
         """
+        if self._presence.covers(frozenset({repo})):
+            return self._presence.sessions_for_repos(frozenset({repo}))
         try:
             return await self._get_sessions_for_repo_inner(repo)
         except NotFoundError:
@@ -1574,53 +2550,163 @@ class NatsRelay:
 
     async def _get_sessions_for_repo_inner(self, repo: str) -> list[UserSession]:
         """Inner implementation — may raise on NATS errors."""
-        js, kv = await self._ensure_connected()
-        kv_stream = f"KV_{self._kv_bucket}"
+        return await self._list_sessions(frozenset({repo}), f"{repo}.>")
+
+    async def _get_sessions_for_repos_inner(
+        self, repos: frozenset[str]
+    ) -> list[UserSession]:
+        """Sessions of every repo in *repos* from one bucket-wide listing."""
+        return await self._list_sessions(repos, ">")
+
+    async def _list_sessions(
+        self, repos: frozenset[str], key_filter: str
+    ) -> list[UserSession]:
+        """Sessions of *repos* among the session keys matching *key_filter*."""
         kv_prefix = f"$KV.{self._kv_bucket}."
-        repo_filter = f"{kv_prefix}{repo}.>"
-        info = await self._tracked(
-            "stream_info",
-            js.stream_info(kv_stream, subjects_filter=repo_filter),
-        )
-        if not info.state.subjects:
-            return []
-        session_keys: list[str] = []
-        for subject in info.state.subjects:
+        profiles: list[str] = []
+        beats: set[str] = set()
+        async for page in self._iter_subjects(
+            f"KV_{self._kv_bucket}", f"{kv_prefix}{key_filter}"
+        ):
+            page_profiles, page_beats = self._session_keys(page, kv_prefix, repos)
+            profiles += page_profiles
+            beats |= page_beats
+        _, kv = await self._ensure_connected()
+        return await self._fetch_sessions(kv, profiles, beats)
+
+    async def _iter_subjects(
+        self, stream: str, subjects_filter: str
+    ) -> AsyncIterator[dict[str, int]]:
+        """Yield the subjects of *stream* matching *subjects_filter*, a page at a time.
+
+        Each page maps subject to message count.  The server caps the
+        subject map of one ``STREAM.INFO`` reply (``limit``, 100k today)
+        and reports the ``total``; nats-py's ``stream_info`` drops both and
+        cannot ask for the next page, so a listing through it silently
+        stops at the cap.  This sends the request itself and follows
+        ``offset`` until ``total`` subjects have been seen.  Every caller
+        that lists subjects goes through here.
+
+        Raises ``NotFoundError`` when the stream does not exist.
+        """
+        offset = 0
+        while True:
+            request: dict[str, object] = {"subjects_filter": subjects_filter}
+            if offset:
+                request["offset"] = offset
+            js, _ = await self._ensure_connected()
+            reply = cast(
+                "dict[str, object]",
+                await self._tracked(
+                    "stream_info",
+                    js._api_request(  # pyright: ignore[reportPrivateUsage,reportUnknownMemberType,reportUnknownArgumentType]
+                        f"{js._prefix}.STREAM.INFO.{stream}",  # pyright: ignore[reportPrivateUsage,reportUnknownMemberType]
+                        json.dumps(request).encode(),
+                        timeout=js._timeout,  # pyright: ignore[reportPrivateUsage,reportUnknownMemberType,reportUnknownArgumentType]
+                    ),
+                    subject=subjects_filter,
+                ),
+            )
+            state = cast("dict[str, object]", reply.get("state") or {})
+            page = cast("dict[str, int]", state.get("subjects") or {})
+            if page:
+                yield page
+            offset += len(page)
+            total = reply.get("total")
+            # No ``total``: the server sent the whole map in one reply.
+            if not page or not isinstance(total, int) or offset >= total:
+                return
+
+    async def _fetch_sessions(
+        self, kv: KeyValue, profiles: list[str], beats: set[str]
+    ) -> list[UserSession]:
+        """Read and merge *profiles* (and their beats) with bounded concurrency."""
+        gate = asyncio.Semaphore(_SESSION_GET_CONCURRENCY)
+
+        async def _get(key: str) -> KeyValue.Entry | None:
+            async with gate:
+                try:
+                    return await self._kv_get(kv, self._kv_bucket, key)
+                except KeyNotFoundError:
+                    return None
+
+        # A beat is fetched only where the listing shows one.
+        keys = profiles + [k + BEAT_KV_SUFFIX for k in profiles if k in beats]
+        entries = dict(zip(keys, await asyncio.gather(*map(_get, keys)), strict=True))
+        sessions: list[UserSession] = []
+        for key in profiles:
+            try:
+                session = _merge_entries(
+                    entries[key], entries.get(key + BEAT_KV_SUFFIX)
+                )
+            except (ValidationError, ValueError):
+                continue
+            if session is not None:
+                sessions.append(session)
+        return sessions
+
+    @staticmethod
+    def _session_keys(
+        subjects: Iterable[str], kv_prefix: str, repos: frozenset[str]
+    ) -> tuple[list[str], set[str]]:
+        """Split the KV subjects of *repos* into profile keys and keys with a beat.
+
+        Both as profile keys (``{repo}.{user}.{tty}``); other repos, the
+        wall and the reserved namespaces are skipped.
+        """
+        profiles: list[str] = []
+        beats: set[str] = set()
+        for subject in subjects:
             key = subject.removeprefix(kv_prefix)
-            parts = key.split(".", maxsplit=2)
-            if len(parts) != 3 or parts[0] != repo:
+            parts = key.split(".")
+            if len(parts) < 3 or parts[0] not in repos:
                 continue
             if parts[1] in RESERVED_KV_NAMESPACES:
                 continue
-            session_keys.append(key)
-
-        async def _get_session(key: str) -> UserSession | None:
-            try:
-                entry = await kv.get(key)
-                if entry.value is None:
-                    return None
-                return UserSession.model_validate_json(entry.value)
-            except (KeyNotFoundError, ValidationError, ValueError):
-                return None
-
-        results = await asyncio.gather(*(_get_session(k) for k in session_keys))
-        return [s for s in results if s is not None]
+            if len(parts) == 3:
+                profiles.append(key)
+            elif len(parts) == 4 and key.endswith(BEAT_KV_SUFFIX):
+                beats.add(key.removesuffix(BEAT_KV_SUFFIX))
+        return profiles, beats
+
+    async def delete_session(
+        self, session_key: str, *, logged_out: bool = False
+    ) -> None:
+        """Remove a session's profile and beat keys and its inbox consumer.
 
-    async def delete_session(self, session_key: str) -> None:
-        """Remove a session from KV storage and its inbox consumer."""
+        With *logged_out* the profile's delete marker carries
+        :data:`LOGGED_OUT_MARKER` as its body, telling the repo janitor's
+        watch that the session's logout is already in wtmp.  The beat's
+        marker is what a concurrent heartbeat's revision check fails on.
+        """
         kv_key = self._kv_key(session_key)
         js, kv = await self._ensure_connected()
         with suppress(KeyNotFoundError, BucketNotFoundError):
-            await kv.delete(kv_key)
-        # Delete the per-session inbox consumer.  fetch() already deletes
-        # its consumer after use; this catches the case where a session ends
-        # without a final fetch.  The user-level consumer (userinbox-{user})
-        # is likewise deleted by fetch_user_inbox(); inactive_threshold is
-        # the safety net for consumers orphaned by crashes.
+            if logged_out:
+                # The same KV-Operation: DEL publish kv.delete() makes, which
+                # has no way to attach a body.
+                await js.publish(
+                    f"$KV.{self._kv_bucket}.{kv_key}",
+                    LOGGED_OUT_MARKER,
+                    headers={KV_OP: KV_DEL},
+                )
+            else:
+                await kv.delete(kv_key)
+            await kv.delete(kv_key + BEAT_KV_SUFFIX)
+        self._presence.apply_delete(kv_key)
+        self._presence.apply_beat_delete(kv_key)
+        self._rows.pop(kv_key, None)
+        # Delete the per-session inbox consumer.  fetch() keeps it pooled for
+        # the life of the session, so the session's end is where it goes.
+        # The user-level consumer (userinbox-{user}) is shared by the user's
+        # other sessions and is left to inactive_threshold, the safety net
+        # for consumers orphaned by crashes.
+        await self._evict_consumer(self._subject_for_key(session_key))
         try:
             await js.delete_consumer(self._stream_name, self._durable_name(session_key))
+            self._stats.consumers_deleted += 1
         except NotFoundError:
-            pass  # Already deleted by fetch() — expected.
+            pass  # Never fetched, or already expired — expected.
         except (TimeoutError, NatsError) as exc:
             # INFO: the consumer auto-expires (inactive_threshold), so this
             # teardown-path failure is self-healing and must not print into
@@ -1649,15 +2735,17 @@ class NatsRelay:
         key = f"{user}.{name}"
         try:
             await names_kv.create(key, session_key.encode())
-            return True
         except KeyWrongLastSequenceError:
             return False
+        self._reservations_written[key] = time.time()
+        return True
 
     async def release_tty_name(self, user: str, name: str) -> None:
         """Release a TTY name reservation."""
         self._validate_user(user)
         names_kv = await self._ensure_names_kv()
         key = f"{user}.{name}"
+        self._reservations_written.pop(key, None)
         with suppress(KeyNotFoundError, BucketNotFoundError):
             await names_kv.delete(key)
 
@@ -1667,7 +2755,10 @@ class NatsRelay:
         """Refresh a TTY name reservation to prevent TTL expiry.
 
         Uses compare-and-set to avoid overwriting a reservation
-        legitimately claimed by another session after TTL lapse.
+        legitimately claimed by another session after TTL lapse.  A no-op
+        until less than :data:`_KV_REWRITE_MIN_REMAINING` of the TTL this
+        relay last wrote is left; the names bucket is shared and rarely
+        changes, so rewriting it every heartbeat bought nothing.
         """
         # INFO throughout: refresh runs inside the background heartbeat loop,
         # and every branch here is a benign, self-recovering reservation race
@@ -1675,10 +2766,17 @@ class NatsRelay:
         # WARNING these would clear the CLI's stderr floor and print into the
         # interactive REPL (biff-9la); at INFO biff.log keeps the detail.
         self._validate_user(user)
-        names_kv = await self._ensure_names_kv()
         key = f"{user}.{name}"
+        written_at = self._reservations_written.get(key)
+        if (
+            written_at is not None
+            and _KV_TTL - (time.time() - written_at) > _KV_REWRITE_MIN_REMAINING
+        ):
+            return
+        names_kv = await self._ensure_names_kv()
+        js, _ = await self._ensure_connected()
         try:
-            entry = await names_kv.get(key)
+            entry = await self._leader_kv(js, self._names_bucket).get(key)
         except (KeyNotFoundError, BucketNotFoundError):
             logger.info("TTY reservation %s gone, cannot refresh", key)
             return
@@ -1694,6 +2792,8 @@ class NatsRelay:
             logger.info(
                 "TTY reservation %s changed concurrently, skipping refresh", key
             )
+            return
+        self._reservations_written[key] = time.time()
 
     async def get_tty_reservation_owner(self, user: str, name: str) -> str | None:
         """Return the session key that holds *name*, or ``None``."""
@@ -1701,11 +2801,100 @@ class NatsRelay:
         names_kv = await self._ensure_names_kv()
         key = f"{user}.{name}"
         try:
-            entry = await names_kv.get(key)
+            entry = await self._kv_get(names_kv, self._names_bucket, key)
             return entry.value.decode() if entry.value else None
         except (KeyNotFoundError, BucketNotFoundError):
             return None
 
+    # -- Janitor lease --
+
+    @property
+    def _janitor_key(self) -> str:
+        """Names-bucket key for this repo's janitor lease: ``{repo}.janitor``."""
+        return f"{self._repo_name}.janitor"
+
+    async def claim_janitor_lease(self, holder: str, ttl: float) -> bool:
+        """Take or renew this repo's janitor lease for *ttl* seconds.
+
+        Returns ``True`` when *holder* holds the lease afterwards.  The
+        first claim is a ``kv.create`` (which also recreates over a
+        released lease's delete marker); renewal and takeover of an
+        expired lease are revision-checked updates, so two servers racing
+        for the same lease cannot both win.
+
+        Expiry is judged without comparing clocks across hosts: every
+        renewal bumps the key's revision, and another holder's lease has
+        lapsed once its revision has stood unchanged for the holder's
+        *ttl* by this process's monotonic clock.  A newcomer therefore
+        waits one *ttl* before taking over a lease it has just seen.  The
+        names bucket's 3-day TTL is far too coarse for a lease.  The
+        wall-clock ``expires`` is still written for older servers, which
+        read it.
+        """
+        key = self._janitor_key
+        lease = json.dumps(
+            {"holder": holder, "ttl": ttl, "expires": time.time() + ttl}
+        ).encode()
+        js, _ = await self._ensure_connected()
+        try:
+            entry = await self._tracked(
+                "kv.get", self._leader_kv(js, self._names_bucket).get(key), subject=key
+            )
+        except KeyNotFoundError:
+            entry = None
+        try:
+            if entry is None or entry.revision is None:
+                names_kv = await self._ensure_names_kv()
+                await self._tracked(
+                    "kv.create", names_kv.create(key, lease), subject=key
+                )
+                self._lease_seen = None
+                return True
+            current, held_ttl = _parse_lease(entry.value)
+            if current not in (holder, "") and not self._lease_lapsed(
+                entry.revision, held_ttl if held_ttl is not None else ttl
+            ):
+                return False
+            names_kv = await self._ensure_names_kv()
+            await self._tracked(
+                "kv.update",
+                names_kv.update(key, lease, last=entry.revision),
+                subject=key,
+            )
+        except KeyWrongLastSequenceError:
+            return False  # Another server claimed or renewed it first
+        self._lease_seen = None
+        return True
+
+    def _lease_lapsed(self, revision: int, ttl: float) -> bool:
+        """Whether another holder's lease at *revision* went *ttl* unrenewed."""
+        now = time.monotonic()
+        seen = self._lease_seen
+        if seen is None or seen[0] != revision:
+            self._lease_seen = (revision, now)
+            return False
+        return now - seen[1] >= ttl
+
+    async def release_janitor_lease(self, holder: str) -> None:
+        """Give up the janitor lease if *holder* still holds it.
+
+        Lets another server take over on its next claim rather than
+        after the lease expires.
+        """
+        key = self._janitor_key
+        js, _ = await self._ensure_connected()
+        with suppress(KeyNotFoundError, KeyWrongLastSequenceError):
+            entry = await self._tracked(
+                "kv.get", self._leader_kv(js, self._names_bucket).get(key), subject=key
+            )
+            if _parse_lease(entry.value)[0] == holder:
+                names_kv = await self._ensure_names_kv()
+                await self._tracked(
+                    "kv.delete",
+                    names_kv.delete(key, last=entry.revision),
+                    subject=key,
+                )
+
     async def list_reserved_names(self, user: str) -> list[str]:
         """List reserved TTY names for a user via stream_info subject filter.
 
@@ -1713,27 +2902,25 @@ class NatsRelay:
         ``$KV.{names_bucket}.{user}.{tty_name}``.
         """
         self._validate_user(user)
-        js, _ = await self._ensure_connected()
         names_stream = f"KV_{self._names_bucket}"
         kv_prefix = f"$KV.{self._names_bucket}."
         user_filter = f"{kv_prefix}{user}.>"
+        names: list[str] = []
         try:
-            info = await js.stream_info(names_stream, subjects_filter=user_filter)
+            async for page in self._iter_subjects(names_stream, user_filter):
+                for subject in page:
+                    key = subject.removeprefix(kv_prefix)
+                    parts = key.split(".", maxsplit=1)
+                    if len(parts) != 2 or parts[0] != user:
+                        continue
+                    name = parts[1]
+                    # Skip the session_id->tty reclaim namespace (biff-7ak):
+                    # {user}.sid.{session_id} is a hint, not a reserved tty name.
+                    if name.startswith(f"{SID_HINT_NAMESPACE}."):
+                        continue
+                    names.append(name)
         except NotFoundError:
             return []
-        if not info.state.subjects:
-            return []
-        names: list[str] = []
-        for subject in info.state.subjects:
-            key = subject.removeprefix(kv_prefix)
-            parts = key.split(".", maxsplit=1)
-            if len(parts) == 2 and parts[0] == user:
-                name = parts[1]
-                # Skip the session_id->tty reclaim namespace (biff-7ak):
-                # {user}.sid.{session_id} is a hint, not a reserved tty name.
-                if name.startswith(f"{SID_HINT_NAMESPACE}."):
-                    continue
-                names.append(name)
         return names
 
     def _sid_hint_key(self, user: str, session_id: str) -> str:
@@ -1758,7 +2945,9 @@ class NatsRelay:
         """
         names_kv = await self._ensure_names_kv()
         try:
-            entry = await names_kv.get(self._sid_hint_key(user, session_id))
+            entry = await self._kv_get(
+                names_kv, self._names_bucket, self._sid_hint_key(user, session_id)
+            )
             return entry.value.decode() if entry.value else None
         except (KeyNotFoundError, BucketNotFoundError):
             return None
@@ -1790,7 +2979,9 @@ class NatsRelay:
             return
         subject = self._wtmp_subject(event.user)
         await self._tracked(
-            "publish", js.publish(subject, event.model_dump_json().encode())
+            "publish",
+            js.publish(subject, event.model_dump_json().encode()),
+            subject=subject,
         )
 
     async def get_wtmp(
@@ -1844,6 +3035,7 @@ class NatsRelay:
             stream=self._wtmp_stream,
             config=consumer_config,
         )
+        self._stats.consumers_created += 1
         try:
             raw_msgs = await sub.fetch(batch=batch, timeout=_FETCH_TIMEOUT)
         except TimeoutError:
@@ -1852,6 +3044,7 @@ class NatsRelay:
             await sub.unsubscribe()
             with suppress(NotFoundError):
                 await js.delete_consumer(self._wtmp_stream, consumer_name)
+                self._stats.consumers_deleted += 1
 
         events: list[SessionEvent] = []
         for raw in raw_msgs:
@@ -1880,7 +3073,9 @@ class NatsRelay:
                 await kv.delete(self._wall_kv_key)
         else:
             await self._tracked(
-                "kv.put", kv.put(self._wall_kv_key, wall.model_dump_json().encode())
+                "kv.put",
+                kv.put(self._wall_kv_key, wall.model_dump_json().encode()),
+                subject=self._wall_kv_key,
             )
 
     async def get_wall(self, *, repo: str | None = None) -> WallPost | None:
@@ -1892,7 +3087,9 @@ class NatsRelay:
         _, kv = await self._ensure_connected()
         key = self.wall_kv_key(repo) if repo else self._wall_kv_key
         try:
-            entry = await self._tracked("kv.get", kv.get(key))
+            entry = await self._tracked(
+                "kv.get", self._kv_get(kv, self._kv_bucket, key), subject=key
+            )
             if entry.value is None:
                 return None
             wall = WallPost.model_validate_json(entry.value)
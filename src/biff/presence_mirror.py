@@ -0,0 +1,286 @@
+"""Watch-fed, revision-tracked mirror of the shared sessions KV bucket.
+
+The MCP server already runs a KV watch on ``biff-sessions`` for wall
+changes and logout detection (``server/app.py``).  Every entry it sees
+is applied here, so presence reads (``/who``, ``/finger``, ``get_session``)
+are served from memory instead of a ``stream_info`` plus one ``kv.get``
+per session.
+
+The mirror is authoritative only while a watch is running and its
+initial snapshot has drained (:attr:`PresenceMirror.ready`).  Until then
+— and after any watch error — :class:`~biff.nats_relay.NatsRelay` falls
+back to the live KV query.  A process that never starts a watch (the
+CLI) therefore never reads the mirror.
+
+The watch covers only the server's visible repos (``{repo}.>`` per
+repo), not the whole shared bucket, so readiness is per scope:
+:meth:`PresenceMirror.covers` answers for a set of repos, and a read
+for a repo outside the watched scope goes to the live query.
+
+Each entry carries the KV revision (stream sequence) it was written at.
+Updates older than the held revision are dropped, so a late watch
+delivery can never overwrite a newer write-through from this process,
+and a delete tombstone keeps a late put from resurrecting a removed key.
+Tombstones the watch has delivered past (:meth:`PresenceMirror.advance`)
+are pruned, so a long-lived server does not keep one per ended session.
+
+A session is two keys: the profile under ``{repo}.{user}.{tty}`` and
+its heartbeat under ``{repo}.{user}.{tty}.beat`` (:class:`SessionBeat`).
+Beats are held beside the profiles and folded in on read
+(:func:`merge_beat`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from biff.relay import SESSION_TTL_SECONDS
+
+if TYPE_CHECKING:
+    from biff.models import SessionBeat, UserSession
+
+# Tombstones held before a prune pass runs outside end_snapshot().
+_TOMBSTONE_PRUNE_AT = 1024
+
+
+def merge_beat(
+    session: UserSession, revision: int, beat: tuple[SessionBeat, int] | None
+) -> UserSession:
+    """*session* (profile at *revision*) with its beat folded in.
+
+    KV revisions are one sequence across the bucket, so whichever of the
+    two keys was written last holds the current ``last_active`` — a
+    profile rewritten with an explicit time overrides an older beat.
+    """
+    if beat is None or beat[1] < revision:
+        return session
+    return session.model_copy(update={"last_active": beat[0].last_active})
+
+
+@dataclass(frozen=True, slots=True)
+class _MirrorEntry:
+    """One mirrored session and the KV revision it was written at."""
+
+    repo: str
+    session: UserSession
+    revision: int
+
+
+class PresenceMirror:
+    """In-memory copy of session KV entries, keyed by ``{repo}.{user}.{tty}``.
+
+    Fed by the KV watcher (:meth:`apply_put` / :meth:`apply_delete`) and by
+    write-through from the owning relay.  Readers check :attr:`ready` and
+    fall back to a live query when it is ``False``.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, _MirrorEntry] = {}
+        self._tombstones: dict[str, int] = {}
+        # Beats by their session's profile key, with their own tombstones.
+        self._beats: dict[str, tuple[SessionBeat, int]] = {}
+        self._beat_tombstones: dict[str, int] = {}
+        self._revision = 0
+        # Highest revision the watch itself has delivered (advance()).
+        self._delivered = 0
+        self._ready = False
+        # Repos the running watch covers; None = the whole bucket.
+        self._scope: frozenset[str] | None = None
+        self._snapshotting = False
+        # Keys seen since begin_snapshot(); None outside a snapshot and
+        # while a resumed watch catches up (nothing to prune).
+        self._seen: set[str] | None = None
+        self._seen_beats: set[str] | None = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether reads may be served from the mirror (watch live, snapshot done)."""
+        return self._ready
+
+    def covers(self, repos: frozenset[str]) -> bool:
+        """Whether reads for every repo in *repos* may be served from the mirror."""
+        if not self._ready:
+            return False
+        return self._scope is None or repos <= self._scope
+
+    @property
+    def revision(self) -> int:
+        """Highest KV revision applied so far (0 before any entry)."""
+        return self._revision
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # -- Watch lifecycle --
+
+    def begin_snapshot(
+        self, scope: frozenset[str] | None = None, *, resume: bool = False
+    ) -> None:
+        """Start a fresh watch over *scope* (``None``: every repo).
+
+        Not ready until :meth:`end_snapshot`.  Entries are kept (logout
+        detection still needs them), but any key the new snapshot does not
+        mention is pruned when it ends — it was removed while no watch was
+        running, or its repo has left the scope and would go stale.
+
+        With *resume* the watch continues from the last revision the
+        previous one handled: it delivers changes only, so a key it does
+        not mention is unchanged and nothing is pruned.
+        """
+        self._ready = False
+        self._scope = scope
+        self._snapshotting = True
+        self._seen = None if resume else set()
+        self._seen_beats = None if resume else set()
+
+    def end_snapshot(self) -> None:
+        """Mark the initial snapshot drained; the mirror becomes authoritative.
+
+        A no-op outside a snapshot, so a repeated snapshot-done marker is
+        harmless.
+        """
+        if not self._snapshotting:
+            return
+        seen = self._seen
+        if seen is not None:
+            for key in [k for k in self._entries if k not in seen]:
+                del self._entries[key]
+        seen_beats = self._seen_beats
+        if seen_beats is not None:
+            for key in [k for k in self._beats if k not in seen_beats]:
+                del self._beats[key]
+        self._seen = None
+        self._seen_beats = None
+        self._snapshotting = False
+        self._ready = True
+        self._prune_tombstones()
+
+    def advance(self, revision: int) -> None:
+        """Record that the watch has delivered every change up to *revision*.
+
+        A tombstone absorbs deliveries older than the delete it records.
+        Once the watch is past it, only a write-through still in flight
+        could be older, so it is dropped at the next prune — at
+        :meth:`end_snapshot`, or once enough have piled up.
+        """
+        self._delivered = max(self._delivered, revision)
+        if len(self._tombstones) + len(self._beat_tombstones) > _TOMBSTONE_PRUNE_AT:
+            self._prune_tombstones()
+
+    def _prune_tombstones(self) -> None:
+        """Drop tombstones below the watch's delivered revision."""
+        delivered = self._delivered
+        for tombstones in (self._tombstones, self._beat_tombstones):
+            for key in [k for k, floor in tombstones.items() if floor < delivered]:
+                del tombstones[key]
+
+    def invalidate(self) -> None:
+        """Stop serving reads — the watch errored, was replaced, or stopped.
+
+        Entries are retained so a restarted watch can still pair a delete
+        with the session it removed (logout events).
+        """
+        self._ready = False
+        self._snapshotting = False
+        self._seen = None
+        self._seen_beats = None
+
+    # -- Updates --
+
+    def apply_put(self, kv_key: str, session: UserSession, revision: int) -> bool:
+        """Store *session* at *revision*; return ``False`` if it was stale.
+
+        A revision at or below the held entry (or a delete tombstone) is an
+        out-of-order delivery of an older write and is ignored.
+        """
+        if self._seen is not None:
+            self._seen.add(kv_key)
+        held = self._entries.get(kv_key)
+        floor = held.revision if held is not None else self._tombstones.get(kv_key)
+        if floor is not None and revision <= floor:
+            return False
+        self._tombstones.pop(kv_key, None)
+        repo = kv_key.split(".", maxsplit=1)[0]
+        self._entries[kv_key] = _MirrorEntry(repo, session, revision)
+        self._revision = max(self._revision, revision)
+        return True
+
+    def apply_delete(
+        self, kv_key: str, revision: int | None = None
+    ) -> UserSession | None:
+        """Remove *kv_key* and return the session it held, if any.
+
+        *revision* is the delete marker's revision.  A marker older than the
+        held entry is stale and leaves it in place.  ``None`` (a local delete
+        whose marker revision is unknown) removes unconditionally; the
+        watch's own marker arrives later and is absorbed by the tombstone.
+        """
+        if self._seen is not None:
+            self._seen.add(kv_key)
+        held = self._entries.get(kv_key)
+        if held is not None and revision is not None and revision < held.revision:
+            return None
+        self._entries.pop(kv_key, None)
+        floor = revision if revision is not None else (held.revision if held else 0)
+        self._tombstones[kv_key] = max(self._tombstones.get(kv_key, 0), floor)
+        if revision is not None:
+            self._revision = max(self._revision, revision)
+        return held.session if held is not None else None
+
+    def apply_beat(self, kv_key: str, beat: SessionBeat, revision: int) -> bool:
+        """Store the beat of session *kv_key* (its profile key) at *revision*.
+
+        Stale deliveries are dropped exactly as in :meth:`apply_put`.  A
+        beat whose profile is not held yet is kept for when it arrives.
+        """
+        if self._seen_beats is not None:
+            self._seen_beats.add(kv_key)
+        held = self._beats.get(kv_key)
+        floor = held[1] if held is not None else self._beat_tombstones.get(kv_key)
+        if floor is not None and revision <= floor:
+            return False
+        self._beat_tombstones.pop(kv_key, None)
+        self._beats[kv_key] = (beat, revision)
+        self._revision = max(self._revision, revision)
+        return True
+
+    def apply_beat_delete(self, kv_key: str, revision: int | None = None) -> None:
+        """Remove the beat of session *kv_key*, as :meth:`apply_delete` does."""
+        if self._seen_beats is not None:
+            self._seen_beats.add(kv_key)
+        held = self._beats.get(kv_key)
+        if held is not None and revision is not None and revision < held[1]:
+            return
+        self._beats.pop(kv_key, None)
+        floor = revision if revision is not None else (held[1] if held else 0)
+        self._beat_tombstones[kv_key] = max(self._beat_tombstones.get(kv_key, 0), floor)
+        if revision is not None:
+            self._revision = max(self._revision, revision)
+
+    # -- Reads --
+
+    def get(self, kv_key: str) -> UserSession | None:
+        """Return the mirrored session for *kv_key*, or ``None``."""
+        entry = self._entries.get(kv_key)
+        if entry is None:
+            return None
+        session = self._merged(kv_key, entry)
+        return None if self._expired(session, datetime.now(UTC)) else session
+
+    def sessions_for_repos(self, repos: frozenset[str]) -> list[UserSession]:
+        """Return every mirrored session whose key belongs to one of *repos*."""
+        now = datetime.now(UTC)
+        merged = (
+            self._merged(k, e) for k, e in self._entries.items() if e.repo in repos
+        )
+        return [s for s in merged if not self._expired(s, now)]
+
+    def _merged(self, kv_key: str, entry: _MirrorEntry) -> UserSession:
+        return merge_beat(entry.session, entry.revision, self._beats.get(kv_key))
+
+    @staticmethod
+    def _expired(session: UserSession, now: datetime) -> bool:
+        """Past the KV storage TTL — the bucket dropped it without a marker."""
+        return (now - session.last_active).total_seconds() > SESSION_TTL_SECONDS
@@ -27,7 +27,7 @@ from __future__ import annotations
 import json
 import logging
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Protocol
@@ -41,6 +41,7 @@ from biff.models import (
     UserSession,
     WallPost,
 )
+from biff.relay_stats import RelayStats
 from biff.tty import build_session_key, validate_reclaimable_name, validate_routing_id
 
 logger = logging.getLogger(__name__)
@@ -51,6 +52,8 @@ SESSION_TTL_SECONDS = 259_200  # 3 days — covers weekends; KV storage retentio
 # TTL — used to hide dead sessions from presence before their KV entry
 # expires (biff-mue).
 PRESENCE_LIVENESS_SECONDS = 120.0
+# Messages per ``Relay.drain`` page (and per ``read_messages`` screen).
+DRAIN_PAGE_SIZE = 100
 
 
 def live_sessions(sessions: Sequence[UserSession]) -> list[UserSession]:
@@ -66,6 +69,29 @@ def live_sessions(sessions: Sequence[UserSession]) -> list[UserSession]:
     ]
 
 
+async def deliver_in_turn(
+    relay: Relay,
+    messages: Sequence[Message],
+    *,
+    sender_key: str = "",
+    target_repo: str | None = None,
+) -> list[Exception | None]:
+    """``deliver_many`` for relays with no batched path: deliver each in turn.
+
+    Returns one entry per message — ``None`` once delivered, else that
+    part's exception; a failed part does not stop the rest.
+    """
+    results: list[Exception | None] = []
+    for message in messages:
+        try:
+            await relay.deliver(message, sender_key=sender_key, target_repo=target_repo)
+        except Exception as exc:  # noqa: BLE001 — reported per part
+            results.append(exc)
+        else:
+            results.append(None)
+    return results
+
+
 def atomic_write(path: Path, content: str) -> None:
     """Atomically write *content* to *path* using temp-file-then-replace.
 
@@ -105,6 +131,16 @@ class Relay(Protocol):
         target_repo: str | None = None,
     ) -> None: ...
 
+    # One entry per message: ``None`` if delivered, else that part's
+    # error.  A failed part does not stop the rest.
+    async def deliver_many(
+        self,
+        messages: Sequence[Message],
+        *,
+        sender_key: str = "",
+        target_repo: str | None = None,
+    ) -> list[Exception | None]: ...
+
     async def fetch(self, session_key: str) -> list[Message]: ...
 
     async def mark_read(self, session_key: str, ids: Sequence[uuid.UUID]) -> None: ...
@@ -121,6 +157,27 @@ class Relay(Protocol):
 
     async def get_user_unread_count(self, user: str) -> int: ...
 
+    # -- Messages (backlog) --
+
+    # Every unread message of *session_key* — TTY inbox, then user
+    # inbox — in pages of at most *page_size*.  Each page is consumed
+    # (acked or marked read) before it is yielded.
+    def drain(
+        self, session_key: str, page_size: int = DRAIN_PAGE_SIZE
+    ) -> AsyncIterator[list[Message]]: ...
+
+    # -- Messages (several sessions) --
+
+    # The server's own session and its companion's (DES-039), read
+    # together.  ``{session_key: (tty_unread, user_unread)}``.
+    async def fetch_inboxes(
+        self, session_keys: Sequence[str]
+    ) -> dict[str, tuple[list[Message], list[Message]]]: ...
+
+    async def get_combined_unread_summary(
+        self, session_keys: Sequence[str]
+    ) -> UnreadSummary: ...
+
     # -- Presence --
 
     async def update_session(self, session: UserSession) -> None: ...
@@ -137,7 +194,11 @@ class Relay(Protocol):
         self, repos: frozenset[str]
     ) -> list[UserSession]: ...
 
-    async def delete_session(self, session_key: str) -> None: ...
+    # ``logged_out``: the caller has already appended this session's wtmp
+    # logout, so the repo janitor must not write another for the delete.
+    async def delete_session(
+        self, session_key: str, *, logged_out: bool = False
+    ) -> None: ...
 
     # -- Session history (wtmp) --
 
@@ -177,6 +238,12 @@ class Relay(Protocol):
         self, user: str, session_id: str, name: str
     ) -> None: ...
 
+    # -- Diagnostics --
+
+    def stats(self) -> RelayStats:
+        """Snapshot of per-operation latency and counters (see relay_stats)."""
+        ...
+
     # -- Lifecycle --
 
     async def disconnect(self) -> None:
@@ -203,6 +270,15 @@ class DormantRelay:
     ) -> None:
         pass
 
+    async def deliver_many(
+        self,
+        messages: Sequence[Message],
+        *,
+        sender_key: str = "",  # noqa: ARG002
+        target_repo: str | None = None,  # noqa: ARG002
+    ) -> list[Exception | None]:
+        return [None] * len(messages)
+
     async def fetch(self, session_key: str) -> list[Message]:  # noqa: ARG002 — Protocol impl
         return []
 
@@ -221,6 +297,25 @@ class DormantRelay:
     async def get_user_unread_count(self, user: str) -> int:  # noqa: ARG002
         return 0
 
+    async def drain(
+        self,
+        session_key: str,  # noqa: ARG002
+        page_size: int = DRAIN_PAGE_SIZE,  # noqa: ARG002
+    ) -> AsyncIterator[list[Message]]:
+        return
+        yield
+
+    async def fetch_inboxes(
+        self, session_keys: Sequence[str]
+    ) -> dict[str, tuple[list[Message], list[Message]]]:
+        return {key: ([], []) for key in session_keys}
+
+    async def get_combined_unread_summary(
+        self,
+        session_keys: Sequence[str],  # noqa: ARG002
+    ) -> UnreadSummary:
+        return UnreadSummary()
+
     async def update_session(self, session: UserSession) -> None:
         pass
 
@@ -242,7 +337,9 @@ class DormantRelay:
     ) -> list[UserSession]:
         return []
 
-    async def delete_session(self, session_key: str) -> None:
+    async def delete_session(
+        self, session_key: str, *, logged_out: bool = False
+    ) -> None:
         pass
 
     async def append_wtmp(self, event: SessionEvent) -> None:
@@ -298,6 +395,9 @@ class DormantRelay:
     async def set_session_tty_hint(self, user: str, session_id: str, name: str) -> None:
         pass
 
+    def stats(self) -> RelayStats:
+        return RelayStats()
+
     async def disconnect(self) -> None:
         pass
 
@@ -384,6 +484,18 @@ class LocalRelay:
             with path.open("a") as f:
                 f.write(message.model_dump_json() + "\n")
 
+    async def deliver_many(
+        self,
+        messages: Sequence[Message],
+        *,
+        sender_key: str = "",
+        target_repo: str | None = None,
+    ) -> list[Exception | None]:
+        """Deliver each message in turn, reporting failures per part."""
+        return await deliver_in_turn(
+            self, messages, sender_key=sender_key, target_repo=target_repo
+        )
+
     async def fetch(self, session_key: str) -> list[Message]:
         """Get unread messages for a session, oldest first."""
         return [m for m in self._read_inbox(session_key) if not m.read]
@@ -441,6 +553,42 @@ class LocalRelay:
         """Count unread messages in the user's broadcast mailbox."""
         return len(await self.fetch_user_inbox(user))
 
+    # -- Messages (backlog) --
+
+    async def drain(
+        self, session_key: str, page_size: int = DRAIN_PAGE_SIZE
+    ) -> AsyncIterator[list[Message]]:
+        """Yield unread messages page by page, marking each page read."""
+        user = session_key.split(":")[0]
+        tty_unread = await self.fetch(session_key)
+        for start in range(0, len(tty_unread), page_size):
+            page = tty_unread[start : start + page_size]
+            await self.mark_read(session_key, [m.id for m in page])
+            yield page
+        user_unread = await self.fetch_user_inbox(user)
+        for start in range(0, len(user_unread), page_size):
+            page = user_unread[start : start + page_size]
+            await self.mark_read_user_inbox(user, [m.id for m in page])
+            yield page
+
+    # -- Messages (several sessions) --
+
+    async def fetch_inboxes(
+        self, session_keys: Sequence[str]
+    ) -> dict[str, tuple[list[Message], list[Message]]]:
+        """Get each session's TTY and user unread messages."""
+        return {
+            key: (await self.fetch(key), await self.fetch_user_inbox(key.split(":")[0]))
+            for key in session_keys
+        }
+
+    async def get_combined_unread_summary(
+        self, session_keys: Sequence[str]
+    ) -> UnreadSummary:
+        """Count unread messages across every session's inboxes."""
+        counts = [(await self.get_unread_summary(key)).count for key in session_keys]
+        return UnreadSummary(count=sum(counts))
+
     # -- Presence --
 
     async def update_session(self, session: UserSession) -> None:
@@ -501,7 +649,12 @@ class LocalRelay:
         """LocalRelay is single-repo — returns same as get_sessions()."""
         return await self.get_sessions()
 
-    async def delete_session(self, session_key: str) -> None:
+    async def delete_session(
+        self,
+        session_key: str,
+        *,
+        logged_out: bool = False,  # noqa: ARG002 — no watchers to tell
+    ) -> None:
         """Remove a session from storage."""
         self.delete_session_sync(session_key)
 
@@ -693,6 +846,10 @@ class LocalRelay:
         self._data_dir.mkdir(parents=True, exist_ok=True)
         self._sid_hint_path(user, session_id).write_text(name)
 
+    def stats(self) -> RelayStats:
+        """Empty snapshot — filesystem calls are not timed."""
+        return RelayStats()
+
     async def disconnect(self) -> None:
         """No-op — filesystem relay has no connection to release."""
 
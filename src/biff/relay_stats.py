@@ -0,0 +1,176 @@
+"""Per-operation relay statistics: latency histograms and outcome counters.
+
+:class:`NatsRelay` times every request that passes through its ``_tracked``
+choke point and records it here — one fixed log-scale histogram and one
+ok/timeout/error tally per operation name (``kv.get``, ``publish``, ...),
+plus counts of JetStream consumers created and deleted.  ``Relay.stats()``
+returns an immutable :class:`RelayStats` snapshot, which ``get_poll_status``
+and ``biff doctor`` render with :func:`format_relay_stats`.
+
+The buckets are fixed (powers of two from 0.25ms to 16s, then overflow) so
+snapshots from different processes and runs line up bucket for bucket, and
+recording is a bisect plus two increments — cheap enough for every request.
+Quantiles read from a histogram are bucket *upper bounds*: ``p99 <= 8ms``
+means 99% of calls finished within 8ms, not that one took exactly 8ms.
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+# Upper bounds (ms) of the latency buckets; one overflow bucket follows.
+BUCKET_BOUNDS_MS: tuple[float, ...] = tuple(2.0**k for k in range(-2, 15))
+# Requests slower than this (seconds) are logged with operation and subject.
+# Config key ``slow_op_threshold``; a healthy relay answers in milliseconds.
+DEFAULT_SLOW_OP_THRESHOLD = 1.0
+
+
+class Outcome(StrEnum):
+    """How a tracked request settled."""
+
+    OK = "ok"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+
+
+@dataclass(frozen=True)
+class OpStats:
+    """Snapshot of one operation's counters and latency histogram."""
+
+    ok: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    # len(BUCKET_BOUNDS_MS) + 1 counts; the last is the overflow bucket.
+    buckets: tuple[int, ...] = (0,) * (len(BUCKET_BOUNDS_MS) + 1)
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def count(self) -> int:
+        """Every settled call, whatever the outcome."""
+        return self.ok + self.timeouts + self.errors
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper bound of the bucket holding the *q* quantile (0 < q <= 1).
+
+        Falls in the overflow bucket -> the observed maximum, the only
+        bound known for it.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKET_BOUNDS_MS, self.buckets, strict=False):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max_ms
+
+
+@dataclass(frozen=True)
+class RelayStats:
+    """Immutable snapshot returned by ``Relay.stats()``.
+
+    Relays with nothing to time (local, SQLite, dormant) return the empty
+    default.
+    """
+
+    operations: Mapping[str, OpStats] = field(default_factory=dict[str, OpStats])
+    consumers_created: int = 0
+    consumers_deleted: int = 0
+    slow_ops: int = 0
+
+    @property
+    def total_ops(self) -> int:
+        return sum(op.count for op in self.operations.values())
+
+
+class _OpRecorder:
+    """Mutable per-operation accumulator behind :class:`OpStats`."""
+
+    __slots__ = ("buckets", "max_ms", "outcomes", "total_ms")
+
+    def __init__(self) -> None:
+        self.outcomes = dict.fromkeys(Outcome, 0)
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def freeze(self) -> OpStats:
+        return OpStats(
+            ok=self.outcomes[Outcome.OK],
+            timeouts=self.outcomes[Outcome.TIMEOUT],
+            errors=self.outcomes[Outcome.ERROR],
+            buckets=tuple(self.buckets),
+            total_ms=self.total_ms,
+            max_ms=self.max_ms,
+        )
+
+
+class StatsRecorder:
+    """Accumulates relay statistics; :meth:`snapshot` freezes them.
+
+    Single event loop, no awaits inside — no locking needed.
+    """
+
+    def __init__(self) -> None:
+        self._ops: dict[str, _OpRecorder] = {}
+        self.consumers_created = 0
+        self.consumers_deleted = 0
+        self.slow_ops = 0
+
+    def record(self, operation: str, seconds: float, outcome: Outcome) -> None:
+        """Count one settled request and file its latency."""
+        rec = self._ops.get(operation)
+        if rec is None:
+            rec = self._ops[operation] = _OpRecorder()
+        ms = seconds * 1000
+        rec.outcomes[outcome] += 1
+        rec.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        rec.total_ms += ms
+        rec.max_ms = max(rec.max_ms, ms)
+
+    def snapshot(self) -> RelayStats:
+        return RelayStats(
+            operations={name: rec.freeze() for name, rec in sorted(self._ops.items())},
+            consumers_created=self.consumers_created,
+            consumers_deleted=self.consumers_deleted,
+            slow_ops=self.slow_ops,
+        )
+
+
+def format_relay_stats(stats: RelayStats) -> str:
+    """Render a snapshot as a fixed-width table, one row per operation."""
+    if not stats.operations:
+        return "Relay stats: no operations recorded"
+    timeouts = sum(op.timeouts for op in stats.operations.values())
+    errors = sum(op.errors for op in stats.operations.values())
+    lines = [
+        (
+            f"Relay stats: {stats.total_ops} ops, {timeouts} timeouts, "
+            f"{errors} errors, {stats.slow_ops} slow; "
+            f"consumers +{stats.consumers_created}/-{stats.consumers_deleted}"
+        ),
+        (
+            f"  {'operation':<12} {'count':>6} {'p50':>8} {'p99':>8} {'max':>9}"
+            f" {'timeout':>7} {'error':>5}"
+        ),
+    ]
+    for name, op in stats.operations.items():
+        lines.append(
+            f"  {name:<12} {op.count:>6} {_ms(op.quantile_ms(0.5)):>8}"
+            f" {_ms(op.quantile_ms(0.99)):>8} {op.max_ms:>7.1f}ms"
+            f" {op.timeouts:>7} {op.errors:>5}"
+        )
+    return "\n".join(lines)
+
+
+def _ms(bound: float) -> str:
+    return f"<={bound:g}ms"
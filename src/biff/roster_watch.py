@@ -0,0 +1,276 @@
+"""Change signal for the ethos session roster.
+
+Companion registration (spec § 3.2) waits for ``ethos session roster``
+to name the human at the terminal.  Asking the CLI on every heartbeat
+costs a subprocess a minute for the life of a session that never gets
+a companion.  :class:`RosterWatch` instead wakes when the files under
+the ethos session directory change — inotify on Linux, a stat snapshot
+poll elsewhere — and the caller re-reads the roster only then.
+
+The files are only a change signal: their format stays ethos's
+business, and the roster itself is still read through the CLI.  A
+directory that does not exist yet (ethos not installed, or no session
+started) is watched for through its nearest existing ancestor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_POLL_INTERVAL = 2.0  # seconds between stat snapshots without inotify
+_SETTLE = 0.05  # let a burst of writes land before the roster is re-read
+
+# <sys/inotify.h>
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_DIR_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_ANCESTOR_MASK = _IN_CREATE | _IN_MOVED_TO | _IN_DELETE_SELF | _IN_MOVE_SELF
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of name
+
+
+def ethos_sessions_dir() -> Path:
+    """Where ``ethos iam`` records session state: ``~/.punt-labs/ethos/sessions/``."""
+    return Path.home() / ".punt-labs" / "ethos" / "sessions"
+
+
+def _nearest_existing(path: Path) -> Path:
+    for candidate in (path, *path.parents):
+        if candidate.is_dir():
+            return candidate
+    return Path(path.anchor)
+
+
+def _snapshot(directory: Path) -> frozenset[tuple[str, int, int]]:
+    """``(name, mtime_ns, size)`` for the directory and two levels below it."""
+    stamps: set[tuple[str, int, int]] = set()
+    with contextlib.suppress(OSError):
+        st = directory.stat()
+        stamps.add(("", st.st_mtime_ns, st.st_size))
+        for child in directory.iterdir():
+            st = child.stat()
+            stamps.add((child.name, st.st_mtime_ns, st.st_size))
+            if child.is_dir():
+                for leaf in child.iterdir():
+                    st = leaf.stat()
+                    name = f"{child.name}/{leaf.name}"
+                    stamps.add((name, st.st_mtime_ns, st.st_size))
+    return frozenset(stamps)
+
+
+class _Inotify:
+    """Minimal non-blocking inotify instance over libc (Linux only)."""
+
+    def __init__(self, libc: ctypes.CDLL, fd: int) -> None:
+        self._libc = libc
+        self.fd = fd
+
+    @classmethod
+    def open(cls) -> _Inotify | None:
+        """A new instance, or ``None`` where inotify is unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        return cls(libc, fd)
+
+    def add(self, path: Path, mask: int) -> int | None:
+        """Watch *path*; the same path always yields the same descriptor."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        return wd if wd >= 0 else None
+
+    def remove(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read(self) -> list[tuple[int, int, str]]:
+        """Drain queued events as ``(wd, mask, name)``."""
+        events: list[tuple[int, int, str]] = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except (BlockingIOError, OSError):
+                return events
+            offset = 0
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class RosterWatch:
+    """Wakes :meth:`wait` when files in the ethos session directory change."""
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        poll_interval: float = _POLL_INTERVAL,
+        use_inotify: bool = True,
+    ) -> None:
+        self.directory = directory
+        self._poll_interval = poll_interval
+        self._use_inotify = use_inotify
+        self._changed = asyncio.Event()
+        self._inotify: _Inotify | None = None
+        self._watches: dict[int, Path] = {}
+        self._anchor: int | None = None  # ancestor watch while the dir is missing
+        self._poller: asyncio.Task[None] | None = None
+
+    @property
+    def mode(self) -> str:
+        """``"inotify"`` or ``"poll"``; ``""`` before :meth:`start`."""
+        if self._inotify is not None:
+            return "inotify"
+        return "poll" if self._poller is not None else ""
+
+    def start(self) -> None:
+        """Begin watching; call from a running event loop."""
+        inotify = _Inotify.open() if self._use_inotify else None
+        if inotify is not None:
+            try:
+                asyncio.get_running_loop().add_reader(inotify.fd, self._on_readable)
+            except (NotImplementedError, OSError):
+                inotify.close()
+                inotify = None
+        if inotify is None:
+            self._poller = asyncio.create_task(self._poll_loop())
+            return
+        self._inotify = inotify
+        self._arm()
+
+    def stop(self) -> None:
+        if self._inotify is not None:
+            with contextlib.suppress(RuntimeError, OSError):
+                asyncio.get_running_loop().remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait for a change; ``False`` when *timeout* passes without one.
+
+        A burst of writes is coalesced into one wake-up.
+        """
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except TimeoutError:
+            return False
+        await asyncio.sleep(_SETTLE)
+        self._changed.clear()
+        return True
+
+    # -- inotify --
+
+    def _arm(self) -> bool:
+        """Watch the directory (and its subdirectories), or its nearest ancestor.
+
+        Idempotent.  Returns ``True`` when the directory itself is watched.
+        """
+        assert self._inotify is not None  # noqa: S101 — only armed with inotify
+        nearest = _nearest_existing(self.directory)
+        if nearest != self.directory:
+            wd = self._inotify.add(nearest, _ANCESTOR_MASK)
+            if wd is not None and wd != self._anchor:
+                self._drop_anchor()
+                self._anchor = wd
+                self._watches[wd] = nearest
+            return False
+        self._drop_anchor()
+        targets = [self.directory]
+        with contextlib.suppress(OSError):
+            targets += [p for p in self.directory.iterdir() if p.is_dir()]
+        for path in targets:
+            wd = self._inotify.add(path, _DIR_MASK)
+            if wd is not None:
+                self._watches[wd] = path
+        return True
+
+    def _drop_anchor(self) -> None:
+        if self._anchor is None or self._inotify is None:
+            return
+        self._watches.pop(self._anchor, None)
+        with contextlib.suppress(OSError):
+            self._inotify.remove(self._anchor)
+        self._anchor = None
+
+    def _on_readable(self) -> None:
+        if self._inotify is None:
+            return
+        changed = rearm = False
+        for wd, mask, name in self._inotify.read():
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                if wd == self._anchor:
+                    self._anchor = None
+                rearm = True
+                continue
+            path = self._watches.get(wd)
+            if path is None:
+                continue
+            if wd == self._anchor:
+                # Only the next path component toward the directory matters.
+                rearm = rearm or (path / name) in (
+                    self.directory,
+                    *self.directory.parents,
+                )
+                continue
+            changed = True
+            rearm = rearm or mask & (_IN_CREATE | _IN_MOVED_TO | _IN_DELETE_SELF) != 0
+        if rearm:
+            was_watching = self._anchor is None
+            if self._arm() and not was_watching:
+                changed = True  # the directory appeared
+        if changed:
+            self._changed.set()
+
+    # -- polling fallback --
+
+    async def _poll_loop(self) -> None:
+        seen = _snapshot(self.directory)
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            current = _snapshot(self.directory)
+            if current != seen:
+                seen = current
+                self._changed.set()
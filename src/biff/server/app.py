@@ -11,6 +11,7 @@ import logging
 import signal
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
@@ -18,13 +19,24 @@ from fastmcp import FastMCP
 from fastmcp.server.middleware import CallNext, Middleware, MiddlewareContext
 
 from biff._stdlib import active_dir, remove_active_session, sentinel_dir
-from biff.models import SessionEvent, UserSession
+from biff.models import SessionBeat, SessionEvent, UserSession
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from mcp.types import InitializeRequest, InitializeResult
 
-from biff.nats_relay import RESERVED_KV_NAMESPACES, NatsRelay
+    from biff.session_watch import RepoWatch
+
+from biff.nats_relay import (
+    BEAT_KV_SUFFIX,
+    LOGGED_OUT_MARKER,
+    RESERVED_KV_NAMESPACES,
+    NatsRelay,
+)
 from biff.relay import PRESENCE_LIVENESS_SECONDS, LocalRelay, Relay
+from biff.roster_watch import RosterWatch, ethos_sessions_dir
+from biff.server.janitor import RENEW_INTERVAL_SECONDS
 from biff.server.state import CompanionSession, ServerState
 from biff.server.tools import register_all_tools
 from biff.server.tools._descriptions import (
@@ -40,6 +52,14 @@ from biff.tty import build_session_key, claim_tty_name, validate_reclaimable_nam
 
 logger = logging.getLogger(__name__)
 
+# Heartbeat cadence while the poller naps: stretched toward the presence
+# liveness window, leaving a margin for one slow write and modest clock
+# skew between machines.  A tool call wakes the poller and touches
+# ``last_active`` itself, so the stretch never outlives the nap.
+_NAP_HEARTBEAT_INTERVAL = PRESENCE_LIVENESS_SECONDS - 20.0
+# Safety-net re-read of the ethos roster when its files never change.
+_ROSTER_RECHECK_SECONDS = 600.0
+
 
 class _SessionCaptureMiddleware(Middleware):
     """Capture the MCP session during ``initialize``.
@@ -225,6 +245,7 @@ async def _reap_sentinels(state: ServerState) -> None:
 
     1. Fetch the session from KV (still present — 3-day TTL)
     2. Append a wtmp logout event with ``last_active`` as the timestamp
+       (repo janitor only — see ``_reap_dead_session``)
     3. Delete the KV entry
     4. Remove the sentinel file
 
@@ -262,6 +283,11 @@ async def _reap_sentinels(state: ServerState) -> None:
 async def _reap_dead_session(state: ServerState, session_key: str) -> bool:
     """Log out, release the alias, and delete the KV row for a dead session.
 
+    Only the repo janitor writes the logout here, and marks the delete as
+    logged out.  Any other server deletes the row plainly and the
+    janitor's KV watch writes the logout from its mirror — sentinels are
+    per host, the janitor may be on another one.
+
     Returns ``True`` when the KV row was deleted (the caller should remove the
     sentinel), ``False`` when the delete failed (keep the sentinel to retry).
     """
@@ -269,10 +295,12 @@ async def _reap_dead_session(state: ServerState, session_key: str) -> bool:
     # present (3-day TTL), so we can fetch session data for an accurate
     # last-seen timestamp.
     session: UserSession | None = None
+    logged_out = False
     try:
         session = await state.relay.get_session(session_key)
-        if session is not None:
+        if session is not None and state.janitor.is_leader:
             await state.relay.append_wtmp(_build_logout_event(session_key, session))
+            logged_out = True
     except Exception:  # noqa: BLE001
         logger.warning("Failed to write sentinel logout for %s", session_key)
     # Release TTY name reservation before deleting session (DES-035).
@@ -287,7 +315,7 @@ async def _reap_dead_session(state: ServerState, session_key: str) -> bool:
                 exc_info=True,
             )
     try:
-        await state.relay.delete_session(session_key)
+        await state.relay.delete_session(session_key, logged_out=logged_out)
     except Exception:  # noqa: BLE001 — relay errors vary by backend
         logger.warning("Failed to reap sentinel for %s", session_key, exc_info=True)
         return False
@@ -307,6 +335,53 @@ async def _reap_loop(
         await _reap_sentinels(state)
 
 
+# The janitor re-checks for orphaned logins this often.  Sessions killed
+# without a sentinel (SIGKILL, OOM) leave one each; every server start
+# used to sweep for them, now only the janitor does.
+_ORPHAN_SWEEP_SECONDS = 300.0
+
+# Silence after which a periodic sweep treats a session as dead.  The
+# startup sweep keeps the presence liveness window, as it always has; a
+# sweep that runs all day must not log out a live session whose napping
+# heartbeat (a few seconds inside that window) hit one slow write.
+_ORPHAN_STALE_SECONDS = 1800.0
+
+
+async def _janitor_loop(
+    state: ServerState,
+    shutdown: asyncio.Event,
+    *,
+    interval: float = RENEW_INTERVAL_SECONDS,
+) -> None:
+    """Background task: hold or contend for the repo's janitor lease.
+
+    Renews every *interval* seconds.  A server that takes the lease over
+    (its holder exited or died) sweeps for orphaned logins at once, and
+    the holder sweeps again every ``_ORPHAN_SWEEP_SECONDS`` — counting
+    only sessions silent for ``_ORPHAN_STALE_SECONDS`` as dead.
+    """
+    loop = asyncio.get_running_loop()
+    last_sweep = loop.time()
+    while not shutdown.is_set():
+        try:
+            await asyncio.wait_for(shutdown.wait(), timeout=interval)
+            return  # Shutdown requested
+        except TimeoutError:
+            pass
+        acquired = await state.janitor.renew()
+        due = loop.time() - last_sweep >= _ORPHAN_SWEEP_SECONDS
+        if acquired or (state.janitor.is_leader and due):
+            last_sweep = loop.time()
+            try:
+                sessions = await state.relay.get_sessions()
+            except Exception:  # noqa: BLE001 — relay errors vary by backend
+                logger.debug("Orphan sweep skipped", exc_info=True)
+                continue
+            await _close_orphaned_logins(
+                state, sessions, stale_after=_ORPHAN_STALE_SECONDS
+            )
+
+
 async def _poll_companion_registration(state: ServerState) -> None:
     """Attempt companion registration from the ethos roster.
 
@@ -375,40 +450,86 @@ async def _refresh_org_repos(state: ServerState) -> None:
         logger.debug("Org discovery refresh failed", exc_info=True)
 
 
+async def _companion_loop(
+    state: ServerState,
+    shutdown: asyncio.Event,
+    *,
+    sessions_dir: Path | None = None,
+    first_check: float = 60.0,
+    recheck: float = _ROSTER_RECHECK_SECONDS,
+) -> None:
+    """Register the companion when the ethos roster names one (spec § 3.2).
+
+    Polling ``ethos session roster`` every heartbeat cost a subprocess
+    a minute for the life of a session that never gets a companion.
+    The roster is now re-read when a :class:`RosterWatch` on the ethos
+    session directory sees a change, so a companion registers within
+    milliseconds of the roster appearing.  Without a change it is read
+    once at *first_check* (one heartbeat interval, as before — the
+    roster is not ready at startup on ``claude --resume``), then every
+    *recheck* seconds as a safety net, and after a failed registration
+    at *first_check* again.
+    """
+    watch = RosterWatch(sessions_dir or ethos_sessions_dir())
+    watch.start()
+    stop = asyncio.create_task(shutdown.wait())
+    wait = first_check
+    try:
+        while state.companion is None:
+            change = asyncio.create_task(watch.wait())
+            await asyncio.wait(
+                {stop, change}, timeout=wait, return_when=asyncio.FIRST_COMPLETED
+            )
+            change.cancel()
+            if shutdown.is_set():
+                return
+            wait = recheck
+            try:
+                await _poll_companion_registration(state)
+            except Exception:  # noqa: BLE001
+                logger.warning("Companion registration poll failed", exc_info=True)
+                wait = first_check
+    finally:
+        stop.cancel()
+        watch.stop()
+
+
 async def _heartbeat_loop(
-    state: ServerState, shutdown: asyncio.Event, *, interval: float = 60.0
+    state: ServerState,
+    shutdown: asyncio.Event,
+    *,
+    interval: float = 60.0,
+    nap_interval: float = _NAP_HEARTBEAT_INTERVAL,
 ) -> None:
     """Periodic heartbeat to keep this session alive in the relay.
 
     Each ``heartbeat()`` call updates ``last_active`` and — for NATS KV —
     resets the key's TTL.  When the process sleeps (laptop lid closed) or
     dies (SIGKILL), heartbeats stop and the relay eventually expires the
-    session.
+    session.  While the poller naps, ticks are *nap_interval* apart
+    instead — a napping server is idle, and the liveness window only
+    needs a beat every ``PRESENCE_LIVENESS_SECONDS``.
 
-    On every tick while ``state.companion`` is ``None``, polls the
-    ethos roster for the human identity (spec § 3.2). The poll cost
-    is bounded by one subprocess call per ``interval`` and the
-    subprocess runs on a worker thread so it never blocks the event
-    loop (spec invariant 11).
+    Companion registration is not polled here: :func:`_companion_loop`
+    re-reads the ethos roster when its files change.
     """
     while not shutdown.is_set():
+        wait = max(interval, nap_interval) if state.activity.napping else interval
         try:
-            await asyncio.wait_for(shutdown.wait(), timeout=interval)
+            await asyncio.wait_for(shutdown.wait(), timeout=wait)
             return  # Shutdown requested
         except TimeoutError:
             pass
         try:
-            await state.relay.heartbeat(state.session_key)
+            # The session cache folds pending tool-call touches into this
+            # write; the relay heartbeat covers a cache that holds nothing.
+            if not await state.session_cache.heartbeat():
+                await state.relay.heartbeat(state.session_key)
         except Exception:  # noqa: BLE001 — relay errors vary by backend
             # DEBUG, not WARNING: the loop ticks every 60s, so a NATS wedge
             # would spam a warning per tick.  The relay's _ConnectionHealth
             # logs the wedge onset/recovery once — it is the single source.
             logger.debug("Heartbeat failed", exc_info=True)
-        if state.companion is None:
-            try:
-                await _poll_companion_registration(state)
-            except Exception:  # noqa: BLE001
-                logger.warning("Companion registration poll failed", exc_info=True)
         if state.companion_session_key:
             try:
                 await state.relay.heartbeat(state.companion_session_key)
@@ -424,15 +545,26 @@ def _kv_key_to_session_key(kv_key: str, repo_name: str) -> str | None:
     different repo, or is a non-session key (wall, encryption keys).
     Structural filtering per DES-016.
     """
-    parts = kv_key.split(".", maxsplit=2)
-    if len(parts) != 3:
+    if not _is_session_kv_key(kv_key):
         return None
-    if parts[0] != repo_name:
+    repo, user, tty = kv_key.split(".", maxsplit=2)
+    if repo != repo_name:
         return None
+    return f"{user}:{tty}"
+
+
+def _is_session_kv_key(kv_key: str) -> bool:
+    """Whether *kv_key* is a ``{repo}.{user}.{tty}`` session key in any repo.
+
+    The presence mirror holds every visible repo's sessions (``/who``
+    spans peers and org repos), so this is the repo-agnostic half of
+    :func:`_kv_key_to_session_key`.
+    """
+    parts = kv_key.split(".")
+    if len(parts) != 3:
+        return False  # wall, or a session's ``.beat`` key
     # Skip reserved KV namespaces (encryption keys — DES-016).
-    if parts[1] in RESERVED_KV_NAMESPACES:
-        return None
-    return f"{parts[1]}:{parts[2]}"
+    return parts[1] not in RESERVED_KV_NAMESPACES
 
 
 def _build_logout_event(session_key: str, cached: UserSession) -> SessionEvent:
@@ -451,20 +583,55 @@ def _build_logout_event(session_key: str, cached: UserSession) -> SessionEvent:
     )
 
 
+@dataclass
+class _WatchCursor:
+    """Where the last KV watch cycle stopped, so the next one can resume.
+
+    Survives across ``_run_kv_watch`` cycles inside ``_kv_watcher_loop``.
+    A restart after an error resumes at ``revision + 1`` instead of
+    replaying the whole snapshot — on a flaky link that replay would run
+    on every reconnect.
+    """
+
+    scope: frozenset[str] = frozenset()
+    revision: int = 0  # last KV revision handled (0: take a snapshot)
+
+
 async def _run_kv_watch(
     relay: NatsRelay,
     state: ServerState,
     shutdown: asyncio.Event,
-    cache: dict[str, UserSession],
+    cursor: _WatchCursor | None = None,
 ) -> None:
     """Run a single KV watch cycle until shutdown.
 
     Stays alive during napping — the NATS connection is no longer
     released on idle.  This ensures wall changes and session events
     are detected in real-time regardless of activity state.
+
+    Feeds the relay's presence mirror: the snapshot-done marker makes it
+    authoritative for presence reads, and leaving this cycle for any
+    reason (shutdown, error, client replacement) invalidates it so reads
+    fall back to live queries until the next cycle's snapshot drains.
+
+    Watches only ``state.visible_repos`` — the bucket is shared by every
+    repo on the server.  When ``_refresh_org_repos`` changes that set the
+    cycle ends and ``_kv_watcher_loop`` re-scopes with a fresh watch.
+
+    With a *cursor* from an earlier cycle over the same scope, the watch
+    resumes after the last revision that cycle handled, and the mirror
+    keeps its entries instead of re-snapshotting.
     """
-    kv = await relay.get_kv()
-    watcher = await kv.watchall()  # pyright: ignore[reportUnknownMemberType]
+    mirror = relay.presence
+    scope = _watch_scope(state)
+    await relay.get_kv()  # connect first, so the generation below is its own
+    # The watcher's subscription lives on this client.  A wedge teardown or
+    # give-up close dials a fresh one and orphans it — updates() then times
+    # out forever while the mirror silently goes stale, so end the cycle and
+    # let _kv_watcher_loop start a new watch on the live client.
+    generation = relay.connection_generation
+    watcher = await _open_watch(relay, scope, cursor)
+    mirror.begin_snapshot(scope, resume=watcher.resumed)
     try:
         # Use watcher.updates() instead of ``async for`` because nats.py's
         # __anext__ raises StopAsyncIteration on the snapshot-done None
@@ -472,11 +639,18 @@ async def _run_kv_watch(
         # where notifications can be missed before the restart loop
         # re-creates the watcher.  See biff-udp.
         while not shutdown.is_set():
+            if relay.connection_generation != generation:
+                logger.debug("KV watcher client replaced, restarting watch")
+                return
+            if _watch_scope(state) != scope:
+                logger.debug("Visible repos changed, re-scoping KV watch")
+                return
             try:
-                entry = await watcher.updates(timeout=5.0)  # type: ignore[no-untyped-call]  # pyright: ignore[reportUnknownMemberType]
+                entry = await watcher.updates(timeout=5.0)
             except TimeoutError:
                 continue  # No updates within timeout window
             if entry is None:
+                mirror.end_snapshot()
                 continue  # Snapshot-done marker
             key = str(entry.key)  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType,reportAttributeAccessIssue]
             if key == NatsRelay.wall_kv_key(state.config.repo_name):
@@ -486,45 +660,70 @@ async def _run_kv_watch(
                 # is unreliable.  The poller handles notification delivery
                 # from its own coroutine context.
                 state.activity.wake()
-                continue
-            await _handle_kv_entry(entry, relay, state, cache)
+            else:
+                await _handle_kv_entry(entry, relay, state)
+            # Entries arrive in revision order, so everything up to here
+            # has been handled (session_watch).
+            revision = int(entry.revision or 0)  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType,reportAttributeAccessIssue]
+            mirror.advance(revision)
+            if cursor is not None:
+                cursor.revision = max(cursor.revision, revision)
     finally:
-        await watcher.stop()  # type: ignore[no-untyped-call]  # pyright: ignore[reportUnknownMemberType]
+        mirror.invalidate()
+        await watcher.stop()
+
+
+async def _open_watch(
+    relay: NatsRelay, scope: frozenset[str], cursor: _WatchCursor | None
+) -> RepoWatch:
+    """Start a watch over *scope*, resuming from *cursor* if it still can."""
+    after = cursor.revision if cursor is not None and cursor.scope == scope else 0
+    watcher = await relay.watch_repos(scope, after=after)
+    if watcher.resumed:
+        logger.debug("KV watch resumed after revision %d", after)
+    if cursor is not None:
+        cursor.scope = scope
+        if not watcher.resumed:
+            cursor.revision = 0
+    return watcher
+
+
+def _watch_scope(state: ServerState) -> frozenset[str]:
+    """Repos whose KV keys the watch covers: everything ``/who`` can show."""
+    return frozenset(repo for repo in state.visible_repos if repo)
 
 
 async def _kv_watcher_loop(
     state: ServerState,
     shutdown: asyncio.Event,
 ) -> None:
-    """Watch KV changes for wall updates and session events (wtmp).
+    """Watch KV changes for wall updates, presence, and session events (wtmp).
 
     Handles:
     - **Wall changes**: detected in ``_run_kv_watch()`` when the KV key
       matches ``NatsRelay.wall_kv_key(state.config.repo_name)``.  Wakes
       the poller from napping so the next 2s tick detects the change and
       fires the MCP notification from its own coroutine context.
+    - **Presence**: every session put/delete is applied to the relay's
+      presence mirror, which serves ``/who``, ``/finger`` and
+      ``get_session`` without a NATS round trip while the watch is live.
     - **Session logout events**: for *other* sessions that disappear
-      via TTL expiry or crash (no graceful shutdown).  Our own session's
-      logout is written explicitly by ``_append_logout_event()`` during
-      graceful shutdown.
+      via TTL expiry, crash, or another server's sentinel reap.  Only the
+      repo janitor writes these, and only for deletes not marked
+      ``LOGGED_OUT_MARKER`` — a graceful shutdown, CLI session, or
+      janitor reap writes its logout itself before the delete.
 
     The NATS connection stays alive during napping so wall changes
     arrive in real-time regardless of activity state.
-
-    **Duplicate risk**: If multiple servers are running, each may
-    observe the same KV delete and write a logout event.  This is
-    acceptable — ``/last`` pairs events by session_key, so extra
-    logouts are harmless (they won't match a login).
     """
     relay = state.relay
     if not isinstance(relay, NatsRelay):
         return  # LocalRelay does not support KV watches
 
-    cache: dict[str, UserSession] = {}
-
+    cursor = _WatchCursor()
     while not shutdown.is_set():
         try:
-            await _run_kv_watch(relay, state, shutdown, cache)
+            await _run_kv_watch(relay, state, shutdown, cursor)
         except asyncio.CancelledError:
             return
         except Exception:  # noqa: BLE001
@@ -537,47 +736,76 @@ async def _handle_kv_entry(
     entry: object,  # nats KeyValue.Entry (untyped)
     relay: NatsRelay,
     state: ServerState,
-    cache: dict[str, UserSession],
 ) -> None:
-    """Route a single KV watch entry to the appropriate handler."""
+    """Route a single KV watch entry to the presence mirror and logout handler."""
     key = str(entry.key)  # type: ignore[attr-defined]  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType,reportAttributeAccessIssue]
-    session_key = _kv_key_to_session_key(key, state.config.repo_name)
-    if session_key is None:
-        return
-
     op = entry.operation  # type: ignore[attr-defined]  # pyright: ignore[reportUnknownMemberType,reportAttributeAccessIssue]
     val = entry.value  # type: ignore[attr-defined]  # pyright: ignore[reportUnknownMemberType,reportAttributeAccessIssue]
+    revision = int(entry.revision or 0)  # type: ignore[attr-defined]  # pyright: ignore[reportUnknownMemberType,reportUnknownArgumentType,reportAttributeAccessIssue]
+    profile_key = key.removesuffix(BEAT_KV_SUFFIX)
+    if profile_key != key and _is_session_kv_key(profile_key):
+        _handle_beat_entry(relay, profile_key, op, val, revision)  # pyright: ignore[reportUnknownArgumentType]
+        return
+    if not _is_session_kv_key(key):
+        return
+
     if op is None and val is not None:
-        # PUT — cache the session data
+        # PUT — mirror the session data
         try:
             session = UserSession.model_validate_json(
                 val  # pyright: ignore[reportUnknownArgumentType]
             )
-            cache[session_key] = session
         except Exception:  # noqa: BLE001
             logger.debug("Failed to parse KV entry %s", key)
+            return
+        relay.presence.apply_put(key, session, revision)
     elif op in ("DEL", "PURGE"):
-        await _handle_kv_delete(relay, state, cache, session_key)
+        removed = relay.presence.apply_delete(key, revision)
+        session_key = _kv_key_to_session_key(key, state.config.repo_name)
+        if session_key is not None and val != LOGGED_OUT_MARKER:
+            await _handle_kv_delete(relay, state, removed, session_key)
+
+
+def _handle_beat_entry(
+    relay: NatsRelay,
+    kv_key: str,
+    op: str | None,
+    val: bytes | None,
+    revision: int,
+) -> None:
+    """Mirror a session's ``.beat`` entry; its delete is never a logout."""
+    if op is None and val is not None:
+        try:
+            beat = SessionBeat.model_validate_json(val)
+        except Exception:  # noqa: BLE001
+            logger.debug("Failed to parse KV entry %s%s", kv_key, BEAT_KV_SUFFIX)
+            return
+        relay.presence.apply_beat(kv_key, beat, revision)
+    elif op in ("DEL", "PURGE"):
+        relay.presence.apply_beat_delete(kv_key, revision)
 
 
 async def _handle_kv_delete(
     relay: NatsRelay,
     state: ServerState,
-    cache: dict[str, UserSession],
+    cached: UserSession | None,
     session_key: str,
 ) -> None:
     """Handle a KV delete event — append logout for crashed/expired sessions.
 
+    *cached* is the session the presence mirror held for the deleted key.
     Skips our own session key because graceful shutdown writes the
     logout event explicitly in ``_append_logout_event()`` before the
-    watcher is stopped.  For *other* sessions (TTL expiry, crash),
-    any running server can write the logout on their behalf.
+    watcher is stopped.  For *other* sessions (TTL expiry, crash,
+    sentinel reaped by a non-janitor), the repo janitor writes the
+    logout on their behalf; every other server's watch only mirrors.
     """
     if session_key == state.session_key:
         return  # Our own shutdown writes logout explicitly
     if session_key == state.companion_session_key:
         return  # Companion shutdown writes logout explicitly
-    cached = cache.pop(session_key, None)
+    if not state.janitor.is_leader:
+        return
     if cached is None:
         logger.debug(
             "No cached session for %s on DEL, skipping wtmp",
@@ -594,6 +822,18 @@ async def _handle_kv_delete(
         )
 
 
+async def _refresh_github_identity() -> None:
+    """Refresh a stale cached ``gh`` identity off the startup path.
+
+    ``load_mcp_config`` serves the cached login without spawning a
+    refresh; the ``gh`` call runs here via ``asyncio.to_thread`` so its
+    timeout cannot stall the event loop.
+    """
+    from biff.config import refresh_stale_github_identity  # noqa: PLC0415
+
+    await asyncio.to_thread(refresh_stale_github_identity)
+
+
 async def _shutdown_tasks(
     shutdown: asyncio.Event, tasks: list[asyncio.Task[None]], *, timeout: float = 5.0
 ) -> None:
@@ -742,18 +982,21 @@ def _find_orphaned_logins(
 async def _close_orphaned_logins(
     state: ServerState,
     active_sessions: list[UserSession],
+    *,
+    stale_after: float = PRESENCE_LIVENESS_SECONDS,
 ) -> None:
     """Write retroactive logout events for sessions that died without cleanup.
 
-    At startup, fetches recent wtmp events and identifies login events
-    with no matching logout and no active KV session.  For each orphan,
-    writes a logout event with the session's ``last_active`` timestamp
-    as the logout time (last-seen heuristic).  Falls back to the login
-    timestamp if the session is no longer in KV.
+    Run by the repo janitor at startup, on taking the lease, and every
+    ``_ORPHAN_SWEEP_SECONDS``.  Fetches recent wtmp events and identifies
+    login events with no matching logout and no active KV session.  For
+    each orphan, writes a logout event with the session's ``last_active``
+    timestamp as the logout time (last-seen heuristic).  Falls back to the
+    login timestamp if the session is no longer in KV.
 
     This is the primary logout mechanism — MCP subprocess death prevents
-    async cleanup in the ``finally`` block, so orphan detection on the
-    next startup is the only reliable path.
+    async cleanup in the ``finally`` block, so orphan detection by the
+    janitor is the only reliable path.
     """
     try:
         events = await state.relay.get_wtmp(count=100)
@@ -764,9 +1007,9 @@ async def _close_orphaned_logins(
         return
 
     # Build a map of session_key → last_active from current KV sessions.
-    # Sessions whose last heartbeat is outside the liveness window (older
-    # than 2 heartbeat intervals) are treated as dead — their KV entry
-    # just hasn't expired yet.
+    # Sessions whose last heartbeat is older than *stale_after* (by default
+    # the liveness window, 2 heartbeat intervals) are treated as dead —
+    # their KV entry just hasn't expired yet.
     now = datetime.now(UTC)
     last_seen: dict[str, datetime] = {}
     active_keys: set[str] = {state.session_key}
@@ -775,7 +1018,7 @@ async def _close_orphaned_logins(
     for session in active_sessions:
         key = build_session_key(session.user, session.tty)
         last_seen[key] = session.last_active
-        if session.is_live(now=now, ttl_seconds=PRESENCE_LIVENESS_SECONDS):
+        if session.is_live(now=now, ttl_seconds=stale_after):
             active_keys.add(key)
     orphaned = _find_orphaned_logins(events, active_keys)
 
@@ -803,7 +1046,11 @@ async def _close_orphaned_logins(
 
 
 async def _release_relay(state: ServerState) -> None:
-    """Release TTY name, delete session, and close the relay."""
+    """Release TTY name, delete session, and close the relay.
+
+    Runs after ``_lifespan_cleanup`` wrote the logouts, so the deletes are
+    marked logged out for the janitor's watch.
+    """
     tty_name = get_tty_name()
     if tty_name:
         try:
@@ -811,7 +1058,7 @@ async def _release_relay(state: ServerState) -> None:
         except Exception:  # noqa: BLE001
             logger.warning("Failed to release TTY name %s", tty_name, exc_info=True)
     try:
-        await state.relay.delete_session(state.session_key)
+        await state.relay.delete_session(state.session_key, logged_out=True)
     except Exception:
         logger.exception("Failed to delete session %s", state.session_key)
     # Release companion session (DES-039).
@@ -828,13 +1075,16 @@ async def _release_relay(state: ServerState) -> None:
                     exc_info=True,
                 )
         try:
-            await state.relay.delete_session(state.companion.session_key)
+            await state.relay.delete_session(
+                state.companion.session_key, logged_out=True
+            )
         except Exception:  # noqa: BLE001
             logger.warning(
                 "Failed to delete companion session %s",
                 state.companion.session_key,
                 exc_info=True,
             )
+    await state.janitor.release()
     try:
         await state.relay.close()
     except Exception:  # noqa: BLE001
@@ -853,6 +1103,8 @@ async def _lifespan_cleanup(
     after Claude Code closes stdio, so the logout publish
     must happen while the NATS connection is still healthy.
     """
+    # A debounced session write must not race the logout / row delete.
+    await state.session_cache.close()
     if state.owns_relay:
         await _append_logout_event(state)
         await _append_companion_logout_event(state)
@@ -911,6 +1163,22 @@ async def _register_companion(state: ServerState) -> None:
     )
 
 
+async def _startup_wtmp(state: ServerState, tty_name: str) -> None:
+    """Write our login event and do the janitor's startup bookkeeping."""
+    # Contend for the repo's janitor lease before any logout bookkeeping:
+    # only the holder writes logouts for other sessions.
+    await state.janitor.renew()
+
+    # Reap sentinels FIRST — writes logout events for sessions that
+    # received SIGTERM/SIGINT (the signal handler wrote a sentinel).
+    # Then re-fetch sessions so orphan detection has clean KV state.
+    await _reap_sentinels(state)
+    await _append_login_event(state, tty_name)
+    if state.janitor.is_leader:
+        sessions = await state.relay.get_sessions()
+        await _close_orphaned_logins(state, sessions)
+
+
 @asynccontextmanager
 async def _active_lifespan(
     mcp: FastMCP[ServerState], state: ServerState
@@ -1015,14 +1283,13 @@ async def _active_lifespan(
     await refresh_read_messages(mcp, state)
     await refresh_wall(mcp, state)
 
-    # Reap sentinels FIRST — writes logout events for sessions that
-    # received SIGTERM/SIGINT (the signal handler wrote a sentinel).
-    # Then re-fetch sessions so orphan detection has clean KV state.
-    await _reap_sentinels(state)
-    sessions = await state.relay.get_sessions()
+    await _startup_wtmp(state, final_name)
 
-    await _append_login_event(state, final_name)
-    await _close_orphaned_logins(state, sessions)
+    # The poller asks for the unread summary every tick; let NATS answer
+    # from push-maintained counters instead of two stream_info calls per
+    # session per tick.
+    if isinstance(state.relay, NatsRelay):
+        state.relay.enable_unread_counters()
 
     shutdown = asyncio.Event()
     poll_interval = state.config.poll_interval
@@ -1036,14 +1303,14 @@ async def _active_lifespan(
     reaper = asyncio.create_task(_reap_loop(state, shutdown))
     heartbeat = asyncio.create_task(_heartbeat_loop(state, shutdown))
     watcher = asyncio.create_task(_kv_watcher_loop(state, shutdown))
+    janitor = asyncio.create_task(_janitor_loop(state, shutdown))
+    identity = asyncio.create_task(_refresh_github_identity())
+    companion = asyncio.create_task(_companion_loop(state, shutdown))
+    tasks = [poller, reaper, heartbeat, watcher, janitor, identity, companion]
     try:
         yield state
     finally:
-        await _lifespan_cleanup(
-            state,
-            shutdown,
-            [t for t in [poller, reaper, heartbeat, watcher] if t is not None],
-        )
+        await _lifespan_cleanup(state, shutdown, [t for t in tasks if t is not None])
 
 
 def create_server(state: ServerState) -> FastMCP[ServerState]:
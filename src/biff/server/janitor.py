@@ -0,0 +1,93 @@
+"""Per-repo janitor lease: one server writes logouts on others' behalf.
+
+Every MCP server in a repo used to close orphaned logins at startup
+(a ``get_wtmp(100)`` each), and every server's KV watch wrote a logout
+when another session's row disappeared — ten servers, ten logouts for
+one session end.  The janitor is elected instead: servers race for a
+``{repo}.janitor`` lease in the names bucket (see
+:meth:`~biff.nats_relay.NatsRelay.claim_janitor_lease`), and only the
+holder closes orphans, writes the logout for a reaped sentinel, and
+writes the logout for a session delete that does not already carry
+one.  Every server keeps renewing, so when the holder exits (it
+releases the lease) or dies (the lease expires) another takes over on
+its next tick.
+
+Relays without the lease (local file, SQLite) have no KV watch and no
+cross-host peers; every server there is its own janitor, as before.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from biff.nats_relay import NatsRelay
+
+if TYPE_CHECKING:
+    from biff.relay import Relay
+
+logger = logging.getLogger(__name__)
+
+# How long a claimed lease lasts without renewal.  Bounds how long a
+# crashed janitor's repo goes without one.
+LEASE_TTL_SECONDS = 30.0
+
+# Renewal cadence: three chances to renew before the lease lapses.
+RENEW_INTERVAL_SECONDS = LEASE_TTL_SECONDS / 3
+
+
+class Janitor:
+    """This server's standing in its repo's janitor election.
+
+    Companion to the frozen ``ServerState`` (like ``SessionCache``).
+    Starts as a follower; :meth:`renew` claims or renews the lease.
+    """
+
+    def __init__(
+        self, relay: Relay, holder: str, *, ttl: float = LEASE_TTL_SECONDS
+    ) -> None:
+        self._relay = relay
+        self._holder = holder
+        self._ttl = ttl
+        # No lease to hold outside NATS: every server is its own janitor.
+        self._leader = not isinstance(relay, NatsRelay)
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this server should do the repo's janitor work."""
+        return self._leader
+
+    async def renew(self) -> bool:
+        """Claim or renew the lease; return ``True`` on becoming leader.
+
+        A relay error demotes this server — a janitor that cannot reach
+        NATS cannot renew, and another server will take the lease when
+        it lapses.
+        """
+        if not isinstance(self._relay, NatsRelay):
+            return False
+        was_leader = self._leader
+        try:
+            self._leader = await self._relay.claim_janitor_lease(
+                self._holder, self._ttl
+            )
+        except Exception:  # noqa: BLE001 — relay errors vary by backend
+            logger.debug("Janitor lease renewal failed", exc_info=True)
+            self._leader = False
+        if self._leader != was_leader:
+            logger.info(
+                "Janitor lease %s by %s",
+                "acquired" if self._leader else "lost",
+                self._holder,
+            )
+        return self._leader and not was_leader
+
+    async def release(self) -> None:
+        """Hand the lease back so another server can take it at once."""
+        if not isinstance(self._relay, NatsRelay) or not self._leader:
+            return
+        self._leader = False
+        try:
+            await self._relay.release_janitor_lease(self._holder)
+        except Exception:  # noqa: BLE001
+            logger.debug("Janitor lease release failed", exc_info=True)
@@ -0,0 +1,265 @@
+"""Write-behind cache for this server's own presence row.
+
+Every ``track_activity`` tool call ran ``update_current_session``: a
+``get_session`` plus an ``update_session`` — one KV get and one KV put —
+and the status-file refresh read the row again for the plan.  None of
+that needs the relay.  The server is the only writer of its own row in
+the normal case, so :class:`SessionCache` holds the authoritative local
+:class:`~biff.models.UserSession` and:
+
+- merges field updates in memory;
+- writes a *touch* (``last_active`` only) after a short debounce, so a
+  burst of tool calls costs one write; the heartbeat flushes whatever is
+  still pending;
+- writes material changes (plan, tty name, ``mesg``) immediately, so
+  ``/who`` and other servers see them on the next read;
+- serves in-process reads from memory.
+
+Writes on NATS are revision-checked (``kv.update`` with the last-known
+revision).  When another writer got there first the cache re-reads the
+row, re-applies only its own pending fields, and retries — a concurrent
+change to a field this process did not touch is never clobbered.  Relays
+without revisions re-read and merge on every flush.
+
+Asyncio is single-threaded; the lock only serializes flushes that
+interleave at ``await`` points.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from biff.nats_relay import NatsRelay
+
+if TYPE_CHECKING:
+    from biff.models import UserSession
+    from biff.relay import Relay
+
+logger = logging.getLogger(__name__)
+
+# Delay before a touch-only update is written.  Long enough to fold a
+# burst of tool calls into one write; short enough that /who on another
+# machine sees a fresh idle time.
+_DEBOUNCE_SECONDS = 2.0
+
+# Revision conflicts tolerated per flush before falling back to an
+# unconditional write (last writer wins, as before the cache).
+_CAS_ATTEMPTS = 3
+
+_TOUCH_FIELDS = frozenset({"last_active"})
+
+
+class SessionCache:
+    """This server's ``UserSession``, held locally and written behind.
+
+    Companion to the frozen ``ServerState`` (like ``ActivityTracker``).
+    Empty until the first :meth:`get`, and again after a flush finds the
+    row deleted under a touch-only change.
+    """
+
+    def __init__(
+        self,
+        relay: Relay,
+        session_key: str,
+        *,
+        debounce: float = _DEBOUNCE_SECONDS,
+    ) -> None:
+        self._relay = relay
+        self._key = session_key
+        self._debounce = debounce
+        self._session: UserSession | None = None
+        # KV revision the held session was read or written at (NATS only).
+        # ``None`` with a held session means "not known yet".
+        self._revision: int | None = None
+        self._pending: dict[str, object] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def dirty(self) -> bool:
+        """Whether local changes are waiting to be written."""
+        return bool(self._pending)
+
+    async def get(self) -> UserSession | None:
+        """Return the held session, loading it from the relay on first use."""
+        if self._session is None:
+            await self._load()
+        return self._session
+
+    async def put(self, session: UserSession) -> None:
+        """Replace the held session and write it now (create / backfill)."""
+        self._session = session
+        self._pending.update(session.model_dump())
+        await self.flush()
+
+    async def update(self, **fields: object) -> UserSession:
+        """Merge *fields* into the held session and schedule the write.
+
+        A touch (only ``last_active``) is debounced; anything else is
+        written before returning.  Callers load the session first
+        (:meth:`get`); updating an empty cache is a programming error.
+        """
+        session = self._apply(fields)
+        if fields.keys() <= _TOUCH_FIELDS:
+            self._schedule_flush()
+        else:
+            await self.flush()
+        return session
+
+    async def flush(self) -> UserSession | None:
+        """Write pending changes, if any, in one revision-checked update.
+
+        Returns the session held afterwards (``None`` if the flush found
+        the row deleted and dropped it).
+        """
+        self._cancel_scheduled()
+        async with self._lock:
+            session = self._session
+            if not self._pending or session is None:
+                return session
+            pending, self._pending = self._pending, {}
+            try:
+                written = await self._write(session, pending)
+            except BaseException:
+                # Keep the changes for the next flush (heartbeat retries).
+                self._pending = {**pending, **self._pending}
+                raise
+            # Fields applied while the write was in flight stay pending and
+            # are layered over what was written.
+            if written is not None and self._pending:
+                written = written.model_copy(update=self._pending)
+            self._session = written
+            if written is None:
+                self._revision = None
+                self._pending.clear()
+            return written
+
+    async def heartbeat(self) -> bool:
+        """Touch ``last_active`` and flush; ``False`` when nothing is held.
+
+        Folds any pending debounced touch into the heartbeat's write.  The
+        caller falls back to ``Relay.heartbeat`` on ``False`` — including
+        when the flush found the row deleted and dropped it, since a bare
+        touch never resurrects a removed session.
+        """
+        if self._session is None:
+            return False
+        self._apply({"last_active": datetime.now(UTC)})
+        session = await self.flush()
+        if session is None:
+            return False
+        # Refresh TTY name reservation to prevent TTL expiry (DES-035).
+        if session.tty_name:
+            try:
+                await self._relay.refresh_tty_reservation(
+                    session.user, session.tty_name, self._key
+                )
+            except Exception:  # noqa: BLE001
+                # INFO: runs inside the background heartbeat; a transient
+                # failure retries next tick (biff-9la).
+                logger.info("Failed to refresh TTY name reservation", exc_info=True)
+        return True
+
+    async def close(self) -> None:
+        """Cancel a scheduled write without flushing.
+
+        Called at shutdown, just before the row is deleted — writing a
+        debounced touch then would only race the delete.
+        """
+        task = self._flush_task
+        self._cancel_scheduled()
+        if task is not None:
+            with suppress(asyncio.CancelledError):
+                await task
+
+    # -- Internals --
+
+    def _apply(self, fields: dict[str, object]) -> UserSession:
+        if self._session is None:
+            msg = f"session {self._key} is not loaded"
+            raise RuntimeError(msg)
+        self._session = self._session.model_copy(update=fields)
+        self._pending.update(fields)
+        return self._session
+
+    async def _load(self) -> None:
+        relay = self._relay
+        if isinstance(relay, NatsRelay):
+            entry = await relay.get_session_entry(self._key)
+            self._session, self._revision = entry if entry else (None, None)
+        else:
+            self._session = await relay.get_session(self._key)
+
+    def _schedule_flush(self) -> None:
+        # Not reset by later touches: the first touch of a burst starts the
+        # clock, so steady activity still reaches the KV every debounce.
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    def _cancel_scheduled(self) -> None:
+        task = self._flush_task
+        self._flush_task = None
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._debounce)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception:  # noqa: BLE001
+            # DEBUG: the pending touch is kept and the heartbeat retries;
+            # relay health is logged once by the relay itself.
+            logger.debug("Deferred session write failed", exc_info=True)
+
+    async def _write(
+        self, session: UserSession, pending: dict[str, object]
+    ) -> UserSession | None:
+        """Apply *pending* to the stored row and write the result.
+
+        Returns the session now held, or ``None`` if it was dropped.
+        """
+        relay = self._relay
+        if not isinstance(relay, NatsRelay):
+            stored = await relay.get_session(self._key)
+            if stored is None and pending.keys() <= _TOUCH_FIELDS:
+                return None
+            merged = (stored or session).model_copy(update=pending)
+            await relay.update_session(merged)
+            return merged
+        held: UserSession | None = session
+        if self._revision is None:
+            held = await self._rebase(relay, session, pending)
+        for _ in range(_CAS_ATTEMPTS):
+            if held is None:
+                return None
+            written = await relay.update_session_if(held, self._revision)
+            if written is not None:
+                self._revision = written
+                return held
+            held = await self._rebase(relay, held, pending)
+        if held is not None:
+            logger.info("Session %s kept changing; writing unconditionally", self._key)
+            await relay.update_session(held)
+            self._revision = None
+        return held
+
+    async def _rebase(
+        self, relay: NatsRelay, session: UserSession, pending: dict[str, object]
+    ) -> UserSession | None:
+        """Re-read the row and re-apply *pending* on top of it.
+
+        A deleted row is recreated from *session* — matching the auto-create
+        in ``get_or_create_session`` — unless *pending* is only a touch, in
+        which case the session is dropped (``None``).
+        """
+        entry = await relay.get_session_entry(self._key)
+        if entry is None:
+            self._revision = None
+            return None if pending.keys() <= _TOUCH_FIELDS else session
+        stored, self._revision = entry
+        return stored.model_copy(update=pending)
@@ -14,6 +14,9 @@ from biff.nats_relay import NatsRelay
 from biff.relay import DormantRelay, LocalRelay, Relay
 from biff.server.activity import ActivityTracker
 from biff.server.display_queue import DisplayQueue
+from biff.server.janitor import Janitor
+from biff.server.session_cache import SessionCache
+from biff.sqlite_relay import SqliteRelay, is_sqlite_url, sqlite_path_from_url
 from biff.talk_state import TalkState
 from biff.tty import build_session_key, generate_tty, get_hostname, get_pwd
 
@@ -56,6 +59,8 @@ class ServerState:
     org_repos: frozenset[str] = field(default_factory=lambda: frozenset[str]())
     companion: CompanionSession | None = None
     talk: TalkState = field(init=False)
+    session_cache: SessionCache = field(init=False)
+    janitor: Janitor = field(init=False)
 
     def __post_init__(self) -> None:
         """Compose the shared ephemeral talk state from this server's identity.
@@ -66,6 +71,11 @@ class ServerState:
         state-returning tool drains it (talk_state.py, DES-020/021).  The
         display ``tty_name`` is populated after registration via
         ``TalkState.set_tty_name``.
+
+        ``SessionCache`` is seated the same way: it holds this server's own
+        presence row so tool calls do not round-trip the relay for it.
+        ``Janitor`` tracks whether this server holds the repo's janitor
+        lease (orphan and logout bookkeeping for other sessions).
         """
         object.__setattr__(
             self,
@@ -77,6 +87,10 @@ class ServerState:
                 session_key=self.session_key,
             ),
         )
+        object.__setattr__(
+            self, "session_cache", SessionCache(self.relay, self.session_key)
+        )
+        object.__setattr__(self, "janitor", Janitor(self.relay, self.session_key))
 
     @property
     def session_key(self) -> str:
@@ -122,9 +136,11 @@ def create_state(
     1. An explicit *relay* always wins (used by tests).
     2. When *dormant* is ``True``, uses
        :class:`~biff.relay.DormantRelay`.
-    3. ``config.relay_url`` selects
+    3. A ``sqlite://`` ``config.relay_url`` selects
+       :class:`~biff.sqlite_relay.SqliteRelay`.
+    4. Any other ``config.relay_url`` selects
        :class:`~biff.nats_relay.NatsRelay`.
-    4. Otherwise :class:`~biff.relay.LocalRelay`.
+    5. Otherwise :class:`~biff.relay.LocalRelay`.
 
     Runtime identity (tty, hostname, pwd) is auto-generated when not
     provided — each server instance gets a unique session key.
@@ -133,12 +149,18 @@ def create_state(
     if relay is None:
         if dormant:
             relay = DormantRelay()
+        elif is_sqlite_url(config.relay_url):
+            relay = SqliteRelay(
+                sqlite_path_from_url(config.relay_url, data_dir),
+                repo_name=config.repo_name,
+            )
         elif config.relay_url:
             relay = NatsRelay(
                 url=config.relay_url,
                 auth=config.relay_auth,
                 name=f"biff-{config.repo_name}-{config.user}",
                 repo_name=config.repo_name,
+                slow_op_threshold=config.slow_op_threshold,
             )
         else:
             relay = LocalRelay(data_dir=data_dir)
@@ -179,6 +179,13 @@ async def notify_tool_list_changed() -> None:
             _session = None
 
 
+def _inbox_keys(state: ServerState) -> list[str]:
+    """Session keys whose inboxes this server reads: its own and the companion's."""
+    if state.companion_session_key:
+        return [state.session_key, state.companion_session_key]
+    return [state.session_key]
+
+
 async def _sync_unread_file(
     state: ServerState,
     *,
@@ -198,9 +205,10 @@ async def _sync_unread_file(
     if summary is None:
         summary = await state.relay.get_unread_summary(state.session_key)
     items = state.display_queue.snapshot()
-    # Fetch plan from the relay session (lives in NATS KV, not display queue).
+    # Plan lives on the session row, not the display queue; the session
+    # cache serves it without a relay read.
     plan = ""
-    session = await state.relay.get_session(state.session_key)
+    session = await state.session_cache.get()
     if session is not None:
         plan = session.plan
     if state.companion is not None:
@@ -238,14 +246,7 @@ async def refresh_read_messages(mcp: FastMCP[ServerState], state: ServerState) -
     tool = await mcp.get_tool("read_messages")
     if tool is None:
         return
-    primary = await state.relay.get_unread_summary(state.session_key)
-    companion_count = 0
-    if state.companion_session_key:
-        companion_summary = await state.relay.get_unread_summary(
-            state.companion_session_key
-        )
-        companion_count = companion_summary.count
-    total = primary.count + companion_count
+    total = (await state.relay.get_combined_unread_summary(_inbox_keys(state))).count
     old_desc = tool.description
     if total == 0:
         tool.description = _READ_MESSAGES_BASE
@@ -550,14 +551,7 @@ async def _active_tick(
 
     Returns updated ``(count, wall_key, talk_signal)`` tracking state.
     """
-    primary = await state.relay.get_unread_summary(state.session_key)
-    companion_count = 0
-    if state.companion_session_key:
-        companion_summary = await state.relay.get_unread_summary(
-            state.companion_session_key
-        )
-        companion_count = companion_summary.count
-    total = primary.count + companion_count
+    total = (await state.relay.get_combined_unread_summary(_inbox_keys(state))).count
     if total != last_count:
         last_count = total
         await refresh_read_messages(mcp, state)
@@ -25,8 +25,8 @@ logger = logging.getLogger(__name__)
 async def get_or_create_session(state: ServerState) -> UserSession:
     """Get this server's session, creating one if it doesn't exist.
 
-    Uses ``state.session_key`` (``{user}:{tty}``) to look up the
-    session, backfilling display_name, hostname, pwd, and tty_name
+    Reads through ``state.session_cache`` — the relay is consulted only
+    the first time — backfilling display_name, hostname, pwd, and tty_name
     from the server state when creating a fresh session.
 
     The auto-create branch exists for test scaffolding and edge cases
@@ -36,7 +36,8 @@ async def get_or_create_session(state: ServerState) -> UserSession:
     written with an empty ``tty_name`` — guarding against the v1.8.0
     biff-dzqc defect resurfacing from a different code path.
     """
-    session = await state.relay.get_session(state.session_key)
+    cache = state.session_cache
+    session = await cache.get()
     if session is None:
         # Lifespan registration writes this row before any tool call.
         # Reaching the auto-create branch means the row was deleted
@@ -63,7 +64,7 @@ async def get_or_create_session(state: ServerState) -> UserSession:
             kind=state.config.kind,
             repo=state.config.repo_name,
         )
-        await state.relay.update_session(session)
+        await cache.put(session)
     else:
         # Backfill fields that may be missing from pre-DES-030 sessions
         # or from sessions created before display_name was resolved.
@@ -75,8 +76,7 @@ async def get_or_create_session(state: ServerState) -> UserSession:
         if not session.repo:
             updates["repo"] = state.config.repo_name
         if updates:
-            session = session.model_copy(update=updates)
-            await state.relay.update_session(session)
+            session = await cache.update(**updates)
     return session
 
 
@@ -146,9 +146,11 @@ def resolve_talk_target(
 
 
 async def update_current_session(state: ServerState, **updates: object) -> UserSession:
-    """Update this server's session with automatic last_active refresh."""
-    session = await get_or_create_session(state)
+    """Update this server's session with automatic last_active refresh.
+
+    Goes through ``state.session_cache``: a bare activity touch is written
+    behind (debounced), field changes are written before returning.
+    """
+    await get_or_create_session(state)
     updates["last_active"] = datetime.now(UTC)
-    updated = session.model_copy(update=updates)
-    await state.relay.update_session(updated)
-    return updated
+    return await state.session_cache.update(**updates)
@@ -20,7 +20,7 @@ if TYPE_CHECKING:
 
     from biff.server.state import ServerState
 
-_VALID_SCHEMES = ("tls://", "nats://", "ws://", "wss://")
+_VALID_SCHEMES = ("tls://", "nats://", "ws://", "wss://", "sqlite://")
 
 
 def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
@@ -45,7 +45,8 @@ def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
         ----------
         url:
             Relay URL (must start with ``tls://``, ``nats://``,
-            ``ws://``, or ``wss://``).
+            ``ws://``, ``wss://``, or ``sqlite://`` for a single-host
+            SQLite relay).
         auth:
             Optional path to a credentials file.
         local:
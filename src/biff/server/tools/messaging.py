@@ -77,21 +77,6 @@ async def _resolve_recipient(
 _log = logging.getLogger(__name__)
 
 
-async def _fetch_companion_unread(
-    state: ServerState,
-) -> tuple[list[Message], list[Message]]:
-    """Fetch unread messages from the companion's inboxes.
-
-    Returns ``(tty_unread, user_unread)`` — both empty when no companion.
-    """
-    companion = state.companion
-    if companion is None:
-        return [], []
-    tty = await state.relay.fetch(companion.session_key)
-    user = await state.relay.fetch_user_inbox(companion.user)
-    return tty, user
-
-
 async def _mark_companion_read(
     state: ServerState,
     tty_unread: list[Message],
@@ -109,6 +94,20 @@ async def _mark_companion_read(
         await state.relay.mark_read_user_inbox(companion.user, user_ids)
 
 
+async def _deliver_parts(
+    state: ServerState, messages: list[Message], target_repo: str | None
+) -> None:
+    """Deliver a chunked message's parts, logging any part that failed."""
+    results = await state.relay.deliver_many(
+        messages, sender_key=state.session_key, target_repo=target_repo
+    )
+    for part, error in enumerate(results, 1):
+        if error is not None:
+            _log.warning(
+                "message delivery part %d/%d failed: %s", part, len(results), error
+            )
+
+
 def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
     """Register messaging tools."""
 
@@ -135,16 +134,16 @@ def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
         await refresh_read_messages(mcp, state)
 
         async def _deliver_chunks() -> None:
-            for chunk in chunks:
-                msg = Message(
+            messages = [
+                Message(
                     from_user=state.config.user,
                     from_tty=get_tty_name(),
                     to_user=to_user,
                     body=chunk,
                 )
-                await state.relay.deliver(
-                    msg, sender_key=state.session_key, target_repo=target_repo
-                )
+                for chunk in chunks
+            ]
+            await _deliver_parts(state, messages, target_repo)
 
         fire_and_forget(
             _deliver_chunks(),
@@ -178,12 +177,13 @@ def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
         session_key = state.session_key
         user = state.config.user
 
-        # Fetch from primary inboxes (per-TTY + per-user broadcast).
-        tty_unread = await state.relay.fetch(session_key)
-        user_unread = await state.relay.fetch_user_inbox(user)
-
-        # Fetch from companion inboxes (DES-039).
-        comp_tty, comp_user = await _fetch_companion_unread(state)
+        # Primary inboxes (per-TTY + per-user broadcast) and the
+        # companion's (DES-039), fetched in one relay pass.
+        companion_key = state.companion_session_key
+        keys = [session_key] if companion_key is None else [session_key, companion_key]
+        inboxes = await state.relay.fetch_inboxes(keys)
+        tty_unread, user_unread = inboxes[session_key]
+        comp_tty, comp_user = inboxes[companion_key] if companion_key else ([], [])
 
         all_unread = sorted(
             tty_unread + user_unread + comp_tty + comp_user,
@@ -204,14 +204,20 @@ def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
         await _mark_companion_read(state, comp_tty, comp_user)
 
         await refresh_read_messages(mcp, state)
+        # Each inbox yields at most one fetch page; say what is left.
+        remaining = (await state.relay.get_combined_unread_summary(keys)).count
 
         if state.companion is not None:
             human_msgs = sorted(comp_tty + comp_user, key=lambda m: m.timestamp)
             agent_msgs = sorted(tty_unread + user_unread, key=lambda m: m.timestamp)
-            return format_read_dual(
+            text = format_read_dual(
                 state.companion.user,
                 human_msgs,
                 state.config.user,
                 agent_msgs,
             )
-        return format_read(all_unread)
+        else:
+            text = format_read(all_unread)
+        if remaining:
+            text += f"\n\n{remaining} more unread — call read_messages again."
+        return text
@@ -1,7 +1,9 @@
 """Poll interval configuration tools — ``set_poll_interval`` / ``get_poll_status``.
 
 Allows users to adjust the background polling frequency at runtime
-and persist the setting to ``config.local.yaml``.
+and persist the setting to ``config.local.yaml``.  ``get_poll_status``
+also reports the relay's latency histograms and counters
+(:mod:`biff.relay_stats`).
 """
 
 from __future__ import annotations
@@ -10,6 +12,7 @@ import re
 from typing import TYPE_CHECKING
 
 from biff.config import ensure_gitignore_yaml, load_yaml_local, write_yaml_config
+from biff.relay_stats import format_relay_stats
 
 if TYPE_CHECKING:
     from fastmcp import FastMCP
@@ -85,15 +88,22 @@ def register(mcp: FastMCP[ServerState], state: ServerState) -> None:
 
     @mcp.tool(
         name="get_poll_status",
-        description="Show the current poll interval and whether polling is active.",
+        description=(
+            "Show the current poll interval, whether polling is active, "
+            "and relay latency/counter statistics."
+        ),
     )
     async def get_poll_status() -> str:
-        """Return current polling configuration."""
-        interval = state.config.poll_interval
-        if interval <= 0:
-            return "Polling: disabled"
-        if interval >= 60 and interval % 60 == 0:
-            display = f"{interval / 60:g}m"
-        else:
-            display = f"{interval:g}s"
-        return f"Polling: active, interval={display} ({interval:g}s)"
+        """Return current polling configuration and the relay stats snapshot."""
+        polling = _polling_line(state.config.poll_interval)
+        return f"{polling}\n{format_relay_stats(state.relay.stats())}"
+
+
+def _polling_line(interval: float) -> str:
+    if interval <= 0:
+        return "Polling: disabled"
+    if interval >= 60 and interval % 60 == 0:
+        display = f"{interval / 60:g}m"
+    else:
+        display = f"{interval:g}s"
+    return f"Polling: active, interval={display} ({interval:g}s)"
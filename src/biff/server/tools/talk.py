@@ -57,12 +57,10 @@ def format_talk_messages(messages: list[Message]) -> str:
     return "\n".join(lines)
 
 
-async def fetch_all_unread(
-    relay: NatsRelay, session_key: str, user: str
-) -> list[Message]:
+async def fetch_all_unread(relay: NatsRelay, session_key: str) -> list[Message]:
     """Fetch and merge unread messages from both inboxes, sorted by time."""
-    tty_unread = await relay.fetch(session_key)
-    user_unread = await relay.fetch_user_inbox(user)
+    inboxes = await relay.fetch_inboxes([session_key])
+    tty_unread, user_unread = inboxes[session_key]
     return sorted(tty_unread + user_unread, key=lambda m: m.timestamp)
 
 
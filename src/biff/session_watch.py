@@ -0,0 +1,155 @@
+"""Repo-scoped, resumable watch on the shared ``biff-sessions`` KV bucket.
+
+Every repo in an organization shares one sessions bucket, keyed
+``{repo}.{user}.{tty}``.  A ``watchall()`` there hands each MCP server
+the initial snapshot and every heartbeat put from every repo on the
+server — most of which it can never show.  :class:`RepoWatch` filters
+on ``{repo}.>`` for each visible repo instead, so a server's watch
+traffic grows with what it can see, not with the size of the
+organization.
+
+It is one ordered push consumer with ``filter_subjects`` — nats.py's
+``KeyValue.watch`` takes a single filter and cannot start mid-stream —
+so entries arrive in KV revision (stream sequence) order.  That makes
+the last revision handled a complete resume point: a watch restarted
+with ``after=revision`` delivers only what changed since, instead of
+replaying the bucket.  :meth:`RepoWatch.updates` keeps the
+``KeyValue.KeyWatcher`` contract ``_run_kv_watch`` was written against:
+entries, and one ``None`` once the watch has caught up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import TYPE_CHECKING
+
+from nats.js.api import ConsumerConfig, DeliverPolicy
+from nats.js.kv import KV_DEL, KV_MARKER_REASON, KV_OP, KV_PURGE, KeyValue
+
+if TYPE_CHECKING:
+    from nats.aio.msg import Msg
+    from nats.js.client import JetStreamContext
+
+# Matches nats.py's KV watcher: the server reaps an ordered consumer whose
+# client vanished after this long.
+_INACTIVE_THRESHOLD = 300.0
+
+
+def repo_filter(repo: str) -> str:
+    """KV key filter covering every key of *repo* (sessions and wall)."""
+    return f"{repo}.>"
+
+
+class RepoWatch:
+    """Ordered consumer on ``{repo}.>`` for a set of repos."""
+
+    def __init__(self, bucket: str, repos: frozenset[str], *, resumed: bool) -> None:
+        self.repos = repos
+        # True when started after a revision: no snapshot, only changes.
+        self.resumed = resumed
+        self._bucket = bucket
+        self._prefix = f"$KV.{bucket}."
+        self._queue: asyncio.Queue[KeyValue.Entry | None] = asyncio.Queue()
+        self._setup = asyncio.Event()
+        self._caught_up = False
+        self._sub: JetStreamContext.PushSubscription | None = None
+
+    @classmethod
+    async def start(
+        cls,
+        js: JetStreamContext,
+        bucket: str,
+        repos: frozenset[str],
+        *,
+        after: int = 0,
+    ) -> RepoWatch:
+        """Watch *repos* in KV *bucket*.
+
+        ``after=0`` delivers the latest entry per key (the snapshot), then
+        live changes.  ``after=N`` delivers every entry from revision
+        ``N + 1`` on — the caller has already seen the bucket up to *N*.
+        """
+        watch = cls(bucket, repos, resumed=after > 0)
+        if not repos:
+            watch._mark_caught_up()
+            return watch
+        subjects = [f"{watch._prefix}{repo_filter(r)}" for r in sorted(repos)]
+        config = ConsumerConfig(filter_subjects=subjects)
+        if after:
+            config.deliver_policy = DeliverPolicy.BY_START_SEQUENCE
+            config.opt_start_seq = after + 1
+        else:
+            config.deliver_policy = DeliverPolicy.LAST_PER_SUBJECT
+        watch._sub = await js.subscribe(
+            subjects[0],
+            stream=f"KV_{bucket}",
+            cb=watch._on_msg,
+            config=config,
+            ordered_consumer=True,
+            inactive_threshold=_INACTIVE_THRESHOLD,
+        )
+        try:
+            # Nothing pending and nothing delivered yet: already caught up.
+            # Otherwise the entry with num_pending == 0 sends the marker.
+            await asyncio.sleep(0)
+            info = await watch._sub.consumer_info()
+            if info.num_pending == 0 and watch._sub.delivered == 0:
+                watch._mark_caught_up()
+        except BaseException:
+            await watch.stop()
+            raise
+        finally:
+            watch._setup.set()
+        return watch
+
+    def _mark_caught_up(self) -> None:
+        if not self._caught_up:
+            self._caught_up = True
+            self._queue.put_nowait(None)
+
+    async def _on_msg(self, msg: Msg) -> None:
+        await self._setup.wait()
+        meta = msg.metadata
+        op: str | None = None
+        headers = msg.headers or {}
+        if KV_OP in headers:
+            op = headers[KV_OP]
+        elif KV_MARKER_REASON in headers:
+            # nats-server 2.11+ TTL/age expiry markers, read as nats.py's
+            # watcher does; an unknown future reason is skipped.
+            reason = headers[KV_MARKER_REASON]
+            if reason in ("MaxAge", "Purge"):
+                op = KV_PURGE
+            elif reason == "Remove":
+                op = KV_DEL
+            else:
+                if meta.num_pending == 0:
+                    self._mark_caught_up()
+                return
+        self._queue.put_nowait(
+            KeyValue.Entry(
+                bucket=self._bucket,
+                key=msg.subject.removeprefix(self._prefix),
+                value=msg.data,
+                revision=meta.sequence.stream,
+                delta=meta.num_pending,
+                created=meta.timestamp,  # type: ignore[arg-type]  # pyright: ignore[reportArgumentType]
+                operation=op,
+            )
+        )
+        if meta.num_pending == 0:
+            self._mark_caught_up()
+
+    async def updates(self, timeout: float = 5.0) -> KeyValue.Entry | None:
+        """Next entry, or ``None`` once (when the watch has caught up).
+
+        Raises :class:`TimeoutError` when nothing arrives within *timeout*.
+        """
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+    async def stop(self) -> None:
+        """Unsubscribe; the server deletes the ephemeral consumer."""
+        if self._sub is not None:
+            with contextlib.suppress(Exception):
+                await self._sub.unsubscribe()
@@ -0,0 +1,692 @@
+"""Single-host relay over one WAL-mode SQLite database.
+
+``LocalRelay`` rewrites whole files: every heartbeat and session update
+re-serializes ``sessions.json``, and every read scans a JSONL inbox.  That
+is fine for a handful of sessions and grows linearly after.
+``SqliteRelay`` implements the same :class:`~biff.relay.Relay` protocol on
+indexed tables, so each operation touches only the rows it needs::
+
+    messages   (repo, user, tty, seq)   TTY mailbox; tty '' = user mailbox
+    sessions   key  + (repo, last_active), (user)
+    names      (user, name)             TTY name reservations (DES-035)
+    sid_hints  (user, session_id)       resume reclaim hints (biff-7ak)
+    wall       repo
+    wtmp       (repo, user, seq)        session history
+
+Selected by a ``sqlite://`` relay URL (``sqlite:///var/biff/relay.db``;
+bare ``sqlite://`` puts ``relay.db`` in the data directory).  Several
+servers on one host may share the file: WAL lets readers run alongside
+the single writer, and ``busy_timeout`` queues competing writers instead
+of failing them.
+
+Semantics follow ``NatsRelay`` where the two relays differ: reads are
+scoped to this relay's repo, ``mark_read`` removes the message (work-queue
+retention), TTY name reservations lapse after the session TTL, and wtmp
+is kept for 30 days.  Like ``LocalRelay``, a heartbeat for a missing
+session creates a bare one.
+
+Statements run on one worker thread per relay, never on the event loop:
+a writer queued behind another server's lock waits out ``busy_timeout``
+there, and the single thread keeps each transaction on one connection
+without a lock of its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TypeGuard
+
+from pydantic import ValidationError
+
+from biff.models import (
+    Message,
+    SessionEvent,
+    UnreadSummary,
+    UserSession,
+    WallPost,
+)
+from biff.relay import DRAIN_PAGE_SIZE, SESSION_TTL_SECONDS, deliver_in_turn
+from biff.relay_stats import RelayStats
+from biff.tty import build_session_key, validate_reclaimable_name, validate_routing_id
+
+SQLITE_SCHEME = "sqlite://"
+DEFAULT_DB_NAME = "relay.db"
+
+_BUSY_TIMEOUT_MS = 5_000
+_WTMP_MAX_AGE = 30 * 24 * 60 * 60  # 30 days, matching the NATS wtmp stream
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    seq  INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo TEXT NOT NULL,
+    user TEXT NOT NULL,
+    tty  TEXT NOT NULL,
+    id   TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_mailbox ON messages (repo, user, tty, seq);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    key         TEXT PRIMARY KEY,
+    repo        TEXT NOT NULL,
+    user        TEXT NOT NULL,
+    last_active REAL NOT NULL,
+    data        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_repo ON sessions (repo, last_active);
+CREATE INDEX IF NOT EXISTS sessions_user ON sessions (user);
+
+CREATE TABLE IF NOT EXISTS names (
+    user    TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    owner   TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (user, name)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS sid_hints (
+    user       TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    PRIMARY KEY (user, session_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS wall (
+    repo TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS wtmp (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    repo      TEXT NOT NULL,
+    user      TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wtmp_user ON wtmp (repo, user, seq);
+"""
+
+
+def is_sqlite_url(url: str | None) -> TypeGuard[str]:
+    """Whether *url* selects :class:`SqliteRelay`."""
+    return url is not None and url.startswith(SQLITE_SCHEME)
+
+
+def sqlite_path_from_url(url: str, data_dir: Path) -> Path:
+    """Database path for a ``sqlite://`` relay URL.
+
+    ``sqlite:///abs/relay.db`` is an absolute path, ``sqlite://~/relay.db``
+    is expanded, and a bare ``sqlite://`` means ``{data_dir}/relay.db``.
+    """
+    if not is_sqlite_url(url):
+        msg = f"Not a sqlite relay URL: {url!r}"
+        raise ValueError(msg)
+    rest = url.removeprefix(SQLITE_SCHEME)
+    if not rest:
+        return data_dir / DEFAULT_DB_NAME
+    return Path(rest).expanduser()
+
+
+class SqliteRelay:
+    """Relay backed by indexed tables in one SQLite database.
+
+    *repo_name* scopes sessions, mailboxes, wall, and wtmp the way the
+    NATS subject hierarchy does.  Empty is a repo of its own for
+    mailboxes, wall, and wtmp — what a single-repo ``LocalRelay``
+    replacement wants — while session listings then span every repo.
+    The connection opens lazily and reopens after :meth:`disconnect`.
+    """
+
+    def __init__(self, path: Path, *, repo_name: str = "") -> None:
+        self._path = path
+        self._repo_name = repo_name
+        self._conn: sqlite3.Connection | None = None
+        self._worker: ThreadPoolExecutor | None = None
+
+    @property
+    def path(self) -> Path:
+        """The database file."""
+        return self._path
+
+    # -- Validation (same contract as LocalRelay) --
+
+    @staticmethod
+    def _validate_user(user: str) -> str:
+        """Reject usernames ``LocalRelay`` and ``NatsRelay`` would refuse."""
+        if not user or "/" in user or "\\" in user or ".." in user:
+            msg = f"Invalid username: {user!r}"
+            raise ValueError(msg)
+        return user
+
+    def _validate_session_key(self, session_key: str) -> tuple[str, str]:
+        """Split and validate a ``{user}:{tty}`` key."""
+        if ":" not in session_key:
+            msg = f"Invalid session key (missing ':'): {session_key!r}"
+            raise ValueError(msg)
+        user, tty = session_key.split(":", maxsplit=1)
+        self._validate_user(user)
+        if not tty or "/" in tty or "\\" in tty or ".." in tty or ":" in tty:
+            msg = f"Invalid tty in session key: {tty!r}"
+            raise ValueError(msg)
+        return user, tty
+
+    # -- Messages --
+
+    async def deliver(
+        self,
+        message: Message,
+        *,
+        sender_key: str = "",  # noqa: ARG002
+        target_repo: str | None = None,
+    ) -> None:
+        """Insert a message into the recipient's mailbox.
+
+        A ``to_user`` with a ``:`` is targeted at that TTY; otherwise it
+        goes to the user's broadcast mailbox (no session lookup, persists
+        offline).  *target_repo* routes cross-repo (DES-030).
+        """
+        self._validate_user(message.from_user)
+        if ":" in message.to_user:
+            user, tty = self._validate_session_key(message.to_user)
+        else:
+            user, tty = self._validate_user(message.to_user), ""
+        await self._write(
+            "INSERT INTO messages (repo, user, tty, id, data) VALUES (?,?,?,?,?)",
+            (
+                target_repo or self._repo_name,
+                user,
+                tty,
+                str(message.id),
+                message.model_dump_json(),
+            ),
+        )
+
+    async def deliver_many(
+        self,
+        messages: Sequence[Message],
+        *,
+        sender_key: str = "",
+        target_repo: str | None = None,
+    ) -> list[Exception | None]:
+        """Deliver each message in turn, reporting failures per part."""
+        return await deliver_in_turn(
+            self, messages, sender_key=sender_key, target_repo=target_repo
+        )
+
+    async def fetch(self, session_key: str) -> list[Message]:
+        """Get unread messages for a session, oldest first."""
+        user, tty = self._validate_session_key(session_key)
+        return await self._fetch_mailbox(user, tty)
+
+    async def mark_read(self, session_key: str, ids: Sequence[uuid.UUID]) -> None:
+        """Remove read messages from a session's mailbox."""
+        user, tty = self._validate_session_key(session_key)
+        await self._remove(user, tty, ids)
+
+    async def get_unread_summary(self, session_key: str) -> UnreadSummary:
+        """Count unread messages across TTY and user mailboxes in one query."""
+        user, tty = self._validate_session_key(session_key)
+        count = await self._count(
+            "SELECT COUNT(*) FROM messages "
+            "WHERE repo = ? AND user = ? AND tty IN (?, '')",
+            (self._repo_name, user, tty),
+        )
+        return UnreadSummary(count=count)
+
+    # -- Messages (user inbox) --
+
+    async def fetch_user_inbox(self, user: str) -> list[Message]:
+        """Get unread messages from the user's broadcast mailbox."""
+        return await self._fetch_mailbox(self._validate_user(user), "")
+
+    async def mark_read_user_inbox(self, user: str, ids: Sequence[uuid.UUID]) -> None:
+        """Remove read messages from the user's broadcast mailbox (POP)."""
+        await self._remove(self._validate_user(user), "", ids)
+
+    async def get_user_unread_count(self, user: str) -> int:
+        """Count unread messages in the user's broadcast mailbox."""
+        return await self._count(
+            "SELECT COUNT(*) FROM messages WHERE repo = ? AND user = ? AND tty = ''",
+            (self._repo_name, self._validate_user(user)),
+        )
+
+    # -- Messages (backlog) --
+
+    async def drain(
+        self, session_key: str, page_size: int = DRAIN_PAGE_SIZE
+    ) -> AsyncIterator[list[Message]]:
+        """Yield unread messages page by page, removing each page (POP)."""
+        user, tty = self._validate_session_key(session_key)
+        for mailbox in (tty, ""):
+            after = 0
+            while True:
+                page, after = await self._run(
+                    self._fetch_page, user, mailbox, after, page_size
+                )
+                if not page:
+                    break
+                await self._remove(user, mailbox, [m.id for m in page])
+                yield page
+
+    # -- Messages (several sessions) --
+
+    async def fetch_inboxes(
+        self, session_keys: Sequence[str]
+    ) -> dict[str, tuple[list[Message], list[Message]]]:
+        """Get each session's TTY and user unread messages."""
+        return {
+            key: (await self.fetch(key), await self.fetch_user_inbox(key.split(":")[0]))
+            for key in session_keys
+        }
+
+    async def get_combined_unread_summary(
+        self, session_keys: Sequence[str]
+    ) -> UnreadSummary:
+        """Count unread messages across every session's mailboxes."""
+        counts = [(await self.get_unread_summary(key)).count for key in session_keys]
+        return UnreadSummary(count=sum(counts))
+
+    # -- Presence --
+
+    async def update_session(self, session: UserSession) -> None:
+        """Create or update a session (keyed by ``{user}:{tty}``)."""
+        self._validate_user(session.user)
+        key = build_session_key(session.user, session.tty)
+        self._validate_session_key(key)
+        await self._run(self._put_session, key, session)
+
+    async def get_session(self, session_key: str) -> UserSession | None:
+        """Get a specific session by its ``{user}:{tty}`` key."""
+        data = await self._text(
+            "SELECT data FROM sessions WHERE key = ? AND last_active >= ?",
+            (session_key, _ttl_cutoff()),
+        )
+        return _load_session(data) if data is not None else None
+
+    async def get_sessions_for_user(self, user: str) -> list[UserSession]:
+        """Get all of this repo's sessions for *user*."""
+        self._validate_user(user)
+        return await self._select_sessions("user = ?", (user,))
+
+    async def heartbeat(self, session_key: str) -> None:
+        """Update ``last_active``, creating a bare session if needed."""
+        user, tty = self._validate_session_key(session_key)
+        await self._run(self._touch_session, session_key, user, tty)
+
+    async def get_sessions(self) -> list[UserSession]:
+        """Get this repo's unexpired sessions."""
+        return await self._select_sessions("", ())
+
+    async def get_sessions_for_repos(self, repos: frozenset[str]) -> list[UserSession]:
+        """Get unexpired sessions from several repos in one indexed query."""
+        if not repos:
+            return []
+        marks = ",".join("?" * len(repos))
+        rows = await self._rows(
+            f"SELECT data FROM sessions WHERE repo IN ({marks}) AND last_active >= ?",  # noqa: S608 — placeholders only
+            (*sorted(repos), _ttl_cutoff()),
+        )
+        return [s for (data,) in rows if (s := _load_session(data)) is not None]
+
+    async def delete_session(
+        self,
+        session_key: str,
+        *,
+        logged_out: bool = False,  # noqa: ARG002 — no watchers to tell
+    ) -> None:
+        """Remove a session from storage."""
+        self._validate_session_key(session_key)
+        await self._write("DELETE FROM sessions WHERE key = ?", (session_key,))
+
+    # -- Session history (wtmp) --
+
+    async def append_wtmp(self, event: SessionEvent) -> None:
+        """Record a session event."""
+        await self._write(
+            "INSERT INTO wtmp (repo, user, timestamp, data) VALUES (?,?,?,?)",
+            (
+                event.repo or self._repo_name,
+                event.user,
+                event.timestamp.timestamp(),
+                event.model_dump_json(),
+            ),
+        )
+
+    async def get_wtmp(
+        self, *, user: str | None = None, count: int = 25
+    ) -> list[SessionEvent]:
+        """Return up to *count* recent events, most recent first."""
+        count = max(1, min(count, 1000))
+        where, params = "repo = ?", [self._repo_name]
+        if user:
+            where += " AND user = ?"
+            params.append(user)
+        rows = await self._rows(
+            f"SELECT data FROM wtmp WHERE {where} ORDER BY seq DESC LIMIT ?",  # noqa: S608 — fixed clauses
+            (*params, count),
+        )
+        events: list[SessionEvent] = []
+        for (data,) in rows:
+            try:
+                events.append(SessionEvent.model_validate_json(data))
+            except (ValidationError, ValueError):
+                continue
+        return events
+
+    # -- Wall (team broadcast) --
+
+    async def set_wall(self, wall: WallPost | None) -> None:
+        """Set or clear this repo's wall."""
+        if wall is None:
+            await self._write("DELETE FROM wall WHERE repo = ?", (self._repo_name,))
+        else:
+            await self._write(
+                "INSERT OR REPLACE INTO wall (repo, data) VALUES (?, ?)",
+                (self._repo_name, wall.model_dump_json()),
+            )
+
+    async def get_wall(self, *, repo: str | None = None) -> WallPost | None:
+        """Read the active wall for *repo* (default: this repo)."""
+        repo = repo or self._repo_name
+        data = await self._text("SELECT data FROM wall WHERE repo = ?", (repo,))
+        if data is None:
+            return None
+        try:
+            wall = WallPost.model_validate_json(data)
+        except (ValidationError, ValueError):
+            return None
+        if wall.is_expired:
+            await self._write("DELETE FROM wall WHERE repo = ?", (repo,))
+            return None
+        return wall
+
+    # -- TTY name reservation (DES-035) --
+
+    async def reserve_tty_name(self, user: str, name: str, session_key: str) -> bool:
+        """Reserve a TTY name in one statement; a lapsed holder is replaced."""
+        self._validate_user(user)
+        now = time.time()
+        changed = await self._write(
+            "INSERT INTO names (user, name, owner, updated) VALUES (?,?,?,?) "
+            "ON CONFLICT (user, name) DO UPDATE "
+            "SET owner = excluded.owner, updated = excluded.updated "
+            "WHERE names.updated < ?",
+            (user, name, session_key, now, _ttl_cutoff(now)),
+        )
+        return changed == 1
+
+    async def release_tty_name(self, user: str, name: str) -> None:
+        """Release a TTY name reservation."""
+        self._validate_user(user)
+        await self._write("DELETE FROM names WHERE user = ? AND name = ?", (user, name))
+
+    async def refresh_tty_reservation(
+        self, user: str, name: str, session_key: str
+    ) -> None:
+        """Extend a reservation — only while *session_key* still owns it."""
+        self._validate_user(user)
+        await self._write(
+            "UPDATE names SET updated = ? WHERE user = ? AND name = ? AND owner = ?",
+            (time.time(), user, name, session_key),
+        )
+
+    async def get_tty_reservation_owner(self, user: str, name: str) -> str | None:
+        """Return the session key that holds *name*, or ``None``."""
+        self._validate_user(user)
+        return await self._text(
+            "SELECT owner FROM names WHERE user = ? AND name = ? AND updated >= ?",
+            (user, name, _ttl_cutoff()),
+        )
+
+    async def list_reserved_names(self, user: str) -> list[str]:
+        """List *user*'s live TTY name reservations."""
+        self._validate_user(user)
+        rows = await self._rows(
+            "SELECT name FROM names WHERE user = ? AND updated >= ?",
+            (user, _ttl_cutoff()),
+        )
+        return [name for (name,) in rows]
+
+    # -- session_id -> last tty-name hint (resume reclaim, biff-7ak) --
+
+    def _validate_sid(self, user: str, session_id: str) -> None:
+        """Same contract as ``LocalRelay._sid_hint_path``."""
+        self._validate_user(user)
+        error = validate_routing_id(session_id)
+        if error is not None:
+            raise ValueError(error)
+
+    async def get_session_tty_hint(self, user: str, session_id: str) -> str | None:
+        """Return the last tty_name this session_id claimed, or ``None``."""
+        self._validate_sid(user, session_id)
+        return await self._text(
+            "SELECT name FROM sid_hints WHERE user = ? AND session_id = ?",
+            (user, session_id),
+        )
+
+    async def set_session_tty_hint(self, user: str, session_id: str, name: str) -> None:
+        """Record the tty_name this session_id claimed (overwrites)."""
+        error = validate_reclaimable_name(name)
+        if error is not None:
+            raise ValueError(error)
+        self._validate_sid(user, session_id)
+        await self._write(
+            "INSERT OR REPLACE INTO sid_hints (user, session_id, name) VALUES (?,?,?)",
+            (user, session_id, name),
+        )
+
+    # -- Diagnostics --
+
+    def stats(self) -> RelayStats:
+        """Empty snapshot — local SQLite calls are not timed."""
+        return RelayStats()
+
+    # -- Lifecycle --
+
+    async def disconnect(self) -> None:
+        """Close the connection; the next call reopens it."""
+        await self._shutdown()
+
+    async def close(self) -> None:
+        """Close the connection."""
+        await self._shutdown()
+
+    # -- Internal I/O --
+
+    async def _run[**P, T](
+        self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """Run *fn* on the relay's worker thread.
+
+        One thread per relay: the event loop never blocks on the database
+        (``busy_timeout`` waits happen here), and statements reach the
+        connection one at a time, so a transaction is never interleaved.
+        """
+        if self._worker is None:
+            self._worker = ThreadPoolExecutor(1, thread_name_prefix="biff-sqlite")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._worker, lambda: fn(*args, **kwargs))
+
+    async def _shutdown(self) -> None:
+        """Close the connection on the worker thread, then stop the worker."""
+        worker, self._worker = self._worker, None
+        if worker is None:
+            self._close()
+            return
+        await asyncio.get_running_loop().run_in_executor(worker, self._close)
+        worker.shutdown(wait=False)
+
+    def _db(self) -> sqlite3.Connection:
+        """Return the open connection, creating the database on first use."""
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit; ``with conn`` commits any explicit BEGIN.
+            conn = sqlite3.connect(
+                self._path, isolation_level=None, check_same_thread=False
+            )
+            conn.execute(f"PRAGMA busy_timeout = {_BUSY_TIMEOUT_MS}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            # WAL + NORMAL: commits skip fsync; the database stays
+            # consistent and at most the last commits are lost on power
+            # failure — the same durability class as a NATS memory flush.
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.executescript(_SCHEMA)
+            conn.execute(
+                "DELETE FROM wtmp WHERE timestamp < ?", (time.time() - _WTMP_MAX_AGE,)
+            )
+            self._conn = conn
+        return self._conn
+
+    def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            conn.close()
+
+    def _fetchall(self, sql: str, params: Sequence[object]) -> list[Any]:
+        return self._db().execute(sql, params).fetchall()
+
+    def _commit(self, sql: str, params: Sequence[object]) -> int:
+        with self._db() as db:
+            return db.execute(sql, params).rowcount
+
+    async def _rows(self, sql: str, params: Sequence[object]) -> list[Any]:
+        """Every row of a query."""
+        return await self._run(self._fetchall, sql, params)
+
+    async def _write(self, sql: str, params: Sequence[object]) -> int:
+        """Run one write statement; return the number of rows it changed."""
+        return await self._run(self._commit, sql, params)
+
+    async def _count(self, sql: str, params: tuple[object, ...]) -> int:
+        """Run a ``SELECT COUNT(*)``."""
+        rows = await self._rows(sql, params)
+        return int(rows[0][0])
+
+    async def _text(self, sql: str, params: tuple[object, ...]) -> str | None:
+        """First column of the first row, or ``None`` if there is no row."""
+        rows = await self._rows(sql, params)
+        return str(rows[0][0]) if rows else None
+
+    async def _fetch_mailbox(self, user: str, tty: str) -> list[Message]:
+        rows = await self._rows(
+            "SELECT data FROM messages WHERE repo = ? AND user = ? AND tty = ? "
+            "ORDER BY seq",
+            (self._repo_name, user, tty),
+        )
+        messages: list[Message] = []
+        for (data,) in rows:
+            try:
+                messages.append(Message.model_validate_json(data))
+            except (ValidationError, ValueError):
+                continue
+        return messages
+
+    def _fetch_page(
+        self, user: str, tty: str, after: int, limit: int
+    ) -> tuple[list[Message], int]:
+        """Up to *limit* messages past seq *after*, and the last seq read.
+
+        Paged by seq rather than offset, and past any page of nothing but
+        malformed rows (skipped, never removed), so those cannot stall or
+        end a drain early.
+        """
+        while True:
+            rows = (
+                self._db()
+                .execute(
+                    "SELECT seq, data FROM messages "
+                    "WHERE repo = ? AND user = ? AND tty = ? AND seq > ? "
+                    "ORDER BY seq LIMIT ?",
+                    (self._repo_name, user, tty, after, limit),
+                )
+                .fetchall()
+            )
+            if not rows:
+                return [], after
+            messages: list[Message] = []
+            for seq, data in rows:
+                after = seq
+                try:
+                    messages.append(Message.model_validate_json(data))
+                except (ValidationError, ValueError):
+                    continue
+            if messages:
+                return messages, after
+
+    async def _remove(self, user: str, tty: str, ids: Sequence[uuid.UUID]) -> None:
+        if not ids:
+            return
+        marks = ",".join("?" * len(ids))
+        sql = f"DELETE FROM messages WHERE repo = ? AND user = ? AND tty = ? AND id IN ({marks})"  # noqa: E501, S608 — placeholders only
+        await self._write(sql, (self._repo_name, user, tty, *(str(i) for i in ids)))
+
+    def _touch_session(self, key: str, user: str, tty: str) -> None:
+        """Heartbeat body: bump ``last_active`` or create a bare session."""
+        with self._db() as db:
+            # Take the write lock first so the read and the write are one
+            # step — a concurrent update_session cannot slip in between.
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT data FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            existing = _load_session(row[0]) if row else None
+            if existing is not None:
+                session = existing.model_copy(update={"last_active": datetime.now(UTC)})
+            else:
+                session = UserSession(user=user, tty=tty)
+            self._store_session(db, key, session)
+
+    def _put_session(self, key: str, session: UserSession) -> None:
+        with self._db() as db:
+            self._store_session(db, key, session)
+
+    def _store_session(
+        self, db: sqlite3.Connection, key: str, session: UserSession
+    ) -> None:
+        db.execute(
+            "INSERT OR REPLACE INTO sessions (key, repo, user, last_active, data) "
+            "VALUES (?,?,?,?,?)",
+            (
+                key,
+                session.repo or self._repo_name,
+                session.user,
+                session.last_active.timestamp(),
+                session.model_dump_json(),
+            ),
+        )
+
+    async def _select_sessions(
+        self, where: str, params: tuple[object, ...]
+    ) -> list[UserSession]:
+        clauses = ["last_active >= ?"]
+        args: list[object] = [_ttl_cutoff()]
+        if self._repo_name:
+            clauses.append("repo = ?")
+            args.append(self._repo_name)
+        if where:
+            clauses.append(where)
+            args.extend(params)
+        rows = await self._rows(
+            f"SELECT data FROM sessions WHERE {' AND '.join(clauses)}",  # noqa: S608 — fixed clauses
+            args,
+        )
+        return [s for (data,) in rows if (s := _load_session(data)) is not None]
+
+
+def _ttl_cutoff(now: float | None = None) -> float:
+    """Oldest ``last_active`` / reservation time still inside the TTL."""
+    return (time.time() if now is None else now) - SESSION_TTL_SECONDS
+
+
+def _load_session(data: str) -> UserSession | None:
+    try:
+        return UserSession.model_validate_json(data)
+    except (ValidationError, ValueError):
+        return None
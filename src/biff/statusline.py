@@ -6,6 +6,12 @@ status line: repo:branch, context usage, session cost, and biff messaging.
 
 If the user had a pre-existing status line command before biff was installed,
 it is stashed and its output replaces the repo/context/cost segments.
+
+The runtime path runs on every status bar render, so module-level imports
+here stay stdlib-only (plus the stdlib-only ``biff._stdlib``,
+``biff.session_key`` and ``biff.unread``).  ``biff-statusline``
+(``_statusline_entry.py``) imports this module directly and skips the
+full CLI.  Install-time helpers import heavier modules lazily.
 """
 
 from __future__ import annotations
@@ -20,7 +26,6 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from biff._stdlib import BIFF_DATA_DIR
-from biff.relay import atomic_write
 from biff.session_key import find_session_key
 from biff.unread import (
     DisplayItemView,
@@ -68,6 +73,8 @@ def read_settings(path: Path) -> dict[str, object]:
 
 def write_settings(path: Path, settings: dict[str, object]) -> None:
     """Atomic write of *settings* to *path*."""
+    from biff.relay import atomic_write  # noqa: PLC0415 — keeps render path light
+
     atomic_write(path, json.dumps(settings, indent=2) + "\n")
 
 
@@ -89,6 +96,8 @@ def read_stash(path: Path) -> str | dict[str, object] | None:
 
 def write_stash(path: Path, value: str | dict[str, object] | None) -> None:
     """Persist the original ``statusLine`` value to the stash file."""
+    from biff.relay import atomic_write  # noqa: PLC0415 — keeps render path light
+
     atomic_write(path, json.dumps({"original": value}) + "\n")
 
 
@@ -349,7 +358,12 @@ def _biff_statusline_setting() -> dict[str, str]:
     """Build the ``statusLine`` settings object for Claude Code.
 
     Claude Code requires ``{"type": "command", "command": "..."}``.
+    Prefers the stdlib-only ``biff-statusline`` entry point; falls back
+    to ``biff statusline`` (full CLI import) when it is not on ``PATH``.
     """
+    fast = shutil.which("biff-statusline")
+    if fast:
+        return {"type": "command", "command": fast}
     cmd, base = _resolve_biff_command()
     parts = [cmd, *base, "statusline"]
     return {"type": "command", "command": " ".join(parts)}
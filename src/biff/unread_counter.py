@@ -0,0 +1,112 @@
+"""Push-maintained unread count for one JetStream inbox subject.
+
+The MCP poller asks for the unread summary every 2 seconds.  Answering
+with ``stream_info(subjects_filter=...)`` costs two JetStream API calls
+per session per tick (~120/minute for one idle session).  Instead,
+:class:`~biff.nats_relay.NatsRelay` taps each inbox subject with two
+core-NATS subscriptions and feeds an :class:`UnreadCounter`:
+
+- the inbox subject itself — every ``deliver`` publish is seen as it is
+  stored, so the count goes up without a query;
+- the consumer's ack subject (``$JS.ACK.{stream}.{durable}.>``) — an ack
+  or ``term`` from *any* process removes the message from the
+  ``WORK_QUEUE``, so the count goes down.  Acks name the stream sequence,
+  which lets a local decrement and the echo of the same ack on the wire
+  count once.
+
+Anything the taps cannot see — stream limits, purges, messages published
+while the connection was down — is corrected by a periodic
+:meth:`UnreadCounter.reconcile` against ``stream_info``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+# Acks that remove a message from a WORK_QUEUE stream.  An empty payload is
+# a plain ack; ``+NXT`` acks and requests the next message.  ``-NAK`` and
+# ``+WPI`` leave the message pending.
+_REMOVING_ACKS = (b"+ACK", b"+TERM", b"+NXT")
+
+# $JS.ACK.<stream>.<consumer>.<delivered>.<sseq>.<cseq>.<ts>.<pending>
+_V1_TOKENS = 9
+_V1_STREAM_SEQ = 5
+# $JS.ACK.<domain>.<hash>.<stream>.<consumer>.<delivered>.<sseq>.<cseq>.<ts>...
+_V2_MIN_TOKENS = 11
+_V2_STREAM_SEQ = 7
+
+# Stream sequences remembered for ack de-duplication.  Only has to cover
+# the window between a local decrement and its echo on the wire.
+_REMOVED_MEMORY = 1024
+
+
+def removed_stream_seq(ack_subject: str, payload: bytes) -> int | None:
+    """Return the stream sequence an ack removes, or ``None``.
+
+    ``None`` for acks that leave the message pending (nak, in-progress)
+    and for subjects that are not JetStream ack replies.
+    """
+    if payload and not payload.startswith(_REMOVING_ACKS):
+        return None
+    tokens = ack_subject.split(".")
+    if tokens[:2] != ["$JS", "ACK"]:
+        return None
+    if len(tokens) == _V1_TOKENS:
+        raw = tokens[_V1_STREAM_SEQ]
+    elif len(tokens) >= _V2_MIN_TOKENS:
+        raw = tokens[_V2_STREAM_SEQ]
+    else:
+        return None
+    return int(raw) if raw.isdigit() else None
+
+
+class UnreadCounter:
+    """Unread messages on one inbox subject, adjusted by push events.
+
+    :attr:`count` is authoritative only after the first :meth:`reconcile`;
+    callers check :meth:`needs_reconcile` and query the stream when it is
+    ``True``.
+    """
+
+    def __init__(self, reconcile_interval: float) -> None:
+        self._interval = reconcile_interval
+        self._count = 0
+        self._reconciled_at: float | None = None
+        self._removed: OrderedDict[int, None] = OrderedDict()
+
+    @property
+    def count(self) -> int:
+        """Current unread count (never negative)."""
+        return self._count
+
+    def needs_reconcile(self, now: float) -> bool:
+        """Whether the count must be re-read from the stream before use."""
+        return (
+            self._reconciled_at is None or now - self._reconciled_at >= self._interval
+        )
+
+    def reconcile(self, count: int, now: float) -> None:
+        """Replace the count with the stream's own figure."""
+        self._count = count
+        self._reconciled_at = now
+
+    def invalidate(self) -> None:
+        """Force a reconcile on the next read (events may have been missed)."""
+        self._reconciled_at = None
+
+    def apply_publish(self) -> None:
+        """A message was published to the subject."""
+        self._count += 1
+
+    def apply_removed(self, stream_seq: int) -> None:
+        """The message at *stream_seq* was acked or terminated.
+
+        Idempotent per sequence: the local fetch path and the ack observed
+        on the wire both report the same removal.
+        """
+        if stream_seq in self._removed:
+            return
+        self._removed[stream_seq] = None
+        if len(self._removed) > _REMOVED_MEMORY:
+            self._removed.popitem(last=False)
+        self._count = max(0, self._count - 1)
@@ -34,6 +34,18 @@ def _confine_git_walk(  # pyright: ignore[reportUnusedFunction]
     monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
 
 
+@pytest.fixture(autouse=True)
+def _isolate_identity_cache(  # pyright: ignore[reportUnusedFunction]
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Keep the ``gh`` identity cache out of the real ``~/.punt-labs/biff``.
+
+    Every test starts with an empty cache, so ``get_github_identity``
+    queries ``gh`` (or its mock) exactly as it did before the cache.
+    """
+    monkeypatch.setattr("biff.config.biff_data_dir", lambda: tmp_path / "biff-data")
+
+
 @pytest.fixture(autouse=True)
 def _reset_description_globals() -> Iterator[None]:  # pyright: ignore[reportUnusedFunction]
     """Clear ``_descriptions`` module globals around every test.
@@ -0,0 +1,122 @@
+"""Tests for the ``biff bench`` load generator (``biff.bench``).
+
+Report building, saving, and comparison run without a server; the run
+itself is exercised against a real ``nats-server`` in
+``tests/test_nats/test_bench_run.py``.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, cast
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from nats.errors import NoServersError
+from typer.testing import CliRunner
+
+from biff.__main__ import app
+from biff.bench import (
+    BenchConfig,
+    compare_reports,
+    load_report,
+    parse_mix,
+    save_report,
+    summarize,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+runner = CliRunner()
+
+
+class TestConfig:
+    def test_parse_mix(self) -> None:
+        assert parse_mix("heartbeat=3, deliver=1") == {"heartbeat": 3, "deliver": 1}
+
+    @pytest.mark.parametrize("spec", ["heartbeat", "heartbeat=x", "heartbeat=-1"])
+    def test_parse_mix_rejects_malformed(self, spec: str) -> None:
+        with pytest.raises(ValueError, match="Invalid mix entry"):
+            parse_mix(spec)
+
+    def test_unknown_operation(self) -> None:
+        with pytest.raises(ValueError, match="Unknown operation"):
+            BenchConfig(mix={"purge": 1})
+
+    def test_all_zero_weights(self) -> None:
+        with pytest.raises(ValueError, match="positive weight"):
+            BenchConfig(mix={"heartbeat": 0})
+
+    def test_refuses_production_prefix(self) -> None:
+        with pytest.raises(ValueError, match="production"):
+            BenchConfig(stream_prefix="biff")
+
+    def test_needs_two_sessions(self) -> None:
+        with pytest.raises(ValueError, match="at least 2"):
+            BenchConfig(sessions=1)
+
+
+def _report(p50: float) -> dict[str, object]:
+    samples = {"heartbeat": [p50 / 1000] * 99 + [1.0], "deliver": [0.002]}
+    return summarize(BenchConfig(), samples, {"deliver": 1}, elapsed=2.0)
+
+
+class TestReport:
+    def test_summarize(self) -> None:
+        report = _report(1.0)
+        ops = cast("dict[str, dict[str, float]]", report["operations"])
+        heartbeat = ops["heartbeat"]
+        assert heartbeat["count"] == 100
+        assert heartbeat["ops_per_sec"] == 50.0
+        assert heartbeat["p50_ms"] == 1.0
+        assert heartbeat["p99_ms"] > heartbeat["p95_ms"]
+        assert ops["deliver"]["errors"] == 1
+        assert report["total_ops"] == 101
+        json.dumps(report)  # serializable as-is
+
+    def test_save_and_load_roundtrip(self, tmp_path: Path) -> None:
+        path = save_report(_report(1.0), tmp_path / "runs" / "a.json")
+        assert load_report(path)["total_ops"] == 101
+
+    def test_load_rejects_other_json(self, tmp_path: Path) -> None:
+        path = tmp_path / "x.json"
+        path.write_text("[]")
+        with pytest.raises(ValueError, match="Not a biff bench report"):
+            load_report(path)
+
+    def test_compare_shows_ratio(self) -> None:
+        table = compare_reports(_report(1.0), _report(2.0))
+        line = next(row for row in table.splitlines() if row.startswith("heartbeat"))
+        assert "1->2 x2.00" in line
+
+
+class TestCommand:
+    @pytest.fixture(autouse=True)
+    def _no_logging_setup(self) -> Iterator[None]:
+        """Keep the CLI callback from reconfiguring logging for later tests."""
+        with (
+            patch("biff.logging_config.configure_logging"),
+            patch("biff.__main__._suppress_nats_noise"),
+        ):
+            yield
+
+    def test_prints_json_and_saves(self, tmp_path: Path) -> None:
+        out = tmp_path / "run.json"
+        with patch("biff.bench.run_bench", AsyncMock(return_value=_report(1.0))):
+            result = runner.invoke(
+                app, ["bench", "--sessions", "3", "--output", str(out)]
+            )
+        assert result.exit_code == 0, result.output
+        assert json.loads(out.read_text())["total_ops"] == 101
+
+    def test_unreachable_server_is_one_line(self) -> None:
+        with patch("biff.bench.run_bench", AsyncMock(side_effect=NoServersError())):
+            result = runner.invoke(app, ["bench"])
+        assert result.exit_code == 1
+        assert "Error: nats: no servers available" in result.output
+
+    def test_bad_mix_exits_nonzero(self) -> None:
+        result = runner.invoke(app, ["bench", "--mix", "purge=1"])
+        assert result.exit_code == 1
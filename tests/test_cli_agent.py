@@ -0,0 +1,213 @@
+"""Tests for the warm CLI agent (``biff.cli_agent``).
+
+The agent serves a faked ``cli_session`` on a short temporary socket; the
+blocking client calls run on a worker thread so the agent's event loop
+keeps answering.  The NATS-backed ``biff who`` benchmark lives in
+``tests/test_nats/test_cli_agent_bench.py``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from biff import cli_agent
+from biff._unix_socket import request_line
+from biff.cli_agent import (
+    AgentError,
+    command_fn,
+    ping,
+    run_via_agent,
+    serve,
+    socket_path,
+    stop,
+)
+from biff.cli_session import CliContext
+from biff.commands import CommandResult
+from biff.models import BiffConfig
+
+_CTX = CliContext(
+    relay=MagicMock(),
+    config=BiffConfig(user="kai", repo_name="myrepo"),
+    session_key="kai:abc123",
+    user="kai",
+    tty="abc123",
+)
+
+
+@asynccontextmanager
+async def _fake_session(
+    *,
+    interactive: bool = False,
+    user_override: str | None = None,
+) -> AsyncGenerator[CliContext]:
+    yield _CTX
+
+
+@pytest.fixture
+def sock() -> Iterator[Path]:
+    """Short socket path — Unix socket paths are capped at ~108 bytes."""
+    with tempfile.TemporaryDirectory(prefix="ba") as d:
+        yield Path(d) / "agent.sock"
+
+
+@asynccontextmanager
+async def _running(
+    path: Path, *, idle_timeout: float = 30.0
+) -> AsyncGenerator[asyncio.Task[None]]:
+    ready = asyncio.Event()
+    with patch("biff.cli_agent.cli_session", new=_fake_session):
+        task = asyncio.create_task(serve(path, idle_timeout=idle_timeout, ready=ready))
+        await asyncio.wait_for(ready.wait(), timeout=5)
+        try:
+            yield task
+        finally:
+            if not task.done():
+                await asyncio.to_thread(stop, path)
+            await asyncio.wait_for(task, timeout=5)
+
+
+class TestSocketPath:
+    def test_keyed_by_repo_and_user(self, tmp_path: Path) -> None:
+        a = socket_path(tmp_path / "a")
+        assert a == socket_path(tmp_path / "a")
+        assert a != socket_path(tmp_path / "b")
+        assert a != socket_path(tmp_path / "a", "eric")
+        assert a.parent.name == "agent"
+        assert a.suffix == ".sock"
+
+
+class TestCommandFn:
+    def test_rejects_unknown(self) -> None:
+        with pytest.raises(ValueError, match="Unknown command"):
+            command_fn("talk")
+
+    def test_resolves_at_call_time(self) -> None:
+        with patch("biff.commands.who", new_callable=AsyncMock) as mock_who:
+            assert command_fn("who") is mock_who
+
+
+class TestClientWithoutAgent:
+    def test_no_socket_file(self, sock: Path) -> None:
+        assert run_via_agent(sock, "who") is None
+        assert ping(sock) is None
+        assert stop(sock) is False
+
+    def test_stale_socket_file(self, sock: Path) -> None:
+        sock.touch()
+        assert run_via_agent(sock, "who") is None
+
+
+class TestServe:
+    async def test_runs_commands_on_the_shared_session(self, sock: Path) -> None:
+        with patch("biff.commands.finger", new_callable=AsyncMock) as mock_finger:
+            mock_finger.return_value = CommandResult(
+                text="Login: eric", json_data={"user": "eric"}
+            )
+            async with _running(sock):
+                result = await asyncio.to_thread(
+                    run_via_agent, sock, "finger", ("@eric",)
+                )
+        assert result == CommandResult(text="Login: eric", json_data={"user": "eric"})
+        mock_finger.assert_awaited_once_with(_CTX, "@eric")
+
+    async def test_kwargs_forwarded(self, sock: Path) -> None:
+        with patch("biff.commands.wall", new_callable=AsyncMock) as mock_wall:
+            mock_wall.return_value = CommandResult(text="Wall cleared.")
+            async with _running(sock):
+                await asyncio.to_thread(
+                    run_via_agent, sock, "wall", ("", ""), {"clear": True}
+                )
+        mock_wall.assert_awaited_once_with(_CTX, "", "", clear=True)
+
+    async def test_ping_reports_session(self, sock: Path) -> None:
+        async with _running(sock):
+            reply = await asyncio.to_thread(ping, sock)
+        assert reply is not None
+        assert reply["session_key"] == "kai:abc123"
+
+    async def test_socket_is_private_and_removed(self, sock: Path) -> None:
+        async with _running(sock):
+            assert sock.stat().st_mode & 0o777 == 0o600
+        assert not sock.exists()
+
+    async def test_oversized_request_is_malformed(self, sock: Path) -> None:
+        """A line past the read limit gets a fault reply, not a dropped socket."""
+        line = b'{"command": "who", "pad": "' + b"x" * 70_000 + b'"}\n'
+        async with _running(sock):
+            reply = await asyncio.to_thread(
+                request_line, sock, line, connect_timeout=1.0, reply_timeout=5.0
+            )
+        assert json.loads(reply) == {"fault": "Malformed request"}
+
+    async def test_value_error_becomes_fault(self, sock: Path) -> None:
+        with patch(
+            "biff.commands.who",
+            new_callable=AsyncMock,
+            side_effect=ValueError("no relay configured"),
+        ):
+            async with _running(sock):
+                with pytest.raises(ValueError, match="no relay configured"):
+                    await asyncio.to_thread(run_via_agent, sock, "who")
+
+    async def test_unexpected_error_keeps_agent_up(self, sock: Path) -> None:
+        with patch(
+            "biff.commands.who", new_callable=AsyncMock, side_effect=KeyError("x")
+        ):
+            async with _running(sock) as task:
+                with pytest.raises(ValueError, match="KeyError"):
+                    await asyncio.to_thread(run_via_agent, sock, "who")
+                assert not task.done()
+
+    async def test_exits_when_idle(self, sock: Path) -> None:
+        async with _running(sock, idle_timeout=0.2) as task:
+            await asyncio.wait_for(task, timeout=5)
+        assert not sock.exists()
+
+    async def test_refuses_live_socket(self, sock: Path) -> None:
+        async with _running(sock):
+            with pytest.raises(RuntimeError, match="already running"):
+                await serve(sock)
+
+    async def test_silent_agent_raises_agent_error(self, sock: Path) -> None:
+        """A request that was sent but never answered is not retried."""
+
+        async def _hang(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            await reader.readline()
+            writer.close()
+
+        server = await asyncio.start_unix_server(_hang, path=str(sock))
+        async with server:
+            with pytest.raises(AgentError):
+                await asyncio.to_thread(run_via_agent, sock, "who")
+
+
+class TestMainUsesAgent:
+    def test_inline_command_prefers_agent(self, tmp_path: Path) -> None:
+        from typer.testing import CliRunner
+
+        from biff.__main__ import app
+
+        reply = CommandResult(text="from agent")
+        with (
+            patch("biff.logging_config.configure_logging"),
+            patch("biff.__main__._suppress_nats_noise"),
+            patch("biff.__main__.find_git_root", return_value=tmp_path),
+            patch.object(cli_agent, "_request") as mock_request,
+            patch("biff.__main__.cli_session") as mock_session,
+        ):
+            mock_request.return_value = {"text": reply.text, "error": False}
+            result = CliRunner().invoke(app, ["who"])
+        assert result.exit_code == 0
+        assert "from agent" in result.output
+        mock_session.assert_not_called()
+        assert mock_request.call_args.args[0] == socket_path(tmp_path)
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
 from biff.cli_session import CliContext
 from biff.commands.write import write
 from biff.models import UserSession
 from biff.relay import LocalRelay
 
+if TYPE_CHECKING:
+    import pytest
+
 
 class TestWrite:
     async def test_send_to_user(self, ctx: CliContext, relay: LocalRelay) -> None:
@@ -43,6 +49,19 @@ class TestWrite:
         assert isinstance(json_data, dict)
         assert json_data["parts"] == 2
 
+    async def test_failed_part_is_reported(
+        self, ctx: CliContext, relay: LocalRelay, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            relay, "deliver_many", AsyncMock(return_value=[None, OSError("disk full")])
+        )
+        result = await write(ctx, "@eric", " ".join(["word"] * 200))
+        assert result.error
+        assert result.text == "Parts 2 of 2 failed: disk full"
+        json_data = result.json_data
+        assert isinstance(json_data, dict)
+        assert json_data["failed_parts"] == [2]
+
     async def test_short_message_no_parts_label(
         self, ctx: CliContext, relay: LocalRelay
     ) -> None:
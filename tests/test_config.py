@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+import os
 import subprocess
+import sys
+import time
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 
+from biff import _stdlib, config
 from biff._stdlib import _parse_repo_slug
 from biff.config import (
+    _GH_TOKEN_VARS,  # pyright: ignore[reportPrivateUsage]
     DEMO_RELAY_URL,
     EthosIdentity,
     GitHubIdentity,
+    _ConfigFields,  # pyright: ignore[reportPrivateUsage]
     compute_data_dir,
     extract_biff_fields,
     find_git_root,
@@ -23,6 +29,7 @@ from biff.config import (
     get_repo_slug,
     load_cli_config,
     load_mcp_config,
+    refresh_stale_github_identity,
     resolve_agent_identity_from_disk,
     sanitize_repo_name,
 )
@@ -103,6 +110,132 @@ class TestGetGithubIdentity:
             assert get_github_identity() is None
 
 
+class _FakeGh:
+    """A ``gh`` on ``PATH`` that sleeps, then prints a login and name."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.bin = root / "bin"
+        self.bin.mkdir(parents=True)
+        script = self.bin / "gh"
+        script.write_text(
+            f"#!{sys.executable}\n"
+            "import pathlib, time\n"
+            f"root = pathlib.Path({str(root)!r})\n"
+            "time.sleep(float((root / 'sleep').read_text()))\n"
+            "print((root / 'user').read_text())\n"
+        )
+        script.chmod(0o755)
+        self.answer("octo\tOcto Cat")
+
+    def answer(self, user: str, *, sleep: float = 0.0) -> None:
+        (self.root / "user").write_text(user)
+        (self.root / "sleep").write_text(str(sleep))
+
+
+@pytest.fixture
+def fake_gh(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> _FakeGh:
+    """Fake ``gh`` first on ``PATH``; the cache under a throwaway ``HOME``.
+
+    ``HOME`` (not a patched ``biff_data_dir``) isolates the cache so the
+    detached refresh process writes to the same place.
+    """
+    gh = _FakeGh(tmp_path / "gh")
+    monkeypatch.setenv("PATH", f"{gh.bin}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    for var in ("GH_HOST", "GH_CONFIG_DIR", "XDG_CONFIG_HOME", *_GH_TOKEN_VARS):
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.setattr(config, "biff_data_dir", _stdlib.biff_data_dir)
+    return gh
+
+
+def _cache_stale(login: str) -> None:
+    """Seed a cache entry for the current credentials, past its TTL."""
+    config._write_identity_cache(  # pyright: ignore[reportPrivateUsage]
+        config._identity_cache_key(),  # pyright: ignore[reportPrivateUsage]
+        GitHubIdentity(login=login, display_name=""),
+        fetched_at=0.0,
+        attempted_at=0.0,
+    )
+
+
+def _cached_login() -> str | None:
+    key = config._identity_cache_key()  # pyright: ignore[reportPrivateUsage]
+    cached = config._read_identity_cache(key)  # pyright: ignore[reportPrivateUsage]
+    return None if cached is None else cached.identity.login
+
+
+class TestGithubIdentityCache:
+    def test_miss_queries_gh_then_hit_skips_it(self, fake_gh: _FakeGh) -> None:
+        assert get_github_identity() == GitHubIdentity("octo", "Octo Cat")
+
+        fake_gh.answer("other", sleep=30)
+        start = time.monotonic()
+        assert get_github_identity() == GitHubIdentity("octo", "Octo Cat")
+        assert time.monotonic() - start < 1.0
+
+    def test_miss_is_bounded_by_timeout(
+        self, fake_gh: _FakeGh, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(config, "_GH_TIMEOUT", 0.5)
+        fake_gh.answer("octo", sleep=30)
+
+        start = time.monotonic()
+        assert get_github_identity() is None
+        assert time.monotonic() - start < 5.0
+        assert _cached_login() is None
+
+    def test_stale_startup_does_not_wait_for_gh(
+        self, fake_gh: _FakeGh, tmp_path: Path
+    ) -> None:
+        """The CLI starts on the stale login; a detached process refreshes."""
+        _cache_stale("old-login")
+        fake_gh.answer("octo\tOcto Cat", sleep=1.0)
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        _setup_repo_with_yaml(repo)
+
+        start = time.monotonic()
+        with patch("biff.config.get_repo_slug", return_value=None):
+            resolved = load_cli_config(start=repo)
+        assert time.monotonic() - start < 1.0
+        assert resolved.config.user == "old-login"
+
+        deadline = time.monotonic() + 20
+        while _cached_login() != "octo" and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert _cached_login() == "octo"
+
+    def test_credential_change_misses_the_cache(
+        self, fake_gh: _FakeGh, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        assert get_github_identity() is not None
+        monkeypatch.setenv("GH_TOKEN", "gho_other")
+        fake_gh.answer("other")
+
+        identity = get_github_identity()
+
+        assert identity is not None
+        assert identity.login == "other"
+
+    def test_server_defers_refresh_to_its_task(self, fake_gh: _FakeGh) -> None:
+        _cache_stale("old-login")
+
+        identity = get_github_identity(background_refresh=False)
+        assert identity is not None
+        assert identity.login == "old-login"
+        time.sleep(0.5)
+        assert _cached_login() == "old-login"  # nothing spawned
+
+        refresh_stale_github_identity()
+        assert _cached_login() == "octo"
+
+        fake_gh.answer("other", sleep=30)
+        start = time.monotonic()
+        refresh_stale_github_identity()  # fresh: no gh call
+        assert time.monotonic() - start < 1.0
+
+
 # -- get_os_user --
 
 
@@ -571,6 +704,199 @@ class TestLoadMcpConfig:
         assert resolved.config.relay_url == DEMO_RELAY_URL
         assert resolved.config.relay_auth is not None
 
+    @patch("biff.config.get_github_identity", return_value=_KAI)
+    def test_slow_op_threshold_from_local_yaml(
+        self, _mock_gh: object, tmp_path: Path
+    ) -> None:
+        repo = _setup_repo_with_yaml(tmp_path)
+        local = repo / ".punt-labs" / "biff" / "config.local.yaml"
+        local.write_text("slow_op_threshold: 0.25\n")
+        assert load_mcp_config(start=repo).config.slow_op_threshold == 0.25
+        local.write_text("slow_op_threshold: -1\n")
+        assert load_mcp_config(start=repo).config.slow_op_threshold == 1.0
+
+
+# -- compiled-config cache --
+
+
+def _git_repo(root: Path, remote: str = "git@github.com:punt-labs/biff.git") -> Path:
+    """A real git repo with an origin remote and a shared config.yaml."""
+    root.mkdir()
+    subprocess.run(["git", "init", "-q", str(root)], check=True)  # noqa: S603, S607
+    _set_remote(root, remote, add=True)
+    biff_dir = root / ".punt-labs" / "biff"
+    biff_dir.mkdir(parents=True)
+    (biff_dir / "config.yaml").write_text("relay:\n  url: tls://shared\n")
+    return root
+
+
+def _set_remote(root: Path, url: str, *, add: bool = False) -> None:
+    verb = "add" if add else "set-url"
+    subprocess.run(  # noqa: S603
+        ["git", "-C", str(root), "remote", verb, "origin", url],  # noqa: S607
+        check=True,
+    )
+
+
+def _resolve(root: Path) -> _ConfigFields:
+    return config._resolve_config_fields(root)  # pyright: ignore[reportPrivateUsage]
+
+
+class _CountingCompile:
+    """Spy on ``_read_config_fields``: how many times config was compiled."""
+
+    def __init__(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        self.calls = 0
+        self._real = config._read_config_fields  # pyright: ignore[reportPrivateUsage]
+        monkeypatch.setattr(config, "_read_config_fields", self)
+
+    def __call__(self, repo_root: Path) -> _ConfigFields:
+        self.calls += 1
+        return self._real(repo_root)
+
+
+@pytest.fixture
+def compiles(monkeypatch: pytest.MonkeyPatch) -> _CountingCompile:
+    monkeypatch.setattr(config, "get_ethos_team", lambda: None)
+    return _CountingCompile(monkeypatch)
+
+
+class TestCompiledConfigCache:
+    def test_unchanged_inputs_skip_yaml_and_git(
+        self, tmp_path: Path, compiles: _CountingCompile
+    ) -> None:
+        repo = _git_repo(tmp_path / "repo")
+        first = _resolve(repo)
+        assert first.relay_url == "tls://shared"
+        assert first.orgs == ("punt-labs",)
+
+        with (
+            patch("biff.config.yaml.safe_load", side_effect=AssertionError),
+            patch("biff.config.get_repo_owner", side_effect=AssertionError),
+        ):
+            assert _resolve(repo) == first
+        assert compiles.calls == 1
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            ".punt-labs/biff/config.yaml",
+            ".punt-labs/biff/config.local.yaml",
+            ".git/config",
+        ],
+    )
+    def test_touching_an_input_recompiles(
+        self, tmp_path: Path, compiles: _CountingCompile, name: str
+    ) -> None:
+        repo = _git_repo(tmp_path / "repo")
+        path = repo / name
+        path.touch()
+        _resolve(repo)
+        _resolve(repo)
+        assert compiles.calls == 1
+
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        _resolve(repo)
+
+        assert compiles.calls == 2
+
+    def test_edits_are_picked_up(
+        self, tmp_path: Path, compiles: _CountingCompile
+    ) -> None:
+        repo = _git_repo(tmp_path / "repo")
+        biff_dir = repo / ".punt-labs" / "biff"
+        _resolve(repo)
+
+        (biff_dir / "config.yaml").write_text("relay:\n  url: tls://edited\n")
+        assert _resolve(repo).relay_url == "tls://edited"
+
+        (biff_dir / "config.local.yaml").write_text("relay:\n  url: tls://local\n")
+        assert _resolve(repo).relay_url == "tls://local"
+
+        (biff_dir / "config.local.yaml").unlink()
+        assert _resolve(repo).relay_url == "tls://edited"
+
+        _set_remote(repo, "git@github.com:jmf-pobox/biff.git")
+        assert _resolve(repo).orgs == ("jmf-pobox",)
+
+        (biff_dir / "config.yaml").unlink()
+        assert _resolve(repo).relay_url == DEMO_RELAY_URL
+        assert compiles.calls == 6
+
+    def test_ethos_team_reused_within_ttl(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        repo = _git_repo(tmp_path / "repo")
+        asked: list[int] = []
+
+        def ethos_team() -> tuple[str, ...]:
+            asked.append(1)
+            return ("eric", "kai")
+
+        monkeypatch.setattr(config, "get_ethos_team", ethos_team)
+        assert _resolve(repo).team == ("eric", "kai")
+        assert _resolve(repo).team == ("eric", "kai")
+        assert len(asked) == 1
+
+        monkeypatch.setattr(config, "_ETHOS_TEAM_TTL", 0.0)
+        _resolve(repo)
+        assert len(asked) == 2
+
+    def test_configured_team_never_asks_ethos(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        repo = _git_repo(tmp_path / "repo")
+        (repo / ".punt-labs" / "biff" / "config.yaml").write_text(
+            "team:\n  members:\n    - kai\n"
+        )
+        monkeypatch.setattr(config, "get_ethos_team", Mock(side_effect=AssertionError))
+
+        assert _resolve(repo).team == ("kai",)
+        assert _resolve(repo).team == ("kai",)
+
+    def test_demo_creds_follow_the_installed_package(
+        self, tmp_path: Path, compiles: _CountingCompile
+    ) -> None:
+        """A cached demo-relay config survives a reinstall to a new path."""
+        repo = _git_repo(tmp_path / "repo")
+        (repo / ".punt-labs" / "biff" / "config.yaml").unlink()
+        _resolve(repo)
+
+        moved = tmp_path / "new-venv" / "demo.creds"
+        with patch("biff.config.demo_creds_path", return_value=moved):
+            auth = _resolve(repo).relay_auth
+        assert auth is not None
+        assert auth.user_credentials == str(moved)
+        assert compiles.calls == 1
+
+    def test_worktree_tracks_the_common_git_config(
+        self, tmp_path: Path, compiles: _CountingCompile
+    ) -> None:
+        repo = _git_repo(tmp_path / "repo")
+        subprocess.run(  # noqa: S603
+            ["git", "-C", str(repo), "commit", "-q", "--allow-empty", "-m", "init"],  # noqa: S607
+            check=True,
+            env={
+                **os.environ,
+                "GIT_AUTHOR_NAME": "t",
+                "GIT_AUTHOR_EMAIL": "t@example.com",
+                "GIT_COMMITTER_NAME": "t",
+                "GIT_COMMITTER_EMAIL": "t@example.com",
+            },
+        )
+        worktree = tmp_path / "wt"
+        subprocess.run(  # noqa: S603
+            ["git", "-C", str(repo), "worktree", "add", "-q", str(worktree)],  # noqa: S607
+            check=True,
+        )
+        assert _resolve(worktree).orgs == ("punt-labs",)
+
+        _set_remote(repo, "git@github.com:jmf-pobox/biff.git")
+
+        assert _resolve(worktree).orgs == ("jmf-pobox",)
+        assert compiles.calls == 2
+
 
 # -- get_ethos_team --
 
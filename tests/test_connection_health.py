@@ -193,11 +193,13 @@ class TestWedgeOnsetRecovery:
 
         entry = MagicMock()
         entry.value = UserSession(user="kai", tty="abc123").model_dump_json().encode()
+        entry.revision = 7
         kv = MagicMock()
         kv.get = AsyncMock(return_value=entry)
-        kv.put = AsyncMock(side_effect=TimeoutError)
+        kv.update = AsyncMock(side_effect=TimeoutError)
         js = MagicMock()
         relay._ensure_connected = AsyncMock(return_value=(js, kv))  # type: ignore[method-assign]
+        relay._leader_kv = MagicMock(return_value=kv)  # type: ignore[method-assign]
 
         caplog.set_level(logging.DEBUG, logger=_LOGGER_NAME)
         with pytest.raises(TimeoutError):
@@ -18,6 +18,7 @@ from biff.doctor import (
     _check_user_commands,
     _check_user_import,
     _print_check,
+    _relay_stats_detail,
     _resolve_relay_config,
     check_environment,
 )
@@ -254,12 +255,21 @@ class TestResolveRelayConfig:
 
 
 class TestCheckRelay:
+    @patch("biff.doctor._relay_stats_detail", return_value="Relay stats: x")
     @patch("biff.doctor._test_nats_connection", return_value=True)
     @patch("biff.doctor._resolve_relay_config")
-    def test_reachable(self, mock_config: object, _mock_conn: object) -> None:
+    def test_reachable(
+        self, mock_config: object, _mock_conn: object, _mock_stats: object
+    ) -> None:
         mock_config.return_value = ("nats://localhost:4222", None)  # type: ignore[attr-defined]
         result = _check_relay()
         assert result.passed
+        assert result.detail == "Relay stats: x"
+
+    @patch("biff.doctor._probe_relay_stats", side_effect=OSError("refused"))
+    def test_stats_probe_failure_is_a_note(self, _mock_probe: object) -> None:
+        detail = _relay_stats_detail("nats://localhost:4222", None)
+        assert detail == "Relay stats: probe failed"
 
     @patch("biff.doctor._test_nats_connection", return_value=False)
     @patch("biff.doctor._resolve_relay_config")
@@ -276,6 +286,17 @@ class TestCheckRelay:
         assert not result.passed
         assert "connection error" in result.message
 
+    @patch("biff.doctor._test_nats_connection")
+    @patch("biff.doctor._resolve_relay_config")
+    def test_sqlite_relay_skips_nats(
+        self, mock_config: object, mock_conn: object
+    ) -> None:
+        mock_config.return_value = ("sqlite:///tmp/biff.db", None)  # type: ignore[attr-defined]
+        result = _check_relay()
+        assert result.passed
+        assert "SQLite" in result.message
+        mock_conn.assert_not_called()  # type: ignore[attr-defined]
+
 
 # -- Output ------------------------------------------------------------------
 
@@ -293,6 +314,11 @@ class TestPrintCheck:
         _print_check(CheckResult("test", False, "skip", required=False))
         assert "\u25cb" in capsys.readouterr().out  # type: ignore[attr-defined]
 
+    def test_detail_printed_indented(self, capsys: object) -> None:
+        _print_check(CheckResult("relay", True, "ok", detail="line one\nline two"))
+        out = capsys.readouterr().out  # type: ignore[attr-defined]
+        assert "      line one\n      line two\n" in out
+
 
 # -- Aggregator --------------------------------------------------------------
 
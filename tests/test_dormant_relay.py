@@ -16,6 +16,11 @@ class TestDormantRelay:
         msg = Message(from_user="kai", to_user="eric:tty2", body="hello")
         await relay.deliver(msg)  # should not raise
 
+    async def test_deliver_many_reports_success(self) -> None:
+        relay = DormantRelay()
+        msgs = [Message(from_user="kai", to_user="eric", body=b) for b in "ab"]
+        assert await relay.deliver_many(msgs) == [None, None]
+
     async def test_fetch_returns_empty(self) -> None:
         relay = DormantRelay()
         assert await relay.fetch("eric:tty2") == []
@@ -29,6 +34,16 @@ class TestDormantRelay:
         summary = await relay.get_unread_summary("eric:tty2")
         assert summary.count == 0
 
+    async def test_fetch_inboxes_returns_empty(self) -> None:
+        relay = DormantRelay()
+        assert await relay.fetch_inboxes(["eric:tty2"]) == {"eric:tty2": ([], [])}
+        summary = await relay.get_combined_unread_summary(["eric:tty2"])
+        assert summary.count == 0
+
+    async def test_drain_yields_nothing(self) -> None:
+        relay = DormantRelay()
+        assert [page async for page in relay.drain("eric:tty2")] == []
+
     async def test_fetch_user_inbox_returns_empty(self) -> None:
         relay = DormantRelay()
         assert await relay.fetch_user_inbox("eric") == []
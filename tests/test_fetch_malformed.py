@@ -35,6 +35,7 @@ def _raw(data: bytes) -> MagicMock:
     raw = MagicMock()
     raw.data = data
     raw.ack = AsyncMock()
+    raw.ack_sync = AsyncMock()
     raw.term = AsyncMock()
     return raw
 
@@ -68,10 +69,13 @@ class TestMalformedFrameNotSilentlyDropped:
         relay, js = _relay_with([bad])
         caplog.set_level(logging.ERROR, logger=_LOGGER_NAME)
 
-        messages = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
+        messages, pulled = await relay._fetch_from_subject(
+            js, subject=_SUBJECT, durable="d"
+        )
 
-        assert messages == []
+        assert (messages, pulled) == ([], 1)  # pulled, just not delivered
         bad.ack.assert_not_awaited()  # never acked-and-deleted as if delivered
+        bad.ack_sync.assert_not_awaited()
         bad.term.assert_awaited_once()  # dead-lettered via JetStream term
         assert any(
             r.levelno == logging.ERROR and "malformed" in r.getMessage().lower()
@@ -82,10 +86,11 @@ class TestMalformedFrameNotSilentlyDropped:
         good = _raw(_valid_payload("ok"))
         relay, js = _relay_with([good])
 
-        messages = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
+        messages, _ = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
 
         assert [m.body for m in messages] == ["ok"]
-        good.ack.assert_awaited_once()  # WORK_QUEUE deletes on ack
+        # WORK_QUEUE deletes on ack; a batch's last ack is synchronous.
+        good.ack_sync.assert_awaited_once()
         good.term.assert_not_awaited()
 
     async def test_mixed_batch_terms_bad_acks_good(self) -> None:
@@ -93,7 +98,7 @@ class TestMalformedFrameNotSilentlyDropped:
         bad = _raw(b"\xff\xfe not json")
         relay, js = _relay_with([good, bad])
 
-        messages = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
+        messages, _ = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
 
         assert [m.body for m in messages] == ["keep"]
         good.ack.assert_awaited_once()
@@ -136,7 +141,7 @@ class TestMalformedFrameLogDoesNotLeakContent:
         relay, js = _relay_with([bad])
         caplog.set_level(logging.ERROR, logger=_LOGGER_NAME)
 
-        messages = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
+        messages, _ = await relay._fetch_from_subject(js, subject=_SUBJECT, durable="d")
 
         assert messages == []
         bad.term.assert_awaited_once()  # still poison-terminated
@@ -0,0 +1,321 @@
+"""Tests for the resident PreToolUse gate daemon (``biff.hook_daemon``).
+
+The daemon runs on a background thread against a temporary ``$HOME`` and
+a real git repo, so decisions exercise the same marker files the
+in-process hook reads.  The latency benchmark (``-m slow``) spawns hook
+processes with and without a daemon and prints p50/p99 per invocation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from biff._hook_entry import _pre_tool_use_via_daemon
+from biff.hook import _plan_unverified_deny  # pyright: ignore[reportPrivateUsage]
+from biff.hook_daemon import GateState, query_gate, serve, socket_path
+from biff.markers import clear_plan_marker, write_plan_marker
+
+
+def _fake_which(_: str) -> str:
+    return "/bin/biff"
+
+
+@pytest.fixture
+def home(monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Short temporary ``$HOME`` — Unix socket paths are capped at ~108 bytes."""
+    with tempfile.TemporaryDirectory(prefix="bh") as d:
+        monkeypatch.setenv("HOME", d)
+        monkeypatch.setattr("shutil.which", _fake_which)
+        yield Path(d)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A biff-enabled git repo."""
+    root = tmp_path / "repo"
+    root.mkdir()
+    subprocess.run(["git", "init", "-q", str(root)], check=True)  # noqa: S603, S607
+    marker = root / ".punt-labs" / "biff" / "enabled"
+    marker.parent.mkdir(parents=True)
+    marker.touch()
+    return root.resolve()
+
+
+def _activate(home: Path) -> None:
+    active = home / ".punt-labs" / "biff" / "active"
+    active.mkdir(parents=True, exist_ok=True)
+    (active / "kai-tty1").touch()
+
+
+@pytest.fixture
+def daemon(home: Path) -> Iterator[Path]:
+    """Run :func:`serve` on a background loop; yield its socket path."""
+    path = socket_path()
+    loop = asyncio.new_event_loop()
+    ready = asyncio.Event()
+    task = loop.create_task(serve(path, ready=ready))
+
+    def run() -> None:
+        with contextlib.suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 5
+    while not ready.is_set():
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield path
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+    loop.close()
+
+
+def _reason(decision: dict[str, object] | None) -> str:
+    assert decision is not None
+    output = decision["hookSpecificOutput"]
+    assert isinstance(output, dict)
+    assert output["permissionDecision"] == "deny"  # pyright: ignore[reportUnknownMemberType]
+    return str(output["permissionDecisionReason"])  # pyright: ignore[reportUnknownArgumentType]
+
+
+# ── Decisions ────────────────────────────────────────────────────────
+
+
+class TestDaemonDecisions:
+    """The daemon answers with the same decision as the in-process gate."""
+
+    def test_no_plan_denies(self, home: Path, repo: Path, daemon: Path) -> None:
+        _activate(home)
+        assert "/plan" in _reason(query_gate(str(repo), daemon))
+
+    def test_plan_marker_takes_effect_immediately(
+        self, home: Path, repo: Path, daemon: Path
+    ) -> None:
+        """Markers are re-read per request — no restart, no invalidation."""
+        _activate(home)
+        query_gate(str(repo), daemon)
+        write_plan_marker(str(repo), "auth refactor")
+        assert query_gate(str(repo), daemon) is None
+        clear_plan_marker(str(repo))
+        assert query_gate(str(repo), daemon) is not None
+
+    def test_subdirectory_uses_worktree_root(
+        self, home: Path, repo: Path, daemon: Path
+    ) -> None:
+        _activate(home)
+        sub = repo / "src" / "pkg"
+        sub.mkdir(parents=True)
+        write_plan_marker(str(repo), "auth refactor")
+        assert query_gate(str(sub), daemon) is None
+
+    def test_not_enabled_allows(self, home: Path, repo: Path, daemon: Path) -> None:
+        _activate(home)
+        (repo / ".punt-labs" / "biff" / "enabled").unlink()
+        assert query_gate(str(repo), daemon) is None
+
+    def test_no_active_session_allows(self, repo: Path, daemon: Path) -> None:
+        assert query_gate(str(repo), daemon) is None
+
+    def test_unevaluable_request_fails_closed(self, daemon: Path) -> None:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(daemon))
+            sock.sendall(b'{"op": "pre-tool-use"}\n')
+            reply = json.loads(sock.makefile("rb").readline())
+        assert reply["decision"] == _plan_unverified_deny()  # same words in-process
+
+    def test_oversized_request_fails_closed(self, daemon: Path) -> None:
+        """A line past the read limit is answered, not dropped."""
+        line = json.dumps({"op": "pre-tool-use", "cwd": "x" * 70_000}).encode()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(str(daemon))
+            sock.sendall(line + b"\n")
+            reply = json.loads(sock.makefile("rb").readline())
+        assert "/plan" in _reason(reply["decision"])
+
+    def test_socket_is_owner_only(self, daemon: Path) -> None:
+        assert daemon.stat().st_mode & 0o777 == 0o600
+
+
+class TestGateStateCache:
+    """Worktree roots are cached; git runs only on a miss."""
+
+    def test_root_resolved_once(self, home: Path, repo: Path) -> None:
+        state = GateState()
+        with patch("biff.hook._get_worktree_root", return_value=str(repo)) as mock_root:
+            state.worktree_root(str(repo))
+            state.worktree_root(str(repo))
+        mock_root.assert_called_once()
+
+    def test_removed_worktree_is_re_resolved(
+        self,
+        home: Path,
+        repo: Path,
+    ) -> None:
+        state = GateState()
+        with patch("biff.hook._get_worktree_root", return_value=str(repo)) as mock_root:
+            state.worktree_root(str(repo))
+            (repo / ".git").rename(repo / "gone")
+            state.worktree_root(str(repo))
+        assert mock_root.call_count == 2
+
+
+# ── Lifecycle and fallback ───────────────────────────────────────────
+
+
+class TestDaemonLifecycle:
+    def test_absent_daemon_raises(self, home: Path) -> None:
+        with pytest.raises(OSError):
+            query_gate("/")
+
+    def test_stale_socket_is_replaced(self, home: Path, repo: Path) -> None:
+        path = socket_path()
+        path.parent.mkdir(parents=True)
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+
+        async def once() -> None:
+            ready = asyncio.Event()
+            task = asyncio.ensure_future(serve(path, ready=ready))
+            await ready.wait()
+            await asyncio.to_thread(query_gate, str(repo), path)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(once())
+        assert not path.exists()
+
+    async def test_second_daemon_refuses(self, daemon: Path) -> None:
+        with pytest.raises(RuntimeError, match="already running"):
+            await serve(daemon)
+        assert daemon.exists()
+
+
+class TestHookEntryClient:
+    """``biff-hook claude-code pre-tool-use`` asks the daemon first."""
+
+    def test_emits_daemon_decision(
+        self,
+        home: Path,
+        repo: Path,
+        daemon: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        _activate(home)
+        monkeypatch.chdir(repo)
+        out = io.StringIO()
+        with patch("sys.stdout", out):
+            assert _pre_tool_use_via_daemon()
+        assert "/plan" in _reason(json.loads(out.getvalue()))
+
+    def test_allow_emits_nothing(
+        self,
+        repo: Path,
+        daemon: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.chdir(repo)
+        out = io.StringIO()
+        with patch("sys.stdout", out):
+            assert _pre_tool_use_via_daemon()
+        assert out.getvalue() == ""
+
+    def test_no_daemon_falls_back(self, home: Path) -> None:
+        assert not _pre_tool_use_via_daemon()
+
+
+# ── Latency benchmark ────────────────────────────────────────────────
+
+_HOOK_CMD = (
+    sys.executable,
+    "-c",
+    "from biff._hook_entry import main; main()",
+    "claude-code",
+    "pre-tool-use",
+)
+_DAEMON_CMD = (sys.executable, "-c", "from biff.hook_daemon import main; main()")
+_RUNS = 40
+_ROUND_TRIPS = 2000
+
+
+def _pct(samples: list[float], q: int) -> float:
+    return statistics.quantiles(samples, n=100)[q - 1] * 1000
+
+
+def _time_hook(repo: Path, env: dict[str, str]) -> list[float]:
+    samples: list[float] = []
+    for _ in range(_RUNS):
+        t0 = time.perf_counter()
+        proc = subprocess.run(  # noqa: S603
+            _HOOK_CMD,
+            cwd=repo,
+            env=env,
+            input=b"{}",
+            capture_output=True,
+            check=True,
+        )
+        samples.append(time.perf_counter() - t0)
+        assert proc.stdout == b""  # plan set → allow
+    return samples
+
+
+@pytest.mark.slow
+def test_hook_latency_with_and_without_daemon(home: Path, repo: Path) -> None:
+    """p50/p99 per hook invocation: in-process vs daemon-backed."""
+    _activate(home)
+    write_plan_marker(str(repo), "benchmark")
+    env = {**os.environ, "HOME": str(home)}
+
+    in_process = _time_hook(repo, env)
+
+    daemon = subprocess.Popen(_DAEMON_CMD, env=env)  # noqa: S603
+    try:
+        path = home / ".punt-labs" / "biff" / "hookd.sock"
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                query_gate(str(repo), path)
+                break
+            except OSError:
+                assert time.monotonic() < deadline, "daemon did not start"
+                time.sleep(0.05)
+        with_daemon = _time_hook(repo, env)
+        round_trips: list[float] = []
+        for _ in range(_ROUND_TRIPS):
+            t0 = time.perf_counter()
+            query_gate(str(repo), path)
+            round_trips.append(time.perf_counter() - t0)
+    finally:
+        daemon.send_signal(signal.SIGINT)
+        daemon.wait(10)
+
+    print()
+    print(f"{'path':<26} {'p50 ms':>9} {'p99 ms':>9}")
+    for label, samples in (
+        ("hook, in-process", in_process),
+        ("hook, daemon", with_daemon),
+        ("daemon round-trip only", round_trips),
+    ):
+        print(f"{label:<26} {_pct(samples, 50):>9.3f} {_pct(samples, 99):>9.3f}")
+
+    assert statistics.median(with_daemon) < statistics.median(in_process)
+    assert statistics.median(round_trips) < 0.001
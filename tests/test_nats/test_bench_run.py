@@ -0,0 +1,42 @@
+"""``biff bench`` against a real nats-server.
+
+A short run with every operation in the mix: each one is exercised,
+timed, and error-free, and the bench prefix is left clean afterwards.
+"""
+
+from __future__ import annotations
+
+from typing import cast
+
+import nats
+import pytest
+from nats.js.errors import NotFoundError
+
+from biff.bench import DEFAULT_MIX, BenchConfig, run_bench
+
+pytestmark = pytest.mark.nats
+
+_PREFIX = "biff-bench-test"
+
+
+async def test_short_run_reports_every_operation(nats_server: str) -> None:
+    config = BenchConfig(
+        url=nats_server, sessions=4, ops_per_session=60, stream_prefix=_PREFIX
+    )
+    report = await run_bench(config)
+
+    assert report["total_errors"] == 0
+    assert report["total_ops"] == 4 * 60
+    ops = cast("dict[str, dict[str, float]]", report["operations"])
+    assert set(ops) == set(DEFAULT_MIX)
+    for stats in ops.values():
+        if stats["count"]:
+            assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    try:
+        js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
+        with pytest.raises(NotFoundError):
+            await js.stream_info(f"{_PREFIX}-inbox")
+    finally:
+        await nc.close()
@@ -0,0 +1,102 @@
+"""Benchmark: 20 consecutive ``biff who`` with and without the warm agent.
+
+Without the agent every command pays the full ``cli_session`` lifecycle
+(connect, provision, login, ``who``, logout, close); with it, each is one
+Unix-socket round trip to a session that is already registered.  Both
+paths run in-process against the shared ``nats_server`` — interpreter
+start-up is the same either way and would only blur the comparison.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import tempfile
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import suppress
+from pathlib import Path
+from unittest.mock import patch
+
+import nats
+import pytest
+
+from biff import commands
+from biff.cli_agent import run_via_agent, serve
+from biff.cli_session import cli_session
+from biff.config import ResolvedConfig
+from biff.models import BiffConfig
+
+pytestmark = pytest.mark.nats
+
+_TEST_REPO = "_test-cli-agent"
+_CALLS = 20
+
+
+@pytest.fixture
+def resolved(nats_server: str, tmp_path: Path) -> Iterator[ResolvedConfig]:
+    config = ResolvedConfig(
+        config=BiffConfig(user="kai", repo_name=_TEST_REPO, relay_url=nats_server),
+        data_dir=tmp_path / "kai",
+        repo_root=tmp_path,
+    )
+    with patch("biff.cli_session.load_cli_config", return_value=config):
+        yield config
+
+
+@pytest.fixture(autouse=True)
+async def _cleanup_nats(nats_server: str) -> AsyncIterator[None]:  # pyright: ignore[reportUnusedFunction]
+    yield
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
+    with suppress(Exception):
+        await js.delete_stream("biff-inbox")
+    with suppress(Exception):
+        await js.delete_stream("biff-wtmp")
+    with suppress(Exception):
+        await js.delete_key_value("biff-sessions")  # pyright: ignore[reportUnknownMemberType]
+    await nc.close()
+
+
+async def _who_in_session() -> str:
+    async with cli_session() as ctx:
+        return (await commands.who(ctx)).text
+
+
+def _ms(samples: list[float]) -> str:
+    p95 = statistics.quantiles(samples, n=20)[-1]
+    return (
+        f"{statistics.median(samples):>9.1f} {p95:>9.1f} {sum(samples) / 1000:>8.2f}s"
+    )
+
+
+class TestCliAgentBenchmark:
+    @pytest.mark.usefixtures("resolved")
+    async def test_who_20_calls(self) -> None:
+        cold: list[float] = []
+        for _ in range(_CALLS):
+            start = time.perf_counter()
+            text = await _who_in_session()
+            cold.append((time.perf_counter() - start) * 1000)
+            assert "kai" in text
+
+        warm: list[float] = []
+        with tempfile.TemporaryDirectory(prefix="ba") as d:
+            sock = Path(d) / "agent.sock"
+            ready = asyncio.Event()
+            agent = asyncio.create_task(serve(sock, idle_timeout=0.5, ready=ready))
+            await asyncio.wait_for(ready.wait(), timeout=10)
+            for _ in range(_CALLS):
+                start = time.perf_counter()
+                result = await asyncio.to_thread(run_via_agent, sock, "who")
+                warm.append((time.perf_counter() - start) * 1000)
+                assert result is not None
+                assert "kai" in result.text
+            await asyncio.wait_for(agent, timeout=10)  # idle exit logs out
+
+        print(f"\n  biff who x{_CALLS}")
+        print(f"  {'path':<8} {'p50 ms':>9} {'p95 ms':>9} {'total':>9}")
+        print(f"  {'session':<8} {_ms(cold)}")
+        print(f"  {'agent':<8} {_ms(warm)}")
+
+        assert statistics.median(warm) < statistics.median(cold)
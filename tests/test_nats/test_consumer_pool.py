@@ -0,0 +1,138 @@
+"""Pooled inbox consumers: reads reuse one durable consumer per subject.
+
+Counts JetStream consumer API requests by subscribing a second client to
+``$JS.API.CONSUMER.>`` — core NATS delivers a copy of every API request
+to any matching subscriber, so the test sees exactly what the relay asks
+the server to do.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import nats
+import pytest
+
+from biff.models import Message
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from nats.aio.client import Client as NatsClient
+    from nats.aio.msg import Msg
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_KAI = "kai:tty1"
+_READS = 20
+
+
+class _ConsumerApiCounter:
+    """Tally consumer create/delete/info requests seen on the wire."""
+
+    def __init__(self) -> None:
+        self.subjects: list[str] = []
+
+    async def on_msg(self, msg: Msg) -> None:
+        self.subjects.append(msg.subject)
+
+    def count(self, verb: str) -> int:
+        return sum(1 for s in self.subjects if f".CONSUMER.{verb}." in s)
+
+    @property
+    def churn(self) -> int:
+        """Create plus delete requests (``DURABLE.CREATE`` included)."""
+        return self.count("CREATE") + self.count("DURABLE") + self.count("DELETE")
+
+
+@pytest.fixture
+async def observer(nats_server: str) -> AsyncIterator[NatsClient]:
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    yield nc
+    await nc.close()
+
+
+async def _counting(observer: NatsClient) -> _ConsumerApiCounter:
+    counter = _ConsumerApiCounter()
+    await observer.subscribe("$JS.API.CONSUMER.>", cb=counter.on_msg)  # pyright: ignore[reportUnknownMemberType]
+    await observer.flush()
+    return counter
+
+
+async def _settle(observer: NatsClient) -> None:
+    """Round-trip both clients so every observed request has arrived."""
+    await observer.flush()
+    await asyncio.sleep(0.05)
+
+
+class TestConsumerPool:
+    async def test_steady_state_makes_no_consumer_churn(
+        self, relay: NatsRelay, observer: NatsClient
+    ) -> None:
+        # Warm-up read binds both consumers (TTY inbox + user broadcast).
+        await relay.fetch(_KAI)
+        await relay.fetch_user_inbox("kai")
+        counter = await _counting(observer)
+
+        received: list[str] = []
+        for i in range(_READS):
+            await relay.deliver(Message(from_user="eric", to_user=_KAI, body=f"t{i}"))
+            await relay.deliver(Message(from_user="eric", to_user="kai", body=f"u{i}"))
+            received.extend(m.body for m in await relay.fetch(_KAI))
+            received.extend(m.body for m in await relay.fetch_user_inbox("kai"))
+        await _settle(observer)
+
+        assert len(received) == 2 * _READS
+        assert counter.churn == 0
+        assert counter.count("INFO") == 0  # no per-read consumer lookup either
+
+    async def test_rebinds_after_server_side_delete(
+        self, relay: NatsRelay, observer: NatsClient
+    ) -> None:
+        """inactive_threshold expiry or another process's delete is survived."""
+        await relay.fetch(_KAI)
+        js, _ = await relay._ensure_connected()
+        await js.delete_consumer(relay._stream_name, relay._durable_name(_KAI))
+
+        await relay.deliver(Message(from_user="eric", to_user=_KAI, body="after"))
+        messages = await relay.fetch(_KAI)
+        assert [m.body for m in messages] == ["after"]
+
+    async def test_rebinds_on_new_client_without_recreating(
+        self, relay: NatsRelay, observer: NatsClient
+    ) -> None:
+        """A fresh dial rebinds to the surviving durable — INFO, not CREATE."""
+        await relay.fetch(_KAI)
+        generation = relay.connection_generation
+        await relay.disconnect()
+        counter = await _counting(observer)
+
+        await relay.deliver(Message(from_user="eric", to_user=_KAI, body="again"))
+        messages = await relay.fetch(_KAI)
+        await _settle(observer)
+
+        assert relay.connection_generation == generation + 1
+        assert [m.body for m in messages] == ["again"]
+        assert counter.count("INFO") == 1
+        assert counter.churn == 0
+
+    async def test_close_keeps_shared_consumers(
+        self, relay: NatsRelay, second_relay: NatsRelay, observer: NatsClient
+    ) -> None:
+        """The user's other processes still read through the shared durable."""
+        await relay.fetch(_KAI)
+        await relay.fetch_user_inbox("kai")
+        await second_relay.fetch_user_inbox("kai")
+        stream = relay._stream_name
+        counter = await _counting(observer)
+
+        await relay.close()
+        await second_relay.fetch_user_inbox("kai")
+        await _settle(observer)
+
+        assert counter.churn == 0
+        js = observer.jetstream()  # pyright: ignore[reportUnknownMemberType]
+        await js.consumer_info(stream, relay._user_durable_name("kai"))
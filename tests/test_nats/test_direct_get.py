@@ -0,0 +1,292 @@
+"""Direct-get KV reads (``allow_direct`` on the sessions and names buckets).
+
+Presence reads — ``get_session``, ``get_wall``, reservation owners — go
+to ``$JS.API.DIRECT.GET``, which any replica serves; reads that feed a
+write stay on the stream leader.  The single-node tests cover
+provisioning and both fallbacks.  The cluster tests run three
+nats-servers with replicated buckets, print direct vs leader get
+latency, and keep reading through a leader stepdown.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import socket
+import subprocess
+import time
+from contextlib import suppress
+from statistics import quantiles
+from typing import TYPE_CHECKING, NoReturn
+
+import nats
+import pytest
+from nats.js.api import KeyValueConfig
+from nats.js.client import JetStreamContext
+from nats.js.errors import BadRequestError
+
+from biff.models import UserSession
+from biff.nats_relay import NatsRelay
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+pytestmark = pytest.mark.nats
+
+_TEST_REPO = "_test-nats-unit"  # the conftest relay's repo: cleaned per test
+_SESSIONS = "biff-sessions"
+_NAMES = "biff-names"
+_NODES = 3
+_GETS = 200
+
+
+def _session() -> UserSession:
+    return UserSession(user="kai", tty="tty1", plan="direct")
+
+
+def _is_ours(session: UserSession | None) -> bool:
+    return session is not None and session.plan == "direct"
+
+
+async def _allow_direct(js: JetStreamContext, bucket: str) -> bool:
+    info = await js.stream_info(f"KV_{bucket}")
+    return bool(info.config.allow_direct)
+
+
+async def _bucket_without_direct(nats_server: str, history: int = 1) -> None:
+    """Re-create the sessions bucket as provisioned before ``allow_direct``."""
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
+    with suppress(Exception):
+        await js.delete_key_value(_SESSIONS)  # pyright: ignore[reportUnknownMemberType]
+    kv = await js.create_key_value(  # pyright: ignore[reportUnknownMemberType]
+        config=KeyValueConfig(bucket=_SESSIONS, history=history)
+    )
+    await kv.put("kept", b"v")
+    await nc.close()
+
+
+class TestSingleNode:
+    async def test_buckets_provisioned_with_allow_direct(
+        self, relay: NatsRelay
+    ) -> None:
+        js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        assert await _allow_direct(js, _SESSIONS)
+        assert await _allow_direct(js, _NAMES)
+
+    async def test_bucket_without_direct_is_switched_on_in_place(
+        self, relay: NatsRelay, nats_server: str
+    ) -> None:
+        await _bucket_without_direct(nats_server, history=5)
+
+        await relay.update_session(_session())
+
+        assert _is_ours(await relay.get_session("kai:tty1"))
+        js, kv = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        assert await _allow_direct(js, _SESSIONS)
+        assert (await kv.get("kept")).value == b"v"  # edited, not re-created
+        assert (await kv.status()).history == 5  # pyright: ignore[reportUnknownMemberType]
+
+    async def test_refused_edit_reads_through_leader(
+        self, relay: NatsRelay, nats_server: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        await _bucket_without_direct(nats_server)
+
+        async def _refuse(*_a: object, **_kw: object) -> NoReturn:
+            raise BadRequestError
+
+        monkeypatch.setattr(JetStreamContext, "update_stream", _refuse)
+
+        await relay.update_session(_session())
+
+        assert _is_ours(await relay.get_session("kai:tty1"))
+        js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        assert not await _allow_direct(js, _SESSIONS)  # used as-is
+
+    async def test_direct_switched_off_retries_through_leader(
+        self, relay: NatsRelay
+    ) -> None:
+        await relay.update_session(_session())
+        js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        info = await js.stream_info(f"KV_{_SESSIONS}")
+        info.config.allow_direct = False
+        await js.update_stream(config=info.config)  # pyright: ignore[reportUnknownMemberType]
+
+        # The cached handle still sends direct gets; nobody answers them.
+        assert _is_ours(await relay.get_session("kai:tty1"))
+
+
+# -- Three-node cluster --
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+def _wait_for_port(port: int) -> None:
+    for _ in range(50):
+        with suppress(OSError), socket.create_connection(("127.0.0.1", port), 0.1):
+            return
+        time.sleep(0.1)
+    pytest.fail(f"nats-server on {port} did not start")
+
+
+@pytest.fixture(scope="module")
+def nats_cluster(tmp_path_factory: pytest.TempPathFactory) -> Iterator[str]:
+    """Three clustered JetStream servers; yields the first one's URL.
+
+    Clients learn the other two from the server's INFO.
+    """
+    exe = shutil.which("nats-server")
+    if exe is None:
+        pytest.skip("nats-server not found on PATH")
+    client_ports = [_free_port() for _ in range(_NODES)]
+    route_ports = [_free_port() for _ in range(_NODES)]
+    routes = ",".join(f"nats://127.0.0.1:{p}" for p in route_ports)
+    store = tmp_path_factory.mktemp("nats-cluster")
+    procs = [
+        subprocess.Popen(  # noqa: S603
+            [
+                exe,
+                "-js",
+                "-sd",
+                str(store / f"n{i}"),
+                "-p",
+                str(client_ports[i]),
+                "-n",
+                f"n{i}",
+                "--cluster_name",
+                "biff-test",
+                "--cluster",
+                f"nats://127.0.0.1:{route_ports[i]}",
+                "--routes",
+                routes,
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for i in range(_NODES)
+    ]
+    try:
+        for port in client_ports:
+            _wait_for_port(port)
+        yield f"nats://127.0.0.1:{client_ports[0]}"
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+async def _replicated_buckets(url: str) -> None:
+    """Create both buckets as R3 with ``allow_direct``, once the meta leader is up.
+
+    The relay finds them already there and uses them as-is.
+    """
+    nc = await nats.connect(url)  # pyright: ignore[reportUnknownMemberType]
+    js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
+    try:
+        for _ in range(100):
+            try:
+                await js.account_info()
+                break
+            except Exception:  # noqa: BLE001 — no meta leader yet
+                await asyncio.sleep(0.1)
+        for bucket in (_SESSIONS, _NAMES):
+            with suppress(Exception):
+                await js.delete_key_value(bucket)  # pyright: ignore[reportUnknownMemberType]
+            await js.create_key_value(  # pyright: ignore[reportUnknownMemberType]
+                config=KeyValueConfig(bucket=bucket, replicas=_NODES, direct=True)
+            )
+    finally:
+        await nc.close()
+
+
+async def _leader(js: JetStreamContext) -> str | None:
+    """The sessions stream's leader, or ``None`` mid-election."""
+    try:
+        info = await js.stream_info(f"KV_{_SESSIONS}")
+    except Exception:  # noqa: BLE001 — the API needs a leader to answer
+        return None
+    return info.cluster.leader if info.cluster is not None else None
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    cuts = quantiles(samples, n=100)
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+class TestCluster:
+    async def test_get_latency_direct_vs_leader(self, nats_cluster: str) -> None:
+        await _replicated_buckets(nats_cluster)
+        relay = NatsRelay(url=nats_cluster, repo_name=_TEST_REPO)
+        try:
+            await relay.update_session(_session())
+            js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+            leader = relay._leader_kv(js, _SESSIONS)  # pyright: ignore[reportPrivateUsage]
+            kv_key = f"{_TEST_REPO}.kai.tty1"
+
+            direct: list[float] = []
+            via_leader: list[float] = []
+            for _ in range(_GETS):
+                start = time.perf_counter()
+                assert _is_ours(await relay.get_session("kai:tty1"))
+                direct.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                await leader.get(kv_key)
+                via_leader.append(time.perf_counter() - start)
+        finally:
+            await relay.close()
+
+        print(f"\n  {_GETS} gets, {_NODES}-node cluster, R{_NODES} bucket")
+        print(f"  {'path':<8} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, samples in (("direct", direct), ("leader", via_leader)):
+            p50, p99 = _percentiles(samples)
+            print(f"  {name:<8} {p50:>8.2f} {p99:>8.2f}")
+
+    async def test_reads_continue_through_leader_change(
+        self, nats_cluster: str
+    ) -> None:
+        await _replicated_buckets(nats_cluster)
+        relay = NatsRelay(url=nats_cluster, repo_name=_TEST_REPO)
+        reads: list[UserSession | None] = []
+        stop = asyncio.Event()
+
+        async def _read_loop() -> None:
+            while not stop.is_set():
+                reads.append(await relay.get_session("kai:tty1"))
+                await asyncio.sleep(0.005)
+
+        try:
+            await relay.update_session(_session())
+            js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+            before = await _leader(js)
+            reader = asyncio.create_task(_read_loop())
+            await asyncio.sleep(0.2)
+
+            nc = relay._nc  # pyright: ignore[reportPrivateUsage]
+            assert nc is not None
+            await nc.request(f"$JS.API.STREAM.LEADER.STEPDOWN.KV_{_SESSIONS}", b"")
+            for _ in range(100):
+                after = await _leader(js)
+                if after not in (None, before):
+                    break
+                await asyncio.sleep(0.05)
+            else:
+                pytest.fail("stream leader did not change")
+            await asyncio.sleep(0.2)
+            stop.set()
+            await reader
+        finally:
+            stop.set()
+            await relay.close()
+
+        print(f"\n  leader {before} -> {after}: {len(reads)} reads, all served")
+        assert reads
+        assert all(_is_ours(r) for r in reads)
@@ -0,0 +1,122 @@
+"""Full-inbox drain past the per-fetch cap (``NatsRelay.drain``).
+
+``fetch`` returns at most one pull batch; ``drain`` walks the whole
+backlog on the subject's pooled consumer, acking each page before it is
+yielded.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+from fastmcp.tools.function_tool import FunctionTool
+
+from biff.models import BiffConfig, Message
+from biff.server.app import create_server
+from biff.server.state import create_state
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_TEST_REPO = "_test-nats-unit"  # the conftest relay's repo
+_BACKLOG = 5_000
+_PAGE = 250
+_CHUNK = 500  # parts per deliver_many while queueing the backlog
+
+
+async def _queue(relay: NatsRelay, to: str, count: int) -> None:
+    for start in range(0, count, _CHUNK):
+        batch = [
+            Message(from_user="kai", to_user=to, body=f"{i:05d}")
+            for i in range(start, min(start + _CHUNK, count))
+        ]
+        assert await relay.deliver_many(batch) == [None] * len(batch)
+
+
+class TestDrain:
+    async def test_drains_large_backlog_in_order(self, relay: NatsRelay) -> None:
+        await _queue(relay, "eric:tty2", _BACKLOG)
+        assert (await relay.get_unread_summary("eric:tty2")).count == _BACKLOG
+        created = relay.stats().consumers_created
+
+        start = time.perf_counter()
+        pages = [page async for page in relay.drain("eric:tty2", page_size=_PAGE)]
+        elapsed = time.perf_counter() - start
+
+        bodies = [m.body for page in pages for m in page]
+        print(f"\n  drained {len(bodies)} messages in {len(pages)} pages")
+        print(f"  {elapsed * 1000:.0f} ms")
+        assert bodies == [f"{i:05d}" for i in range(_BACKLOG)]
+        assert all(len(page) <= _PAGE for page in pages)
+        assert relay.stats().consumers_created == created + 1
+        assert (await relay.get_unread_summary("eric:tty2")).count == 0
+
+    async def test_tty_inbox_then_user_inbox(self, relay: NatsRelay) -> None:
+        await relay.deliver(Message(from_user="kai", to_user="eric", body="all"))
+        await relay.deliver(Message(from_user="kai", to_user="eric:tty2", body="me"))
+
+        pages = [page async for page in relay.drain("eric:tty2")]
+
+        assert [[m.body for m in page] for page in pages] == [["me"], ["all"]]
+
+    async def test_stopping_early_leaves_unseen_pages(self, relay: NatsRelay) -> None:
+        await _queue(relay, "eric:tty2", 30)
+
+        async for page in relay.drain("eric:tty2", page_size=10):
+            assert len(page) == 10
+            break
+
+        assert (await relay.get_unread_summary("eric:tty2")).count == 20
+
+    async def test_malformed_page_does_not_end_the_drain(
+        self, relay: NatsRelay
+    ) -> None:
+        js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        subject = relay._subject_for_key("eric:tty2")  # pyright: ignore[reportPrivateUsage]
+        await relay.get_unread_summary("eric:tty2")  # provision the stream
+        for _ in range(10):
+            await js.publish(subject, b"{ not valid json")
+        await _queue(relay, "eric:tty2", 3)
+
+        pages = [page async for page in relay.drain("eric:tty2", page_size=5)]
+
+        assert [[m.body for m in page] for page in pages] == [
+            ["00000", "00001", "00002"]
+        ]
+        assert (await relay.get_unread_summary("eric:tty2")).count == 0
+
+    async def test_empty_backlog_does_not_wait(self, relay: NatsRelay) -> None:
+        await relay.get_unread_summary("eric:tty2")  # provision the stream
+        start = time.monotonic()
+        assert [page async for page in relay.drain("eric:tty2")] == []
+        assert time.monotonic() - start < 0.5
+
+
+class TestReadMessagesRemaining:
+    async def test_first_page_reports_the_rest(
+        self, relay: NatsRelay, tmp_path: Path
+    ) -> None:
+        await _queue(relay, "eric:tty2", 150)
+        state = create_state(
+            BiffConfig(user="eric", repo_name=_TEST_REPO),
+            tmp_path,
+            relay=relay,
+            tty="tty2",
+        )
+        tool = await create_server(state).get_tool("read_messages")
+        assert isinstance(tool, FunctionTool)
+
+        first = await tool.fn()
+        rest = await tool.fn()
+
+        assert "00099" in first
+        assert "00100" not in first
+        assert "50 more unread" in first
+        assert "00149" in rest
+        assert "more unread" not in rest
@@ -0,0 +1,140 @@
+"""KV operations an idle session's heartbeat costs per hour.
+
+Counts the reads and writes the relay issues, on every KV handle of
+both buckets a heartbeat touches.  *Before* is every tick starting
+cold — read the profile and beat keys, write the beat, read the tty
+reservation, rewrite it — at the fixed 60 s cadence.  *After* is the steady state: one
+revision-checked update on the remembered revision, the reservation
+left alone until its TTL runs low, at the napping cadence.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from nats.js.kv import KeyValue
+
+from biff.models import UserSession
+from biff.server.app import (
+    _NAP_HEARTBEAT_INTERVAL,  # pyright: ignore[reportPrivateUsage]
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_KEY = "kai:tty1"
+_TICKS = 5
+_ACTIVE_INTERVAL = 60.0
+_READS = ("get",)
+_WRITES = ("put", "create", "update", "delete")
+
+
+class _KvOpCounter:
+    """Tally the KV reads and writes the relay issues, as it issues them.
+
+    Counted at the call rather than tapped off the wire: a wiretap only
+    sees what was delivered to it by the time it stops listening.
+    """
+
+    def __init__(self) -> None:
+        self.reads = 0
+        self.writes = 0
+
+    def install(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for name in (*_READS, *_WRITES):
+            monkeypatch.setattr(KeyValue, name, self._counting(name))
+
+    def _counting(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(KeyValue, name)
+
+        async def counted(kv: KeyValue, *args: Any, **kwargs: Any) -> Any:
+            if name in _READS:
+                self.reads += 1
+            else:
+                self.writes += 1
+            return await method(kv, *args, **kwargs)
+
+        return counted
+
+
+@pytest.fixture
+def counter(monkeypatch: pytest.MonkeyPatch) -> _KvOpCounter:
+    counter = _KvOpCounter()
+    counter.install(monkeypatch)
+    return counter
+
+
+async def _ticks(
+    relay: NatsRelay, counter: _KvOpCounter, *, cold: bool
+) -> tuple[float, float]:
+    """Average (reads, writes) per heartbeat over ``_TICKS`` ticks."""
+    counter.reads = counter.writes = 0
+    for _ in range(_TICKS):
+        if cold:
+            relay._rows.clear()  # pyright: ignore[reportPrivateUsage]
+            relay._reservations_written.clear()  # pyright: ignore[reportPrivateUsage]
+        await relay.heartbeat(_KEY)
+    return counter.reads / _TICKS, counter.writes / _TICKS
+
+
+class TestIdleHeartbeatOps:
+    async def test_kv_ops_per_hour(
+        self, relay: NatsRelay, counter: _KvOpCounter
+    ) -> None:
+        name = f"tty{uuid.uuid4().hex[:6]}"
+        await relay.update_session(UserSession(user="kai", tty="tty1", tty_name=name))
+        assert await relay.reserve_tty_name("kai", name, _KEY)
+        try:
+            before = await _ticks(relay, counter, cold=True)
+            after = await _ticks(relay, counter, cold=False)
+        finally:
+            await relay.release_tty_name("kai", name)
+
+        rows = (
+            ("before", _ACTIVE_INTERVAL, before),
+            ("after", _NAP_HEARTBEAT_INTERVAL, after),
+        )
+        print("\n  idle session, KV operations per hour")
+        print(f"  {'':<8} {'cadence':>8} {'reads':>7} {'writes':>7} {'total':>7}")
+        per_hour: dict[str, float] = {}
+        for label, cadence, (reads, writes) in rows:
+            ticks = 3600 / cadence
+            per_hour[label] = (reads + writes) * ticks
+            print(
+                f"  {label:<8} {cadence:>7.0f}s {reads * ticks:>7.0f}"
+                f" {writes * ticks:>7.0f} {per_hour[label]:>7.0f}"
+            )
+        assert (before, after) == ((3, 2), (0, 1))
+        assert per_hour["after"] < per_hour["before"] / 5
+
+    async def test_concurrent_write_is_reread_not_clobbered(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        await relay.update_session(UserSession(user="kai", tty="tty1"))
+        await relay.heartbeat(_KEY)  # base remembered
+        other = await second_relay.get_session(_KEY)
+        assert other is not None
+        await second_relay.update_session(other.model_copy(update={"plan": "new"}))
+
+        await relay.heartbeat(_KEY)  # stale revision: re-read, then update
+
+        stored = await second_relay.get_session(_KEY)
+        assert stored is not None
+        assert stored.plan == "new"
+        assert stored.last_active > other.last_active
+
+    async def test_deleted_session_is_not_recreated(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        await relay.update_session(UserSession(user="kai", tty="tty1"))
+        await second_relay.delete_session(_KEY)
+
+        await relay.heartbeat(_KEY)
+
+        assert await second_relay.get_session(_KEY) is None
@@ -0,0 +1,123 @@
+"""Batched inbox reads: one count, and pulls only where mail is waiting.
+
+``fetch_inboxes`` and ``get_combined_unread_summary`` cover the TTY and
+user inboxes of the server's own session and, when present, its
+companion's (DES-039).  Every subject is counted by one ``stream_info``;
+an empty inbox is never pulled, so it costs no consumer bind and no
+``_FETCH_TIMEOUT`` wait.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from biff.models import Message
+
+if TYPE_CHECKING:
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_AGENT = "claude:tty1"
+_HUMAN = "kai:tty2"
+
+
+async def _send(relay: NatsRelay, to: str, body: str) -> None:
+    await relay.deliver(Message(from_user="eric", to_user=to, body=body))
+
+
+def _bodies(messages: list[Message]) -> list[str]:
+    return [m.body for m in messages]
+
+
+def _stream_infos(relay: NatsRelay) -> int:
+    op = relay.stats().operations.get("stream_info")
+    return op.count if op is not None else 0
+
+
+class TestWithoutCompanion:
+    async def test_splits_tty_and_user_inboxes(self, relay: NatsRelay) -> None:
+        await _send(relay, _HUMAN, "targeted")
+        await _send(relay, "kai", "broadcast")
+        assert (await relay.get_combined_unread_summary([_HUMAN])).count == 2
+
+        inboxes = await relay.fetch_inboxes([_HUMAN])
+
+        tty, user = inboxes[_HUMAN]
+        assert _bodies(tty) == ["targeted"]
+        assert _bodies(user) == ["broadcast"]
+        assert (await relay.get_combined_unread_summary([_HUMAN])).count == 0
+
+    async def test_empty_read_binds_nothing_and_does_not_wait(
+        self, relay: NatsRelay
+    ) -> None:
+        await relay.get_unread_summary(_HUMAN)  # provision the stream
+        created = relay.stats().consumers_created
+        infos = _stream_infos(relay)
+
+        start = time.monotonic()
+        inboxes = await relay.fetch_inboxes([_HUMAN])
+        elapsed = time.monotonic() - start
+
+        assert inboxes == {_HUMAN: ([], [])}
+        assert relay.stats().consumers_created == created
+        assert _stream_infos(relay) == infos + 1
+        assert elapsed < 0.5  # an empty pull would linger for _FETCH_TIMEOUT
+
+
+class TestWithCompanion:
+    async def test_four_inboxes_one_count(self, relay: NatsRelay) -> None:
+        await _send(relay, _AGENT, "agent tty")
+        await _send(relay, "claude", "agent broadcast")
+        await _send(relay, _HUMAN, "human tty")
+        await _send(relay, "kai", "human broadcast")
+        await _send(relay, "eric:tty9", "someone else")
+        infos = _stream_infos(relay)
+
+        summary = await relay.get_combined_unread_summary([_AGENT, _HUMAN])
+
+        assert summary.count == 4
+        assert _stream_infos(relay) == infos + 1
+
+    async def test_splits_results_by_session(self, relay: NatsRelay) -> None:
+        await _send(relay, _AGENT, "agent tty")
+        await _send(relay, "claude", "agent broadcast")
+        await _send(relay, _HUMAN, "human tty")
+        await _send(relay, "kai", "human broadcast")
+        await _send(relay, "eric:tty9", "someone else")
+
+        inboxes = await relay.fetch_inboxes([_AGENT, _HUMAN])
+
+        assert {k: (_bodies(t), _bodies(u)) for k, (t, u) in inboxes.items()} == {
+            _AGENT: (["agent tty"], ["agent broadcast"]),
+            _HUMAN: (["human tty"], ["human broadcast"]),
+        }
+        # Another session's inbox is counted in the reply but never pulled.
+        assert (await relay.get_unread_summary("eric:tty9")).count == 1
+
+    async def test_pulls_only_inboxes_with_mail(self, relay: NatsRelay) -> None:
+        await _send(relay, _HUMAN, "only one")
+        created = relay.stats().consumers_created
+
+        inboxes = await relay.fetch_inboxes([_AGENT, _HUMAN])
+
+        assert _bodies(inboxes[_HUMAN][0]) == ["only one"]
+        assert inboxes[_AGENT] == ([], [])
+        assert relay.stats().consumers_created == created + 1
+
+    async def test_push_counters_reconcile_together(self, relay: NatsRelay) -> None:
+        relay.enable_unread_counters()
+        await _send(relay, _AGENT, "agent tty")
+        await _send(relay, "kai", "human broadcast")
+        await relay.get_unread_summary(_AGENT)  # provision the stream
+        infos = _stream_infos(relay)
+
+        summary = await relay.get_combined_unread_summary([_AGENT, _HUMAN])
+
+        assert summary.count == 2
+        # The human's two new taps share one seeding stream_info; the
+        # agent's were seeded by the warm-up call.
+        assert _stream_infos(relay) == infos + 1
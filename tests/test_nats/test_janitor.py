@@ -0,0 +1,274 @@
+"""Repo janitor election against a real NATS server.
+
+The lease primitives on :class:`~biff.nats_relay.NatsRelay`, then ten
+servers in one repo — each running its own KV watch and janitor loop —
+ending sessions every way a session ends: graceful exit, sentinel reaped
+by a follower and by the janitor, crash (plain delete), and after the
+janitor itself exits or dies.  Every session end must leave exactly one
+logout in wtmp.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+import nats
+import pytest
+
+from biff.models import BiffConfig, SessionEvent, UserSession
+from biff.nats_relay import NatsRelay
+from biff.server.app import (
+    _janitor_loop,  # pyright: ignore[reportPrivateUsage]
+    _kv_watcher_loop,  # pyright: ignore[reportPrivateUsage]
+    _reap_dead_session,  # pyright: ignore[reportPrivateUsage]
+)
+from biff.server.janitor import Janitor
+from biff.server.state import ServerState, create_state
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from pathlib import Path
+
+pytestmark = pytest.mark.nats
+
+_REPO = "_test-janitor"
+_SERVERS = 10
+_TTL = 1.0
+
+
+@pytest.fixture(autouse=True)
+async def _cleanup_nats(nats_server: str) -> AsyncIterator[None]:  # pyright: ignore[reportUnusedFunction]
+    yield
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    js = nc.jetstream()  # pyright: ignore[reportUnknownMemberType]
+    for stream in ("biff-inbox", "biff-wtmp"):
+        with suppress(Exception):
+            await js.delete_stream(stream)
+    for bucket in ("biff-sessions", "biff-names"):
+        with suppress(Exception):
+            await js.delete_key_value(bucket)  # pyright: ignore[reportUnknownMemberType]
+    await nc.close()
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 15.0) -> None:
+    for _ in range(int(timeout / 0.05)):
+        if predicate():
+            return
+        await asyncio.sleep(0.05)
+    pytest.fail("condition not reached")
+
+
+class TestJanitorLease:
+    async def test_one_holder_at_a_time(self, nats_server: str) -> None:
+        relay = NatsRelay(url=nats_server, repo_name=_REPO)
+        try:
+            assert await relay.claim_janitor_lease("kai:a", _TTL)
+            assert not await relay.claim_janitor_lease("eric:b", _TTL)
+            assert await relay.claim_janitor_lease("kai:a", _TTL)  # renewal
+        finally:
+            await relay.close()
+
+    async def test_expired_lease_is_taken_over(self, nats_server: str) -> None:
+        """A lease lapses after its holder's ttl without a new revision."""
+        kai = NatsRelay(url=nats_server, repo_name=_REPO)
+        eric = NatsRelay(url=nats_server, repo_name=_REPO)
+        try:
+            assert await kai.claim_janitor_lease("kai:a", 0.2)
+            assert not await eric.claim_janitor_lease("eric:b", _TTL)  # first seen
+            await asyncio.sleep(0.3)
+            assert await eric.claim_janitor_lease("eric:b", _TTL)
+            assert not await kai.claim_janitor_lease("kai:a", _TTL)
+        finally:
+            await kai.close()
+            await eric.close()
+
+    async def test_renewed_lease_is_never_taken_over(self, nats_server: str) -> None:
+        """Expiry is read from revisions, not from the holder's wall clock."""
+        kai = NatsRelay(url=nats_server, repo_name=_REPO)
+        eric = NatsRelay(url=nats_server, repo_name=_REPO)
+        try:
+            assert await kai.claim_janitor_lease("kai:a", 0.2)
+            # kai's clock runs an hour behind: its lease "expired" long ago.
+            entry = await (await kai._ensure_names_kv()).get(kai._janitor_key)  # pyright: ignore[reportPrivateUsage]
+            await (await kai._ensure_names_kv()).update(  # pyright: ignore[reportPrivateUsage]
+                kai._janitor_key,  # pyright: ignore[reportPrivateUsage]
+                b'{"holder": "kai:a", "ttl": 0.2, "expires": 0}',
+                last=entry.revision,
+            )
+            for _ in range(5):
+                assert not await eric.claim_janitor_lease("eric:b", _TTL)
+                await asyncio.sleep(0.1)
+                assert await kai.claim_janitor_lease("kai:a", 0.2)
+        finally:
+            await kai.close()
+            await eric.close()
+
+    async def test_release_hands_over(self, nats_server: str) -> None:
+        relay = NatsRelay(url=nats_server, repo_name=_REPO)
+        try:
+            assert await relay.claim_janitor_lease("kai:a", _TTL)
+            await relay.release_janitor_lease("eric:b")  # not the holder: no-op
+            assert not await relay.claim_janitor_lease("eric:b", _TTL)
+            await relay.release_janitor_lease("kai:a")
+            assert await relay.claim_janitor_lease("eric:b", _TTL)
+        finally:
+            await relay.close()
+
+    async def test_claims_race_to_one_winner(self, nats_server: str) -> None:
+        relays = [NatsRelay(url=nats_server, repo_name=_REPO) for _ in range(5)]
+        try:
+            won = await asyncio.gather(
+                *(r.claim_janitor_lease(f"u{i}:t", _TTL) for i, r in enumerate(relays))
+            )
+            assert sum(won) == 1
+        finally:
+            for r in relays:
+                await r.close()
+
+
+class _Server:
+    """One MCP server's background tasks: KV watch and janitor loop."""
+
+    def __init__(self, nats_server: str, tmp_path: Path, index: int) -> None:
+        self.relay = NatsRelay(url=nats_server, repo_name=_REPO)
+        self.state: ServerState = create_state(
+            BiffConfig(user=f"srv{index}", repo_name=_REPO, relay_url=nats_server),
+            tmp_path / f"srv{index}",
+            relay=self.relay,
+            tty="tty1",
+        )
+        object.__setattr__(
+            self.state, "janitor", Janitor(self.relay, self.state.session_key, ttl=_TTL)
+        )
+        self._shutdown = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def start(self) -> None:
+        user = self.state.config.user
+        await self.relay.update_session(UserSession(user=user, tty="tty1"))
+        await self.state.janitor.renew()
+        self._tasks = [
+            asyncio.create_task(_kv_watcher_loop(self.state, self._shutdown)),
+            asyncio.create_task(
+                _janitor_loop(self.state, self._shutdown, interval=0.1)
+            ),
+        ]
+
+    async def _stop_tasks(self) -> None:
+        self._shutdown.set()
+        await asyncio.gather(*self._tasks)
+
+    async def exit(self) -> None:
+        """Graceful shutdown: own logout, marked delete, lease released."""
+        await self._stop_tasks()
+        await self.relay.append_wtmp(
+            SessionEvent(
+                session_key=self.state.session_key,
+                event="logout",
+                user=self.state.config.user,
+                tty="tty1",
+            )
+        )
+        await self.relay.delete_session(self.state.session_key, logged_out=True)
+        await self.state.janitor.release()
+        await self.relay.close()
+
+    async def die(self) -> None:
+        """SIGKILL: tasks and connection gone, lease left to expire."""
+        await self._stop_tasks()
+        await self.relay.close()
+
+
+class _Repo:
+    """Ten servers in one repo, plus a client that ends sessions."""
+
+    def __init__(self, nats_server: str, tmp_path: Path) -> None:
+        self.writer = NatsRelay(url=nats_server, repo_name=_REPO)
+        self.live = [_Server(nats_server, tmp_path, i) for i in range(_SERVERS)]
+        self.ended: list[str] = []
+
+    async def one_leader(self) -> _Server:
+        def _leaders() -> list[_Server]:
+            return [s for s in self.live if s.state.janitor.is_leader]
+
+        await _until(lambda: len(_leaders()) == 1)
+        return _leaders()[0]
+
+    async def mirrored(self, key: str) -> None:
+        kv_key = f"{_REPO}.{key.replace(':', '.')}"
+        await _until(lambda: all(s.relay.presence.get(kv_key) for s in self.live))
+
+    async def logged_out(self, key: str) -> None:
+        """Record a session end and wait for its logout to reach wtmp."""
+        self.ended.append(key)
+        for _ in range(300):
+            events = await self.writer.get_wtmp(count=1000)
+            if any(e.session_key == key for e in events if e.event == "logout"):
+                return
+            await asyncio.sleep(0.05)
+        pytest.fail(f"no logout for {key}")
+
+    async def remove(self, srv: _Server, *, graceful: bool) -> None:
+        self.live.remove(srv)
+        if graceful:
+            await srv.exit()
+            await self.logged_out(srv.state.session_key)
+        else:
+            await srv.die()
+
+
+class TestJanitorTenServers:
+    async def test_exactly_one_logout_per_session_end(
+        self, nats_server: str, tmp_path: Path
+    ) -> None:
+        repo = _Repo(nats_server, tmp_path)
+        writer = repo.writer
+        victims = [f"v{i}:tty1" for i in range(5)]
+        for key in victims:
+            await writer.update_session(UserSession(user=key.split(":")[0], tty="tty1"))
+        for srv in repo.live:
+            await srv.start()
+
+        try:
+            for key in victims:
+                await repo.mirrored(key)
+            leader = await repo.one_leader()
+            follower = next(s for s in repo.live if s is not leader)
+
+            # Crash: the row is deleted with no logout written.
+            await writer.delete_session(victims[0])
+            await repo.logged_out(victims[0])
+
+            # Sentinel reaped by a follower, then by the janitor.
+            await _reap_dead_session(follower.state, victims[1])
+            await repo.logged_out(victims[1])
+            await _reap_dead_session(leader.state, victims[2])
+            await repo.logged_out(victims[2])
+
+            # A follower exits, then the janitor: the lease moves on release.
+            await repo.remove(follower, graceful=True)
+            await repo.remove(leader, graceful=True)
+            successor = await repo.one_leader()
+            await writer.delete_session(victims[3])
+            await repo.logged_out(victims[3])
+
+            # The janitor dies: the lease moves when it expires.
+            await repo.remove(successor, graceful=False)
+            await repo.one_leader()
+            await writer.delete_session(victims[4])
+            await repo.logged_out(victims[4])
+
+            await asyncio.sleep(0.5)  # let any duplicate arrive
+            events = await writer.get_wtmp(count=1000)
+        finally:
+            for srv in repo.live:
+                await srv.die()
+            await writer.close()
+
+        logouts = Counter(e.session_key for e in events if e.event == "logout")
+        print(f"\n  {len(repo.ended)} session ends across {_SERVERS} servers")
+        print(f"  logout events: {logouts.total()}")
+        assert logouts == Counter(repo.ended)
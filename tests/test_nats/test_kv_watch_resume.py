@@ -0,0 +1,174 @@
+"""Fault injection: the KV watch resumes across a nats-server restart.
+
+Runs ``_kv_watcher_loop`` against a private nats-server (file store), then
+kills and restarts that server mid-session and drops the relay's client,
+which ends the watch cycle.  Sessions are deleted before and after the
+outage; the watch must write exactly one logout per deletion and the
+next cycle must resume from its last revision rather than replay the
+snapshot.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import shutil
+import socket
+import subprocess
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from biff.models import BiffConfig, SessionEvent, UserSession
+from biff.nats_relay import NatsRelay
+from biff.server import app
+from biff.server.state import create_state
+from biff.session_watch import RepoWatch
+
+pytestmark = pytest.mark.nats
+
+_REPO = "_test-kv-resume"
+_SESSIONS = 30
+
+
+class _Server:
+    """A nats-server that can be killed and restarted on the same port/store."""
+
+    def __init__(self, store: Path) -> None:
+        exe = shutil.which("nats-server")
+        if exe is None:
+            pytest.skip("nats-server not found on PATH")
+        self._exe = exe
+        self._store = store
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            self.port: int = s.getsockname()[1]
+        self.url = f"nats://127.0.0.1:{self.port}"
+        self._proc: subprocess.Popen[bytes] | None = None
+
+    def start(self) -> None:
+        self._proc = subprocess.Popen(  # noqa: S603
+            [self._exe, "-js", "-sd", str(self._store), "-p", str(self.port)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        for _ in range(50):
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=0.1):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        pytest.fail("nats-server did not start within 5 seconds")
+
+    def kill(self) -> None:
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[_Server]:
+    srv = _Server(tmp_path / "js")
+    srv.start()
+    yield srv
+    srv.kill()
+
+
+async def _until(predicate: Callable[[], bool], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            pytest.fail("condition not reached")
+        await asyncio.sleep(0.05)
+
+
+class TestKvWatchResume:
+    async def test_restart_resumes_without_replay(
+        self, server: _Server, tmp_path: Path
+    ) -> None:
+        relay = NatsRelay(url=server.url, repo_name=_REPO)
+        writer = NatsRelay(url=server.url, repo_name=_REPO)
+        for i in range(_SESSIONS):
+            await writer.update_session(UserSession(user=f"user{i:02d}", tty="tty1"))
+
+        state = create_state(
+            BiffConfig(user="kai", repo_name=_REPO, relay_url=server.url),
+            tmp_path,
+            relay=relay,
+            tty="tty0",
+        )
+        # The only server in the repo: it holds the janitor lease, so its
+        # watch writes the logouts.
+        assert await state.janitor.renew()
+        logouts: list[str] = []
+        watches: list[tuple[int, bool]] = []
+        handled = 0
+        real_watch = relay.watch_repos
+        real_handle = app._handle_kv_entry  # pyright: ignore[reportPrivateUsage]
+
+        async def _append_wtmp(event: SessionEvent) -> None:
+            if event.event == "logout":
+                logouts.append(event.session_key)
+
+        async def _watch_repos(repos: frozenset[str], *, after: int = 0) -> RepoWatch:
+            watch = await real_watch(repos, after=after)
+            watches.append((after, watch.resumed))
+            return watch
+
+        async def _handle(entry: object, r: NatsRelay, s: object) -> None:
+            nonlocal handled
+            handled += 1
+            await real_handle(entry, r, s)  # type: ignore[arg-type]
+
+        shutdown = asyncio.Event()
+        with (
+            patch.object(relay, "append_wtmp", _append_wtmp),
+            patch.object(relay, "watch_repos", _watch_repos),
+            patch.object(app, "_handle_kv_entry", _handle),
+        ):
+            loop = asyncio.create_task(app._kv_watcher_loop(state, shutdown))  # pyright: ignore[reportPrivateUsage]
+            try:
+                await _until(lambda: relay.presence.ready)
+                assert handled == _SESSIONS  # the one full snapshot
+
+                await writer.delete_session("user00:tty1")
+                await _until(lambda: logouts == ["user00:tty1"])
+                handled_before_outage = handled
+
+                # Outage long enough that the client is dropped, as the
+                # wedge teardown does; the next relay call (a heartbeat in
+                # the server) dials a fresh client and orphans the watch.
+                server.kill()
+                await relay.disconnect()
+                await asyncio.sleep(1.0)
+                server.start()
+                await relay.get_kv()
+                await _until(lambda: len(watches) >= 2)
+
+                # Changes after the outage reach the resumed watch.
+                await writer.delete_session("user01:tty1")
+                await writer.update_session(
+                    UserSession(user="user02", tty="tty1", plan="back")
+                )
+
+                def _caught_up() -> bool:
+                    held = relay.presence.get(f"{_REPO}.user02.tty1")
+                    return held is not None and held.plan == "back"
+
+                await _until(_caught_up)
+                await _until(lambda: len(logouts) >= 2)
+                await asyncio.sleep(0.5)  # let any duplicate arrive
+            finally:
+                shutdown.set()
+                await loop
+                await writer.close()
+                await relay.close()
+
+        assert logouts == ["user00:tty1", "user01:tty1"]
+        assert watches[0] == (0, False)
+        assert all(resumed for _, resumed in watches[1:]), watches
+        # Only the post-outage changes were delivered — no snapshot replay.
+        assert handled - handled_before_outage < _SESSIONS
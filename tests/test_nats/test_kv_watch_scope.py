@@ -0,0 +1,127 @@
+"""Repo-scoped KV watch against a real NATS server.
+
+Seeds 20 repos x 10 sessions in the shared sessions bucket and counts the
+entries one server's watch receives — initial snapshot plus one round of
+heartbeat puts — with ``watchall()`` (the old behaviour) and with
+:meth:`~biff.nats_relay.NatsRelay.watch_repos` over its visible repos.
+Then checks that an org refresh re-scopes a running ``_run_kv_watch``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Protocol
+
+import pytest
+
+from biff.models import BiffConfig, UserSession
+from biff.server.app import _run_kv_watch
+from biff.server.state import create_state
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from nats.js.kv import KeyValue
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_REPOS = [f"scope-r{i:02d}" for i in range(20)]
+_SESSIONS = 10
+
+
+class _Updates(Protocol):
+    async def updates(self, timeout: float = 5.0) -> object: ...
+
+
+async def _put_all(kv: KeyValue) -> None:
+    for repo in _REPOS:
+        for i in range(_SESSIONS):
+            session = UserSession(user=f"user{i}", tty="tty1", repo=repo)
+            await kv.put(f"{repo}.user{i}.tty1", session.model_dump_json().encode())  # pyright: ignore[reportUnknownMemberType]
+
+
+async def _count(watcher: _Updates, kv: KeyValue) -> tuple[int, int]:
+    """Entries in the initial snapshot, then in one heartbeat round."""
+    snapshot = 0
+    while await watcher.updates(timeout=5.0) is not None:
+        snapshot += 1
+    await _put_all(kv)
+    live = 0
+    while True:
+        try:
+            await watcher.updates(timeout=0.5)
+        except TimeoutError:
+            return snapshot, live
+        live += 1
+
+
+class TestKvWatchScope:
+    async def test_entries_received_20_repos(self, relay: NatsRelay) -> None:
+        kv = await relay.get_kv()
+        await _put_all(kv)
+
+        everything = await kv.watchall()  # pyright: ignore[reportUnknownMemberType]
+        try:
+            all_snap, all_live = await _count(everything, kv)  # pyright: ignore[reportUnknownArgumentType]
+        finally:
+            await everything.stop()  # type: ignore[no-untyped-call]
+
+        scoped = await relay.watch_repos(frozenset({_REPOS[0], _REPOS[1]}))
+        try:
+            scoped_snap, scoped_live = await _count(scoped, kv)
+        finally:
+            await scoped.stop()
+
+        print(f"\n  KV watch entries, {len(_REPOS)} repos x {_SESSIONS} sessions")
+        print(f"  {'watch':<10} {'snapshot':>9} {'heartbeat':>10}")
+        print(f"  {'watchall':<10} {all_snap:>9} {all_live:>10}")
+        print(f"  {'2 repos':<10} {scoped_snap:>9} {scoped_live:>10}")
+
+        total = len(_REPOS) * _SESSIONS
+        assert (all_snap, all_live) == (total, total)
+        assert (scoped_snap, scoped_live) == (2 * _SESSIONS, 2 * _SESSIONS)
+
+    async def test_empty_repo_snapshot_drains(self, relay: NatsRelay) -> None:
+        await relay.get_kv()
+        watch = await relay.watch_repos(frozenset({"scope-empty"}))
+        try:
+            assert await watch.updates(timeout=5.0) is None
+        finally:
+            await watch.stop()
+
+    async def test_org_refresh_rescopes(self, relay: NatsRelay, tmp_path: Path) -> None:
+        kv = await relay.get_kv()
+        await _put_all(kv)
+        config = BiffConfig(user="kai", repo_name=_REPOS[0], relay_url="x")
+        state = create_state(config, tmp_path, relay=relay, tty="tty1")
+        shutdown = asyncio.Event()
+
+        async def _loop() -> None:
+            while not shutdown.is_set():
+                await _run_kv_watch(relay, state, shutdown)
+
+        watch = asyncio.create_task(_loop())
+        try:
+            await _wait_for(lambda: relay.presence.covers(frozenset({_REPOS[0]})))
+            assert not relay.presence.covers(frozenset({_REPOS[1]}))
+            assert len(relay.presence) == _SESSIONS
+
+            object.__setattr__(state, "org_repos", frozenset({_REPOS[1]}))
+            await _wait_for(lambda: relay.presence.covers(frozenset(_REPOS[:2])))
+            sessions = await relay.get_sessions_for_repos(frozenset({_REPOS[1]}))
+            assert len(sessions) == _SESSIONS
+            assert len(relay.presence) == 2 * _SESSIONS
+        finally:
+            shutdown.set()
+            await watch
+
+
+async def _wait_for(predicate: Callable[[], bool], timeout: float = 15.0) -> None:
+    for _ in range(int(timeout / 0.05)):
+        if predicate():
+            return
+        await asyncio.sleep(0.05)
+    pytest.fail("condition not reached")
@@ -0,0 +1,179 @@
+"""Benchmark: cross-repo presence, one listing per repo vs one per bucket.
+
+Seeds 40 repos x 5 sessions, then times ``get_sessions_for_repos`` over
+all 40 two ways — *per repo* (one repo-scoped ``stream_info`` each, as
+before) and *single pass* (one bucket-wide listing partitioned by repo
+prefix client-side).  ``STREAM.INFO`` requests are counted on the wire.
+Also checks the partitioning and the subject-map paging the single
+pass relies on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import nats
+import pytest
+
+from biff.models import SessionBeat, UserSession
+from biff.nats_relay import BEAT_KV_SUFFIX
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from nats.aio.client import Client as NatsClient
+    from nats.aio.msg import Msg
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_REPOS = 40
+_SESSIONS_PER_REPO = 5
+_READS = 10
+
+
+def _repo(i: int) -> str:
+    return f"punt-labs__bench{i:02d}"
+
+
+async def _seed(relay: NatsRelay, repos: list[str]) -> None:
+    _, kv = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+    puts: list[Awaitable[int]] = []
+    for repo in repos:
+        for j in range(_SESSIONS_PER_REPO):
+            session = UserSession(user=f"user{j}", tty="tty1", repo=repo)
+            puts.append(
+                kv.put(f"{repo}.user{j}.tty1", session.model_dump_json().encode())
+            )
+    await asyncio.gather(*puts)
+
+
+class _Counter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    async def on_msg(self, msg: Msg) -> None:
+        self.count += 1
+
+
+@pytest.fixture
+async def observer(nats_server: str) -> AsyncIterator[NatsClient]:
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    yield nc
+    await nc.close()
+
+
+async def _settle(observer: NatsClient, counter: _Counter) -> None:
+    """Wait until the observer's delivery of counted requests goes quiet."""
+    await observer.flush()
+    seen = -1
+    while seen != counter.count:
+        seen = counter.count
+        await asyncio.sleep(0.2)
+
+
+async def _measure(
+    observer: NatsClient, read: Callable[[], Awaitable[list[UserSession]]]
+) -> tuple[float, float]:
+    """Return (mean ms per read, mean ``STREAM.INFO`` requests per read)."""
+    counter = _Counter()
+    sub = await observer.subscribe("$JS.API.STREAM.INFO.>", cb=counter.on_msg)  # pyright: ignore[reportUnknownMemberType]
+    await observer.flush()
+    # The server can route a request issued right after the subscribe
+    # before the new interest reaches it; warm up until one is seen.
+    while not counter.count:
+        await read()
+        await _settle(observer, counter)
+    counter.count = 0
+    start = time.perf_counter()
+    for _ in range(_READS):
+        assert len(await read()) == _REPOS * _SESSIONS_PER_REPO
+    elapsed = time.perf_counter() - start
+    await _settle(observer, counter)
+    await sub.unsubscribe()
+    return elapsed / _READS * 1000, counter.count / _READS
+
+
+class TestMultiRepoPresence:
+    async def test_single_pass_partitions_by_repo(self, relay: NatsRelay) -> None:
+        await _seed(relay, [_repo(0), _repo(1), _repo(2)])
+        await relay.update_session(UserSession(user="kai", tty="tty1"))
+        _, kv = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        beat = datetime.now(UTC) + timedelta(minutes=5)
+        await kv.put(
+            f"{_repo(1)}.user0.tty1{BEAT_KV_SUFFIX}",
+            SessionBeat(last_active=beat).model_dump_json().encode(),
+        )
+
+        sessions = await relay.get_sessions_for_repos(frozenset({_repo(0), _repo(1)}))
+
+        assert sorted((s.repo, s.user) for s in sessions) == [
+            (repo, f"user{j}")
+            for repo in (_repo(0), _repo(1))
+            for j in range(_SESSIONS_PER_REPO)
+        ]
+        merged = next(s for s in sessions if (s.repo, s.user) == (_repo(1), "user0"))
+        assert merged.last_active == beat
+
+    async def test_missing_bucket_returns_empty(self, relay: NatsRelay) -> None:
+        assert await relay.get_sessions_for_repos(frozenset({"a", "b"})) == []
+
+    async def test_subject_map_is_paged(
+        self, relay: NatsRelay, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """A truncated reply is followed by requests at the next offset."""
+        await _seed(relay, [_repo(0), _repo(1)])
+        js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+        real = js._api_request  # pyright: ignore[reportPrivateUsage,reportUnknownMemberType,reportUnknownVariableType]
+        offsets: list[int] = []
+
+        async def _small_pages(subject: str, req: bytes, **kw: float) -> object:
+            reply = await real(subject, req, **kw)  # pyright: ignore[reportUnknownVariableType]
+            subjects: dict[str, int] = reply["state"]["subjects"]  # pyright: ignore[reportUnknownVariableType]
+            offset = int(reply.get("offset", 0))  # pyright: ignore[reportUnknownArgumentType,reportUnknownMemberType]
+            offsets.append(offset)
+            # Hand back three subjects at a time, as if the server's cap were 3.
+            page = sorted(subjects)[:3]  # pyright: ignore[reportUnknownArgumentType]
+            reply["state"]["subjects"] = {k: subjects[k] for k in page}
+            reply["total"] = reply.get("total", len(subjects))  # pyright: ignore[reportUnknownMemberType]
+            return reply  # pyright: ignore[reportUnknownVariableType]
+
+        monkeypatch.setattr(js, "_api_request", _small_pages)
+
+        sessions = await relay.get_sessions_for_repos(frozenset({_repo(0), _repo(1)}))
+
+        assert len(sessions) == 2 * _SESSIONS_PER_REPO
+        assert offsets == [0, 3, 6, 9]
+
+    async def test_40_repos_single_pass(
+        self, relay: NatsRelay, observer: NatsClient
+    ) -> None:
+        repos = [_repo(i) for i in range(_REPOS)]
+        await _seed(relay, repos)
+        wanted = frozenset(repos)
+
+        async def per_repo() -> list[UserSession]:
+            batches = await asyncio.gather(
+                *(relay._get_sessions_for_repo(r) for r in wanted)  # pyright: ignore[reportPrivateUsage]
+            )
+            return [s for batch in batches for s in batch]
+
+        before_ms, before_infos = await _measure(observer, per_repo)
+        after_ms, after_infos = await _measure(
+            observer, lambda: relay.get_sessions_for_repos(wanted)
+        )
+
+        print(
+            f"\n  /who over {_REPOS} repos x {_SESSIONS_PER_REPO} sessions"
+            f" ({_READS} reads each)"
+        )
+        print(f"  {'path':<12} {'ms/read':>10} {'stream_info':>12}")
+        print(f"  {'per repo':<12} {before_ms:>10.2f} {before_infos:>12.1f}")
+        print(f"  {'single pass':<12} {after_ms:>10.2f} {after_infos:>12.1f}")
+
+        assert before_infos == _REPOS
+        assert after_infos == 1
@@ -0,0 +1,76 @@
+"""Benchmark: /who presence reads, live KV query vs watch-fed mirror.
+
+Seeds 500 sessions, then times ``get_sessions_for_repos`` twice — once
+with no watch running (``stream_info`` plus one ``kv.get`` per session)
+and once after ``_run_kv_watch`` has drained its snapshot into
+:attr:`~biff.nats_relay.NatsRelay.presence`.  Round trips are counted
+from the client's ``out_msgs`` statistic.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from biff.models import BiffConfig, UserSession
+from biff.server.app import _run_kv_watch
+from biff.server.state import create_state
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_SESSIONS = 500
+_READS = 20
+
+
+async def _measure(relay: NatsRelay, repos: frozenset[str]) -> tuple[float, float]:
+    """Return (mean ms per read, mean client messages per read)."""
+    nc = relay._nc
+    assert nc is not None
+    before = nc.stats["out_msgs"]
+    start = time.perf_counter()
+    for _ in range(_READS):
+        sessions = await relay.get_sessions_for_repos(repos)
+        assert len(sessions) == _SESSIONS
+    elapsed = time.perf_counter() - start
+    sent = nc.stats["out_msgs"] - before
+    return elapsed / _READS * 1000, sent / _READS
+
+
+class TestPresenceMirrorBenchmark:
+    async def test_who_500_sessions(self, relay: NatsRelay, tmp_path: Path) -> None:
+        for i in range(_SESSIONS):
+            await relay.update_session(UserSession(user=f"user{i:03d}", tty="tty1"))
+        repos = frozenset({relay._repo_name})
+
+        live_ms, live_msgs = await _measure(relay, repos)
+
+        config = BiffConfig(user="kai", repo_name=relay._repo_name, relay_url="x")
+        state = create_state(config, tmp_path, relay=relay, tty="bench")
+        shutdown = asyncio.Event()
+        watch = asyncio.create_task(_run_kv_watch(relay, state, shutdown))
+        for _ in range(200):
+            if relay.presence.ready:
+                break
+            await asyncio.sleep(0.05)
+        assert relay.presence.ready
+
+        mirror_ms, mirror_msgs = await _measure(relay, repos)
+        shutdown.set()
+        await watch
+
+        print(f"\n  /who over {_SESSIONS} sessions ({_READS} reads each)")
+        print(f"  {'path':<8} {'ms/read':>10} {'msgs/read':>10}")
+        print(f"  {'live':<8} {live_ms:>10.2f} {live_msgs:>10.1f}")
+        print(f"  {'mirror':<8} {mirror_ms:>10.2f} {mirror_msgs:>10.1f}")
+
+        assert live_msgs >= _SESSIONS  # one kv.get per session
+        assert mirror_msgs == 0
+        assert mirror_ms < live_ms
@@ -0,0 +1,100 @@
+"""JetStream API calls made while a relay connects and provisions.
+
+Every shared resource is looked up first and created only when missing,
+the lookups run concurrently, and the pre-DES-016 legacy cleanup runs at
+most once a day per server and repo (a stamp in the biff data dir).
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from nats.aio.client import Client
+
+from biff import nats_relay
+from biff.nats_relay import NatsRelay
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from nats.aio.msg import Msg
+
+pytestmark = pytest.mark.nats
+
+_TEST_REPO = "_test-nats-unit"  # the conftest relay's repo: cleaned per test
+
+
+@pytest.fixture(autouse=True)
+def _data_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:  # pyright: ignore[reportUnusedFunction]
+    monkeypatch.setattr(nats_relay, "biff_data_dir", lambda: tmp_path)
+
+
+@pytest.fixture
+def api_calls(monkeypatch: pytest.MonkeyPatch) -> Iterator[Counter[str]]:
+    """Count ``$JS.API`` requests by verb (``STREAM.INFO``, ...)."""
+    calls: Counter[str] = Counter()
+    original = Client.request
+
+    async def _counting(self: Client, subject: str, *args: Any, **kw: Any) -> Msg:
+        if subject.startswith("$JS.API."):
+            verb = subject.removeprefix("$JS.API.").split(".")
+            calls[".".join(verb[:2])] += 1
+        return await original(self, subject, *args, **kw)
+
+    monkeypatch.setattr(Client, "request", _counting)
+    yield calls
+
+
+async def _connect(nats_server: str) -> NatsRelay:
+    relay = NatsRelay(url=nats_server, repo_name=_TEST_REPO)
+    await relay.get_kv()
+    return relay
+
+
+class TestProvisionApiCalls:
+    async def test_connect_counts(
+        self,
+        relay: NatsRelay,
+        nats_server: str,
+        api_calls: Counter[str],
+        tmp_path: Path,
+    ) -> None:
+        await relay.get_kv()  # cold: creates what is missing, cleans up
+        cold = api_calls.copy()
+
+        api_calls.clear()
+        warm = await _connect(nats_server)
+        await warm.close()
+        stamped = api_calls.copy()
+
+        api_calls.clear()
+        (tmp_path / "provisioned").rename(tmp_path / "stale")  # see _data_dir
+        again = await _connect(nats_server)
+        await again.close()
+        unstamped = api_calls.copy()
+
+        print("\n  JetStream API calls per connect")
+        for name, calls in (
+            ("cold", cold),
+            ("warm, stamped", stamped),
+            ("warm, no stamp", unstamped),
+        ):
+            print(f"  {name:<15} {calls.total():>3}  {dict(sorted(calls.items()))}")
+        # Bound: two bucket lookups, two stream lookups, nothing created.
+        assert stamped == Counter({"STREAM.INFO": 4})
+        assert unstamped == Counter({"STREAM.INFO": 4, "STREAM.DELETE": 3})
+        assert cold["STREAM.CREATE"] >= 1
+
+    async def test_cleanup_stamp_is_per_server_and_repo(
+        self, nats_server: str, api_calls: Counter[str]
+    ) -> None:
+        first = await _connect(nats_server)
+        await first.close()
+        other = NatsRelay(url=nats_server, repo_name="_test-nats-other")
+        api_calls.clear()
+        await other.get_kv()
+        await other.close()
+        assert api_calls["STREAM.DELETE"] == 3
@@ -0,0 +1,52 @@
+"""Relay statistics against a real NATS server.
+
+Checks that ordinary relay traffic lands in the ``_tracked`` histograms,
+that pooled consumer binds and session-end deletes are counted, and that
+the ``biff doctor`` probe returns a populated snapshot.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from biff.doctor import _probe_relay_stats  # pyright: ignore[reportPrivateUsage]
+from biff.models import Message, UserSession
+from biff.relay_stats import format_relay_stats
+
+if TYPE_CHECKING:
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_KAI = "kai:tty1"
+
+
+class TestRelayStats:
+    async def test_operations_are_recorded(self, relay: NatsRelay) -> None:
+        await relay.update_session(UserSession(user="kai", tty="tty1"))
+        await relay.deliver(Message(from_user="eric", to_user=_KAI, body="hi"))
+        await relay.get_session(_KAI)
+        await relay.get_unread_summary(_KAI)
+        ops = relay.stats().operations
+        assert ops["kv.put"].ok == 1
+        assert ops["publish"].ok == 1
+        assert ops["stream_info"].count >= 1
+        assert all(op.timeouts == 0 and op.errors == 0 for op in ops.values())
+        # A local server answers well inside the first few buckets.
+        assert ops["kv.put"].quantile_ms(0.99) <= 256.0
+
+    async def test_consumer_create_and_delete_counted(self, relay: NatsRelay) -> None:
+        await relay.update_session(UserSession(user="kai", tty="tty1"))
+        await relay.fetch(_KAI)
+        await relay.fetch(_KAI)  # pooled: no second create
+        assert relay.stats().consumers_created == 1
+        await relay.delete_session(_KAI)
+        stats = relay.stats()
+        assert (stats.consumers_created, stats.consumers_deleted) == (1, 1)
+
+    async def test_doctor_probe(self, nats_server: str) -> None:
+        stats = await _probe_relay_stats(nats_server, None)
+        assert stats.operations["stream_info"].count >= 5
+        assert "stream_info" in format_relay_stats(stats)
@@ -0,0 +1,291 @@
+"""Sessions split into a cold profile key and a hot ``.beat`` key.
+
+A heartbeat writes ``{repo}.{user}.{tty}.beat`` (a :class:`SessionBeat`);
+the profile under ``{repo}.{user}.{tty}`` is rewritten when a field other
+than ``last_active`` changes, or when its own ``last_active`` is half a
+liveness window old — so clients that read the profile alone still see
+the session live.  Readers see one merged :class:`UserSession`, and a
+session written before the split — a profile with no beat key — reads
+and heartbeats as before.
+
+The benchmark prints bytes written to the bucket and delivered to one
+repo watch per hour for 100 idle sessions, whole-document heartbeats
+against beat-key heartbeats (with the profile refreshed every other
+beat, as at a 60 s cadence).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import nats
+import pytest
+from nats.js.errors import KeyNotFoundError
+
+from biff.models import UserSession
+from biff.nats_relay import BEAT_KV_SUFFIX
+from biff.relay import PRESENCE_LIVENESS_SECONDS, SESSION_TTL_SECONDS
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from nats.aio.client import Client as NatsClient
+    from nats.aio.msg import Msg
+    from nats.js.kv import KeyValue
+
+    from biff.nats_relay import NatsRelay
+    from biff.session_watch import RepoWatch
+
+pytestmark = pytest.mark.nats
+
+_TEST_REPO = "_test-nats-unit"  # the conftest relay's repo: cleaned per test
+_KEY = "kai:tty1"
+_KV_KEY = f"{_TEST_REPO}.kai.tty1"
+_IDLE_SESSIONS = 100
+_HEARTBEAT_INTERVAL = 60.0
+
+
+def _profile(user: str = "kai", **kw: object) -> UserSession:
+    """A session with its cold fields filled in, as a real server writes it."""
+    fields: dict[str, object] = {
+        "tty_name": "",
+        "hostname": "build-host-03.example.com",
+        "pwd": f"/home/{user}/src/punt-labs/biff",
+        "display_name": f"{user.title()} Example",
+        "kind": "human",
+        "plan": "reviewing the presence split before the release branch is cut",
+        "public_key": "q3S1hbZ0bXQmB0jV5oJ8x2mF7eYc9wKp4sLr6TnD1aE=",
+        "repo": _TEST_REPO,
+        **kw,
+    }
+    return UserSession(user=user, tty="tty1", **fields)  # type: ignore[arg-type]
+
+
+async def _kv(relay: NatsRelay) -> KeyValue:
+    _, kv = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+    return kv
+
+
+async def _revision(relay: NatsRelay, key: str) -> int | None:
+    try:
+        entry = await (await _kv(relay)).get(key)
+    except KeyNotFoundError:
+        return None
+    return entry.revision
+
+
+class TestSplitWrites:
+    async def test_heartbeat_writes_only_the_beat(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        await relay.update_session(_profile())
+        profile_rev = await _revision(relay, _KV_KEY)
+
+        await relay.heartbeat(_KEY)
+
+        assert await _revision(relay, _KV_KEY) == profile_rev
+        assert await _revision(relay, _KV_KEY + BEAT_KV_SUFFIX) is not None
+        seen = await second_relay.get_session(_KEY)
+        assert seen is not None
+        assert seen.plan == _profile().plan
+        assert seen.last_active > _profile().last_active - timedelta(seconds=1)
+
+    async def test_touch_writes_beat_change_writes_profile(
+        self, relay: NatsRelay
+    ) -> None:
+        session = _profile()
+        await relay.update_session(session)
+        profile_rev = await _revision(relay, _KV_KEY)
+
+        await relay.update_session(
+            session.model_copy(update={"last_active": datetime.now(UTC)})
+        )
+        assert await _revision(relay, _KV_KEY) == profile_rev
+
+        await relay.update_session(session.model_copy(update={"plan": "new"}))
+        assert (await _revision(relay, _KV_KEY) or 0) > (profile_rev or 0)
+
+    async def test_explicit_last_active_wins_over_earlier_beat(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        session = _profile()
+        await relay.update_session(session)
+        await relay.heartbeat(_KEY)
+        old = datetime.now(UTC) - timedelta(hours=2)
+
+        await relay.update_session(session.model_copy(update={"last_active": old}))
+
+        seen = await second_relay.get_session(_KEY)
+        assert seen is not None
+        assert seen.last_active == old
+
+    async def test_get_sessions_merges_beats(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        old = datetime.now(UTC) - timedelta(hours=1)
+        await relay.update_session(_profile(last_active=old))
+        await relay.update_session(_profile("eric", last_active=old))
+        await relay.heartbeat(_KEY)
+
+        sessions = {s.user: s for s in await second_relay.get_sessions()}
+
+        assert sessions["eric"].last_active == old
+        assert sessions["kai"].last_active > old
+
+    async def test_delete_removes_both_keys_and_stops_heartbeat(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        await relay.update_session(_profile())
+        await relay.heartbeat(_KEY)  # relay now holds the beat revision
+
+        await second_relay.delete_session(_KEY)
+        await relay.heartbeat(_KEY)
+
+        assert await _revision(relay, _KV_KEY) is None
+        assert await _revision(relay, _KV_KEY + BEAT_KV_SUFFIX) is None
+        assert await second_relay.get_session(_KEY) is None
+
+
+class TestLegacyAndTtl:
+    async def test_single_key_session_reads_and_heartbeats(
+        self, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        """A session written before the split has no beat key."""
+        old = datetime.now(UTC) - timedelta(minutes=30)
+        legacy = _profile(last_active=old)
+        await (await _kv(second_relay)).put(_KV_KEY, legacy.model_dump_json().encode())
+
+        assert await relay.get_session(_KEY) == legacy
+        assert await relay.get_sessions() == [legacy]
+
+        await relay.heartbeat(_KEY)
+
+        seen = await second_relay.get_session(_KEY)
+        assert seen is not None
+        assert seen.last_active > old
+        assert seen.model_copy(update={"last_active": old}) == legacy
+
+    async def test_profile_stays_live_for_profile_only_readers(
+        self, relay: NatsRelay
+    ) -> None:
+        """A client from before the split reads ``last_active`` off the profile."""
+        aged = datetime.now(UTC) - timedelta(seconds=PRESENCE_LIVENESS_SECONDS / 2)
+        await relay.update_session(_profile(last_active=aged))
+
+        await relay.heartbeat(_KEY)
+        profile_rev = await _revision(relay, _KV_KEY)
+        await relay.heartbeat(_KEY)
+
+        entry = await (await _kv(relay)).get(_KV_KEY)
+        assert entry.value is not None
+        stored = UserSession.model_validate_json(entry.value)
+        assert stored.is_live(
+            now=datetime.now(UTC), ttl_seconds=PRESENCE_LIVENESS_SECONDS / 2
+        )
+        assert entry.revision == profile_rev  # fresh again: back to the beat
+
+    async def test_profile_near_ttl_is_rewritten(self, relay: NatsRelay) -> None:
+        """Beats alone would let the profile age out of the bucket."""
+        aged = datetime.now(UTC) - timedelta(seconds=SESSION_TTL_SECONDS - 3600)
+        await (await _kv(relay)).put(
+            _KV_KEY, _profile(last_active=aged).model_dump_json().encode()
+        )
+        profile_rev = await _revision(relay, _KV_KEY)
+
+        await relay.heartbeat(_KEY)
+
+        assert (await _revision(relay, _KV_KEY) or 0) > (profile_rev or 0)
+        entry = await (await _kv(relay)).get(_KV_KEY)
+        assert entry.value is not None
+        stored = UserSession.model_validate_json(entry.value)
+        assert stored.last_active > aged + timedelta(days=1)
+
+
+# -- Benchmark --
+
+
+class _Bytes:
+    def __init__(self) -> None:
+        self.written = 0
+
+    async def on_put(self, msg: Msg) -> None:
+        self.written += len(msg.data)
+
+
+async def _drain_watch(watch: RepoWatch) -> int:
+    """Bytes (key + value) the watch delivers until it goes quiet."""
+    total = 0
+    with suppress(TimeoutError):
+        while True:
+            entry = await watch.updates(timeout=0.5)
+            if entry is not None:
+                total += len(entry.key) + len(entry.value or b"")
+    return total
+
+
+@pytest.fixture
+async def observer(nats_server: str) -> AsyncIterator[NatsClient]:
+    nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+    yield nc
+    await nc.close()
+
+
+class TestIdleSessionBytes:
+    async def test_bytes_per_hour_for_idle_sessions(
+        self, relay: NatsRelay, second_relay: NatsRelay, observer: NatsClient
+    ) -> None:
+        # Half a liveness window old: each session's next heartbeat
+        # refreshes its profile, the one after writes only the beat.
+        aged = datetime.now(UTC) - timedelta(seconds=PRESENCE_LIVENESS_SECONDS / 2)
+        sessions = [
+            _profile(f"user{i:03d}", last_active=aged) for i in range(_IDLE_SESSIONS)
+        ]
+        await asyncio.gather(*map(relay.update_session, sessions))
+        keys = [f"{s.user}:{s.tty}" for s in sessions]
+        watch = await second_relay.watch_repos(frozenset({_TEST_REPO}))
+        await _drain_watch(watch)  # the snapshot
+        bytes_ = _Bytes()
+        bucket = relay._kv_bucket  # pyright: ignore[reportPrivateUsage]
+        sub = await observer.subscribe(  # pyright: ignore[reportUnknownMemberType]
+            f"$KV.{bucket}.{_TEST_REPO}.>", cb=bytes_.on_put
+        )
+        await observer.flush()
+        kv = await _kv(relay)
+        try:
+            # After first: a raw put below would move the profile revision
+            # under the relay, and the observer also sees a rejected update.
+            for _ in range(2):  # a profile refresh, then a beat
+                for key in keys:
+                    await relay.heartbeat(key)
+            after_watched = await _drain_watch(watch) / 2
+            after_written, bytes_.written = bytes_.written / 2, 0
+
+            # Before: every heartbeat rewrote the whole document.
+            for session in sessions:
+                touched = session.model_copy(update={"last_active": datetime.now(UTC)})
+                await kv.put(
+                    f"{_TEST_REPO}.{session.user}.tty1",
+                    touched.model_dump_json().encode(),
+                )
+            before_watched = await _drain_watch(watch)
+            before_written = bytes_.written
+        finally:
+            await sub.unsubscribe()
+            await watch.stop()
+
+        ticks = 3600 / _HEARTBEAT_INTERVAL
+        print(f"\n  {_IDLE_SESSIONS} idle sessions, heartbeat every 60 s, KiB/hour")
+        print(f"  {'layout':<16} {'written':>9} {'watched':>9}")
+        for name, written, watched in (
+            ("whole document", before_written, before_watched),
+            ("beat key", after_written, after_watched),
+        ):
+            print(
+                f"  {name:<16} {written * ticks / 1024:>9.0f}"
+                f" {watched * ticks / 1024:>9.0f}"
+            )
+        assert after_written < before_written * 2 / 3
+        assert after_watched < before_watched * 2 / 3
@@ -0,0 +1,157 @@
+"""Write-behind session cache against a real NATS KV bucket.
+
+Counts the KV reads and writes the relay issues on the sessions bucket,
+as it issues them, so the test sees every read and write the relay makes
+for the session row.  Also checks the revision-checked write: a
+concurrent writer is re-read and merged, never clobbered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from nats.js.kv import KeyValue
+
+from biff.models import BiffConfig, UserSession
+from biff.server.session_cache import SessionCache
+from biff.server.state import ServerState, create_state
+from biff.server.tools._session import update_current_session
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from pathlib import Path
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_REPO = "_test-nats-unit"
+_KEY = "kai:tty1"
+_BURST = 50
+_DEBOUNCE = 0.2
+
+
+_READS = ("get",)
+_WRITES = ("put", "create", "update", "delete")
+
+
+class _KvOpCounter:
+    """Tally session-row reads and writes, counted at the call.
+
+    Only handles on *bucket* count, whichever ``KeyValue`` object the
+    relay used (cached, leader, or fresh).
+    """
+
+    def __init__(self, bucket: str) -> None:
+        self._bucket = bucket
+        self.reads = 0
+        self.writes = 0
+
+    def install(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        for name in (*_READS, *_WRITES):
+            monkeypatch.setattr(KeyValue, name, self._counting(name))
+
+    def reset(self) -> None:
+        self.reads = self.writes = 0
+
+    def _counting(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(KeyValue, name)
+
+        async def counted(kv: KeyValue, *args: Any, **kwargs: Any) -> Any:
+            if kv._name == self._bucket:  # pyright: ignore[reportPrivateUsage]
+                if name in _READS:
+                    self.reads += 1
+                else:
+                    self.writes += 1
+            return await method(kv, *args, **kwargs)
+
+        return counted
+
+
+@pytest.fixture
+def counter(relay: NatsRelay, monkeypatch: pytest.MonkeyPatch) -> _KvOpCounter:
+    counter = _KvOpCounter(relay._kv_bucket)  # pyright: ignore[reportPrivateUsage]
+    counter.install(monkeypatch)
+    return counter
+
+
+@pytest.fixture
+async def state(tmp_path: Path, relay: NatsRelay) -> ServerState:
+    await relay.update_session(
+        UserSession(user="kai", tty="tty1", tty_name="tty1", repo=_REPO)
+    )
+    s = create_state(
+        BiffConfig(user="kai", repo_name=_REPO),
+        tmp_path,
+        relay=relay,
+        tty="tty1",
+        hostname="test-host",
+        pwd="/test",
+    )
+    object.__setattr__(
+        s, "session_cache", SessionCache(relay, s.session_key, debounce=_DEBOUNCE)
+    )
+    return s
+
+
+class TestSessionCacheKvOps:
+    async def test_burst_of_tool_calls(
+        self, state: ServerState, relay: NatsRelay, counter: _KvOpCounter
+    ) -> None:
+        """50 tool-call updates: one load, one write (was 50 of each)."""
+        # Pre-cache cost of the same burst, for the printed comparison.
+        counter.reset()
+        for _ in range(_BURST):
+            session = await relay.get_session(_KEY)
+            assert session is not None
+            await relay.update_session(
+                session.model_copy(update={"last_active": datetime.now(UTC)})
+            )
+        baseline = (counter.reads, counter.writes)
+
+        counter.reset()
+        for _ in range(_BURST):
+            await update_current_session(state)
+        await asyncio.sleep(_DEBOUNCE * 3)
+        after = (counter.reads, counter.writes)
+
+        print()
+        print(f"{'path':<22} {'KV reads':>9} {'KV writes':>10}")
+        print(f"{'get + put per call':<22} {baseline[0]:>9} {baseline[1]:>10}")
+        print(f"{'session cache':<22} {after[0]:>9} {after[1]:>10}")
+        # A read is of both keys, profile and beat; a touch writes the beat.
+        assert baseline == (2 * _BURST, _BURST)
+        assert after == (2, 1)
+        assert not state.session_cache.dirty
+
+    async def test_concurrent_writer_is_merged_not_clobbered(
+        self, state: ServerState, relay: NatsRelay, second_relay: NatsRelay
+    ) -> None:
+        cache = state.session_cache
+        await cache.get()
+        # Another process changes a field this server never touches.
+        other = await second_relay.get_session(_KEY)
+        assert other is not None
+        await second_relay.update_session(
+            other.model_copy(update={"biff_enabled": False})
+        )
+        # This server's next write is at a stale revision: it must re-read.
+        await cache.update(plan="auth refactor")
+        stored = await second_relay.get_session(_KEY)
+        assert stored is not None
+        assert stored.plan == "auth refactor"
+        assert stored.biff_enabled is False
+
+    async def test_heartbeat_replaces_relay_heartbeat(
+        self, state: ServerState, counter: _KvOpCounter
+    ) -> None:
+        cache = state.session_cache
+        await cache.get()
+        await cache.update(last_active=datetime.now(UTC))
+        counter.reset()
+        assert await cache.heartbeat()
+        # One revision-checked write; no read.
+        assert (counter.reads, counter.writes) == (0, 1)
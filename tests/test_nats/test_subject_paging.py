@@ -0,0 +1,55 @@
+"""Subject listings past the server's per-reply cap.
+
+``STREAM.INFO`` returns at most ``limit`` subjects (100k today) per
+reply.  Seeds the sessions bucket with 150k profile keys under one org,
+one repo each — published raw, so seeding takes seconds — and checks that
+``_iter_subjects`` and ``discover_repos_for_org`` see every one, where a
+single nats-py ``stream_info`` stops at the cap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_SUBJECTS = 150_000
+_ORG = "pager"
+
+
+async def test_150k_subjects_are_all_listed(relay: NatsRelay) -> None:
+    js, _ = await relay._ensure_connected()  # pyright: ignore[reportPrivateUsage]
+    nc = relay._nc  # pyright: ignore[reportPrivateUsage]
+    assert nc is not None
+    bucket = relay._kv_bucket  # pyright: ignore[reportPrivateUsage]
+    stream = f"KV_{bucket}"
+    profiles = f"$KV.{bucket}.*.*.*"
+    expected = {f"{_ORG}__r{i:06d}" for i in range(_SUBJECTS)}
+    for repo in expected:
+        await nc.publish(f"$KV.{bucket}.{repo}.kai.t", b"")
+    # Neither a repo of another org nor a beat key names a repo of this one.
+    await nc.publish(f"$KV.{bucket}.other__r000001.kai.t", b"")
+    await nc.publish(f"$KV.{bucket}.{_ORG}__beat.kai.t.beat", b"")
+    await nc.flush()
+    # Core publishes are unacked; wait until the stream holds them all.
+    for _ in range(100):
+        if (await js.stream_info(stream)).state.messages >= _SUBJECTS + 2:
+            break
+        await asyncio.sleep(0.1)
+
+    info = await js.stream_info(stream, subjects_filter=profiles)
+    assert info.state.subjects is not None
+    assert len(info.state.subjects) < _SUBJECTS  # one reply is truncated
+
+    pages = [
+        page
+        async for page in relay._iter_subjects(stream, profiles)  # pyright: ignore[reportPrivateUsage]
+    ]
+    assert len(pages) == 2
+    assert sum(map(len, pages)) == _SUBJECTS + 1
+
+    assert await relay.discover_repos_for_org(_ORG) == expected
@@ -0,0 +1,95 @@
+"""Soak: push-maintained unread counts stay exact across 10k deliveries.
+
+One relay polls ``get_unread_summary`` with counters enabled while a
+second relay delivers to both inboxes and both relays read them.  After
+every round the counter must equal the stream's own count, and no
+``stream_info`` request may be issued once the counters are seeded.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import nats
+import pytest
+
+from biff.models import Message
+
+if TYPE_CHECKING:
+    from nats.aio.msg import Msg
+
+    from biff.nats_relay import NatsRelay
+
+pytestmark = pytest.mark.nats
+
+_KAI = "kai:tty1"
+_DELIVERIES = 10_000
+_ROUND = 200
+
+
+async def _truth(relay: NatsRelay) -> int:
+    """The stream's own count for kai's TTY and user inboxes."""
+    return await relay._count_subject(
+        relay._subject_for_key(_KAI)
+    ) + await relay._count_subject(relay._user_subject("kai"))
+
+
+async def _settled_count(relay: NatsRelay, expected: int) -> int:
+    """Poll until the pushed count matches *expected* (events are async)."""
+    count = (await relay.get_unread_summary(_KAI)).count
+    deadline = time.monotonic() + 5.0
+    while count != expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+        count = (await relay.get_unread_summary(_KAI)).count
+    return count
+
+
+class TestUnreadCounterSoak:
+    async def test_counts_exact_over_10k_deliveries(
+        self, relay: NatsRelay, second_relay: NatsRelay, nats_server: str
+    ) -> None:
+        relay.enable_unread_counters()
+        assert (await relay.get_unread_summary(_KAI)).count == 0  # seeds
+        await second_relay.get_kv()  # connect: provisioning looks the stream up
+
+        observer = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
+        stream_infos = 0
+
+        async def _on_info(_msg: Msg) -> None:
+            nonlocal stream_infos
+            stream_infos += 1
+
+        await observer.subscribe(  # pyright: ignore[reportUnknownMemberType]
+            f"$JS.API.STREAM.INFO.{relay._stream_name}", cb=_on_info
+        )
+        await observer.flush()
+
+        delivered = 0
+        try:
+            while delivered < _DELIVERIES:
+                for i in range(_ROUND):
+                    # Alternate TTY-targeted and user-broadcast deliveries.
+                    to = _KAI if i % 2 else "kai"
+                    await second_relay.deliver(
+                        Message(from_user="eric", to_user=to, body=f"m{delivered}")
+                    )
+                    delivered += 1
+                expected = await _truth(relay)
+                assert await _settled_count(relay, expected) == expected
+
+                # Reads: this relay drains its TTY inbox (local decrement),
+                # another process drains the shared user inbox (wire acks).
+                # A round puts exactly one fetch batch (100) in each inbox.
+                assert len(await relay.fetch(_KAI)) == _ROUND // 2
+                assert len(await second_relay.fetch_user_inbox("kai")) == _ROUND // 2
+                expected = await _truth(relay)
+                assert await _settled_count(relay, expected) == expected
+        finally:
+            await observer.close()
+
+        assert delivered == _DELIVERIES
+        # Only the _truth() oracle queried the stream: two per check.
+        assert stream_infos == 2 * 2 * (_DELIVERIES // _ROUND)
+        assert (await relay.get_unread_summary(_KAI)).count == 0
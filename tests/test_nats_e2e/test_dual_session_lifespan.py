@@ -77,7 +77,7 @@ class TestDualSessionLifespan:
             Client(FastMCPTransport(mcp_a)),
             Client(FastMCPTransport(mcp_b)),
         ):
-            # Production registers the companion from the heartbeat loop once
+            # Production registers the companion from its roster watch once
             # the ethos roster resolves the human identity.  With the companion
             # pre-set (no roster in-test) and thus never ``None``, the discovery
             # poll is skipped — drive the same registration path directly so the
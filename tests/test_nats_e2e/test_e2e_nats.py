@@ -465,18 +465,11 @@ class TestConsumerCleanup:
         consumer_name = relay._durable_name(session_key)
 
         try:
-            # Deliver a message so the stream has data, then create
-            # the durable consumer via pull_subscribe (not fetch(),
-            # which deletes the consumer in its finally block).
+            # Deliver and fetch — fetch() binds the pooled durable consumer
+            # and leaves it in place for the next read.
             msg = Message(from_user="eric", to_user=session_key, body="hello")
             await relay.deliver(msg)
-
-            js_relay, _ = await relay._ensure_connected()
-            subject = relay._subject_for_key(session_key)
-            sub = await js_relay.pull_subscribe(
-                subject, durable=consumer_name, stream=relay._stream_name
-            )
-            await sub.unsubscribe()
+            assert [m.body for m in await relay.fetch(session_key)] == ["hello"]
 
             # Verify consumer exists on the shared stream.
             nc = await nats.connect(nats_server)  # pyright: ignore[reportUnknownMemberType]
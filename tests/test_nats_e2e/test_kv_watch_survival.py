@@ -68,15 +68,8 @@ class TestKvWatchSurvivalE2E:
         writer_task = asyncio.create_task(_write_after_snapshot())
         shutdown_task = asyncio.create_task(_shutdown_after_detection())
 
-        cache: dict[str, object] = {}
-
         with patch("biff.server.activity.ActivityTracker.wake", _counting_wake):
-            await _run_kv_watch(
-                relay,
-                state,
-                shutdown,
-                cache,  # type: ignore[arg-type]
-            )
+            await _run_kv_watch(relay, state, shutdown)
 
         await writer_task
         await shutdown_task
@@ -88,10 +81,10 @@ class TestKvWatchSurvivalE2E:
 
         await relay.disconnect()
 
-    async def test_post_snapshot_session_update_cached(
+    async def test_post_snapshot_session_update_mirrored(
         self, nats_server: str, tmp_path: Path
     ) -> None:
-        """A session KV entry written after snapshot is cached by _handle_kv_entry."""
+        """A session KV entry written after snapshot lands in the presence mirror."""
         from biff.models import UserSession
 
         config = BiffConfig(user="kai", repo_name=_TEST_REPO, relay_url=nats_server)
@@ -111,7 +104,6 @@ class TestKvWatchSurvivalE2E:
         await kv.put(kai_key, kai_session.model_dump_json().encode())  # pyright: ignore[reportUnknownMemberType]
 
         shutdown = asyncio.Event()
-        cache: dict[str, UserSession] = {}
 
         # We'll write eric's session after the snapshot
         eric_key = f"{_TEST_REPO}.eric.tty2"
@@ -124,9 +116,9 @@ class TestKvWatchSurvivalE2E:
             await kv.put(eric_key, eric_session.model_dump_json().encode())  # pyright: ignore[reportUnknownMemberType]
 
         async def _shutdown_when_cached() -> None:
-            # Poll the cache for eric's session
+            # Poll the mirror for eric's session
             for _ in range(100):
-                if "eric:tty2" in cache:
+                if relay.presence.get(eric_key) is not None:
                     break
                 await asyncio.sleep(0.1)
             shutdown.set()
@@ -134,15 +126,16 @@ class TestKvWatchSurvivalE2E:
         writer_task = asyncio.create_task(_write_eric_after_snapshot())
         shutdown_task = asyncio.create_task(_shutdown_when_cached())
 
-        await _run_kv_watch(relay, state, shutdown, cache)
+        await _run_kv_watch(relay, state, shutdown)
 
         await writer_task
         await shutdown_task
 
-        assert "eric:tty2" in cache, (
-            "Post-snapshot session entry was not cached. "
+        mirrored = relay.presence.get(eric_key)
+        assert mirrored is not None, (
+            "Post-snapshot session entry was not mirrored. "
             "The watcher likely terminated on the snapshot-done marker."
         )
-        assert cache["eric:tty2"].user == "eric"
+        assert mirrored.user == "eric"
 
         await relay.disconnect()
@@ -642,8 +642,8 @@ class TestTimeoutIdentityGuard:
 class TestSequentialTrackedRebuildRace:
     """The second of two sequential ``_tracked`` calls must re-anchor.
 
-    ``get_unread_summary`` and ``heartbeat`` each fetch a handle once and then
-    issue two sequential ``_tracked`` requests.  If a concurrent loop rebuilds
+    ``heartbeat`` fetches a handle once and then issues two sequential
+    ``_tracked`` requests.  If a concurrent loop rebuilds
     ``self._nc`` to a fresh live client during the first request's await, the
     second request must run its awaitable on the *fresh* handle — not on the
     stale one captured earlier.  Otherwise ``owner = self._nc`` reads the fresh
@@ -652,63 +652,6 @@ class TestSequentialTrackedRebuildRace:
     (code-reviewer + alex-chen: residual two-``_tracked`` race).
     """
 
-    @pytest.mark.anyio()
-    async def test_get_unread_summary_second_op_reanchors(self) -> None:
-        relay, _old_nc = _wedged_relay()
-
-        # Wedge the current (old) client to threshold-1.
-        for _ in range(_WEDGE_FORCE_RECONNECT_THRESHOLD - 1):
-            with pytest.raises(TimeoutError):
-                await relay._tracked("stream_info", _timeout())
-        assert (
-            relay._health.consecutive_timeouts == _WEDGE_FORCE_RECONNECT_THRESHOLD - 1
-        )
-
-        # The fresh, healthy client a concurrent loop installs mid-request.
-        new_nc = _live_nc()
-        new_js = MagicMock()
-        healthy_info = MagicMock()
-        healthy_info.state.subjects = {}
-
-        async def _rebuild_then_ok() -> object:
-            # A concurrent loop rebuilt the connection during this await.
-            relay._nc = new_nc
-            relay._js = new_js
-            return healthy_info
-
-        async def _stale_timeout() -> object:
-            raise TimeoutError
-
-        async def _fresh_ok() -> object:
-            return healthy_info
-
-        # The stale js captured at the top of get_unread_summary: the first op
-        # swaps the connection; a second op landing here would time out.
-        stale_calls: list[int] = []
-
-        def _stale_stream_info(*_a: object, **_k: object) -> object:
-            stale_calls.append(1)
-            if len(stale_calls) == 1:
-                return _rebuild_then_ok()
-            return _stale_timeout()
-
-        def _fresh_stream_info(*_a: object, **_k: object) -> object:
-            return _fresh_ok()
-
-        stale_js = MagicMock()
-        stale_js.stream_info = _stale_stream_info
-        new_js.stream_info = _fresh_stream_info
-        relay._js = stale_js
-
-        # With the fix the second op re-anchors to new_js and completes; without
-        # it, the stale-handle timeout force-reconnects the healthy new client.
-        await relay.get_unread_summary("kai:tty1")
-
-        new_nc.close.assert_not_awaited()
-        assert relay._nc is new_nc
-        assert relay._js is new_js
-        assert relay._health.consecutive_timeouts < _WEDGE_FORCE_RECONNECT_THRESHOLD
-
     @pytest.mark.anyio()
     async def test_heartbeat_second_op_reanchors(self) -> None:
         relay, _old_nc = _wedged_relay()
@@ -726,6 +669,7 @@ class TestSequentialTrackedRebuildRace:
         session = UserSession(user="kai", tty="tty1", plan="coding")
         entry = MagicMock()
         entry.value = session.model_dump_json().encode()
+        entry.revision = 3
 
         async def _get_then_rebuild() -> object:
             relay._nc = new_nc
@@ -749,43 +693,33 @@ class TestSequentialTrackedRebuildRace:
 
         stale_kv = MagicMock()
         stale_kv.get = _stale_get
-        stale_kv.put = _stale_put
-        new_kv.put = _fresh_put
+        stale_kv.update = _stale_put
+        new_kv.update = _fresh_put
         relay._kv = stale_kv
 
-        await relay.heartbeat("kai:tty1")
+        # The heartbeat's read goes to the stream leader; route it to the
+        # current sessions handle so the stale get above drives the rebuild.
+        def _current_kv(*_a: object) -> object:
+            return relay._kv
+
+        with patch.object(relay, "_leader_kv", _current_kv):
+            await relay.heartbeat("kai:tty1")
 
         new_nc.close.assert_not_awaited()
         assert relay._nc is new_nc
         assert relay._kv is new_kv
 
     @pytest.mark.anyio()
-    async def test_get_unread_summary_reanchor_provision_failure_propagates(
-        self,
-    ) -> None:
-        # The re-anchor _ensure_connected can raise BucketNotFoundError (a
-        # NotFoundError subclass) when a slow-path rebuild hits the
-        # js.key_value() fallback.  That is a connection/provisioning failure,
-        # not a genuine "0 unread" answer — it must propagate, not be swallowed
-        # into a tty_count-only undercount.
+    async def test_get_unread_summary_provision_failure_propagates(self) -> None:
+        # Every inbox is counted by one stream_info, so there is no second
+        # op to re-anchor — but the _ensure_connected ahead of it can still
+        # raise BucketNotFoundError (a NotFoundError subclass) when a
+        # slow-path rebuild hits the js.key_value() fallback.  That is a
+        # connection/provisioning failure, not a genuine "0 unread" answer —
+        # it must propagate, not be swallowed into an undercount.
         relay, _nc = _wedged_relay()
 
-        tty_subject = relay._subject_for_key("kai:tty1")
-        tty_info = MagicMock()
-        tty_info.state.subjects = {tty_subject: 3}
-
-        async def _tty_ok() -> object:
-            return tty_info
-
-        stale_js = MagicMock()
-        stale_js.stream_info = MagicMock(return_value=_tty_ok())
-
-        calls: list[int] = []
-
         async def _ensure() -> tuple[object, object]:
-            calls.append(1)
-            if len(calls) == 1:
-                return stale_js, MagicMock()
             raise BucketNotFoundError
 
         with (
@@ -795,38 +729,27 @@ class TestSequentialTrackedRebuildRace:
             await relay.get_unread_summary("kai:tty1")
 
     @pytest.mark.anyio()
-    async def test_get_unread_summary_second_stream_notfound_still_swallowed(
+    async def test_get_unread_summary_stream_notfound_still_swallowed(
         self,
     ) -> None:
-        # Contrast: a genuine NotFoundError from the *second* stream_info (a
-        # missing user stream/subject) legitimately means 0 unread for that
-        # inbox and stays swallowed — the summary returns tty_count only.
+        # Contrast: a genuine NotFoundError from stream_info itself (the
+        # inbox stream is missing) legitimately means 0 unread.
         relay, _nc = _wedged_relay()
 
-        tty_subject = relay._subject_for_key("kai:tty1")
-        tty_info = MagicMock()
-        tty_info.state.subjects = {tty_subject: 3}
-
-        async def _tty_ok() -> object:
-            return tty_info
-
-        async def _user_notfound() -> object:
+        async def _notfound() -> object:
             raise NotFoundError
 
-        stale_js = MagicMock()
-        stale_js.stream_info = MagicMock(return_value=_tty_ok())
-        fresh_js = MagicMock()
-        fresh_js.stream_info = MagicMock(return_value=_user_notfound())
-
-        handles = iter([(stale_js, MagicMock()), (fresh_js, MagicMock())])
+        # _iter_subjects sends the STREAM.INFO request itself.
+        js = MagicMock()
+        js._api_request = MagicMock(return_value=_notfound())
 
         async def _ensure() -> tuple[object, object]:
-            return next(handles)
+            return js, MagicMock()
 
         with patch.object(relay, "_ensure_connected", _ensure):
             summary = await relay.get_unread_summary("kai:tty1")
 
-        assert summary.count == 3
+        assert summary.count == 0
         assert relay._health.consecutive_timeouts < _WEDGE_FORCE_RECONNECT_THRESHOLD
 
 
@@ -0,0 +1,236 @@
+"""Tests for the watch-fed presence mirror (revision ordering, readiness)."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from biff.models import SessionBeat, UserSession
+from biff.presence_mirror import PresenceMirror, merge_beat
+from biff.relay import SESSION_TTL_SECONDS
+
+_KEY = "repo-a.kai.tty1"
+
+
+def _session(user: str = "kai", tty: str = "tty1", **kw: object) -> UserSession:
+    return UserSession(user=user, tty=tty, **kw)  # type: ignore[arg-type]
+
+
+class TestReadiness:
+    """Reads are authoritative only between snapshot-done and invalidation."""
+
+    def test_not_ready_initially(self) -> None:
+        assert not PresenceMirror().ready
+
+    def test_ready_after_snapshot(self) -> None:
+        mirror = PresenceMirror()
+        mirror.begin_snapshot()
+        assert not mirror.ready
+        mirror.end_snapshot()
+        assert mirror.ready
+
+    def test_end_snapshot_outside_snapshot_is_noop(self) -> None:
+        mirror = PresenceMirror()
+        mirror.end_snapshot()
+        assert not mirror.ready
+
+    def test_invalidate_keeps_entries(self) -> None:
+        mirror = PresenceMirror()
+        mirror.begin_snapshot()
+        mirror.apply_put(_KEY, _session(), 1)
+        mirror.end_snapshot()
+        mirror.invalidate()
+        assert not mirror.ready
+        assert mirror.get(_KEY) is not None
+
+    def test_snapshot_prunes_keys_it_did_not_mention(self) -> None:
+        """A key removed while no watch ran is dropped by the next snapshot."""
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(), 1)
+        mirror.apply_put("repo-a.eric.tty2", _session("eric", "tty2"), 2)
+        mirror.begin_snapshot()
+        mirror.apply_put("repo-a.eric.tty2", _session("eric", "tty2"), 2)
+        mirror.end_snapshot()
+        assert mirror.get(_KEY) is None
+        assert mirror.get("repo-a.eric.tty2") is not None
+        assert len(mirror) == 1
+
+    def test_covers_only_the_watched_scope(self) -> None:
+        mirror = PresenceMirror()
+        mirror.begin_snapshot(frozenset({"repo-a", "repo-b"}))
+        assert not mirror.covers(frozenset({"repo-a"}))
+        mirror.end_snapshot()
+        assert mirror.covers(frozenset({"repo-a", "repo-b"}))
+        assert not mirror.covers(frozenset({"repo-a", "repo-c"}))
+
+    def test_resume_does_not_prune(self) -> None:
+        """A resumed watch sends changes only; unmentioned keys are unchanged."""
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(), 1)
+        mirror.begin_snapshot(resume=True)
+        resuming = mirror.ready
+        mirror.end_snapshot()
+        assert (resuming, mirror.ready) == (False, True)
+        assert mirror.get(_KEY) is not None
+
+    def test_unscoped_snapshot_covers_everything(self) -> None:
+        mirror = PresenceMirror()
+        mirror.begin_snapshot()
+        mirror.end_snapshot()
+        assert mirror.covers(frozenset({"any-repo"}))
+
+
+class TestRevisionOrdering:
+    """Out-of-order deliveries never overwrite newer state."""
+
+    def test_newer_put_wins(self) -> None:
+        mirror = PresenceMirror()
+        assert mirror.apply_put(_KEY, _session(plan="old"), 1)
+        assert mirror.apply_put(_KEY, _session(plan="new"), 2)
+        held = mirror.get(_KEY)
+        assert held is not None
+        assert held.plan == "new"
+        assert mirror.revision == 2
+
+    def test_stale_put_ignored(self) -> None:
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(plan="new"), 5)
+        assert not mirror.apply_put(_KEY, _session(plan="old"), 3)
+        assert not mirror.apply_put(_KEY, _session(plan="dup"), 5)
+        held = mirror.get(_KEY)
+        assert held is not None
+        assert held.plan == "new"
+
+    def test_delete_returns_held_session(self) -> None:
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(), 1)
+        removed = mirror.apply_delete(_KEY, 2)
+        assert removed is not None
+        assert removed.user == "kai"
+        assert mirror.get(_KEY) is None
+
+    def test_delete_unknown_key_returns_none(self) -> None:
+        assert PresenceMirror().apply_delete(_KEY, 1) is None
+
+    def test_stale_delete_ignored(self) -> None:
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(), 7)
+        assert mirror.apply_delete(_KEY, 4) is None
+        assert mirror.get(_KEY) is not None
+
+    def test_tombstone_blocks_late_put(self) -> None:
+        """A put older than the delete cannot resurrect the session."""
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(), 1)
+        mirror.apply_delete(_KEY, 3)
+        assert not mirror.apply_put(_KEY, _session(), 2)
+        assert mirror.get(_KEY) is None
+        assert mirror.apply_put(_KEY, _session(), 4)
+        assert mirror.get(_KEY) is not None
+
+    def test_local_delete_absorbs_own_marker(self) -> None:
+        """Write-through delete (no revision) then the watch's marker arrives."""
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(), 3)
+        assert mirror.apply_delete(_KEY) is not None
+        assert mirror.apply_delete(_KEY, 4) is None
+        assert not mirror.apply_put(_KEY, _session(), 3)
+
+    def test_tombstones_pruned_once_the_watch_is_past(self) -> None:
+        mirror = PresenceMirror()
+        mirror.begin_snapshot()
+        mirror.apply_put(_KEY, _session(), 1)
+        mirror.apply_delete(_KEY, 3)
+        mirror.apply_beat_delete(_KEY, 3)
+        mirror.advance(3)
+        mirror.end_snapshot()
+        assert not mirror.apply_put(_KEY, _session(), 2)  # at the watermark: kept
+
+        mirror.advance(4)
+        mirror.begin_snapshot(resume=True)
+        mirror.end_snapshot()
+        assert mirror._tombstones == {}  # pyright: ignore[reportPrivateUsage]
+        assert mirror._beat_tombstones == {}  # pyright: ignore[reportPrivateUsage]
+
+    def test_long_running_watch_prunes_in_batches(self) -> None:
+        """No snapshot ends while a watch runs for days; advance() prunes."""
+        mirror = PresenceMirror()
+        for revision in range(1, 5001):
+            mirror.apply_delete(f"repo-a.user{revision}.tty1", revision)
+            mirror.advance(revision)
+        assert len(mirror._tombstones) <= 1025  # pyright: ignore[reportPrivateUsage]
+
+
+class TestReads:
+    def test_sessions_for_repos_filters_by_repo(self) -> None:
+        mirror = PresenceMirror()
+        mirror.apply_put("repo-a.kai.tty1", _session(), 1)
+        mirror.apply_put("repo-b.eric.tty2", _session("eric", "tty2"), 2)
+        mirror.apply_put("repo-c.priya.tty3", _session("priya", "tty3"), 3)
+        users = sorted(
+            s.user for s in mirror.sessions_for_repos(frozenset({"repo-a", "repo-b"}))
+        )
+        assert users == ["eric", "kai"]
+
+    def test_expired_sessions_hidden(self) -> None:
+        """KV TTL expiry emits no marker — the mirror ages entries itself."""
+        mirror = PresenceMirror()
+        stale = datetime.now(UTC) - timedelta(seconds=SESSION_TTL_SECONDS + 60)
+        mirror.apply_put(_KEY, _session(last_active=stale), 1)
+        assert mirror.get(_KEY) is None
+        assert mirror.sessions_for_repos(frozenset({"repo-a"})) == []
+
+
+class TestBeats:
+    """A session's ``.beat`` key is folded into its profile on read."""
+
+    def test_later_beat_sets_last_active(self) -> None:
+        mirror = PresenceMirror()
+        beat = SessionBeat()
+        mirror.apply_put(_KEY, _session(plan="cold"), 1)
+        assert mirror.apply_beat(_KEY, beat, 2)
+        held = mirror.get(_KEY)
+        assert held is not None
+        assert held.plan == "cold"
+        assert held.last_active == beat.last_active
+
+    def test_later_profile_overrides_beat(self) -> None:
+        """Whichever key was written last holds ``last_active``."""
+        old = datetime.now(UTC) - timedelta(hours=1)
+        merged = merge_beat(_session(last_active=old), 5, (SessionBeat(), 4))
+        assert merged.last_active == old
+
+    def test_beat_before_profile_is_kept(self) -> None:
+        mirror = PresenceMirror()
+        beat = SessionBeat()
+        mirror.apply_beat(_KEY, beat, 3)
+        assert mirror.get(_KEY) is None
+        mirror.apply_put(_KEY, _session(), 1)
+        held = mirror.get(_KEY)
+        assert held is not None
+        assert held.last_active == beat.last_active
+
+    def test_stale_beat_ignored(self) -> None:
+        mirror = PresenceMirror()
+        mirror.apply_beat(_KEY, SessionBeat(), 5)
+        assert not mirror.apply_beat(_KEY, SessionBeat(), 4)
+        mirror.apply_beat_delete(_KEY, 6)
+        assert not mirror.apply_beat(_KEY, SessionBeat(), 5)
+
+    def test_beat_revives_expired_profile(self) -> None:
+        stale = datetime.now(UTC) - timedelta(seconds=SESSION_TTL_SECONDS + 60)
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(last_active=stale), 1)
+        mirror.apply_beat(_KEY, SessionBeat(), 2)
+        assert mirror.get(_KEY) is not None
+
+    def test_snapshot_prunes_unmentioned_beats(self) -> None:
+        stale = datetime.now(UTC) - timedelta(hours=1)
+        mirror = PresenceMirror()
+        mirror.apply_put(_KEY, _session(last_active=stale), 1)
+        mirror.apply_beat(_KEY, SessionBeat(), 2)
+        mirror.begin_snapshot()
+        mirror.apply_put(_KEY, _session(last_active=stale), 1)
+        mirror.end_snapshot()
+        held = mirror.get(_KEY)
+        assert held is not None
+        assert held.last_active == stale
@@ -112,6 +112,32 @@ class TestDeliver:
 # -- Fetch --
 
 
+class TestDeliverMany:
+    async def test_delivers_in_order(self, relay: LocalRelay) -> None:
+        parts = [
+            Message(from_user="kai", to_user="eric:tty2", body=f"part {i}")
+            for i in range(5)
+        ]
+        assert await relay.deliver_many(parts) == [None] * 5
+        unread = await relay.fetch("eric:tty2")
+        assert [m.body for m in unread] == [f"part {i}" for i in range(5)]
+
+    async def test_reports_failed_part_and_delivers_the_rest(
+        self, relay: LocalRelay
+    ) -> None:
+        parts = [
+            Message(from_user="kai", to_user="eric", body="one"),
+            Message(from_user="kai", to_user="../eric", body="two"),
+            Message(from_user="kai", to_user="eric", body="three"),
+        ]
+        results = await relay.deliver_many(parts)
+        assert results[0] is None
+        assert isinstance(results[1], ValueError)
+        assert results[2] is None
+        unread = await relay.fetch_user_inbox("eric")
+        assert [m.body for m in unread] == ["one", "three"]
+
+
 class TestFetch:
     async def test_empty(self, relay: LocalRelay) -> None:
         assert await relay.fetch("eric:tty2") == []
@@ -256,6 +282,52 @@ class TestUserInbox:
         assert await relay.get_user_unread_count("eric") == 2
 
 
+class TestFetchInboxes:
+    """The server's own session and its companion's, read together."""
+
+    async def test_splits_by_session_and_inbox(self, relay: LocalRelay) -> None:
+        await relay.deliver(Message(from_user="kai", to_user="eric:tty2", body="a"))
+        await relay.deliver(Message(from_user="kai", to_user="eric", body="b"))
+        await relay.deliver(Message(from_user="eric", to_user="jess:tty3", body="c"))
+        inboxes = await relay.fetch_inboxes(["eric:tty2", "jess:tty3"])
+        bodies = {
+            key: ([m.body for m in tty], [m.body for m in user])
+            for key, (tty, user) in inboxes.items()
+        }
+        assert bodies == {"eric:tty2": (["a"], ["b"]), "jess:tty3": (["c"], [])}
+
+    async def test_combined_unread_summary(self, relay: LocalRelay) -> None:
+        await relay.deliver(Message(from_user="kai", to_user="eric:tty2", body="a"))
+        await relay.deliver(Message(from_user="kai", to_user="eric", body="b"))
+        await relay.deliver(Message(from_user="eric", to_user="jess:tty3", body="c"))
+        summary = await relay.get_combined_unread_summary(["eric:tty2", "jess:tty3"])
+        assert summary.count == 3
+
+
+class TestDrain:
+    async def test_pages_tty_then_user_inbox(self, relay: LocalRelay) -> None:
+        for i in range(5):
+            await relay.deliver(
+                Message(from_user="kai", to_user="eric:tty2", body=f"t{i}")
+            )
+        await relay.deliver(Message(from_user="kai", to_user="eric", body="u0"))
+        pages = [
+            [m.body for m in page]
+            async for page in relay.drain("eric:tty2", page_size=2)
+        ]
+        assert pages == [["t0", "t1"], ["t2", "t3"], ["t4"], ["u0"]]
+        assert (await relay.get_unread_summary("eric:tty2")).count == 0
+
+    async def test_stopping_early_leaves_the_rest(self, relay: LocalRelay) -> None:
+        for i in range(3):
+            await relay.deliver(
+                Message(from_user="kai", to_user="eric:tty2", body=f"t{i}")
+            )
+        async for _ in relay.drain("eric:tty2", page_size=2):
+            break
+        assert [m.body for m in await relay.fetch("eric:tty2")] == ["t2"]
+
+
 # -- Sessions --
 
 
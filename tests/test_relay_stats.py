@@ -0,0 +1,155 @@
+"""Tests for relay statistics (``biff.relay_stats``) and ``NatsRelay._tracked``.
+
+The recorder and snapshot are exercised directly; ``_tracked`` is driven
+with plain coroutines, which needs no server — the owner/health logic
+tolerates a relay that never connected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+
+import pytest
+from nats.js.errors import KeyNotFoundError
+
+from biff.nats_relay import NatsRelay
+from biff.relay import DormantRelay, LocalRelay
+from biff.relay_stats import (
+    BUCKET_BOUNDS_MS,
+    Outcome,
+    RelayStats,
+    StatsRecorder,
+    format_relay_stats,
+)
+
+
+class TestStatsRecorder:
+    def test_buckets_are_fixed_log_scale(self) -> None:
+        ratios = {b / a for a, b in itertools.pairwise(BUCKET_BOUNDS_MS)}
+        assert ratios == {2.0}
+        assert BUCKET_BOUNDS_MS[0] == 0.25
+
+    def test_counts_outcomes_per_operation(self) -> None:
+        rec = StatsRecorder()
+        rec.record("kv.get", 0.001, Outcome.OK)
+        rec.record("kv.get", 0.002, Outcome.TIMEOUT)
+        rec.record("publish", 0.003, Outcome.ERROR)
+        ops = rec.snapshot().operations
+        assert (ops["kv.get"].ok, ops["kv.get"].timeouts, ops["kv.get"].errors) == (
+            1,
+            1,
+            0,
+        )
+        assert ops["publish"].errors == 1
+        assert rec.snapshot().total_ops == 3
+
+    def test_latency_lands_in_bucket(self) -> None:
+        rec = StatsRecorder()
+        rec.record("kv.get", 0.003, Outcome.OK)  # 3ms -> (2, 4] bucket
+        op = rec.snapshot().operations["kv.get"]
+        assert op.buckets[BUCKET_BOUNDS_MS.index(4.0)] == 1
+        assert sum(op.buckets) == 1
+        assert op.max_ms == pytest.approx(3.0)
+
+    def test_overflow_bucket(self) -> None:
+        rec = StatsRecorder()
+        rec.record("stream_info", 30.0, Outcome.TIMEOUT)
+        op = rec.snapshot().operations["stream_info"]
+        assert op.buckets[-1] == 1
+        assert op.quantile_ms(0.99) == pytest.approx(30_000.0)
+
+    def test_quantiles_are_bucket_upper_bounds(self) -> None:
+        rec = StatsRecorder()
+        for _ in range(99):
+            rec.record("kv.get", 0.0009, Outcome.OK)  # 0.9ms -> <=1ms
+        rec.record("kv.get", 0.1, Outcome.OK)  # 100ms -> <=128ms
+        op = rec.snapshot().operations["kv.get"]
+        assert op.quantile_ms(0.5) == 1.0
+        assert op.quantile_ms(0.99) == 1.0
+        assert op.quantile_ms(1.0) == 128.0
+
+    def test_snapshot_is_detached(self) -> None:
+        rec = StatsRecorder()
+        rec.record("kv.get", 0.001, Outcome.OK)
+        snap = rec.snapshot()
+        rec.record("kv.get", 0.001, Outcome.OK)
+        assert snap.operations["kv.get"].count == 1
+
+
+class TestFormat:
+    def test_empty(self) -> None:
+        assert format_relay_stats(RelayStats()) == "Relay stats: no operations recorded"
+
+    def test_table(self) -> None:
+        rec = StatsRecorder()
+        rec.record("kv.get", 0.001, Outcome.OK)
+        rec.consumers_created = 2
+        rec.consumers_deleted = 1
+        text = format_relay_stats(rec.snapshot())
+        assert text.startswith("Relay stats: 1 ops, 0 timeouts, 0 errors, 0 slow")
+        assert "consumers +2/-1" in text
+        assert "kv.get" in text
+
+
+class TestOtherRelays:
+    def test_local_and_dormant_report_empty(self, tmp_path: object) -> None:
+        assert LocalRelay(tmp_path).stats() == RelayStats()  # type: ignore[arg-type]
+        assert DormantRelay().stats() == RelayStats()
+
+
+# -- NatsRelay._tracked -------------------------------------------------------
+
+
+async def _sleep_ok(seconds: float = 0.0) -> str:
+    await asyncio.sleep(seconds)
+    return "done"
+
+
+async def _raise(exc: BaseException) -> None:
+    raise exc
+
+
+class TestTracked:
+    async def test_success_is_timed(self) -> None:
+        relay = NatsRelay()
+        assert await relay._tracked("kv.get", _sleep_ok()) == "done"  # pyright: ignore[reportPrivateUsage]
+        op = relay.stats().operations["kv.get"]
+        assert (op.ok, op.timeouts, op.errors) == (1, 0, 0)
+
+    async def test_timeout_counted(self) -> None:
+        relay = NatsRelay()
+        with pytest.raises(TimeoutError):
+            await relay._tracked("publish", _raise(TimeoutError()))  # pyright: ignore[reportPrivateUsage]
+        assert relay.stats().operations["publish"].timeouts == 1
+
+    async def test_error_counted(self) -> None:
+        relay = NatsRelay()
+        with pytest.raises(RuntimeError):
+            await relay._tracked("publish", _raise(RuntimeError()))  # pyright: ignore[reportPrivateUsage]
+        assert relay.stats().operations["publish"].errors == 1
+
+    async def test_not_found_counts_as_ok(self) -> None:
+        relay = NatsRelay()
+        with pytest.raises(KeyNotFoundError):
+            await relay._tracked("kv.get", _raise(KeyNotFoundError()))  # pyright: ignore[reportPrivateUsage]
+        assert relay.stats().operations["kv.get"].ok == 1
+
+    async def test_cancelled_not_recorded(self) -> None:
+        relay = NatsRelay()
+        with pytest.raises(asyncio.CancelledError):
+            await relay._tracked("kv.get", _raise(asyncio.CancelledError()))  # pyright: ignore[reportPrivateUsage]
+        assert relay.stats().operations == {}
+
+    async def test_slow_op_logged_with_subject(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        relay = NatsRelay(slow_op_threshold=0.01)
+        with caplog.at_level(logging.INFO, logger="biff.nats_relay"):
+            await relay._tracked("kv.put", _sleep_ok(0.02), subject="r.kai.tty1")  # pyright: ignore[reportPrivateUsage]
+            await relay._tracked("kv.put", _sleep_ok(), subject="r.kai.tty2")  # pyright: ignore[reportPrivateUsage]
+        slow = [r.getMessage() for r in caplog.records if "Slow relay op" in r.message]
+        assert len(slow) == 1
+        assert "kv.put on r.kai.tty1" in slow[0]
+        assert relay.stats().slow_ops == 1
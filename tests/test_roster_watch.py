@@ -0,0 +1,90 @@
+"""Tests for :class:`biff.roster_watch.RosterWatch` against a fake ethos dir."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from biff.roster_watch import RosterWatch
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from pathlib import Path
+
+# Generous for a loaded CI box; inotify wakes in milliseconds.
+_WAKE = 2.0
+
+
+@pytest.fixture(params=["inotify", "poll"])
+async def watch(
+    request: pytest.FixtureRequest, tmp_path: Path
+) -> AsyncIterator[RosterWatch]:
+    use_inotify = request.param == "inotify"
+    w = RosterWatch(
+        tmp_path / "ethos" / "sessions", poll_interval=0.05, use_inotify=use_inotify
+    )
+    w.start()
+    if w.mode != request.param:
+        w.stop()
+        pytest.skip(f"{request.param} unavailable here")
+    yield w
+    w.stop()
+
+
+async def _quiet(watch: RosterWatch) -> None:
+    """Absorb wake-ups from setup so the next assertion sees one change."""
+    while await watch.wait(timeout=0.3):
+        pass
+
+
+class TestRosterWatch:
+    async def test_directory_appearing_wakes(self, watch: RosterWatch) -> None:
+        start = time.monotonic()
+        watch.directory.mkdir(parents=True)
+        (watch.directory / "a1b2.yaml").write_text("root: jfreeman\n")
+
+        assert await watch.wait(timeout=_WAKE)
+        print(f"\n  {watch.mode}: woke {time.monotonic() - start:.3f}s after mkdir")
+
+    async def test_roster_file_written_wakes(self, watch: RosterWatch) -> None:
+        watch.directory.mkdir(parents=True)
+        roster = watch.directory / "a1b2.yaml"
+        roster.write_text("root: claude\n")
+        await _quiet(watch)
+
+        roster.write_text("root: jfreeman\nprimary: claude\n")
+
+        assert await watch.wait(timeout=_WAKE)
+
+    async def test_nested_session_dir_wakes(self, watch: RosterWatch) -> None:
+        session = watch.directory / "a1b2"
+        session.mkdir(parents=True)
+        await _quiet(watch)
+
+        (session / "roster.yaml").write_text("root: jfreeman\n")
+
+        assert await watch.wait(timeout=_WAKE)
+
+    async def test_unrelated_files_do_not_wake(self, watch: RosterWatch) -> None:
+        ethos = watch.directory.parent
+        ethos.mkdir()
+        await _quiet(watch)
+
+        (ethos / "identities").mkdir()
+        (ethos.parent / "notes.txt").write_text("not ethos\n")
+
+        assert not await watch.wait(timeout=0.3)
+
+    async def test_burst_is_coalesced(self, watch: RosterWatch) -> None:
+        watch.directory.mkdir(parents=True)
+        await _quiet(watch)
+
+        for i in range(20):
+            (watch.directory / f"s{i}.yaml").write_text("x\n")
+        await asyncio.sleep(0.2)
+
+        assert await watch.wait(timeout=_WAKE)
+        assert not await watch.wait(timeout=0.3)
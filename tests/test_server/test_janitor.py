@@ -0,0 +1,181 @@
+"""Tests for the repo janitor lease (``server/janitor.py``) and its gates.
+
+The lease itself runs against an ``AsyncMock(spec=NatsRelay)``; the gated
+logout paths run against a ``LocalRelay`` with the janitor's standing
+forced.  The ten-server NATS scenario lives in
+``tests/test_nats/test_janitor.py``.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock
+
+import pytest
+
+from biff.models import BiffConfig, SessionEvent, UserSession
+from biff.nats_relay import NatsRelay
+from biff.relay import LocalRelay
+from biff.server.app import (
+    _ORPHAN_STALE_SECONDS,  # pyright: ignore[reportPrivateUsage]
+    _close_orphaned_logins,  # pyright: ignore[reportPrivateUsage]
+    _handle_kv_delete,  # pyright: ignore[reportPrivateUsage]
+    _reap_dead_session,  # pyright: ignore[reportPrivateUsage]
+)
+from biff.server.janitor import Janitor
+from biff.server.state import ServerState, create_state
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_TEST_REPO = "_test-janitor"
+_DEAD = "eric:tty2"
+
+
+def _nats_relay(*claims: bool | Exception) -> AsyncMock:
+    relay = AsyncMock(spec=NatsRelay)
+    relay.claim_janitor_lease.side_effect = list(claims)
+    return relay
+
+
+class TestJanitor:
+    def test_non_nats_relay_is_always_janitor(self, tmp_path: Path) -> None:
+        assert Janitor(LocalRelay(tmp_path), "kai:tty1").is_leader
+
+    async def test_starts_as_follower_until_claimed(self) -> None:
+        janitor = Janitor(_nats_relay(True), "kai:tty1")
+        assert not janitor.is_leader
+        assert await janitor.renew()
+        assert janitor.is_leader
+
+    async def test_renewal_is_not_a_new_acquisition(self) -> None:
+        janitor = Janitor(_nats_relay(True, True), "kai:tty1", ttl=5.0)
+        assert await janitor.renew()
+        assert not await janitor.renew()
+        assert janitor.is_leader
+
+    async def test_lost_claim_demotes(self) -> None:
+        janitor = Janitor(_nats_relay(True, False), "kai:tty1")
+        await janitor.renew()
+        assert not await janitor.renew()
+        assert not janitor.is_leader
+
+    async def test_relay_error_demotes(self) -> None:
+        janitor = Janitor(_nats_relay(True, TimeoutError()), "kai:tty1")
+        await janitor.renew()
+        assert not await janitor.renew()
+        assert not janitor.is_leader
+
+    async def test_release_only_when_leader(self) -> None:
+        relay = _nats_relay(True)
+        janitor = Janitor(relay, "kai:tty1")
+        await janitor.release()
+        relay.release_janitor_lease.assert_not_awaited()
+        await janitor.renew()
+        await janitor.release()
+        relay.release_janitor_lease.assert_awaited_once_with("kai:tty1")
+        assert not janitor.is_leader
+
+
+class _RecordingRelay(LocalRelay):
+    """``LocalRelay`` that records wtmp appends and delete markers."""
+
+    def __init__(self, data_dir: Path) -> None:
+        super().__init__(data_dir)
+        self.events: list[SessionEvent] = []
+        self.deletes: list[tuple[str, bool]] = []
+
+    async def append_wtmp(self, event: SessionEvent) -> None:
+        self.events.append(event)
+
+    async def get_wtmp(
+        self, *, user: str | None = None, count: int = 25
+    ) -> list[SessionEvent]:
+        return self.events[-count:]
+
+    async def delete_session(
+        self, session_key: str, *, logged_out: bool = False
+    ) -> None:
+        self.deletes.append((session_key, logged_out))
+        await super().delete_session(session_key)
+
+
+@pytest.fixture
+def relay(tmp_path: Path) -> _RecordingRelay:
+    return _RecordingRelay(tmp_path)
+
+
+def _state(tmp_path: Path, relay: _RecordingRelay, *, leader: bool) -> ServerState:
+    state = create_state(
+        BiffConfig(user="kai", repo_name=_TEST_REPO), tmp_path, relay=relay, tty="tty1"
+    )
+    janitor = state.janitor
+    janitor._leader = leader  # pyright: ignore[reportPrivateUsage]
+    return state
+
+
+class TestGatedLogouts:
+    async def test_janitor_reap_writes_logout_and_marks_delete(
+        self, tmp_path: Path, relay: _RecordingRelay
+    ) -> None:
+        await relay.update_session(UserSession(user="eric", tty="tty2"))
+        assert await _reap_dead_session(_state(tmp_path, relay, leader=True), _DEAD)
+        assert [e.session_key for e in relay.events] == [_DEAD]
+        assert relay.deletes == [(_DEAD, True)]
+
+    async def test_follower_reap_leaves_logout_to_janitor(
+        self, tmp_path: Path, relay: _RecordingRelay
+    ) -> None:
+        await relay.update_session(UserSession(user="eric", tty="tty2"))
+        assert await _reap_dead_session(_state(tmp_path, relay, leader=False), _DEAD)
+        assert relay.events == []
+        assert relay.deletes == [(_DEAD, False)]
+        assert await relay.get_session(_DEAD) is None
+
+    async def test_follower_watch_writes_no_logout(
+        self, tmp_path: Path, relay: _RecordingRelay
+    ) -> None:
+        state = _state(tmp_path, relay, leader=False)
+        cached = UserSession(user="eric", tty="tty2")
+        await _handle_kv_delete(relay, state, cached, _DEAD)  # type: ignore[arg-type]
+        assert relay.events == []
+
+    async def test_janitor_watch_writes_logout(
+        self, tmp_path: Path, relay: _RecordingRelay
+    ) -> None:
+        state = _state(tmp_path, relay, leader=True)
+        cached = UserSession(user="eric", tty="tty2")
+        await _handle_kv_delete(relay, state, cached, _DEAD)  # type: ignore[arg-type]
+        assert [e.session_key for e in relay.events] == [_DEAD]
+
+
+class TestOrphanSweep:
+    """A session inside its heartbeat's slack is not an orphan all day long."""
+
+    @pytest.mark.parametrize(
+        ("stale_after", "closed"),
+        [(None, True), (_ORPHAN_STALE_SECONDS, False)],
+        ids=["startup", "periodic"],
+    )
+    async def test_quiet_session(
+        self,
+        tmp_path: Path,
+        relay: _RecordingRelay,
+        stale_after: float | None,
+        closed: bool,
+    ) -> None:
+        state = _state(tmp_path, relay, leader=True)
+        await relay.append_wtmp(
+            SessionEvent(session_key=_DEAD, event="login", user="eric", tty="tty2")
+        )
+        quiet = datetime.now(UTC) - timedelta(minutes=5)
+        sessions = [UserSession(user="eric", tty="tty2", last_active=quiet)]
+
+        if stale_after is None:
+            await _close_orphaned_logins(state, sessions)
+        else:
+            await _close_orphaned_logins(state, sessions, stale_after=stale_after)
+
+        logouts = [e for e in relay.events if e.event == "logout"]
+        assert bool(logouts) is closed
@@ -9,14 +9,19 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
 from biff.models import BiffConfig, UserSession
-from biff.server.app import _run_kv_watch
+from biff.nats_relay import LOGGED_OUT_MARKER
+from biff.presence_mirror import PresenceMirror
+from biff.server.app import (  # pyright: ignore[reportPrivateUsage]
+    _run_kv_watch,
+    _WatchCursor,
+)
 from biff.server.state import ServerState, create_state
 
 _TEST_REPO = "_test-kv-watch"
@@ -34,6 +39,7 @@ class FakeKVEntry:
     key: str
     value: bytes | None = None
     operation: str | None = None  # None = PUT, "DEL", "PURGE"
+    revision: int = 1
 
 
 class FakeWatcher:
@@ -52,6 +58,7 @@ class FakeWatcher:
         self._shutdown = shutdown
         self._index = 0
         self.stopped = False
+        self.resumed = False
 
     async def updates(self, timeout: float = 5.0) -> FakeKVEntry | None:
         if self._index < len(self._script):
@@ -74,19 +81,28 @@ class FakeKV:
 
     watcher: FakeWatcher
 
-    async def watchall(self) -> FakeWatcher:
-        return self.watcher
-
 
 @dataclass
 class FakeNatsRelay:
     """Minimal mock of NatsRelay for _run_kv_watch."""
 
     kv: FakeKV
+    presence: PresenceMirror = field(default_factory=PresenceMirror)
+    connection_generation: int = 1
+    scopes: list[frozenset[str]] = field(default_factory=list[frozenset[str]])
+    afters: list[int] = field(default_factory=list[int])
 
     async def get_kv(self) -> FakeKV:
         return self.kv
 
+    async def watch_repos(
+        self, repos: frozenset[str], *, after: int = 0
+    ) -> FakeWatcher:
+        self.scopes.append(repos)
+        self.afters.append(after)
+        self.kv.watcher.resumed = after > 0
+        return self.kv.watcher
+
     @staticmethod
     def wall_kv_key(repo_name: str) -> str:
         return f"{repo_name}.wall"
@@ -140,7 +156,6 @@ class TestKvWatchSnapshotSurvival:
         fake_kv = FakeKV(watcher=watcher)
         fake_relay = FakeNatsRelay(kv=fake_kv)
 
-        cache: dict[str, UserSession] = {}
         wake_called = asyncio.Event()
 
         def _tracking_wake(_self: object) -> None:
@@ -160,15 +175,16 @@ class TestKvWatchSnapshotSurvival:
                 fake_relay,  # type: ignore[arg-type]
                 state,
                 shutdown,
-                cache,
             )
 
         await shutdown_task
 
         # The wall entry after None woke the poller
         assert wake_called.is_set(), "Poller not woken for post-snapshot wall entry"
-        # The session entry after None was cached
-        assert "kai:tty1" in cache, "Session entry after snapshot-done was not cached"
+        # The session entry after None was mirrored
+        assert fake_relay.presence.get(session_key) is not None, (
+            "Session entry after snapshot-done was not mirrored"
+        )
         assert watcher.stopped, "Watcher was not stopped in finally block"
 
     async def test_none_does_not_terminate_loop(self, state: ServerState) -> None:
@@ -189,7 +205,6 @@ class TestKvWatchSnapshotSurvival:
         fake_kv = FakeKV(watcher=watcher)
         fake_relay = FakeNatsRelay(kv=fake_kv)
 
-        cache: dict[str, UserSession] = {}
         wake_called = asyncio.Event()
 
         def _tracking_wake(_self: object) -> None:
@@ -206,7 +221,6 @@ class TestKvWatchSnapshotSurvival:
                 fake_relay,  # type: ignore[arg-type]
                 state,
                 shutdown,
-                cache,
             )
 
         await shutdown_task
@@ -233,7 +247,6 @@ class TestKvWatchSnapshotSurvival:
         fake_kv = FakeKV(watcher=watcher)
         fake_relay = FakeNatsRelay(kv=fake_kv)
 
-        cache: dict[str, UserSession] = {}
         wake_called = asyncio.Event()
 
         def _tracking_wake(_self: object) -> None:
@@ -250,7 +263,6 @@ class TestKvWatchSnapshotSurvival:
                 fake_relay,  # type: ignore[arg-type]
                 state,
                 shutdown,
-                cache,
             )
 
         await shutdown_task
@@ -265,16 +277,301 @@ class TestKvWatchSnapshotSurvival:
         fake_kv = FakeKV(watcher=watcher)
         fake_relay = FakeNatsRelay(kv=fake_kv)
 
-        cache: dict[str, UserSession] = {}
-
         # Should return immediately
         await asyncio.wait_for(
             _run_kv_watch(
                 fake_relay,  # type: ignore[arg-type]
                 state,
                 shutdown,
-                cache,
             ),
             timeout=2.0,
         )
         assert watcher.stopped
+
+
+def _session_json(user: str, tty: str) -> bytes:
+    return (
+        UserSession(user=user, tty=tty, hostname="test-host", pwd="/test")
+        .model_dump_json()
+        .encode()
+    )
+
+
+class _IdleWatcher(FakeWatcher):
+    """After the script, time out like an idle nats watcher instead of blocking."""
+
+    async def updates(self, timeout: float = 5.0) -> FakeKVEntry | None:
+        if self._index < len(self._script):
+            return await super().updates(timeout)
+        await asyncio.sleep(0.01)
+        raise TimeoutError("nats: timeout")
+
+
+class TestKvWatchPresenceMirror:
+    """The watch feeds the relay's presence mirror and owns its readiness."""
+
+    async def test_ready_only_after_snapshot_done(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        key = f"{_TEST_REPO}.eric.tty2"
+        watcher = FakeWatcher(
+            [FakeKVEntry(key=key, value=_session_json("eric", "tty2"))], shutdown
+        )
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+
+        async def _stop_soon() -> None:
+            await asyncio.sleep(0.05)
+            # Snapshot entry applied, but no snapshot-done marker yet.
+            assert not fake_relay.presence.ready
+            assert fake_relay.presence.get(key) is not None
+            shutdown.set()
+
+        stopper = asyncio.create_task(_stop_soon())
+        await _run_kv_watch(fake_relay, state, shutdown)  # type: ignore[arg-type]
+        await stopper
+
+    async def test_snapshot_done_then_exit_invalidates(
+        self, state: ServerState
+    ) -> None:
+        shutdown = asyncio.Event()
+        watcher = FakeWatcher([None], shutdown)
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+        seen_ready = asyncio.Event()
+
+        async def _observe() -> None:
+            for _ in range(100):
+                if fake_relay.presence.ready:
+                    seen_ready.set()
+                    break
+                await asyncio.sleep(0.01)
+            shutdown.set()
+
+        observer = asyncio.create_task(_observe())
+        await _run_kv_watch(fake_relay, state, shutdown)  # type: ignore[arg-type]
+        await observer
+
+        assert seen_ready.is_set()
+        assert not fake_relay.presence.ready  # leaving the cycle invalidates
+
+    async def test_client_replacement_ends_cycle(self, state: ServerState) -> None:
+        """A new connection generation orphans the watcher — end the cycle."""
+        shutdown = asyncio.Event()
+        watcher = _IdleWatcher([None], shutdown)
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+
+        async def _replace_client() -> None:
+            await asyncio.sleep(0.05)
+            fake_relay.connection_generation += 1
+
+        replacer = asyncio.create_task(_replace_client())
+        await asyncio.wait_for(
+            _run_kv_watch(fake_relay, state, shutdown),  # type: ignore[arg-type]
+            timeout=2.0,
+        )
+        await replacer
+        assert not shutdown.is_set()
+        assert watcher.stopped
+        assert not fake_relay.presence.ready
+
+    async def test_delete_removes_from_mirror_and_logs_out(
+        self, state: ServerState
+    ) -> None:
+        shutdown = asyncio.Event()
+        key = f"{_TEST_REPO}.eric.tty2"
+        watcher = FakeWatcher(
+            [
+                FakeKVEntry(key=key, value=_session_json("eric", "tty2"), revision=1),
+                None,
+                FakeKVEntry(key=key, operation="DEL", revision=2),
+            ],
+            shutdown,
+        )
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+        logouts: list[str] = []
+
+        async def _append_wtmp(event: object) -> None:
+            logouts.append(event.session_key)  # type: ignore[attr-defined]
+            shutdown.set()
+
+        fake_relay.append_wtmp = _append_wtmp  # type: ignore[attr-defined]
+        await asyncio.wait_for(
+            _run_kv_watch(fake_relay, state, shutdown),  # type: ignore[arg-type]
+            timeout=2.0,
+        )
+
+        assert logouts == ["eric:tty2"]
+        assert fake_relay.presence.get(key) is None
+
+    async def test_logged_out_delete_writes_no_logout(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        key = f"{_TEST_REPO}.eric.tty2"
+        watcher = FakeWatcher(
+            [
+                FakeKVEntry(key=key, value=_session_json("eric", "tty2"), revision=1),
+                None,
+                FakeKVEntry(
+                    key=key, value=LOGGED_OUT_MARKER, operation="DEL", revision=2
+                ),
+            ],
+            shutdown,
+        )
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+        logouts: list[str] = []
+
+        async def _append_wtmp(event: object) -> None:
+            logouts.append(event.session_key)  # type: ignore[attr-defined]
+
+        async def _stop_when_removed() -> None:
+            while fake_relay.presence.get(key) is not None or not (
+                fake_relay.presence.ready
+            ):
+                await asyncio.sleep(0.01)
+            shutdown.set()
+
+        fake_relay.append_wtmp = _append_wtmp  # type: ignore[attr-defined]
+        stopper = asyncio.create_task(_stop_when_removed())
+        await asyncio.wait_for(
+            _run_kv_watch(fake_relay, state, shutdown),  # type: ignore[arg-type]
+            timeout=2.0,
+        )
+        await stopper
+
+        assert logouts == []
+
+    async def test_mirrors_other_repos(self, tmp_path: Path) -> None:
+        """Peer-repo sessions are mirrored too — /who spans visible repos."""
+        state = create_state(
+            BiffConfig(user="kai", repo_name=_TEST_REPO, peers=("peer-repo",)),
+            tmp_path,
+            tty="tty1",
+        )
+        shutdown = asyncio.Event()
+        peer_key = "peer-repo.eric.tty2"
+        watcher = FakeWatcher(
+            [FakeKVEntry(key=peer_key, value=_session_json("eric", "tty2")), None],
+            shutdown,
+        )
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+
+        async def _stop_when_ready() -> None:
+            for _ in range(100):
+                if fake_relay.presence.ready:
+                    break
+                await asyncio.sleep(0.01)
+            sessions = fake_relay.presence.sessions_for_repos(frozenset({"peer-repo"}))
+            assert [s.user for s in sessions] == ["eric"]
+            shutdown.set()
+
+        stopper = asyncio.create_task(_stop_when_ready())
+        await _run_kv_watch(fake_relay, state, shutdown)  # type: ignore[arg-type]
+        await stopper
+        assert fake_relay.scopes == [frozenset({_TEST_REPO, "peer-repo"})]
+
+
+class TestKvWatchScope:
+    """The watch covers the visible repos only and follows org refreshes."""
+
+    async def test_scoped_to_visible_repos(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        shutdown.set()
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=FakeWatcher([], shutdown)))
+        await _run_kv_watch(fake_relay, state, shutdown)  # type: ignore[arg-type]
+        assert fake_relay.scopes == [frozenset({_TEST_REPO})]
+
+    async def test_mirror_covers_only_the_scope(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        watcher = _IdleWatcher([None], shutdown)
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+
+        async def _check_when_ready() -> None:
+            for _ in range(100):
+                if fake_relay.presence.ready:
+                    break
+                await asyncio.sleep(0.01)
+            assert fake_relay.presence.covers(frozenset({_TEST_REPO}))
+            assert not fake_relay.presence.covers(frozenset({_TEST_REPO, "other"}))
+            shutdown.set()
+
+        checker = asyncio.create_task(_check_when_ready())
+        await _run_kv_watch(fake_relay, state, shutdown)  # type: ignore[arg-type]
+        await checker
+
+    async def test_org_refresh_ends_cycle(self, state: ServerState) -> None:
+        """A changed visible set ends the cycle so the loop re-scopes."""
+        shutdown = asyncio.Event()
+        watcher = _IdleWatcher([None], shutdown)
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+
+        async def _discover_repo() -> None:
+            await asyncio.sleep(0.05)
+            object.__setattr__(state, "org_repos", frozenset({"org__new"}))
+
+        discover = asyncio.create_task(_discover_repo())
+        await asyncio.wait_for(
+            _run_kv_watch(fake_relay, state, shutdown),  # type: ignore[arg-type]
+            timeout=2.0,
+        )
+        await discover
+        assert not shutdown.is_set()
+        assert watcher.stopped
+        assert not fake_relay.presence.ready
+
+
+class TestKvWatchResume:
+    """A cursor carries the last handled revision into the next cycle."""
+
+    async def test_cursor_tracks_last_revision(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        key = f"{_TEST_REPO}.eric.tty2"
+        watcher = _IdleWatcher(
+            [
+                FakeKVEntry(key=key, value=_session_json("eric", "tty2"), revision=7),
+                FakeKVEntry(key=f"{_TEST_REPO}.wall", value=b"w", revision=9),
+                None,
+            ],
+            shutdown,
+        )
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=watcher))
+        cursor = _WatchCursor()
+
+        async def _stop_when_ready() -> None:
+            for _ in range(100):
+                if fake_relay.presence.ready:
+                    break
+                await asyncio.sleep(0.01)
+            shutdown.set()
+
+        stopper = asyncio.create_task(_stop_when_ready())
+        await _run_kv_watch(fake_relay, state, shutdown, cursor)  # type: ignore[arg-type]
+        await stopper
+        assert cursor == _WatchCursor(scope=frozenset({_TEST_REPO}), revision=9)
+        assert fake_relay.afters == [0]
+
+    async def test_next_cycle_resumes_without_pruning(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        key = f"{_TEST_REPO}.eric.tty2"
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=_IdleWatcher([None], shutdown)))
+        fake_relay.presence.apply_put(key, UserSession(user="eric", tty="tty2"), 7)
+        cursor = _WatchCursor(scope=frozenset({_TEST_REPO}), revision=7)
+
+        async def _stop_when_ready() -> None:
+            for _ in range(100):
+                if fake_relay.presence.ready:
+                    break
+                await asyncio.sleep(0.01)
+            shutdown.set()
+
+        stopper = asyncio.create_task(_stop_when_ready())
+        await _run_kv_watch(fake_relay, state, shutdown, cursor)  # type: ignore[arg-type]
+        await stopper
+        assert fake_relay.afters == [7]
+        # The resumed watch never mentioned eric: unchanged, not removed.
+        assert fake_relay.presence.get(key) is not None
+
+    async def test_changed_scope_takes_snapshot(self, state: ServerState) -> None:
+        shutdown = asyncio.Event()
+        shutdown.set()
+        fake_relay = FakeNatsRelay(kv=FakeKV(watcher=FakeWatcher([], shutdown)))
+        cursor = _WatchCursor(scope=frozenset({"old-repo"}), revision=7)
+        await _run_kv_watch(fake_relay, state, shutdown, cursor)  # type: ignore[arg-type]
+        assert fake_relay.afters == [0]
+        assert cursor == _WatchCursor(scope=frozenset({_TEST_REPO}), revision=0)
@@ -530,6 +530,58 @@ class TestPollCompanionRegistration:
         assert ticks >= 5, f"event loop stalled (only {ticks} watchdog ticks)"
 
 
+class TestCompanionLoop:
+    """_companion_loop() re-reads the roster when its files change."""
+
+    async def test_registers_when_roster_appears_without_polling(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import asyncio
+        import time
+        from unittest.mock import MagicMock
+
+        from biff.config import EthosIdentity, EthosRoster
+        from biff.server.app import _companion_loop
+
+        config = BiffConfig(user="claude", kind="agent", repo_name="_test-roster")
+        state = create_state(
+            config, tmp_path, tty="a1b2c3d4", hostname="test-host", pwd="/test"
+        )
+        sessions = tmp_path / "ethos" / "sessions"
+        roster = EthosRoster(
+            root=EthosIdentity(handle="jfreeman", display_name="Jim", kind="human"),
+            primary=EthosIdentity(handle="claude", display_name="Claude", kind="agent"),
+        )
+        read_roster = MagicMock(
+            side_effect=lambda: roster if (sessions / "a1b2.json").exists() else None
+        )
+        monkeypatch.setattr("biff.config.get_ethos_roster", read_roster)
+        shutdown = asyncio.Event()
+        loop = asyncio.create_task(
+            _companion_loop(state, shutdown, sessions_dir=sessions, first_check=60.0)
+        )
+        try:
+            await asyncio.sleep(0.5)
+            assert read_roster.call_count == 0, "no roster read without a change"
+
+            start = time.monotonic()
+            sessions.mkdir(parents=True)
+            (sessions / "a1b2.json").write_text("{}")
+            while getattr(state, "companion") is None:  # noqa: B009
+                assert time.monotonic() - start < 5.0
+                await asyncio.sleep(0.01)
+            elapsed = time.monotonic() - start
+            await asyncio.wait_for(loop, timeout=1.0)  # done once registered
+        finally:
+            shutdown.set()
+            await loop
+
+        assert elapsed < 2.5
+        assert read_roster.call_count == 1
+        companion = getattr(state, "companion")  # noqa: B009
+        assert companion.user == "jfreeman"
+
+
 class TestOrgReposRefresh:
     """_refresh_org_repos() updates state.org_repos from relay discovery."""
 
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import patch
 
 from fastmcp.tools.function_tool import FunctionTool
 
 from biff.models import BiffConfig
+from biff.relay import LocalRelay
+from biff.relay_stats import Outcome, StatsRecorder
 from biff.server.app import create_server
 from biff.server.state import ServerState, create_state
 
@@ -105,6 +108,16 @@ class TestGetPollStatus:
         result = await fn()
         assert "2m" in result
 
+    async def test_reports_relay_stats(self, tmp_path: Path) -> None:
+        state = _make_state(tmp_path)
+        recorder = StatsRecorder()
+        recorder.record("kv.get", 0.003, Outcome.OK)
+        with patch.object(LocalRelay, "stats", return_value=recorder.snapshot()):
+            fn = await _get_tool_fn(state, "get_poll_status")
+            result = await fn()
+        assert "Relay stats: 1 ops" in result
+        assert "kv.get" in result
+
 
 class TestParseInterval:
     """Unit tests for _parse_interval helper."""
@@ -0,0 +1,199 @@
+"""Tests for the write-behind session cache (``server/session_cache.py``).
+
+Runs against a ``LocalRelay`` wrapped to count session-row operations, so
+the tests see exactly how often a tool call reaches the relay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+import pytest
+from fastmcp.tools.function_tool import FunctionTool
+
+from biff.models import BiffConfig, UserSession
+from biff.relay import LocalRelay
+from biff.server.app import create_server
+from biff.server.session_cache import SessionCache
+from biff.server.state import ServerState, create_state
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_TEST_REPO = "_test-server"
+_KEY = "kai:tty1"
+_DEBOUNCE = 0.05
+_BURST = 50
+
+
+class _CountingRelay(LocalRelay):
+    """``LocalRelay`` that tallies reads and writes of session rows."""
+
+    def __init__(self, data_dir: Path) -> None:
+        super().__init__(data_dir)
+        self.gets = 0
+        self.puts = 0
+
+    async def get_session(self, session_key: str) -> UserSession | None:
+        self.gets += 1
+        return await super().get_session(session_key)
+
+    async def update_session(self, session: UserSession) -> None:
+        self.puts += 1
+        await super().update_session(session)
+
+    @property
+    def ops(self) -> int:
+        return self.gets + self.puts
+
+
+@pytest.fixture
+def relay(tmp_path: Path) -> _CountingRelay:
+    return _CountingRelay(tmp_path)
+
+
+@pytest.fixture
+def state(tmp_path: Path, relay: _CountingRelay) -> ServerState:
+    s = create_state(
+        BiffConfig(user="kai", repo_name=_TEST_REPO),
+        tmp_path,
+        relay=relay,
+        tty="tty1",
+        hostname="test-host",
+        pwd="/test",
+    )
+    object.__setattr__(
+        s, "session_cache", SessionCache(relay, s.session_key, debounce=_DEBOUNCE)
+    )
+    return s
+
+
+async def _tool(state: ServerState, name: str):
+    tool = await create_server(state).get_tool(name)
+    assert isinstance(tool, FunctionTool)
+    return tool.fn
+
+
+async def _seed(relay: _CountingRelay) -> None:
+    """Write this server's row as registration would, then zero the tally."""
+    await relay.update_session(
+        UserSession(user="kai", tty="tty1", tty_name="tty1", repo=_TEST_REPO)
+    )
+    relay.gets = relay.puts = 0
+
+
+class TestToolCallBurst:
+    async def test_fifty_tool_calls_cost_one_load_and_one_write(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        who = await _tool(state, "who")
+        for _ in range(_BURST):
+            await who()
+        # One load; every touch is held in memory.
+        assert relay.ops == 1
+        await asyncio.sleep(_DEBOUNCE * 4)
+        # One deferred flush: re-read + merge, then a single write.
+        print(f"\n{_BURST} tool calls: {relay.ops} session-row ops (was {2 * _BURST})")
+        assert relay.puts == 1
+        assert relay.ops <= 3
+
+    async def test_deferred_flush_persists_last_active(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        before = await relay.get_session(_KEY)
+        assert before is not None
+        await (await _tool(state, "who"))()
+        await asyncio.sleep(_DEBOUNCE * 4)
+        after = await relay.get_session(_KEY)
+        assert after is not None
+        assert after.last_active > before.last_active
+        assert not state.session_cache.dirty
+
+
+class TestSessionCacheWrites:
+    async def test_material_change_is_written_immediately(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        await (await _tool(state, "plan"))(message="auth refactor")
+        stored = await relay.get_session(_KEY)
+        assert stored is not None
+        assert stored.plan == "auth refactor"
+
+    async def test_flush_preserves_fields_changed_elsewhere(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        cache = state.session_cache
+        await cache.get()
+        # Another writer flips mesg while this process has a pending touch.
+        await relay.update_session(
+            UserSession(
+                user="kai",
+                tty="tty1",
+                tty_name="tty1",
+                repo=_TEST_REPO,
+                biff_enabled=False,
+            )
+        )
+        await cache.update(plan="mine")
+        stored = await relay.get_session(_KEY)
+        assert stored is not None
+        assert stored.plan == "mine"
+        assert stored.biff_enabled is False
+
+    async def test_touch_does_not_resurrect_deleted_row(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        cache = state.session_cache
+        await cache.get()
+        await relay.delete_session(_KEY)
+        await cache.update(last_active=datetime.now(UTC))
+        assert await cache.flush() is None
+        assert await relay.get_session(_KEY) is None
+
+    async def test_field_change_recreates_deleted_row(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        cache = state.session_cache
+        await cache.get()
+        await relay.delete_session(_KEY)
+        await cache.update(plan="still here")
+        stored = await relay.get_session(_KEY)
+        assert stored is not None
+        assert stored.plan == "still here"
+
+    async def test_close_drops_scheduled_write(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        cache = state.session_cache
+        await cache.get()
+        await cache.update(last_active=datetime.now(UTC))
+        await cache.close()
+        await asyncio.sleep(_DEBOUNCE * 4)
+        assert relay.puts == 0
+
+
+class TestSessionCacheHeartbeat:
+    async def test_heartbeat_folds_pending_touch(
+        self, state: ServerState, relay: _CountingRelay
+    ) -> None:
+        await _seed(relay)
+        cache = state.session_cache
+        await cache.get()
+        await cache.update(last_active=datetime.now(UTC))
+        assert await cache.heartbeat()
+        assert relay.puts == 1
+        assert not cache.dirty
+
+    async def test_heartbeat_without_session_defers_to_relay(
+        self, state: ServerState
+    ) -> None:
+        assert not await state.session_cache.heartbeat()
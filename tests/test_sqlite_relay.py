@@ -0,0 +1,334 @@
+"""Tests for the SQLite relay (``biff.sqlite_relay``).
+
+The protocol-level ``LocalRelay`` test classes are re-run here against a
+``SqliteRelay`` (conformance), followed by the behaviour only the SQLite
+backend has: repo scoping, shared-file access, reservation lapse, wall,
+wtmp, and URL selection.  The ``slow`` benchmark compares both relays at
+10k messages and 200 sessions.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from biff.models import BiffConfig, Message, SessionEvent, UserSession, WallPost
+from biff.relay import SESSION_TTL_SECONDS, LocalRelay, Relay
+from biff.server.state import create_state
+from biff.sqlite_relay import DEFAULT_DB_NAME, SqliteRelay, sqlite_path_from_url
+
+from . import test_relay as local
+
+_REPO = "_test-sqlite"
+
+
+@pytest.fixture
+def relay(tmp_path: Path) -> Iterator[SqliteRelay]:
+    r = SqliteRelay(tmp_path / "relay.db")
+    yield r
+    r._close()  # pyright: ignore[reportPrivateUsage]
+
+
+@pytest.fixture
+def scoped(tmp_path: Path) -> Iterator[SqliteRelay]:
+    r = SqliteRelay(tmp_path / "relay.db", repo_name=_REPO)
+    yield r
+    r._close()  # pyright: ignore[reportPrivateUsage]
+
+
+# -- Conformance: LocalRelay's protocol-level tests, this module's fixture --
+
+
+class TestDeliverMany(local.TestDeliverMany):
+    pass
+
+
+class TestFetch(local.TestFetch):
+    pass
+
+
+class TestGetUnreadSummary(local.TestGetUnreadSummary):
+    pass
+
+
+class TestUserInbox(local.TestUserInbox):
+    pass
+
+
+class TestFetchInboxes(local.TestFetchInboxes):
+    pass
+
+
+class TestDrain(local.TestDrain):
+    pass
+
+
+class TestGetSession(local.TestGetSession):
+    pass
+
+
+class TestGetSessionsForUser(local.TestGetSessionsForUser):
+    pass
+
+
+class TestGetSessions(local.TestGetSessions):
+    pass
+
+
+class TestHeartbeat(local.TestHeartbeat):
+    pass
+
+
+class TestSessionKeyValidation(local.TestSessionKeyValidation):
+    pass
+
+
+class TestSessionTtyHint(local.TestSessionTtyHint):
+    pass
+
+
+# -- SQLite-specific --
+
+
+class TestMarkRead:
+    async def test_removes_only_named_messages(self, relay: SqliteRelay) -> None:
+        keep = Message(from_user="kai", to_user="eric:tty2", body="keep")
+        drop = Message(from_user="kai", to_user="eric:tty2", body="drop")
+        await relay.deliver(drop)
+        await relay.deliver(keep)
+        await relay.mark_read("eric:tty2", [drop.id])
+        assert [m.body for m in await relay.fetch("eric:tty2")] == ["keep"]
+
+    async def test_does_not_touch_other_mailboxes(self, relay: SqliteRelay) -> None:
+        msg = Message(from_user="kai", to_user="eric", body="broadcast")
+        await relay.deliver(msg)
+        await relay.mark_read("eric:tty2", [msg.id])
+        assert len(await relay.fetch_user_inbox("eric")) == 1
+
+
+class TestSharedDatabase:
+    async def test_second_instance_sees_writes(
+        self, tmp_path: Path, relay: SqliteRelay
+    ) -> None:
+        """Two servers on one host share the file (WAL)."""
+        other = SqliteRelay(tmp_path / "relay.db")
+        await relay.update_session(UserSession(user="kai", tty="tty1", plan="x"))
+        await relay.deliver(Message(from_user="kai", to_user="eric:tty2", body="hi"))
+        session = await other.get_session("kai:tty1")
+        assert session is not None
+        assert session.plan == "x"
+        assert len(await other.fetch("eric:tty2")) == 1
+        await other.close()
+
+    async def test_reopens_after_disconnect(self, relay: SqliteRelay) -> None:
+        await relay.update_session(UserSession(user="kai", tty="tty1"))
+        await relay.disconnect()
+        assert await relay.get_session("kai:tty1") is not None
+
+    async def test_locked_write_does_not_block_loop(
+        self, tmp_path: Path, relay: SqliteRelay
+    ) -> None:
+        """A writer queued behind another server's lock waits off the loop."""
+        await relay.get_sessions()
+        holder = sqlite3.connect(tmp_path / "relay.db", isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        write = asyncio.create_task(
+            relay.update_session(UserSession(user="kai", tty="tty1"))
+        )
+        t0 = time.perf_counter()
+        await asyncio.sleep(0.05)
+        assert time.perf_counter() - t0 < 1.0
+        assert not write.done()
+        holder.execute("COMMIT")
+        holder.close()
+        await asyncio.wait_for(write, timeout=5)
+        assert await relay.get_session("kai:tty1") is not None
+
+    async def test_wal_mode(self, relay: SqliteRelay) -> None:
+        await relay.get_sessions()
+        db = relay._db()  # pyright: ignore[reportPrivateUsage]
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestRepoScope:
+    async def test_sessions_scoped_to_repo(self, tmp_path: Path) -> None:
+        a = SqliteRelay(tmp_path / "relay.db", repo_name="alpha")
+        b = SqliteRelay(tmp_path / "relay.db", repo_name="beta")
+        await a.update_session(UserSession(user="kai", tty="tty1"))
+        await b.update_session(UserSession(user="eric", tty="tty2"))
+        assert [s.user for s in await a.get_sessions()] == ["kai"]
+        assert await a.get_sessions_for_user("eric") == []
+        both = await a.get_sessions_for_repos(frozenset({"alpha", "beta"}))
+        assert {s.user for s in both} == {"kai", "eric"}
+
+    async def test_cross_repo_delivery(self, tmp_path: Path) -> None:
+        a = SqliteRelay(tmp_path / "relay.db", repo_name="alpha")
+        b = SqliteRelay(tmp_path / "relay.db", repo_name="beta")
+        msg = Message(from_user="kai", to_user="eric", body="over here")
+        await a.deliver(msg, target_repo="beta")
+        assert await a.fetch_user_inbox("eric") == []
+        assert [m.body for m in await b.fetch_user_inbox("eric")] == ["over here"]
+
+    async def test_expired_sessions_hidden(self, scoped: SqliteRelay) -> None:
+        stale = datetime.now(UTC) - timedelta(seconds=SESSION_TTL_SECONDS + 60)
+        await scoped.update_session(
+            UserSession(user="kai", tty="tty1", last_active=stale)
+        )
+        assert await scoped.get_session("kai:tty1") is None
+        assert await scoped.get_sessions() == []
+
+
+class TestTtyReservation:
+    async def test_reserve_is_exclusive(self, relay: SqliteRelay) -> None:
+        assert await relay.reserve_tty_name("kai", "tty1", "kai:a")
+        assert not await relay.reserve_tty_name("kai", "tty1", "kai:b")
+        assert await relay.get_tty_reservation_owner("kai", "tty1") == "kai:a"
+
+    async def test_release_frees_name(self, relay: SqliteRelay) -> None:
+        await relay.reserve_tty_name("kai", "tty1", "kai:a")
+        await relay.release_tty_name("kai", "tty1")
+        assert await relay.reserve_tty_name("kai", "tty1", "kai:b")
+
+    async def test_lapsed_reservation_is_reclaimable(self, relay: SqliteRelay) -> None:
+        await relay.reserve_tty_name("kai", "tty1", "kai:a")
+        db = relay._db()  # pyright: ignore[reportPrivateUsage]
+        db.execute("UPDATE names SET updated = ?", (time.time() - 2 * 86_400 * 3,))
+        assert await relay.list_reserved_names("kai") == []
+        assert await relay.reserve_tty_name("kai", "tty1", "kai:b")
+        assert await relay.get_tty_reservation_owner("kai", "tty1") == "kai:b"
+
+    async def test_refresh_only_by_owner(self, relay: SqliteRelay) -> None:
+        await relay.reserve_tty_name("kai", "tty1", "kai:a")
+        db = relay._db()  # pyright: ignore[reportPrivateUsage]
+        db.execute("UPDATE names SET updated = 0")
+        await relay.refresh_tty_reservation("kai", "tty1", "kai:b")
+        assert await relay.get_tty_reservation_owner("kai", "tty1") is None
+        await relay.refresh_tty_reservation("kai", "tty1", "kai:a")
+        assert await relay.get_tty_reservation_owner("kai", "tty1") == "kai:a"
+
+
+class TestWallAndWtmp:
+    async def test_wall_roundtrip_and_expiry(self, scoped: SqliteRelay) -> None:
+        now = datetime.now(UTC)
+        await scoped.set_wall(
+            WallPost(text="deploy", from_user="kai", expires_at=now + timedelta(1))
+        )
+        wall = await scoped.get_wall()
+        assert wall is not None
+        assert wall.text == "deploy"
+        assert await scoped.get_wall(repo="elsewhere") is None
+        await scoped.set_wall(
+            WallPost(text="old", from_user="kai", expires_at=now - timedelta(1))
+        )
+        assert await scoped.get_wall() is None
+
+    async def test_wtmp_most_recent_first(self, scoped: SqliteRelay) -> None:
+        for i, user in enumerate(("kai", "eric", "kai")):
+            await scoped.append_wtmp(
+                SessionEvent(
+                    session_key=f"{user}:tty{i}", event="login", user=user, repo=_REPO
+                )
+            )
+        events = await scoped.get_wtmp(count=2)
+        assert [e.session_key for e in events] == ["kai:tty2", "eric:tty1"]
+        kai = await scoped.get_wtmp(user="kai")
+        assert [e.session_key for e in kai] == ["kai:tty2", "kai:tty0"]
+
+
+class TestRelaySelection:
+    def test_url_paths(self, tmp_path: Path) -> None:
+        assert sqlite_path_from_url("sqlite:///var/b.db", tmp_path) == Path("/var/b.db")
+        assert sqlite_path_from_url("sqlite://", tmp_path) == tmp_path / DEFAULT_DB_NAME
+        with pytest.raises(ValueError, match="Not a sqlite"):
+            sqlite_path_from_url("nats://x", tmp_path)
+
+    def test_create_state_selects_sqlite(self, tmp_path: Path) -> None:
+        db = tmp_path / "shared.db"
+        config = BiffConfig(user="kai", repo_name=_REPO, relay_url=f"sqlite://{db}")
+        state = create_state(config, tmp_path)
+        assert isinstance(state.relay, SqliteRelay)
+        assert state.relay.path == db
+
+
+# -- Benchmark ----------------------------------------------------------------
+
+_MESSAGES = 10_000
+_SESSIONS = 200
+_KEYS = [f"user{i % 50}:tty{i}" for i in range(_SESSIONS)]
+
+
+async def _register(relay: Relay) -> None:
+    for key in _KEYS:
+        user, tty = key.split(":")
+        await relay.update_session(UserSession(user=user, tty=tty, repo=_REPO))
+
+
+async def _deliver(relay: Relay) -> None:
+    for n in range(_MESSAGES):
+        await relay.deliver(
+            Message(from_user="kai", to_user=_KEYS[n % _SESSIONS], body=f"m{n}")
+        )
+
+
+async def _heartbeat(relay: Relay) -> None:
+    for key in _KEYS:
+        await relay.heartbeat(key)
+
+
+async def _unread(relay: Relay) -> None:
+    for key in _KEYS:
+        await relay.get_unread_summary(key)
+
+
+async def _who(relay: Relay) -> None:
+    for _ in _KEYS:
+        await relay.get_sessions()
+
+
+async def _read_all(relay: Relay) -> None:
+    for key in _KEYS:
+        messages = await relay.fetch(key)
+        await relay.mark_read(key, [m.id for m in messages])
+
+
+_PHASES: list[tuple[str, Callable[[Relay], Awaitable[None]]]] = [
+    ("register 200 sessions", _register),
+    ("deliver 10k messages", _deliver),
+    ("heartbeat x200", _heartbeat),
+    ("unread summary x200", _unread),
+    ("get_sessions x200", _who),
+    ("fetch + mark_read x200", _read_all),
+]
+
+
+async def _workload(relay: Relay) -> dict[str, float]:
+    """Time each phase of a 10k-message, 200-session run (ms)."""
+    timings: dict[str, float] = {}
+    for phase, run in _PHASES:
+        t0 = time.perf_counter()
+        await run(relay)
+        timings[phase] = (time.perf_counter() - t0) * 1000
+    return timings
+
+
+@pytest.mark.slow
+async def test_sqlite_vs_local_relay(tmp_path: Path) -> None:
+    local = await _workload(LocalRelay(tmp_path / "local"))
+    sqlite_relay = SqliteRelay(tmp_path / "sqlite" / "relay.db")
+    sqlite = await _workload(sqlite_relay)
+    await sqlite_relay.close()
+
+    print()
+    print(f"{'phase':<24} {'LocalRelay ms':>14} {'SqliteRelay ms':>15} {'x':>6}")
+    for phase, local_ms in local.items():
+        ratio = local_ms / sqlite[phase]
+        print(f"{phase:<24} {local_ms:>14.1f} {sqlite[phase]:>15.1f} {ratio:>6.1f}")
+    print(f"{'total':<24} {sum(local.values()):>14.1f} {sum(sqlite.values()):>15.1f}")
+
+    assert sum(sqlite.values()) < sum(local.values())
@@ -0,0 +1,102 @@
+"""Startup-cost regression tests for the ``biff-statusline`` entry point.
+
+Claude Code runs the status line on every render, so the entry point must
+not import the application stack.  These tests run it in a fresh
+interpreter: one asserts the loaded module set, one bounds the wall-clock
+time of a full render.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+# Third-party and heavy first-party modules a render must never load.
+_FORBIDDEN = (
+    "pydantic",
+    "nats",
+    "typer",
+    "fastmcp",
+    "mcp",
+    "biff.models",
+    "biff.relay",
+    "biff.nats_relay",
+    "biff.server",
+    "biff.__main__",
+)
+
+# Generous enough for a loaded CI runner; the full CLI path takes seconds.
+_RENDER_BUDGET_SECONDS = 1.0
+
+_SESSION_BLOB = json.dumps(
+    {
+        "context_window": {"used_percentage": 42},
+        "cost": {"total_cost_usd": 1.5},
+    }
+)
+
+
+def _env(home: Path) -> dict[str, str]:
+    """Isolated HOME so no real stash or unread file is read."""
+    return {**os.environ, "HOME": str(home)}
+
+
+class TestStatuslineEntryImports:
+    def test_render_loads_no_heavy_modules(self, tmp_path: Path) -> None:
+        script = (
+            "import io, sys\n"
+            f"sys.stdin = io.StringIO({_SESSION_BLOB!r})\n"
+            "from biff._statusline_entry import main\n"
+            "main()\n"
+            "print('\\x00' + '\\n'.join(sorted(sys.modules)))\n"
+        )
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env=_env(tmp_path),
+            check=True,
+        )
+        modules = set(result.stdout.split("\x00", 1)[1].split())
+        loaded = sorted(
+            m
+            for m in modules
+            if any(m == f or m.startswith(f"{f}.") for f in _FORBIDDEN)
+        )
+        assert loaded == []
+        biff_modules = sorted(m for m in modules if m.startswith("biff"))
+        assert biff_modules == [
+            "biff",
+            "biff._statusline_entry",
+            "biff._stdlib",
+            "biff.session_key",
+            "biff.statusline",
+            "biff.unread",
+        ]
+
+
+class TestStatuslineEntryWallClock:
+    def test_one_render_within_budget(self, tmp_path: Path) -> None:
+        start = time.perf_counter()
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "biff._statusline_entry"],
+            input=_SESSION_BLOB,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env=_env(tmp_path),
+            check=True,
+        )
+        elapsed = time.perf_counter() - start
+
+        assert "42%" in result.stdout
+        assert "$1.50" in result.stdout
+        assert elapsed < _RENDER_BUDGET_SECONDS, f"render took {elapsed:.3f}s"
@@ -0,0 +1,71 @@
+"""Tests for the push-maintained unread counter and ack-subject parsing."""
+
+from __future__ import annotations
+
+from biff.unread_counter import UnreadCounter, removed_stream_seq
+
+_V1 = "$JS.ACK.biff-inbox.repo-inbox-kai-tty1.1.42.7.1700000000000000000.0"
+_V2 = (
+    "$JS.ACK._.ACCHASH.biff-inbox.repo-inbox-kai-tty1.1.42.7.1700000000000000000.0.tok"
+)
+
+
+class TestRemovedStreamSeq:
+    def test_v1_ack(self) -> None:
+        assert removed_stream_seq(_V1, b"+ACK") == 42
+
+    def test_v2_ack(self) -> None:
+        assert removed_stream_seq(_V2, b"+ACK") == 42
+
+    def test_empty_payload_is_ack(self) -> None:
+        assert removed_stream_seq(_V1, b"") == 42
+
+    def test_term_and_next_remove(self) -> None:
+        assert removed_stream_seq(_V1, b"+TERM") == 42
+        assert removed_stream_seq(_V1, b"+NXT {}") == 42
+
+    def test_nak_and_progress_do_not_remove(self) -> None:
+        assert removed_stream_seq(_V1, b"-NAK") is None
+        assert removed_stream_seq(_V1, b"+WPI") is None
+
+    def test_non_ack_subject(self) -> None:
+        assert removed_stream_seq("biff.repo.inbox.kai", b"") is None
+        assert removed_stream_seq("$JS.ACK.short", b"+ACK") is None
+
+
+class TestUnreadCounter:
+    def test_needs_reconcile_until_seeded(self) -> None:
+        counter = UnreadCounter(reconcile_interval=300.0)
+        assert counter.needs_reconcile(now=0.0)
+        counter.reconcile(3, now=0.0)
+        assert not counter.needs_reconcile(now=299.0)
+        assert counter.needs_reconcile(now=300.0)
+        assert counter.count == 3
+
+    def test_publish_and_remove(self) -> None:
+        counter = UnreadCounter(reconcile_interval=300.0)
+        counter.reconcile(0, now=0.0)
+        counter.apply_publish()
+        counter.apply_publish()
+        counter.apply_removed(1)
+        assert counter.count == 1
+
+    def test_removal_idempotent_per_sequence(self) -> None:
+        """Local decrement plus the wire echo of the same ack count once."""
+        counter = UnreadCounter(reconcile_interval=300.0)
+        counter.reconcile(2, now=0.0)
+        counter.apply_removed(7)
+        counter.apply_removed(7)
+        assert counter.count == 1
+
+    def test_never_negative(self) -> None:
+        counter = UnreadCounter(reconcile_interval=300.0)
+        counter.reconcile(0, now=0.0)
+        counter.apply_removed(1)
+        assert counter.count == 0
+
+    def test_invalidate_forces_reconcile(self) -> None:
+        counter = UnreadCounter(reconcile_interval=300.0)
+        counter.reconcile(5, now=0.0)
+        counter.invalidate()
+        assert counter.needs_reconcile(now=1.0)